@@ -1,8 +1,27 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from .annotation import AnnotationLayer
+import importlib
+
+from .usi import to_usi
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/1/27'
 
+# tensorflowとsonnetを使うものは、使う時に読み込む
+# numpyだけで計算するモジュールはtensorflowがなくても読み込める
+_LAZY_ATTRIBUTES = {
+    'ACTION_FORMATS': '.action_format',
+    'unpack_action': '.action_format',
+    'AnnotationLayer': '.annotation',
+    'OUTPUT_NAMES': '.annotation'
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name)
+    )
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合法手の出力形式
+
+list: 行動ごとの盤面のlist (139個)
+dense: 行動の次元をチャネルにまとめた1つのテンソル
+    NCHWなら[batch, 139, 9, 9]、NHWCなら[batch, 9, 9, 139]
+packed8: マスの次元をビットに詰めた[batch, 139, 11]のuint8
+packed32: マスの次元をビットに詰めた[batch, 139, 3]のuint32
+sparse: 合法手だけを並べたSparseAction
+    values: [合法手の総数, 2]のint32、行動のインデックスと移動先のマスの番号の組
+    offsets: [batch + 1]のint32、局面bの合法手はvalues[offsets[b]:offsets[b + 1]]
+    count: [batch]のint32、局面ごとの合法手の数
+    usi.to_usiでUSI形式の文字列にできる
+
+ビットに詰める場合、マスの番号(筋 * 9 + 段)がsの行動は
+s // ビット数番目の要素のs % ビット数番目のビットになる
+"""
+
+import numpy as np
+import tensorflow as tf
+
+from .memo import lookup, store
+from .vectorized.core import SparseAction
+from .vectorized.table import ACTION_SIZE
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+ACTION_FORMATS = ('list', 'dense', 'packed8', 'packed32', 'sparse')
+
+# 詰める型と1要素のビット数
+PACKED_TYPES = {
+    'packed8': (tf.uint8, np.uint8, 8),
+    'packed32': (tf.uint32, np.uint32, 32)
+}
+
+
+def check_action_format(action_format):
+    if action_format not in ACTION_FORMATS:
+        raise ValueError(action_format)
+
+
+def get_packed_size(n_bits):
+    """
+    81マスを詰めるのに必要な要素の個数
+
+    :param n_bits:
+    :return:
+    """
+    return (81 + n_bits - 1) // n_bits
+
+
+def make_dense_action(actions, data_format):
+    """
+    行動ごとの盤面をチャネルの方向に繋げる
+    それぞれの盤面はチャネルの大きさが1なので、変形せずに繋げられる
+    BlackActionLayerでまとめた[batch, 139, 9, 9]はNCHWの形なので、
+    NHWCの場合だけ転置する
+
+    :param actions: 行動ごとの盤面のlist、またはまとめたテンソル
+    :param data_format:
+    :return:
+    """
+    if not isinstance(actions, (list, tuple)):
+        if data_format == 'NCHW':
+            return tf.identity(actions, name='dense_action')
+        return tf.transpose(actions, [0, 2, 3, 1], name='dense_action')
+
+    axis = 1 if data_format == 'NCHW' else -1
+    return tf.concat(actions, axis=axis, name='dense_action')
+
+
+def make_pack_weight(n_bits):
+    name = 'action_pack_weight'
+    cached = lookup(name, n_bits)
+    if cached is not None:
+        return cached
+
+    # uint32の最上位ビットまで扱えるようにint64で足し合わせる
+    weight = tf.constant(1 << np.arange(n_bits, dtype=np.int64),
+                         dtype=tf.int64, name=name)
+
+    store(weight, name, n_bits)
+
+    return weight
+
+
+def pack_action(dense, data_format, action_format):
+    """
+    行動をマスの次元をビットに詰めた整数にする
+
+    :param dense: make_dense_actionの出力
+    :param data_format:
+    :param action_format: 'packed8'または'packed32'
+    :return:
+    """
+    dtype, _, n_bits = PACKED_TYPES[action_format]
+    size = get_packed_size(n_bits=n_bits)
+
+    with tf.name_scope('pack_action'):
+        if data_format != 'NCHW':
+            dense = tf.transpose(dense, [0, 3, 1, 2])
+        flag = tf.reshape(dense, [-1, ACTION_SIZE, 81])
+        flag = tf.pad(tf.cast(flag, tf.int64),
+                      [[0, 0], [0, 0], [0, size * n_bits - 81]])
+        flag = tf.reshape(flag, [-1, ACTION_SIZE, size, n_bits])
+        packed = tf.reduce_sum(flag * make_pack_weight(n_bits=n_bits),
+                               axis=3)
+        packed = tf.cast(packed, dtype)
+    return packed
+
+
+def unpack_action(packed, data_format):
+    """
+    ビットに詰めた行動をnumpyで盤面の形に戻す
+
+    :param packed: [batch, 139, 11]のuint8または[batch, 139, 3]のuint32
+    :param data_format:
+    :return: bool型の[batch, 139, 9, 9]または[batch, 9, 9, 139]
+    """
+    packed = np.asarray(packed)
+    # リトルエンディアンのバイト列にして、下位ビットから展開する
+    data = packed.astype(packed.dtype.newbyteorder('<')).view(np.uint8)
+    flag = np.unpackbits(data, axis=-1, bitorder='little')[..., :81]
+    flag = np.reshape(flag.astype(np.bool_), packed.shape[:-1] + (9, 9))
+    if data_format != 'NCHW':
+        flag = np.moveaxis(flag, -3, -1)
+    return flag
+
+
+def unpack_action_tensor(packed, data_format):
+    """
+    ビットに詰めた行動をグラフの中で盤面の形に戻す
+
+    :param packed: [batch, 139, 11]のuint8または[batch, 139, 3]のuint32
+    :param data_format:
+    :return: bool型の[batch, 139, 9, 9]または[batch, 9, 9, 139]
+    """
+    n_bits = packed.dtype.size * 8
+    size = get_packed_size(n_bits=n_bits)
+
+    with tf.name_scope('unpack_action'):
+        flag = tf.not_equal(
+            tf.bitwise.bitwise_and(
+                tf.expand_dims(tf.cast(packed, tf.int64), axis=3),
+                make_pack_weight(n_bits=n_bits)
+            ),
+            0
+        )
+        flag = tf.reshape(flag, [-1, ACTION_SIZE, size * n_bits])[..., :81]
+        flag = tf.reshape(flag, [-1, ACTION_SIZE, 9, 9])
+        if data_format != 'NCHW':
+            flag = tf.transpose(flag, [0, 2, 3, 1])
+    return flag
+
+
+def make_sparse_action(dense, data_format):
+    """
+    合法手だけを局面の順に並べる
+    局面の中では行動のインデックス、マスの番号の順
+
+    :param dense: make_dense_actionの出力
+    :param data_format:
+    :return:
+    """
+    with tf.name_scope('sparse_action'):
+        if data_format != 'NCHW':
+            dense = tf.transpose(dense, [0, 3, 1, 2])
+        flag = tf.reshape(dense, [-1, ACTION_SIZE, 81])
+
+        indices = tf.where(flag)
+        values = tf.to_int32(indices[:, 1:])
+        count = tf.reduce_sum(tf.to_int32(flag), axis=[1, 2])
+        offsets = tf.concat([tf.zeros([1], dtype=tf.int32),
+                             tf.cumsum(count)], axis=0)
+    return SparseAction(values=values, offsets=offsets, count=count)
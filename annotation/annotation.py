@@ -2,37 +2,224 @@
 # -*- coding: utf-8 -*-
 
 import sonnet as snt
+import tensorflow as tf
 
+from .action_format import (check_action_format, make_dense_action,
+                            make_sparse_action, pack_action)
 from .black_effect import BlackEffectLayer
 from .black_action import BlackActionLayer
+from .check import CheckLayer
+from .effect_context import EffectContextLayer
 from .white_effect import WhiteEffectLayer
-from .black_action.merge import merge
+from .naive_effect import check_long_engine, check_short_engine
+from .occupancy import make_occupancy
+from .perspective import (split_both_sides, stack_both_sides, to_absolute,
+                          to_relative)
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/3/22'
 
 
+# AnnotationLayerの出力の名前と既定の順序
+OUTPUT_NAMES = ('action', 'black_count', 'white_count', 'check')
+# 盤面の形の出力
+BOARD_OUTPUT_NAMES = ('action', 'black_count', 'white_count')
+
+
+def check_outputs(outputs):
+    for name in outputs:
+        if name not in OUTPUT_NAMES:
+            raise ValueError(name)
+
+
 class AnnotationLayer(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn, name='annotation'):
+    def __init__(self, data_format, use_cudnn, long_engine='conv',
+                 short_engine='conv', outputs=None, absolute_output=False,
+                 both_sides=False, action_format='list', name='annotation'):
+        """
+
+        :param data_format:
+        :param use_cudnn:
+        :param long_engine: 長い利きの計算方法
+            'conv'は距離ごとの畳み込み、'fill'は盤面をずらしながら利きを伸ばす
+            'table'は直線上の駒の配置ごとに計算した利きを表引きする
+            'bank'は方向、距離ごとのフィルタをまとめて畳み込む
+        :param short_engine: 短い利きの計算方法
+            'conv'は方向ごとの畳み込み、'bank'はフィルタをまとめて畳み込む
+            'shift'は盤面をずらして求め、畳み込みを使わない
+        :param outputs: 出力の名前のlist
+            'action', 'black_count', 'white_count', 'check'から選ぶ
+            指定した順序で出力し、必要な部分だけのグラフを作る
+            省略した場合は全て
+        :param absolute_output: 手番を指定して先手から見た局面を入力した場合に、
+            盤面の形の出力を先手から見た向きに戻すか
+            行動の方向や利きの先後は手番側から見たまま
+        :param both_sides: 手番側と非手番側の両方から見た局面の出力を1回で求めるか
+            それぞれの出力は(手番側から見た出力, 非手番側から見た出力)の組になる
+        :param action_format: 合法手の出力形式
+            'list'は行動ごとの盤面のlist、'dense'は行動の次元をチャネルにまとめたテンソル
+            'packed8', 'packed32'はマスの次元をビットに詰めた整数
+            'sparse'は合法手だけを並べたSparseAction
+            詳細はaction_formatを参照
+        :param name:
+        """
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
 
-    def _build(self, board, black_hand):
-        (black_all_effects, black_count, black_check,
-         available_square) = BlackEffectLayer(
-            data_format=self.data_format, use_cudnn=self.use_cudnn
-        )(board)
-        all_actions = BlackActionLayer(
-            data_format=self.data_format
-        )(board, black_hand, black_all_effects, available_square)
+        check_long_engine(long_engine=long_engine)
+        self.long_engine = long_engine
+
+        check_short_engine(short_engine=short_engine)
+        self.short_engine = short_engine
+
+        if outputs is None:
+            outputs = OUTPUT_NAMES
+        check_outputs(outputs=outputs)
+        self.outputs = tuple(outputs)
+        self.absolute_output = absolute_output
+        self.both_sides = both_sides
+
+        check_action_format(action_format=action_format)
+        self.action_format = action_format
+
+    def _build(self, board, black_hand, white_hand=None, turn=None):
+        """
+        turnを省略した場合は手番側から見た局面を入力する
+        turnを指定した場合は先手から見た局面を入力し、グラフの中で手番側から見た局面にする
+
+        :param board: 盤面
+        :param black_hand: 手番側の持ち駒
+            turnを指定した場合は先手の持ち駒
+        :param white_hand: 非手番側の持ち駒
+            turnを指定した場合は後手の持ち駒
+            turnかboth_sidesを指定した場合に必要
+        :param turn: 手番 [batch]のbool、後手番ならTrue
+        :return:
+        """
+        if (turn is not None or self.both_sides) and white_hand is None:
+            raise ValueError('white_hand is required')
+
+        if turn is not None:
+            board, black_hand, white_hand = to_relative(
+                board=board, black_hand=black_hand, white_hand=white_hand,
+                turn=turn
+            )
+
+        if not self.both_sides:
+            results = self._annotate(board=board, black_hand=black_hand)
+            if turn is not None and self.absolute_output:
+                results = self._to_absolute(results=results, turn=turn)
+            results = self._format_action(results=results)
+            return tuple(results[name] for name in self.outputs)
+
+        # 相手から見た局面をバッチの後半に重ねて1回で計算する
+        board, hand = stack_both_sides(board=board, black_hand=black_hand,
+                                       white_hand=white_hand)
+        results = self._annotate(board=board, black_hand=hand, paired=True)
+        black_results, white_results = {}, {}
+        for name, value in results.items():
+            black_results[name], white_results[name] = split_both_sides(
+                output=value
+            )
+        if turn is not None and self.absolute_output:
+            black_results = self._to_absolute(results=black_results,
+                                              turn=turn)
+            white_results = self._to_absolute(results=white_results,
+                                              turn=tf.logical_not(turn))
+        black_results = self._format_action(results=black_results)
+        white_results = self._format_action(results=white_results)
+        return tuple((black_results[name], white_results[name])
+                     for name in self.outputs)
+
+    @staticmethod
+    def _to_absolute(results, turn):
+        """
+        盤面の形の出力を先手から見た向きに戻す
+
+        :param results:
+        :param turn: 出力を計算した局面の手番、後手番ならTrue
+        :return:
+        """
+        results = dict(results)
+        for name in BOARD_OUTPUT_NAMES:
+            if name in results:
+                results[name] = to_absolute(output=results[name], turn=turn)
+        return results
+
+    def _format_action(self, results):
+        """
+        合法手を指定の出力形式にする
+
+        :param results:
+        :return:
+        """
+        if 'action' not in results or self.action_format == 'list':
+            return results
+
+        results = dict(results)
+        action = make_dense_action(actions=results['action'],
+                                   data_format=self.data_format)
+        if self.action_format == 'sparse':
+            action = make_sparse_action(dense=action,
+                                        data_format=self.data_format)
+        elif self.action_format != 'dense':
+            action = pack_action(dense=action, data_format=self.data_format,
+                                 action_format=self.action_format)
+        results['action'] = action
+        return results
+
+    def _annotate(self, board, black_hand, paired=False):
+        """
+        手番側から見た局面で必要な出力を求める
+
+        :param board:
+        :param black_hand:
+        :param paired: バッチの前半と後半が互いに相手から見た局面か
+        :return: 出力の名前をキーとするdict
+        """
+        # 手番側の利きは合法手と手番側の利きの個数で使う
+        use_black = ('action' in self.outputs or
+                     'black_count' in self.outputs)
+        use_white = 'white_count' in self.outputs
+
+        # 空きマスや先後の駒のマスは最初に一度だけ求めて、全ての層に渡す
+        occupancy = make_occupancy(board=board)
+
+        results = {}
+        if use_black or use_white:
+            # 先後のナイーブな利き、王からの仮想的な利き、ピンは両方で使うので一度だけ求める
+            context = EffectContextLayer(
+                data_format=self.data_format, use_cudnn=self.use_cudnn,
+                long_engine=self.long_engine, short_engine=self.short_engine,
+                black=use_black, white=use_white, paired=paired
+            )(board, occupancy)
 
-        white_count = WhiteEffectLayer(
-            data_format=self.data_format, use_cudnn=self.use_cudnn
-        )(board)
+        if use_black:
+            # noinspection PyUnboundLocalVariable
+            (black_all_effects, results['black_count'], black_check,
+             available_square) = BlackEffectLayer(
+                data_format=self.data_format, use_cudnn=self.use_cudnn,
+                long_engine=self.long_engine, short_engine=self.short_engine
+            )(board, context)
+            if 'action' in self.outputs:
+                # list以外の形式ではまとめたテンソルから変換する
+                results['action'] = BlackActionLayer(
+                    data_format=self.data_format,
+                    packed=self.action_format != 'list'
+                )(board, black_hand, black_all_effects, available_square,
+                  occupancy=occupancy)
+            # 方向ごとの王手の判定をまとめる
+            results['check'] = tf.reduce_any(black_check, axis=1,
+                                             keep_dims=True)
+        elif 'check' in self.outputs:
+            # 王手の判定だけなら王のマスから表引きで求める
+            results['check'], _, _ = CheckLayer()(board, occupancy)
 
-        # 方向ごとの王手の判定をまとめる
-        check_list = list(black_check.values())
-        black_check = merge(*check_list)
+        if use_white:
+            results['white_count'] = WhiteEffectLayer(
+                data_format=self.data_format, use_cudnn=self.use_cudnn,
+                long_engine=self.long_engine, short_engine=self.short_engine
+            )(board, context)
 
-        return all_actions, black_count, white_count, black_check
+        return results
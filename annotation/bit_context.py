@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+手番側の利きで使う非手番側のナイーブな利き、手番側の王からの仮想的な利き、
+ピン、王手の判定を、筋ごとにビットに詰めたワード(naive_effect.bits)のまま求める
+
+盤面から1回の表引きで必要な駒と空きマスのワード[batch, K, 9]を作り、
+利きを伸ばす、まとめる、ピンや王手を判定する途中では盤面の形に戻さない
+EffectContextとして後の層に渡す出力だけを最後に盤面の形のboolに戻す
+
+long_engineが'bits'の場合にEffectContextLayerが使う
+出力はEffectContextLayerの他のlong_engineの場合と同じ
+"""
+
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import sonnet as snt
+import tensorflow as tf
+
+from .black_effect.pseudo_ou_effect import PseudoEffect
+from .check.white_long_check import make_long_check_index
+from .direction import (Direction, get_eight_directions,
+                        get_opposite_direction)
+from .memo import lookup, store
+from .naive_effect.bits import (BIT_DTYPE, FULL_BITS, fill_words,
+                                pad_board_words, reduce_and_words,
+                                reduce_or_words, shift_padded_words,
+                                unpack_words)
+from .naive_effect.packed import (SHORT_DIRECTIONS, from_packed_plane,
+                                  reverse_directions)
+from .pin.black_offset import make_black_pin_offset
+from .piece import Piece
+from .selection import TABLE_SIZE, make_tables
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+# 非手番側の短い利きの方向、8方向と前に跳ねる桂馬の動き
+WHITE_SHORT_DIRECTIONS = get_eight_directions() + (Direction.RIGHT_DOWN_DOWN,
+                                                   Direction.LEFT_DOWN_DOWN)
+
+BitContext = namedtuple('BitContext', [
+    'white_naive_effect', 'white_naive_long_effect',
+    'black_pseudo_ou_effect', 'black_pinned_board',
+    'black_check', 'black_long_check', 'black_available_square'
+])
+
+
+def make_word_arrays():
+    """
+    ワードにする盤面ごとの、駒の種類からその駒を選ぶかの表
+    長い利きの表はselectionと同じもののchannel1(利きを伸ばす駒)を使う
+
+    :return: キーから[TABLE_SIZE]のbool型の表へのOrderedDict
+    """
+    tables = make_tables()
+    arrays = OrderedDict()
+
+    empty = np.zeros(TABLE_SIZE, dtype=np.bool_)
+    empty[Piece.EMPTY] = True
+    arrays['empty'] = empty
+    black = np.zeros(TABLE_SIZE, dtype=np.bool_)
+    black[:Piece.WHITE_FU] = True
+    arrays['black'] = black
+
+    arrays['black_long_ou'] = tables['black_long_ou'][:, 1]
+    for direction in get_eight_directions():
+        key = 'white_long', direction
+        arrays[key] = tables[key][:, 1]
+    for direction in WHITE_SHORT_DIRECTIONS:
+        key = 'white_short', direction
+        arrays[key] = tables[key]
+    for key in ('white_hi_ry', 'white_ka_um', 'white_ky'):
+        arrays[key] = tables[key]
+    return OrderedDict((key, np.asarray(value, dtype=np.bool_))
+                       for key, value in arrays.items())
+
+
+_word_catalog = None
+
+
+def get_word_catalog():
+    """
+    キーからワードの位置への対応と、段ごとにビットをずらした表
+    表は[9 * TABLE_SIZE, K]のuint16で、段jの駒vは行j * TABLE_SIZE + v
+
+    :return:
+    """
+    global _word_catalog
+    if _word_catalog is not None:
+        return _word_catalog
+
+    arrays = make_word_arrays()
+    index = {key: i for i, key in enumerate(arrays)}
+    table = np.stack(list(arrays.values()), axis=1).astype(np.uint16)
+    table = np.concatenate([table << rank for rank in range(9)], axis=0)
+    _word_catalog = index, table
+    return _word_catalog
+
+
+def make_word_table():
+    name = 'bit_context_word_table'
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    _, table = get_word_catalog()
+    table = tf.constant(table, dtype=BIT_DTYPE, name=name)
+
+    store(table, name)
+
+    return table
+
+
+def make_rank_offset():
+    name = 'bit_context_rank_offset'
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    offset = tf.constant(np.arange(9, dtype=np.int32) * TABLE_SIZE,
+                         name=name)
+
+    store(offset, name)
+
+    return offset
+
+
+def select_words(board):
+    """
+    make_word_arraysの全ての盤面のワード[batch, K, 9]を求める
+    盤面の値と段から1回だけ表引きして、段の方向に論理和をとる
+
+    :param board:
+    :return:
+    """
+    # data_formatに関係なく盤面の並びは(筋, 段)
+    index = tf.reshape(board, [-1, 9, 9]) + make_rank_offset()
+    bits = tf.gather(make_word_table(), index)
+    words = reduce_or_words(bits, axis=2)
+    return tf.transpose(words, [0, 2, 1])
+
+
+def any_words(words):
+    """
+    盤面ごとにビットが立っているか
+
+    :param words: [batch, n, 9]
+    :return: [batch, n, 1, 1]のbool
+    """
+    flag = tf.reduce_any(tf.not_equal(words, 0), axis=2)
+    return tf.reshape(flag, [-1, words.get_shape()[1].value, 1, 1])
+
+
+class BlackBitContextLayer(snt.AbstractModule):
+    def __init__(self, data_format, name='black_bit_context'):
+        super().__init__(name=name)
+        self.data_format = data_format
+
+    def _build(self, board):
+        """
+        手番側の利きで使うものをワードのまま求める
+        ピンを考慮していない盤面を入力する
+
+        :param board:
+        :return: BitContext
+            white_naive_effectとblack_available_squareはdata_formatの盤面の形、
+            その他の形はEffectContextLayerとWhiteAllCheckLayerの出力と同じ
+        """
+        index, _ = get_word_catalog()
+        words = select_words(board=board)
+
+        def get(key):
+            i = index[key]
+            return words[:, i:i + 1]
+
+        empty = get('empty')
+        ou = get('black_long_ou')
+
+        # 非手番側の駒と手番側の王から8方向に長い利きを伸ばす
+        # 空きマスは共通なので、方向ごとに駒と王を並べて1回で伸ばす
+        white_long_list, ou_long_list = [], []
+        for direction in get_eight_directions():
+            source = tf.concat([get(('white_long', direction)), ou], axis=1)
+            effect = fill_words(source=source, empty=empty,
+                                direction=direction)
+            white_long_list.append(effect[:, :1])
+            ou_long_list.append(effect[:, 1:])
+        white_long = tf.concat(white_long_list, axis=1)
+        ou_long = tf.concat(ou_long_list, axis=1)
+
+        # 短い利きは1マスずらすだけ
+        white_short_pieces = pad_board_words(tf.concat([
+            get(('white_short', direction))
+            for direction in WHITE_SHORT_DIRECTIONS
+        ], axis=1))
+        white_short = tf.concat([
+            shift_padded_words(padded=white_short_pieces[:, i:i + 1],
+                               direction=direction)
+            for i, direction in enumerate(WHITE_SHORT_DIRECTIONS)
+        ], axis=1)
+        padded_ou = pad_board_words(ou)
+        ou_short = tf.concat([
+            shift_padded_words(padded=padded_ou, direction=direction)
+            for direction in SHORT_DIRECTIONS
+        ], axis=1)
+
+        # 非手番側の全ての利きをまとめる
+        white_effect = reduce_or_words(
+            tf.concat([white_short, white_long], axis=1), axis=1
+        )
+
+        # 反対同士からの利きが当たっている手番側の駒はピンされている
+        pinned = tf.bitwise.bitwise_and(
+            tf.bitwise.bitwise_and(ou_long, reverse_directions(white_long)),
+            get('black')
+        )
+
+        # 王の仮想的な利きが王手をする駒に当たっているかを判定する
+        # 8方向の短い利きは利きの方向と逆向きに動ける駒
+        short_check = any_words(tf.bitwise.bitwise_and(ou_short, tf.concat([
+            get(('white_short', get_opposite_direction(direction)))
+            for direction in SHORT_DIRECTIONS
+        ], axis=1)))
+        hi_ry = get('white_hi_ry')
+        long_pieces = tf.gather(tf.concat([
+            hi_ry, get('white_ka_um'),
+            tf.bitwise.bitwise_or(hi_ry, get('white_ky'))
+        ], axis=1), make_long_check_index(), axis=1)
+        long_check = any_words(tf.bitwise.bitwise_and(ou_long, long_pieces))
+        check = tf.concat([
+            tf.logical_or(short_check[:, :8], long_check), short_check[:, 8:]
+        ], axis=1)
+
+        # 王手がない方向は全てのマス、王手がある方向は王の仮想的な利きのマスが有効
+        # 8方向は長い利き、桂馬の動きは短い利きを使う
+        free = tf.gather(
+            tf.constant([FULL_BITS, 0], dtype=BIT_DTYPE),
+            tf.to_int32(tf.reshape(check, [-1, 10, 1]))
+        )
+        available_square = reduce_and_words(tf.bitwise.bitwise_or(
+            tf.concat([ou_long, ou_short[:, 8:]], axis=1), free
+        ), axis=1)
+
+        # ここから盤面の形に戻す
+        pin_value = tf.reduce_sum(
+            make_black_pin_offset() * tf.to_int32(unpack_words(pinned)),
+            axis=1
+        )
+        pinned_board = board + tf.reshape(pin_value, tf.shape(board))
+
+        pseudo_ou_effect = PseudoEffect(short=unpack_words(ou_short),
+                                        long=unpack_words(ou_long))
+        context = BitContext(
+            white_naive_effect=from_packed_plane(
+                plane=unpack_words(white_effect),
+                data_format=self.data_format
+            ),
+            white_naive_long_effect=unpack_words(white_long),
+            black_pseudo_ou_effect=pseudo_ou_effect,
+            black_pinned_board=pinned_board,
+            black_check=check,
+            black_long_check=long_check,
+            black_available_square=from_packed_plane(
+                plane=unpack_words(available_square),
+                data_format=self.data_format
+            )
+        )
+        return context
@@ -10,11 +10,20 @@ __date__ = '2018/2/22'
 
 
 class BlackActionLayer(snt.AbstractModule):
-    def __init__(self, data_format, name='black_action'):
+    def __init__(self, data_format, packed=False, name='black_action'):
+        """
+
+        :param data_format:
+        :param packed: Trueの場合は行動をまとめた[batch, 139, 9, 9]を返す
+            盤面の並びはdata_formatに関係なく(筋, 段)
+        :param name:
+        """
         super().__init__(name=name)
         self.data_format = data_format
+        self.packed = packed
 
-    def _build(self, board, black_hand, all_effects, available_square):
+    def _build(self, board, black_hand, all_effects, available_square,
+               occupancy=None):
         """
         行動を規定の順序で並べる
 
@@ -22,11 +31,14 @@ class BlackActionLayer(snt.AbstractModule):
         :param black_hand:
         :param all_effects:
         :param available_square:
+        :param occupancy: boardのmake_occupancyの出力
+            省略した場合はここで求める
         :return:
         """
         all_actions = BlackMergeAllLayer(
-            data_format=self.data_format
-        )(board, black_hand, all_effects, available_square)
+            data_format=self.data_format, packed=self.packed
+        )(board, black_hand, all_effects, available_square,
+          occupancy=occupancy)
 
         # 特徴量の学習でまた分割するので、リストを繋げることはしない
         return all_actions
@@ -4,6 +4,8 @@
 import numpy as np
 import tensorflow as tf
 
+from ..memo import lookup, store
+
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/22'
 
@@ -19,9 +21,9 @@ def make_drop_mask1(data_format):
     :return:
     """
     name = 'black_drop_mask1'
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
+    cached = lookup(name)
+    if cached is not None:
+        return cached
 
     if data_format == 'NCHW':
         mask = np.ones((1, 1, 9, 9), dtype=np.bool)
@@ -32,7 +34,7 @@ def make_drop_mask1(data_format):
 
     mask = tf.constant(mask, dtype=tf.bool)
 
-    tf.add_to_collection(name, mask)
+    store(mask, name)
 
     return mask
 
@@ -48,9 +50,9 @@ def make_drop_mask2(data_format):
     :return:
     """
     name = 'black_drop_mask2'
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
+    cached = lookup(name)
+    if cached is not None:
+        return cached
 
     if data_format == 'NCHW':
         mask = np.ones((1, 1, 9, 9), dtype=np.bool)
@@ -61,6 +63,6 @@ def make_drop_mask2(data_format):
 
     mask = tf.constant(mask, dtype=tf.bool)
 
-    tf.add_to_collection(name, mask)
+    store(mask, name)
 
     return mask
@@ -5,7 +5,7 @@ import sonnet as snt
 import tensorflow as tf
 
 from .major import BlackMajorMove
-from ..boolean_board.empty import select_empty_board
+from ..occupancy import make_occupancy
 from ..piece import Piece
 
 __author__ = 'Yasuhiro'
@@ -16,8 +16,10 @@ class BlackHiDropLayer(snt.AbstractModule):
     def __init__(self, name='black_hi_drop'):
         super().__init__(name=name)
 
-    def _build(self, board, black_hand, available_square):
-        empty_square = select_empty_board(board=board)
+    def _build(self, board, black_hand, available_square, occupancy=None):
+        if occupancy is None:
+            occupancy = make_occupancy(board=board)
+        empty_square = occupancy.empty
 
         available = tf.logical_and(
             # 空いているマス
@@ -39,5 +41,7 @@ class BlackHiMoveLayer(snt.AbstractModule):
         super().__init__(name=name)
         self.data_format = data_format
 
-    def _build(self, board, hi_effect):
-        return BlackMajorMove(data_format=self.data_format)(board, hi_effect)
+    def _build(self, board, hi_effect, occupancy=None):
+        return BlackMajorMove(data_format=self.data_format)(
+            board, hi_effect, occupancy=occupancy
+        )
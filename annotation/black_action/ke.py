@@ -6,9 +6,8 @@ import tensorflow as tf
 
 from .drop_mask import make_drop_mask2
 from .promotion_mask import make_promotion_mask
-from ..boolean_board.black import select_non_black_board
-from ..boolean_board.empty import select_empty_board
 from ..direction import Direction
+from ..occupancy import make_occupancy
 from ..piece import Piece
 
 __author__ = 'Yasuhiro'
@@ -20,9 +19,11 @@ class BlackKeDropLayer(snt.AbstractModule):
         super().__init__(name=name)
         self.data_format = data_format
 
-    def _build(self, board, black_hand, available_square):
+    def _build(self, board, black_hand, available_square, occupancy=None):
+        if occupancy is None:
+            occupancy = make_occupancy(board=board)
         ke_available_area = make_drop_mask2(data_format=self.data_format)
-        empty_square = select_empty_board(board=board)
+        empty_square = occupancy.empty
 
         available = tf.logical_and(
             # 置けるマスを判定
@@ -44,8 +45,10 @@ class BlackKeMoveLayer(snt.AbstractModule):
         super().__init__(name=name)
         self.data_format = data_format
 
-    def _build(self, board, ke_effect):
-        non_black_mask = select_non_black_board(board=board)
+    def _build(self, board, ke_effect, occupancy=None):
+        if occupancy is None:
+            occupancy = make_occupancy(board=board)
+        non_black_mask = occupancy.non_black
         movable_effect = {
             direction: tf.logical_and(effect, non_black_mask)
             for direction, effect in ke_effect.items()
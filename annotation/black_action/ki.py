@@ -4,8 +4,7 @@
 import sonnet as snt
 import tensorflow as tf
 
-from ..boolean_board.black import select_non_black_board
-from ..boolean_board.empty import select_empty_board
+from ..occupancy import make_occupancy
 from ..piece import Piece
 
 __author__ = 'Yasuhiro'
@@ -16,8 +15,10 @@ class BlackKiDropLayer(snt.AbstractModule):
     def __init__(self, name='black_ki_drop'):
         super().__init__(name=name)
 
-    def _build(self, board, black_hand, available_square):
-        empty_square = select_empty_board(board=board)
+    def _build(self, board, black_hand, available_square, occupancy=None):
+        if occupancy is None:
+            occupancy = make_occupancy(board=board)
+        empty_square = occupancy.empty
 
         available = tf.logical_and(
             # 空いているマス
@@ -38,8 +39,10 @@ class BlackKiMoveLayer(snt.AbstractModule):
     def __init__(self, name='black_ki_move'):
         super().__init__(name=name)
 
-    def _build(self, board, ki_effect):
-        non_black_mask = select_non_black_board(board=board)
+    def _build(self, board, ki_effect, occupancy=None):
+        if occupancy is None:
+            occupancy = make_occupancy(board=board)
+        non_black_mask = occupancy.non_black
         non_promoting_effect = {
             direction: tf.logical_and(non_black_mask, effect)
             for direction, effect in ki_effect.items()
@@ -5,7 +5,7 @@ import sonnet as snt
 import tensorflow as tf
 
 from .promotion_mask import make_promotion_mask
-from ..boolean_board.black import select_non_black_board
+from ..occupancy import make_occupancy
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/24'
@@ -16,8 +16,10 @@ class BlackMajorMove(snt.AbstractModule):
         super().__init__(name=name)
         self.data_format = data_format
 
-    def _build(self, board, major_effect):
-        non_black_mask = select_non_black_board(board=board)
+    def _build(self, board, major_effect, occupancy=None):
+        if occupancy is None:
+            occupancy = make_occupancy(board=board)
+        non_black_mask = occupancy.non_black
         non_promoting_effect = {
             direction: [tf.logical_and(non_black_mask, effect)
                         for effect in effects]
@@ -43,8 +45,10 @@ class BlackPromotedMajorMove(snt.AbstractModule):
     def __init__(self, name='black_promoted_major_move'):
         super().__init__(name=name)
 
-    def _build(self, board, major_effect):
-        non_black_mask = select_non_black_board(board=board)
+    def _build(self, board, major_effect, occupancy=None):
+        if occupancy is None:
+            occupancy = make_occupancy(board=board)
+        non_black_mask = occupancy.non_black
 
         def _update(obj):
             if isinstance(obj, list):
@@ -1,23 +1,24 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from collections import defaultdict
-
 import sonnet as snt
 import tensorflow as tf
 
-from .fu import BlackFuMoveLayer, BlackFuDropLayer
-from .ky import BlackKyMoveLayer, BlackKyDropLayer
-from .ke import BlackKeMoveLayer, BlackKeDropLayer
-from .gi import BlackGiMoveLayer, BlackGiDropLayer
-from .ka import BlackKaMoveLayer, BlackKaDropLayer
-from .hi import BlackHiMoveLayer, BlackHiDropLayer
-from .ki import BlackKiMoveLayer, BlackKiDropLayer
-from .ou import BlackOuMoveLayer
-from .um import BlackUmMoveLayer
-from .ry import BlackRyMoveLayer
+from .drop_mask import make_drop_mask1, make_drop_mask2
+from .fu import BlackFuDropLayer
+from .ky import BlackKyDropLayer
+from .ke import BlackKeDropLayer
+from .gi import BlackGiDropLayer
+from .ka import BlackKaDropLayer
+from .hi import BlackHiDropLayer
+from .ki import BlackKiDropLayer
+from .promotion_mask import make_packed_promotion_mask, make_promotion_mask
 from ..piece import Piece
-from ..direction import get_eight_directions, Direction
+from ..direction import Direction
+from ..naive_effect.combine import combine_any
+from ..naive_effect.packed import (add_short_effects, pack_planes,
+                                   to_packed_plane, unpack_planes)
+from ..occupancy import make_occupancy
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/25'
@@ -28,62 +29,82 @@ class BlackMergeMoveLayer(snt.AbstractModule):
         super().__init__(name=name)
         self.data_format = data_format
 
-    def _build(self, board, all_effects):
-        fu_move = BlackFuMoveLayer(
-            data_format=self.data_format
-        )(board, all_effects[Piece.BLACK_FU])
-        ky_move = BlackKyMoveLayer(
-            data_format=self.data_format
-        )(board, all_effects[Piece.BLACK_KY])
-        ke_move = BlackKeMoveLayer(
-            data_format=self.data_format
-        )(board, all_effects[Piece.BLACK_KE])
-        gi_move = BlackGiMoveLayer(
-            data_format=self.data_format
-        )(board, all_effects[Piece.BLACK_GI])
-        ka_move = BlackKaMoveLayer(
-            data_format=self.data_format
-        )(board, all_effects[Piece.BLACK_KA])
-        hi_move = BlackHiMoveLayer(
-            data_format=self.data_format
-        )(board, all_effects[Piece.BLACK_HI])
-        ki_move = BlackKiMoveLayer()(board, all_effects[Piece.BLACK_KI])
-        ou_move = BlackOuMoveLayer()(board, all_effects[Piece.BLACK_OU])
-        um_move = BlackUmMoveLayer()(board, all_effects[Piece.BLACK_UM])
-        ry_move = BlackRyMoveLayer()(board, all_effects[Piece.BLACK_RY])
-
-        # 桂馬だけは特別なので、別処理にする
-        move_list = [fu_move, ky_move, gi_move, ka_move, hi_move,
-                     ki_move, ou_move, um_move, ry_move]
-        actions = [(defaultdict(list), defaultdict(list)) for _ in range(8)]
-
-        for move in move_list:
-            if not isinstance(move, tuple):
-                move = move,
-
-            for move_type, move_data in enumerate(move):
-                for direction, obj in move_data.items():
-                    if not isinstance(obj, list):
-                        obj = obj,
-
-                    for distance, action in enumerate(obj):
-                        actions[distance][move_type][direction].append(action)
-
-        outputs = []
-        for distance in range(8):
-            non_promotion, promotion = actions[distance]
-            # 成らない場合
-            outputs.extend([merge(*non_promotion[direction])
-                            for direction in get_eight_directions()])
-            # 成る場合
-            outputs.extend([merge(*promotion[direction])
-                            for direction in get_eight_directions()])
-        # 桂馬の動き
-        outputs.append(ke_move[0][Direction.RIGHT_UP_UP])
-        outputs.append(ke_move[0][Direction.LEFT_UP_UP])
-        outputs.append(ke_move[1][Direction.RIGHT_UP_UP])
-        outputs.append(ke_move[1][Direction.LEFT_UP_UP])
+    def _build(self, board, all_effects, occupancy=None):
+        """
+        駒ごとにまとめた利きから移動の行動を[batch, 132, 9, 9]で求める
+        距離、成り、方向の順に並べた128個の後に、桂馬の動きの4個を並べる
+        駒の種類は行動に含まれないので、方向と距離ごとの利きを駒についてまとめる
+
+        :param board:
+        :param all_effects: BlackAllEffectLayerの出力
+        :param occupancy:
+        :return:
+        """
+        if occupancy is None:
+            occupancy = make_occupancy(board=board)
+        non_black_mask = to_packed_plane(occupancy.non_black)
+        long_non_black_mask = tf.expand_dims(non_black_mask, axis=1)
+
+        # FU, KYは成らずに1段目には移動できない
+        available_mask = to_packed_plane(
+            make_drop_mask1(data_format=self.data_format)
+        )
+        fu_effect = all_effects[Piece.BLACK_FU]
+        ky_effect = all_effects[Piece.BLACK_KY]
+        # 短い利きは8方向の[batch, 8, 9, 9]、長い利きは[batch, 8, 8, 9, 9]
+        non_promoting_effect = add_short_effects(
+            long_effects=combine_any([
+                tf.logical_and(ky_effect,
+                               tf.expand_dims(available_mask, axis=1)),
+                all_effects[Piece.BLACK_KA], all_effects[Piece.BLACK_HI],
+                all_effects[Piece.BLACK_UM], all_effects[Piece.BLACK_RY]
+            ]),
+            short_effects=combine_any([
+                tf.logical_and(fu_effect, available_mask),
+                all_effects[Piece.BLACK_GI], all_effects[Piece.BLACK_KI],
+                all_effects[Piece.BLACK_OU]
+            ])
+        )
+        non_promoting_effect = tf.logical_and(non_promoting_effect,
+                                              long_non_black_mask)
+
+        # 成れる駒はFU, KY, GI, KA, HI
+        promoting_effect = add_short_effects(
+            long_effects=combine_any([
+                ky_effect, all_effects[Piece.BLACK_KA],
+                all_effects[Piece.BLACK_HI]
+            ]),
+            short_effects=combine_any([fu_effect, all_effects[Piece.BLACK_GI]])
+        )
+        promoting_effect = tf.logical_and(
+            tf.logical_and(promoting_effect, make_packed_promotion_mask()),
+            long_non_black_mask
+        )
+
+        # [batch, 成り, 方向, 距離, 9, 9]を距離、成り、方向の順に並べ替える
+        moves = tf.stack([non_promoting_effect, promoting_effect], axis=1)
+        moves = tf.reshape(tf.transpose(moves, [0, 3, 1, 2, 4, 5]),
+                           [-1, 128, 9, 9])
 
+        # 桂馬の動き
+        ke_effect = tf.logical_and(all_effects[Piece.BLACK_KE],
+                                   non_black_mask)
+        ke_non_promoting_effect = tf.logical_and(
+            ke_effect,
+            to_packed_plane(make_drop_mask2(data_format=self.data_format))
+        )
+        # RIGHT_UP_UPでもLEFT_UP_UPでも同じ
+        ke_promoting_effect = tf.logical_and(
+            ke_effect,
+            to_packed_plane(make_promotion_mask(
+                direction=Direction.RIGHT_UP_UP,
+                data_format=self.data_format, step_size=1
+            ))
+        )
+
+        outputs = tf.concat(
+            [moves, ke_non_promoting_effect, ke_promoting_effect], axis=1
+        )
         return outputs
 
 
@@ -92,21 +113,31 @@ class BlackMergeDropLayer(snt.AbstractModule):
         super().__init__(name=name)
         self.data_format = data_format
 
-    def _build(self, board, black_hand, available_square):
-        fu_drop = BlackFuDropLayer(self.data_format)(board, black_hand,
-                                                     available_square)
-        ky_drop = BlackKyDropLayer(self.data_format)(board, black_hand,
-                                                     available_square)
-        ke_drop = BlackKeDropLayer(self.data_format)(board, black_hand,
-                                                     available_square)
-        gi_drop = BlackGiDropLayer(self.data_format)(board, black_hand,
-                                                     available_square)
-        ka_drop = BlackKaDropLayer(self.data_format)(board, black_hand,
-                                                     available_square)
-        hi_drop = BlackHiDropLayer(self.data_format)(board, black_hand,
-                                                     available_square)
-        ki_drop = BlackKiDropLayer(self.data_format)(board, black_hand,
-                                                     available_square)
+    def _build(self, board, black_hand, available_square, occupancy=None):
+        if occupancy is None:
+            occupancy = make_occupancy(board=board)
+
+        fu_drop = BlackFuDropLayer(self.data_format)(
+            board, black_hand, available_square, occupancy=occupancy
+        )
+        ky_drop = BlackKyDropLayer(self.data_format)(
+            board, black_hand, available_square, occupancy=occupancy
+        )
+        ke_drop = BlackKeDropLayer(self.data_format)(
+            board, black_hand, available_square, occupancy=occupancy
+        )
+        gi_drop = BlackGiDropLayer(self.data_format)(
+            board, black_hand, available_square, occupancy=occupancy
+        )
+        ka_drop = BlackKaDropLayer(self.data_format)(
+            board, black_hand, available_square, occupancy=occupancy
+        )
+        hi_drop = BlackHiDropLayer(self.data_format)(
+            board, black_hand, available_square, occupancy=occupancy
+        )
+        ki_drop = BlackKiDropLayer(self.data_format)(
+            board, black_hand, available_square, occupancy=occupancy
+        )
 
         outputs = [fu_drop, ky_drop, ke_drop, gi_drop,
                    ka_drop, hi_drop, ki_drop]
@@ -114,32 +145,32 @@ class BlackMergeDropLayer(snt.AbstractModule):
 
 
 class BlackMergeAllLayer(snt.AbstractModule):
-    def __init__(self, data_format, name='black_merge_all'):
+    def __init__(self, data_format, packed=False, name='black_merge_all'):
+        """
+
+        :param data_format:
+        :param packed: Trueの場合は[batch, 139, 9, 9]のテンソルを返す
+            Falseの場合は行動ごとの盤面のlist
+        :param name:
+        """
         super().__init__(name=name)
         self.data_format = data_format
+        self.packed = packed
 
-    def _build(self, board, black_hand, all_effects, available_square):
+    def _build(self, board, black_hand, all_effects, available_square,
+               occupancy=None):
         moves = BlackMergeMoveLayer(
             data_format=self.data_format
-        )(board, all_effects)
+        )(board, all_effects, occupancy=occupancy)
         drops = BlackMergeDropLayer(
             data_format=self.data_format
-        )(board, black_hand, available_square)
+        )(board, black_hand, available_square, occupancy=occupancy)
 
-        actions = moves + drops
-        return actions
+        actions = tf.concat([moves, pack_planes(drops)], axis=1)
+        if self.packed:
+            return actions
+        return unpack_planes(actions, data_format=self.data_format)
 
 
 def merge(*args):
-    n = len(args)
-    if n == 1:
-        return args[0]
-    elif n == 2:
-        return tf.logical_or(*args)
-
-    tmp = [tf.logical_or(v1, v2) for v1, v2 in zip(args[0::2], args[1::2])]
-    if n % 2:
-        # 奇数の場合にペアに成らなかった要素を次回に繰り越す
-        tmp.append(args[-1])
-
-    return merge(*tmp)
+    return combine_any(args)
@@ -4,7 +4,8 @@
 import numpy as np
 import tensorflow as tf
 
-from ..direction import Direction
+from ..direction import Direction, get_eight_directions
+from ..memo import lookup, store
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/22'
@@ -34,9 +35,9 @@ def make_promotion_mask_up(step_size, data_format):
     :return:
     """
     name = 'black_promotion_mask_up'
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
+    cached = lookup(name)
+    if cached is not None:
+        return cached
 
     if data_format == 'NCHW':
         mask = np.zeros((1, 1, 9, 9), dtype=np.bool)
@@ -46,7 +47,7 @@ def make_promotion_mask_up(step_size, data_format):
         mask[:, :, :3, :] = True
     mask = tf.constant(mask, dtype=tf.bool)
 
-    tf.add_to_collection(name, mask)
+    store(mask, name)
 
     return mask
 
@@ -61,9 +62,9 @@ def make_promotion_mask_down(step_size, data_format):
     :return:
     """
     name = 'black_promotion_mask_down{}'.format(step_size)
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
+    cached = lookup(name)
+    if cached is not None:
+        return cached
 
     if data_format == 'NCHW':
         mask = np.zeros((1, 1, 9, 9), dtype=np.bool)
@@ -73,6 +74,34 @@ def make_promotion_mask_down(step_size, data_format):
         mask[:, :, step_size:step_size + 3, :] = True
     mask = tf.constant(mask, dtype=tf.bool)
 
-    tf.add_to_collection(name, mask)
+    store(mask, name)
+
+    return mask
+
+
+def make_packed_promotion_mask():
+    """
+    8方向、距離ごとの成りの領域のマスクを[1, 8, 8, 9, 9]にまとめる
+    方向、距離、筋、段の順で、駒ごとにまとめた長い利きと放送できる
+
+    :return:
+    """
+    name = 'black_packed_promotion_mask'
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    mask = np.zeros((1, 8, 8, 9, 9), dtype=np.bool_)
+    for i, direction in enumerate(get_eight_directions()):
+        for step_size in range(1, 9):
+            if direction in (Direction.RIGHT_DOWN, Direction.DOWN,
+                             Direction.LEFT_DOWN):
+                rank = slice(step_size, step_size + 3)
+            else:
+                rank = slice(0, 3)
+            mask[0, i, step_size - 1, :, rank] = True
+    mask = tf.constant(mask, dtype=tf.bool)
+
+    store(mask, name)
 
     return mask
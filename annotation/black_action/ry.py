@@ -13,5 +13,6 @@ class BlackRyMoveLayer(snt.AbstractModule):
     def __init__(self, name='black_ry_move'):
         super().__init__(name=name)
 
-    def _build(self, board, ry_effect):
-        return BlackPromotedMajorMove()(board, ry_effect)
+    def _build(self, board, ry_effect, occupancy=None):
+        return BlackPromotedMajorMove()(board, ry_effect,
+                                        occupancy=occupancy)
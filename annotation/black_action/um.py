@@ -13,5 +13,6 @@ class BlackUmMoveLayer(snt.AbstractModule):
     def __init__(self, name='black_um_move'):
         super().__init__(name=name)
 
-    def _build(self, board, um_effect):
-        return BlackPromotedMajorMove()(board, um_effect)
+    def _build(self, board, um_effect, occupancy=None):
+        return BlackPromotedMajorMove()(board, um_effect,
+                                        occupancy=occupancy)
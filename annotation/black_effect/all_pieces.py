@@ -19,38 +19,76 @@ __author__ = 'Yasuhiro'
 __date__ = '2018/2/21'
 
 
+# packedで8方向の短い利き[batch, 8, 9, 9]になる駒
+SHORT_PIECES = (Piece.BLACK_FU, Piece.BLACK_GI, Piece.BLACK_KI,
+                Piece.BLACK_OU)
+# packedで8方向、距離ごとの長い利き[batch, 8, 8, 9, 9]になる駒
+LONG_PIECES = (Piece.BLACK_KY, Piece.BLACK_KA, Piece.BLACK_HI,
+               Piece.BLACK_UM, Piece.BLACK_RY)
+
+
 class BlackAllEffectLayer(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn=True, name='black_all_effect'):
+    def __init__(self, data_format, use_cudnn=True, long_engine='conv',
+                 short_engine='conv', name='black_all_effect'):
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.long_engine = long_engine
+        self.short_engine = short_engine
 
     def _build(self, pinned_board, available_square, white_naive_all_effect,
-               white_long_check):
+               white_long_check, occupancy=None):
         """
         手番側の全ての駒の利きを計算する
+        駒をキーとするdictで、値は駒ごとにまとめた利き
+        KEは[batch, 2, 9, 9]、FU, GI, KI, OUは8方向の[batch, 8, 9, 9]、
+        KY, KA, HI, UM, RYは8方向、距離ごとの[batch, 8, 8, 9, 9]
 
         :param pinned_board:
         :param available_square:
         :param white_naive_all_effect:
         :param white_long_check:
+        :param occupancy: ピンを考慮する前の盤面のmake_occupancyの出力
+            王の利きに使う
         :return:
         """
-        pieces = (Piece.BLACK_FU, Piece.BLACK_KY, Piece.BLACK_KE,
-                  Piece.BLACK_GI, Piece.BLACK_KA, Piece.BLACK_HI,
-                  Piece.BLACK_KI, Piece.BLACK_UM, Piece.BLACK_RY)
-        classes = (BlackFuEffectLayer, BlackKyEffectLayer, BlackKeEffectLayer,
-                   BlackGiEffectLayer, BlackKaEffectLayer, BlackHiEffectLayer,
-                   BlackKiEffectLayer, BlackUmEffectLayer, BlackRyEffectLayer)
+        short_pieces = (Piece.BLACK_FU, Piece.BLACK_KE, Piece.BLACK_GI,
+                        Piece.BLACK_KI)
+        short_classes = (BlackFuEffectLayer, BlackKeEffectLayer,
+                         BlackGiEffectLayer, BlackKiEffectLayer)
+        long_pieces = (Piece.BLACK_KY, Piece.BLACK_KA, Piece.BLACK_HI)
+        long_classes = (BlackKyEffectLayer, BlackKaEffectLayer,
+                        BlackHiEffectLayer)
+        # 長い利きと短い利きの両方を持つ駒
+        promoted_pieces = (Piece.BLACK_UM, Piece.BLACK_RY)
+        promoted_classes = (BlackUmEffectLayer, BlackRyEffectLayer)
 
         outputs = {
             p: c(
-                data_format=self.data_format, use_cudnn=self.use_cudnn
+                data_format=self.data_format, use_cudnn=self.use_cudnn,
+                short_engine=self.short_engine, packed=True
             )(pinned_board, available_square)
-            for p, c in zip(pieces, classes)
+            for p, c in zip(short_pieces, short_classes)
         }
+        outputs.update({
+            p: c(
+                data_format=self.data_format, use_cudnn=self.use_cudnn,
+                long_engine=self.long_engine, packed=True
+            )(pinned_board, available_square)
+            for p, c in zip(long_pieces, long_classes)
+        })
+        outputs.update({
+            p: c(
+                data_format=self.data_format, use_cudnn=self.use_cudnn,
+                long_engine=self.long_engine, short_engine=self.short_engine,
+                packed=True
+            )(pinned_board, available_square)
+            for p, c in zip(promoted_pieces, promoted_classes)
+        })
         outputs[Piece.BLACK_OU] = BlackOuEffectLayer(
-            data_format=self.data_format, use_cudnn=self.use_cudnn
-        )(pinned_board, white_naive_all_effect, white_long_check)
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            short_engine=self.short_engine, packed=True
+        )(pinned_board, white_naive_all_effect, white_long_check,
+          occupancy=occupancy)
 
         return outputs
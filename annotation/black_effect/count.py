@@ -4,46 +4,37 @@
 import sonnet as snt
 import tensorflow as tf
 
+from .all_pieces import LONG_PIECES, SHORT_PIECES
+from ..naive_effect.combine import combine_any
+from ..naive_effect.packed import add_short_effects, from_packed_plane
+from ..piece import Piece
+
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/22'
 
 
 class BlackEffectCountLayer(snt.AbstractModule):
-    def __init__(self, name='black_effect_count'):
+    def __init__(self, data_format, name='black_effect_count'):
         super().__init__(name=name)
+        self.data_format = data_format
 
     def _build(self, all_effects):
         """
         手番側の利きがマスごとにいくつあるかを計算する
+        方向と距離が決まれば利きの元のマスは一つなので、
+        駒についてorでまとめてから、方向と距離についてTrueの個数を数えればよい
 
-        :param all_effects:
-        :return:
-        """
-        flat_effects = FlatEffectLayer()(all_effects)
-
-        converted = [tf.to_int32(effect) for effect in flat_effects]
-        count = tf.add_n(converted)
-
-        return count
-
-
-class FlatEffectLayer(snt.AbstractModule):
-    def __init__(self, name='flat_effect'):
-        super().__init__(name=name)
-
-    def _build(self, all_effects):
-        """
-        駒ごと、方向ごとに入れ子になった利きを平らなlistに変換する
-
-        :param all_effects:
+        :param all_effects: BlackAllEffectLayerの出力
         :return:
         """
-        effect_list = []
-        for effects in all_effects.values():
-            for effect in effects.values():
-                if isinstance(effect, list):
-                    effect_list.extend(effect)
-                else:
-                    effect_list.append(effect)
-
-        return effect_list
+        effect = add_short_effects(
+            long_effects=combine_any([all_effects[p] for p in LONG_PIECES]),
+            short_effects=combine_any([all_effects[p] for p in SHORT_PIECES])
+        )
+        flat_effects = tf.concat([
+            tf.reshape(effect, [-1, 64, 81]),
+            tf.reshape(all_effects[Piece.BLACK_KE], [-1, 2, 81])
+        ], axis=1)
+        count = tf.reduce_sum(tf.to_int32(flat_effects), axis=1)
+
+        return from_packed_plane(count, data_format=self.data_format)
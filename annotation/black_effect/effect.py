@@ -2,12 +2,9 @@
 # -*- coding: utf-8 -*-
 
 import sonnet as snt
-import tensorflow as tf
 
-from ..white_naive_effect import WhiteNaiveAllEffect
-from .pseudo_ou_effect import BlackPseudoOuEffect
-from ..pin import BlackPinLayer
-from ..check import WhiteAllCheckLayer, CheckAvailableSquareLayer
+# effect_contextからこのモジュールを読み込むので、循環importを避ける
+from .. import effect_context
 from .all_pieces import BlackAllEffectLayer
 from .count import BlackEffectCountLayer
 
@@ -16,42 +13,49 @@ __date__ = '2018/2/18'
 
 
 class BlackEffectLayer(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn=True, name='black_effect'):
+    def __init__(self, data_format, use_cudnn=True, long_engine='conv',
+                 short_engine='conv', name='black_effect'):
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.long_engine = long_engine
+        self.short_engine = short_engine
 
-    def _build(self, board):
+    def _build(self, board, context=None):
         """
         先後のそれぞれの利きと手番側の合法手を求める
         合法手を求める過程で王手の有無、ピンを検出する
 
         :param board:
+        :param context: EffectContextLayerの出力
+            省略した場合はここで計算する
         :return:
         """
-        # 非手番側の利きを求める
-        white_all_effect, white_long_effect = WhiteNaiveAllEffect(
-            data_format=self.data_format, use_cudnn=self.use_cudnn
-        )(board)
-
-        pseudo_effect = BlackPseudoOuEffect(
-            data_format=self.data_format, use_cudnn=self.use_cudnn
-        )(board)
-        # 王手を判定
-        all_check, long_check = WhiteAllCheckLayer()(board, pseudo_effect)
-        # 王手を考慮した移動可能な領域の候補
-        available_square = CheckAvailableSquareLayer()(pseudo_effect,
-                                                       all_check)
-        # ピンされているかを判定
-        pinned_board = BlackPinLayer(
-            data_format=self.data_format
-        )(board, pseudo_effect.long, white_long_effect)
+        if context is None:
+            context = effect_context.EffectContextLayer(
+                data_format=self.data_format, use_cudnn=self.use_cudnn,
+                long_engine=self.long_engine, short_engine=self.short_engine,
+                white=False
+            )(board)
+        # 非手番側の利き
+        white_all_effect = context.white_naive_effect
+
+        # 王手の判定と王手を考慮した移動可能な領域の候補
+        all_check = context.black_check
+        long_check = context.black_long_check
+        available_square = context.black_available_square
+        # ピンされているかを判定した盤面
+        pinned_board = context.black_pinned_board
         # 駒ごとに利きを計算
         all_effects = BlackAllEffectLayer(
-            data_format=self.data_format, use_cudnn=self.use_cudnn
-        )(pinned_board, available_square, white_all_effect, long_check)
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            long_engine=self.long_engine, short_engine=self.short_engine
+        )(pinned_board, available_square, white_all_effect, long_check,
+          occupancy=context.occupancy)
 
         # マスごとの利きの個数を計算
-        count = BlackEffectCountLayer()(all_effects)
+        count = BlackEffectCountLayer(
+            data_format=self.data_format
+        )(all_effects)
 
         return all_effects, count, all_check, available_square
@@ -2,10 +2,10 @@
 # -*- coding: utf-8 -*-
 
 import sonnet as snt
-import tensorflow as tf
 
+from .piece_helper import get_short_piece_effects
 from ..direction import Direction
-from ..naive_effect import ShortEffectLayer
+from ..naive_effect.packed import expand_directions, unpack_effects
 from ..short_board.black_piece import select_black_fu
 
 __author__ = 'Yasuhiro'
@@ -13,17 +13,35 @@ __date__ = '2018/2/19'
 
 
 class BlackFuEffectLayer(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn=True, name='black_fu_effect'):
+    def __init__(self, data_format, use_cudnn=True, short_engine='conv',
+                 packed=False, name='black_fu_effect'):
+        """
+
+        :param data_format:
+        :param use_cudnn:
+        :param short_engine:
+        :param packed: Trueの場合は8方向の[batch, 8, 9, 9]を返す
+        :param name:
+        """
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.short_engine = short_engine
+        self.packed = packed
 
     def _build(self, pinned_board, available_square):
-        selected = select_black_fu(board=pinned_board, direction=Direction.UP)
-        effect = ShortEffectLayer(
-            direction=Direction.UP, data_format=self.data_format,
-            use_cudnn=self.use_cudnn
-        )(selected)
-        outputs = {Direction.UP: tf.logical_and(effect, available_square)}
-
-        return outputs
+        directions = (Direction.UP,)
+        selected = {
+            Direction.UP: select_black_fu(board=pinned_board,
+                                          direction=Direction.UP)
+        }
+        effects = get_short_piece_effects(
+            selected=selected, available_square=available_square,
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            short_engine=self.short_engine
+        )
+
+        if self.packed:
+            return expand_directions(effects, directions=directions)
+        return unpack_effects(effects, data_format=self.data_format,
+                              directions=directions)
@@ -2,10 +2,10 @@
 # -*- coding: utf-8 -*-
 
 import sonnet as snt
-import tensorflow as tf
 
+from .piece_helper import get_short_piece_effects
 from ..direction import Direction
-from ..naive_effect import ShortEffectLayer
+from ..naive_effect.packed import expand_directions, unpack_effects
 from ..short_board.black_piece import select_black_gi
 
 __author__ = 'Yasuhiro'
@@ -13,27 +13,37 @@ __date__ = '2018/2/19'
 
 
 class BlackGiEffectLayer(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn=True, name='black_gi_effect'):
+    def __init__(self, data_format, use_cudnn=True, short_engine='conv',
+                 packed=False, name='black_gi_effect'):
+        """
+
+        :param data_format:
+        :param use_cudnn:
+        :param short_engine:
+        :param packed: Trueの場合は8方向の[batch, 8, 9, 9]を返す
+        :param name:
+        """
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.short_engine = short_engine
+        self.packed = packed
 
     def _build(self, pinned_board, available_square):
         gi_directions = (Direction.RIGHT_UP, Direction.RIGHT_DOWN,
                          Direction.UP, Direction.LEFT_UP, Direction.LEFT_DOWN)
-        outputs = {
-            direction: self._make_effect(
-                pinned_board=pinned_board, available_square=available_square,
-                direction=direction
-            ) for direction in gi_directions
+        selected = {
+            direction: select_black_gi(board=pinned_board,
+                                        direction=direction)
+            for direction in gi_directions
         }
-
-        return outputs
-
-    def _make_effect(self, pinned_board, available_square, direction):
-        selected = select_black_gi(board=pinned_board, direction=direction)
-        effect = ShortEffectLayer(
-            direction=direction, data_format=self.data_format,
-            use_cudnn=self.use_cudnn
-        )(selected)
-        return tf.logical_and(effect, available_square)
+        effects = get_short_piece_effects(
+            selected=selected, available_square=available_square,
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            short_engine=self.short_engine
+        )
+
+        if self.packed:
+            return expand_directions(effects, directions=gi_directions)
+        return unpack_effects(effects, data_format=self.data_format,
+                              directions=gi_directions)
@@ -2,41 +2,48 @@
 # -*- coding: utf-8 -*-
 
 import sonnet as snt
-import tensorflow as tf
 
+from .piece_helper import get_long_piece_effects
 from ..direction import get_diagonal_directions
 from ..long_board.black_piece import select_black_ka
-from ..naive_effect import LongEffectLayer
+from ..naive_effect.packed import expand_directions, unpack_long_effects
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/20'
 
 
 class BlackKaEffectLayer(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn=True, name='black_ka_effect'):
+    def __init__(self, data_format, use_cudnn=True, long_engine='conv',
+                 packed=False, name='black_ka_effect'):
+        """
+
+        :param data_format:
+        :param use_cudnn:
+        :param long_engine:
+        :param packed: Trueの場合は8方向の[batch, 8, 8, 9, 9]を返す
+        :param name:
+        """
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.long_engine = long_engine
+        self.packed = packed
 
     def _build(self, pinned_board, available_square):
-        outputs = {
-            direction: self._make_effect(
-                pinned_board=pinned_board, available_square=available_square,
+        directions = get_diagonal_directions()
+        selected = {
+            direction: select_black_ka(
+                board=pinned_board, data_format=self.data_format,
                 direction=direction
-            ) for direction in get_diagonal_directions()
+            ) for direction in directions
         }
-
-        return outputs
-
-    def _make_effect(self, pinned_board, available_square, direction):
-        selected = select_black_ka(
-            board=pinned_board, data_format=self.data_format,
-            direction=direction
+        effects = get_long_piece_effects(
+            selected=selected, available_square=available_square,
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            long_engine=self.long_engine
         )
-        effect_list = [LongEffectLayer(
-            direction=direction, kernel_size=kernel_size,
-            data_format=self.data_format, use_cudnn=self.use_cudnn
-        )(selected) for kernel_size in range(2, 10)]
 
-        return [tf.logical_and(effect, available_square)
-                for effect in effect_list]
+        if self.packed:
+            return expand_directions(effects, directions=directions)
+        return unpack_long_effects(effects, data_format=self.data_format,
+                                   directions=directions)
@@ -2,37 +2,48 @@
 # -*- coding: utf-8 -*-
 
 import sonnet as snt
-import tensorflow as tf
 
+from .piece_helper import get_long_piece_effects
 from ..direction import Direction
 from ..long_board.black_piece import select_black_ky
-from ..naive_effect import LongEffectLayer
+from ..naive_effect.packed import expand_directions, unpack_long_effects
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/19'
 
 
 class BlackKyEffectLayer(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn=True, name='black_ky_effect'):
+    def __init__(self, data_format, use_cudnn=True, long_engine='conv',
+                 packed=False, name='black_ky_effect'):
+        """
+
+        :param data_format:
+        :param use_cudnn:
+        :param long_engine:
+        :param packed: Trueの場合は8方向の[batch, 8, 8, 9, 9]を返す
+        :param name:
+        """
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.long_engine = long_engine
+        self.packed = packed
 
     def _build(self, pinned_board, available_square):
-        selected = select_black_ky(
-            board=pinned_board, data_format=self.data_format,
-            direction=Direction.UP
-        )
-        effect_list = [
-            LongEffectLayer(
-                direction=Direction.UP, kernel_size=kernel_size,
-                data_format=self.data_format, use_cudnn=self.use_cudnn
-            )(selected) for kernel_size in range(2, 10)
-        ]
-
-        outputs = {
-            Direction.UP: [tf.logical_and(effect, available_square)
-                           for effect in effect_list]
+        directions = (Direction.UP,)
+        selected = {
+            Direction.UP: select_black_ky(
+                board=pinned_board, data_format=self.data_format,
+                direction=Direction.UP
+            )
         }
+        effects = get_long_piece_effects(
+            selected=selected, available_square=available_square,
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            long_engine=self.long_engine
+        )
 
-        return outputs
+        if self.packed:
+            return expand_directions(effects, directions=directions)
+        return unpack_long_effects(effects, data_format=self.data_format,
+                                   directions=directions)
@@ -4,42 +4,68 @@
 import sonnet as snt
 import tensorflow as tf
 
-from .ou_helper import get_short_effect
-from ..direction import get_eight_directions, get_opposite_direction
+from .ou_helper import get_short_effects
+from ..naive_effect.packed import (SHORT_DIRECTIONS, as_packed_flags,
+                                   reverse_directions, to_packed_plane,
+                                   unpack_effects)
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/20'
 
 
 class BlackOuEffectLayer(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn=True, name='black_ou_effect'):
+    def __init__(self, data_format, use_cudnn=True, short_engine='conv',
+                 packed=False, name='black_ou_effect'):
+        """
+
+        :param data_format:
+        :param use_cudnn:
+        :param short_engine:
+        :param packed: Trueの場合は8方向の[batch, 8, 9, 9]のまま返す
+        :param name:
+        """
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.short_engine = short_engine
+        self.packed = packed
+
+    def _build(self, board, white_naive_all_effect, white_long_check,
+               occupancy=None):
+        """
+        手番側の王の利きを8方向をまとめた[batch, 8, 9, 9]で求める
+        packedがFalseの場合は方向ごとのdictで返す
+
+        :param board:
+        :param white_naive_all_effect:
+        :param white_long_check: 8方向の長い利きでの王手のフラグ [batch, 8, 1, 1]
+            方向ごとのdictでもよい
+        :param occupancy: ピンを考慮する前の盤面のmake_occupancyの出力
+            王はピンされないので、その盤面で王の利きを求める
+        :return:
+        """
+        if occupancy is not None:
+            board = occupancy.board
+        # BlackPseudoOuEffectと同じ10方向の利きを共有して、8方向だけを使う
+        effect = get_short_effects(
+            board=board, directions=SHORT_DIRECTIONS,
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            short_engine=self.short_engine
+        )[:, :8]
 
-    def _build(self, board, white_naive_all_effect, white_long_check):
-        outputs = {}
-        for direction in get_eight_directions():
-            effect = get_short_effect(
-                board=board, direction=direction, data_format=self.data_format,
-                use_cudnn=self.use_cudnn
-            )
-
-            opposite_direction = get_opposite_direction(direction=direction)
-            # effectでTrueのマスがある（盤の端で移動できない可能性がある）
-            # そのマスが相手の効きと重なっていない
-            # long_checkがFalse
-            # ならば、利きは有効
-            overlap = tf.reduce_any(
-                tf.logical_and(effect, white_naive_all_effect),
-                axis=[1, 2, 3], keep_dims=True
-            )
-            long_check = white_long_check[opposite_direction]
-            available_effect = tf.logical_and(
-                effect,
-                tf.logical_not(tf.logical_or(overlap, long_check))
-            )
-
-            outputs[direction] = available_effect
-        return outputs
+        # effectでTrueのマスがある（盤の端で移動できない可能性がある）
+        # そのマスが相手の効きと重なっていない
+        # 逆方向のlong_checkがFalse
+        # ならば、利きは有効
+        overlap = tf.reduce_any(
+            tf.logical_and(effect, to_packed_plane(white_naive_all_effect)),
+            axis=[2, 3], keep_dims=True
+        )
+        long_check = reverse_directions(as_packed_flags(white_long_check))
+        available_effect = tf.logical_and(
+            effect, tf.logical_not(tf.logical_or(overlap, long_check))
+        )
 
+        if self.packed:
+            return available_effect
+        return unpack_effects(available_effect, data_format=self.data_format)
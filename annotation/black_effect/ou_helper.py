@@ -1,74 +1,99 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import tensorflow as tf
-
-from ..naive_effect import ShortEffectLayer, LongEffectAllRangeLayer
+from ..naive_effect import (LongEffectAllRangeLayer,
+                            compute_packed_long_all_range_effects,
+                            compute_packed_short_effects)
 from ..long_board import black_piece as long_piece
 from ..short_board import black_piece as short_piece
-from ..direction import Direction, get_eight_directions
+from ..memo import lookup, store
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/3/25'
 
 
-def get_short_effect(board, direction, data_format, use_cudnn):
-    # 桂馬の動きの場合は一度しか利用しないので、保存しない
-    flag = direction in get_eight_directions()
-
-    if flag:
-        name = 'black_ou_short_move_{}'.format(direction.name)
-        collection = tf.get_collection_ref(name)
-        if len(collection):
-            return collection[0]
+def get_short_effects(board, directions, data_format, use_cudnn,
+                      short_engine='conv'):
+    """
+    王の短い利きを[batch, n, 9, 9]にまとめて求める
+    方向の並びはdirectionsの順
+
+    :param board:
+    :param directions:
+    :param data_format:
+    :param use_cudnn:
+    :param short_engine:
+    :return:
+    """
+    directions = tuple(directions)
+    name = 'black_ou_short_move'
+    cached = lookup(name, board, directions, data_format, use_cudnn,
+                    short_engine)
+    if cached is not None:
+        return cached
 
     ou = get_short_ou(board=board)
-    effect = ShortEffectLayer(
-        direction=direction, data_format=data_format,
-        use_cudnn=use_cudnn,
-        name='black_ou_short_{}'.format(direction.name)
-    )(ou)
+    effects = compute_packed_short_effects(
+        inputs={direction: ou for direction in directions},
+        data_format=data_format, use_cudnn=use_cudnn,
+        short_engine=short_engine
+    )
 
-    if flag:
-        # noinspection PyUnboundLocalVariable
-        tf.add_to_collection(name, effect)
+    store(effects, name, board, directions, data_format, use_cudnn,
+          short_engine)
 
-    return effect
+    return effects
 
 
 def get_short_ou(board):
-    name = 'black_short_ou'
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
-
     ou_short_piece = short_piece.select_black_ou(board=board)
-
-    tf.add_to_collection(name, ou_short_piece)
-
     return ou_short_piece
 
 
-def get_long_effect(board, direction, data_format, use_cudnn):
+def get_long_effect(board, direction, data_format, use_cudnn,
+                    long_engine='conv'):
     ou = get_long_ou(board=board, data_format=data_format)
     effect = LongEffectAllRangeLayer(
         direction=direction, data_format=data_format,
-        use_cudnn=use_cudnn,
+        use_cudnn=use_cudnn, long_engine=long_engine,
         name='black_pseudo_ou_short_{}'.format(direction.name)
     )(ou)
 
     return effect
 
 
+def get_long_effects(board, directions, data_format, use_cudnn,
+                     long_engine='conv'):
+    """
+    複数の方向の仮想的な長い利きを[batch, n, 9, 9]にまとめて計算する
+    方向の並びはdirectionsの順
+    long_engineが'bank'の場合は畳み込みの回数が減る
+
+    :param board:
+    :param directions:
+    :param data_format:
+    :param use_cudnn:
+    :param long_engine:
+    :return:
+    """
+    ou = get_long_ou(board=board, data_format=data_format)
+    effects = compute_packed_long_all_range_effects(
+        inputs={direction: ou for direction in directions},
+        data_format=data_format, use_cudnn=use_cudnn, long_engine=long_engine
+    )
+
+    return effects
+
+
 def get_long_ou(board, data_format):
     name = 'black_long_ou'
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
+    cached = lookup(name, board, data_format)
+    if cached is not None:
+        return cached
 
     ou_long_piece = long_piece.select_black_ou(board=board,
                                                data_format=data_format)
 
-    tf.add_to_collection(name, ou_long_piece)
+    store(ou_long_piece, name, board, data_format)
 
     return ou_long_piece
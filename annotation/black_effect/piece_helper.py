@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import tensorflow as tf
+
+from ..naive_effect import (compute_packed_long_effects,
+                            compute_packed_short_effects)
+from ..naive_effect.packed import to_packed_block, to_packed_plane
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def get_short_piece_effects(selected, available_square, data_format,
+                            use_cudnn, short_engine='conv'):
+    """
+    方向ごとに選び出した駒の短い利きを[batch, n, 9, 9]で求めて、
+    移動できるマスに絞る
+    方向の並びはselectedの順
+
+    :param selected: 方向をキーとするdict
+    :param available_square:
+    :param data_format:
+    :param use_cudnn:
+    :param short_engine:
+    :return:
+    """
+    effects = compute_packed_short_effects(
+        inputs=selected, data_format=data_format, use_cudnn=use_cudnn,
+        short_engine=short_engine
+    )
+    return tf.logical_and(effects, to_packed_plane(available_square))
+
+
+def get_long_piece_effects(selected, available_square, data_format,
+                           use_cudnn, long_engine='conv'):
+    """
+    方向ごとに選び出した駒の長い利きを[batch, n, 8, 9, 9]で求めて、
+    移動できるマスに絞る
+    方向の並びはselectedの順
+
+    :param selected: 方向をキーとするdict
+    :param available_square:
+    :param data_format:
+    :param use_cudnn:
+    :param long_engine:
+    :return:
+    """
+    effects = compute_packed_long_effects(
+        inputs=selected, data_format=data_format, use_cudnn=use_cudnn,
+        long_engine=long_engine
+    )
+    return tf.logical_and(effects, to_packed_block(available_square))
@@ -2,12 +2,12 @@
 # -*- coding: utf-8 -*-
 
 from collections import namedtuple
-from itertools import chain
 
 import sonnet as snt
 
-from .ou_helper import get_long_effect, get_short_effect
-from ..direction import Direction, get_eight_directions
+from .ou_helper import get_long_effects, get_short_effects
+from ..direction import get_eight_directions
+from ..naive_effect.packed import SHORT_DIRECTIONS
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/18'
@@ -17,10 +17,13 @@ PseudoEffect = namedtuple('PseudoEffect', ['short', 'long'])
 
 
 class BlackPseudoOuEffect(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn, name='black_ou_pseudo_effect'):
+    def __init__(self, data_format, use_cudnn, long_engine='conv',
+                 short_engine='conv', name='black_ou_pseudo_effect'):
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.long_engine = long_engine
+        self.short_engine = short_engine
 
     def _build(self, board):
         """
@@ -28,29 +31,25 @@ class BlackPseudoOuEffect(snt.AbstractModule):
         利きがどの駒に当たっているかで王手されているかを判定する
         また、王手の場合に、王手を防ぐ手として動く目的地になる
 
+        shortはSHORT_DIRECTIONSの順の[batch, 10, 9, 9]
+        longは8方向の[batch, 8, 9, 9]
+
         :param board:
         :return:
         """
         # 8方向について仮想的な長い利きを計算する
-        long_effects = {
-            direction:
-                get_long_effect(
-                    board=board, direction=direction,
-                    data_format=self.data_format, use_cudnn=self.use_cudnn
-                ) for direction in get_eight_directions()
-
-        }
+        long_effects = get_long_effects(
+            board=board, directions=get_eight_directions(),
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            long_engine=self.long_engine
+        )
 
         # 桂馬の動きと通常の動きを計算する
-        short_effects = {
-            direction:
-                get_short_effect(
-                    board=board, direction=direction,
-                    data_format=self.data_format, use_cudnn=self.use_cudnn
-                ) for direction in chain(get_eight_directions(),
-                                         (Direction.RIGHT_UP_UP,
-                                          Direction.LEFT_UP_UP))
-        }
+        short_effects = get_short_effects(
+            board=board, directions=SHORT_DIRECTIONS,
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            short_engine=self.short_engine
+        )
 
         effects = PseudoEffect(short=short_effects, long=long_effects)
         return effects
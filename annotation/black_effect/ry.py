@@ -2,57 +2,85 @@
 # -*- coding: utf-8 -*-
 
 import sonnet as snt
-import tensorflow as tf
 
+from .piece_helper import get_long_piece_effects, get_short_piece_effects
 from ..direction import get_diagonal_directions, get_cross_directions
 from ..long_board.black_piece import select_black_ry as select_long_ry
 from ..short_board.black_piece import select_black_ry as select_short_ry
-from ..naive_effect import LongEffectLayer, ShortEffectLayer
+from ..naive_effect.packed import (add_short_effects, expand_directions,
+                                   unpack_effects, unpack_long_effects)
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/20'
 
 
 class BlackRyEffectLayer(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn=True, name='black_ry_effect'):
+    def __init__(self, data_format, use_cudnn=True, long_engine='conv',
+                 short_engine='conv', packed=False, name='black_ry_effect'):
+        """
+
+        :param data_format:
+        :param use_cudnn:
+        :param long_engine:
+        :param short_engine:
+        :param packed: Trueの場合は8方向の[batch, 8, 8, 9, 9]を返す
+            短い利きは距離1に含める
+        :param name:
+        """
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.long_engine = long_engine
+        self.short_engine = short_engine
+        self.packed = packed
 
     def _build(self, pinned_board, available_square):
-        outputs = {
-            direction: self._make_effect_long(
-                pinned_board=pinned_board, available_square=available_square,
+        long_effects = self._make_effect_long(
+            pinned_board=pinned_board, available_square=available_square
+        )
+        short_effects = self._make_effect_short(
+            pinned_board=pinned_board, available_square=available_square
+        )
+
+        if self.packed:
+            return add_short_effects(
+                long_effects=expand_directions(
+                    long_effects, directions=get_cross_directions()
+                ),
+                short_effects=expand_directions(
+                    short_effects, directions=get_diagonal_directions()
+                )
+            )
+
+        outputs = unpack_long_effects(long_effects,
+                                      data_format=self.data_format,
+                                      directions=get_cross_directions())
+        outputs.update(unpack_effects(short_effects,
+                                      data_format=self.data_format,
+                                      directions=get_diagonal_directions()))
+        return outputs
+
+    def _make_effect_long(self, pinned_board, available_square):
+        selected = {
+            direction: select_long_ry(
+                board=pinned_board, data_format=self.data_format,
                 direction=direction
             ) for direction in get_cross_directions()
         }
-        outputs.update({
-            direction: self._make_effect_short(
-                pinned_board=pinned_board, available_square=available_square,
-                direction=direction
-            ) for direction in get_diagonal_directions()
-        })
-
-        return outputs
+        return get_long_piece_effects(
+            selected=selected, available_square=available_square,
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            long_engine=self.long_engine
+        )
 
-    def _make_effect_long(self, pinned_board, available_square, direction):
-        selected = select_long_ry(
-            board=pinned_board, data_format=self.data_format,
-            direction=direction
+    def _make_effect_short(self, pinned_board, available_square):
+        selected = {
+            direction: select_short_ry(board=pinned_board,
+                                        direction=direction)
+            for direction in get_diagonal_directions()
+        }
+        return get_short_piece_effects(
+            selected=selected, available_square=available_square,
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            short_engine=self.short_engine
         )
-        effect_list = [LongEffectLayer(
-            direction=direction, kernel_size=kernel_size,
-            data_format=self.data_format, use_cudnn=self.use_cudnn
-        )(selected) for kernel_size in range(2, 10)]
-
-        return [tf.logical_and(effect, available_square)
-                for effect in effect_list]
-
-    def _make_effect_short(self, pinned_board, available_square, direction):
-        selected = select_short_ry(board=pinned_board, direction=direction)
-        effect = ShortEffectLayer(
-            direction=direction, data_format=self.data_format,
-            use_cudnn=self.use_cudnn
-        )(selected)
-
-        return tf.logical_and(effect, available_square)
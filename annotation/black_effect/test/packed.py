@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+from dotenv import load_dotenv
+
+from annotation.direction import Direction, get_eight_directions
+from annotation.piece import Piece
+from ..fu import BlackFuEffectLayer
+from ..ky import BlackKyEffectLayer
+from ..ke import BlackKeEffectLayer
+from ..gi import BlackGiEffectLayer
+from ..ka import BlackKaEffectLayer
+from ..hi import BlackHiEffectLayer
+from ..ki import BlackKiEffectLayer
+from ..um import BlackUmEffectLayer
+from ..ry import BlackRyEffectLayer
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestPackedEffect(tf.test.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        dotenv_path = Path(__file__).parents[3] / '.env'
+        load_dotenv(str(dotenv_path))
+
+        cls.data_format = os.environ.get('DATA_FORMAT')
+        cls.use_cudnn = bool(os.environ.get('USE_CUDNN'))
+
+    def test_packed(self):
+        """
+        packed=Trueの出力が方向ごとのdictの出力と同じ利きになる
+        dictにない方向や距離はFalse
+
+        :return:
+        """
+        n = 16
+        shape = (n, 1, 9, 9) if self.data_format == 'NCHW' else (n, 9, 9, 1)
+        # 先手の駒を多めに置いた適当な盤面
+        pieces = [Piece.EMPTY] * 4 + list(range(Piece.BLACK_FU,
+                                                Piece.WHITE_FU + 4))
+        board = np.random.choice(pieces, size=shape).astype(np.int32)
+        available_square = np.random.binomial(1, 0.8, size=shape)
+        available_square = available_square.astype(np.bool_)
+
+        classes = (BlackFuEffectLayer, BlackKyEffectLayer,
+                   BlackKeEffectLayer, BlackGiEffectLayer,
+                   BlackKaEffectLayer, BlackHiEffectLayer,
+                   BlackKiEffectLayer, BlackUmEffectLayer,
+                   BlackRyEffectLayer)
+        outputs = []
+        for c in classes:
+            effects = [
+                c(data_format=self.data_format, use_cudnn=self.use_cudnn,
+                  packed=packed)(board, available_square)
+                for packed in (False, True)
+            ]
+            outputs.append(effects)
+
+        with self.test_session() as sess:
+            outputs = sess.run(outputs)
+
+        for c, (effects, packed) in zip(classes, outputs):
+            with self.subTest(layer=c.__name__):
+                if c is BlackKeEffectLayer:
+                    self.assertEqual((n, 2, 9, 9), packed.shape)
+                    for i, direction in enumerate((Direction.RIGHT_UP_UP,
+                                                   Direction.LEFT_UP_UP)):
+                        self.assertAllEqual(
+                            np.reshape(effects[direction], (n, 81)),
+                            np.reshape(packed[:, i], (n, 81))
+                        )
+                    continue
+
+                expected = self.to_block(effects=effects, n=n)
+                if packed.ndim == 4:
+                    # 短い利きだけの駒
+                    self.assertFalse(np.any(expected[:, :, 1:]))
+                    expected = expected[:, :, 0]
+                self.assertAllEqual(
+                    expected, np.reshape(packed, expected.shape)
+                )
+
+    @staticmethod
+    def to_block(effects, n):
+        """
+        方向ごとのdictを[batch, 8, 8, 81]にする
+        短い利きは距離1に入れる
+
+        :param effects:
+        :param n:
+        :return:
+        """
+        block = np.zeros((n, 8, 8, 81), dtype=np.bool_)
+        for direction, effect in effects.items():
+            i = get_eight_directions().index(direction)
+            if isinstance(effect, list):
+                for k, e in enumerate(effect):
+                    block[:, i, k] = np.reshape(e, (n, 81))
+            else:
+                block[:, i, 0] = np.reshape(effect, (n, 81))
+        return block
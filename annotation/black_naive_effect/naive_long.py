@@ -12,11 +12,12 @@ __date__ = '2018/3/15'
 
 class BlackNaiveLongEffectLayer(snt.AbstractModule):
     def __init__(self, direction, data_format, use_cudnn=True,
-                 name='black_naive_long_effect'):
+                 long_engine='conv', name='black_naive_long_effect'):
         super().__init__(name=name)
         self.direction = direction
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.long_engine = long_engine
 
     def _build(self, board):
         """
@@ -35,7 +36,7 @@ class BlackNaiveLongEffectLayer(snt.AbstractModule):
         )
         effect = LongEffectAllRangeLayer(
             direction=self.direction, data_format=self.data_format,
-            use_cudnn=self.use_cudnn, name=name
+            use_cudnn=self.use_cudnn, long_engine=self.long_engine, name=name
         )(selected_pieces)
 
         return effect
@@ -12,11 +12,12 @@ __date__ = '2018/3/15'
 
 class BlackNaiveShortEffectLayer(snt.AbstractModule):
     def __init__(self, direction, data_format, use_cudnn=True,
-                 name='black_naive_short_effect'):
+                 short_engine='conv', name='black_naive_short_effect'):
         super().__init__(name=name)
         self.direction = direction
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.short_engine = short_engine
 
     def _build(self, board):
         """
@@ -31,7 +32,7 @@ class BlackNaiveShortEffectLayer(snt.AbstractModule):
                                                     direction=self.direction)
         effect = ShortEffectLayer(
             direction=self.direction, data_format=self.data_format,
-            use_cudnn=self.use_cudnn,
+            use_cudnn=self.use_cudnn, short_engine=self.short_engine,
             name='black_naive_short_effect_{}'.format(self.direction.name)
         )(selected_pieces)
 
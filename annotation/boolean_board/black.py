@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import numpy as np
 import tensorflow as tf
 
+from ..occupancy import make_occupancy
 from ..piece import Piece
 
 __author__ = 'Yasuhiro'
@@ -18,10 +18,7 @@ def select_black_all_board(board):
     :param board:
     :return:
     """
-    table = np.zeros(Piece.SIZE, dtype=np.bool)
-    table[:Piece.WHITE_FU] = True
-
-    selected = tf.gather(table, board)
+    selected = make_occupancy(board=board).black
     return selected
 
 
@@ -33,15 +30,7 @@ def select_non_black_board(board):
     :param board:
     :return:
     """
-    name = 'non_black_board'
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
-
-    selected = tf.greater_equal(board, Piece.WHITE_FU)
-
-    tf.add_to_collection(name, selected)
-
+    selected = make_occupancy(board=board).non_black
     return selected
 
 
@@ -1,9 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import tensorflow as tf
-
-from ..piece import Piece
+from ..occupancy import make_occupancy
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/15'
@@ -16,13 +14,5 @@ def select_empty_board(board):
     :param board:
     :return:
     """
-    name = 'empty_board'
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
-
-    selected = tf.equal(board, Piece.EMPTY)
-
-    tf.add_to_collection(name, selected)
-
+    selected = make_occupancy(board=board).empty
     return selected
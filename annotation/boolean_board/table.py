@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+駒があるかどうかをbool型で選び出すための表
+"""
+
+import numpy as np
+
+from ..direction import PinDirection
+from ..piece import Piece
+from ..short_board.white_table import make_base_table
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def make_bool_table(pieces):
+    table = np.zeros(Piece.SIZE + 14 * PinDirection.SIZE, dtype=np.bool_)
+    table[list(pieces)] = True
+    return table
+
+
+def make_white_ka_um_table():
+    return make_bool_table((Piece.WHITE_KA, Piece.WHITE_UM))
+
+
+def make_white_hi_ry_table():
+    return make_bool_table((Piece.WHITE_HI, Piece.WHITE_RY))
+
+
+def make_white_ky_table():
+    return make_bool_table((Piece.WHITE_KY,))
+
+
+def make_white_direction_table(direction):
+    table = make_bool_table(())
+    direction_table = make_base_table()
+    table[Piece.WHITE_FU:Piece.EMPTY] = direction_table[direction]
+    return table
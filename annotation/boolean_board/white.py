@@ -1,11 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import numpy as np
-import tensorflow as tf
-
-from ..piece import Piece
-from ..short_board.white_table import make_base_table
+from ..occupancy import make_occupancy
+from ..selection import select_flag
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/15'
@@ -21,11 +18,7 @@ def select_white_ka_um_board(board):
     :param board:
     :return:
     """
-    table = np.zeros(Piece.SIZE, dtype=np.bool)
-    table[Piece.WHITE_KA] = True
-    table[Piece.WHITE_UM] = True
-
-    selected = tf.gather(table, board)
+    selected = select_flag(board=board, key='white_ka_um')
     return selected
 
 
@@ -39,11 +32,7 @@ def select_white_hi_ry_board(board):
     :param board:
     :return:
     """
-    table = np.zeros(Piece.SIZE, dtype=np.bool)
-    table[Piece.WHITE_HI] = True
-    table[Piece.WHITE_RY] = True
-
-    selected = tf.gather(table, board)
+    selected = select_flag(board=board, key='white_hi_ry')
     return selected
 
 
@@ -57,10 +46,7 @@ def select_white_ky_board(board):
     :param board:
     :return:
     """
-    table = np.zeros(Piece.SIZE, dtype=np.bool)
-    table[Piece.WHITE_KY] = True
-
-    selected = tf.gather(table, board)
+    selected = select_flag(board=board, key='white_ky')
     return selected
 
 
@@ -75,11 +61,7 @@ def select_white_direction_board(board, direction):
     :param direction:
     :return:
     """
-    table = np.zeros(Piece.SIZE, dtype=np.bool)
-    direction_table = make_base_table()
-    table[Piece.WHITE_FU:Piece.EMPTY] = direction_table[direction]
-
-    selected = tf.gather(table, board)
+    selected = select_flag(board=board, key=('white_direction', direction))
     return selected
 
 
@@ -91,8 +73,6 @@ def select_white_all_board(board):
     :param board:
     :return:
     """
-    table = np.zeros(Piece.SIZE, dtype=np.bool)
-    table[Piece.WHITE_FU:Piece.SIZE] = True
-
-    selected = tf.gather(table, board)
+    # 空きマスも含む
+    selected = make_occupancy(board=board).non_black
     return selected
@@ -3,6 +3,7 @@
 
 from .white_all_check import WhiteAllCheckLayer
 from .black_available_square import CheckAvailableSquareLayer
+from .king_check import CheckLayer
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/17'
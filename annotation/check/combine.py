@@ -1,9 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import tensorflow as tf
 import sonnet as snt
 
+from ..naive_effect.combine import combine_all
+
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/17'
 
@@ -22,18 +23,9 @@ class CombineMovableMaskLayer(snt.AbstractModule):
         :param effects:
         :return:
         """
-        effect = merge(*effects)
+        effect = combine_all(effects)
         return effect
 
 
 def merge(*args):
-    n = len(args)
-    if n == 1:
-        return args[0]
-    elif n == 2:
-        return tf.logical_and(*args)
-
-    tmp = [tf.logical_and(v1, v2) for v1, v2 in zip(args[0::2], args[1::2])]
-    if n % 2 == 1:
-        tmp.append(args[-1])
-    return merge(*tmp)
+    return combine_all(args)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+手番側の王のマスだけを見て王手を判定する
+
+王から8方向に伸ばした直線上のマスと桂馬で跳ねた先のマスを表引きで集めて、
+直線上で最初に当たる駒が王の方向に動ける非手番側の駒かを調べる
+盤面全体の畳み込みを使わないので、王手の判定だけが必要な場合に速い
+
+マスの番号は筋 * 9 + 段
+盤の外は番号81のマスとして、OFF_BOARDの値を置く
+"""
+
+import numpy as np
+import sonnet as snt
+import tensorflow as tf
+
+from ..direction import (Direction, get_eight_directions,
+                         get_opposite_direction)
+from ..memo import lookup, store
+from ..occupancy import make_occupancy
+from ..piece import Piece
+from ..short_board.white_table import make_base_table
+from ..vectorized.table import (OFF_BOARD, OFF_BOARD_SQUARE,
+                                make_ke_index_array, make_ray_index_array)
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def make_attack_array():
+    """
+    [8, 8, Piece.SIZE + 1]の表
+    王から見た方向、距離-1、駒の種類ごとに、その駒が王に利きを持つか
+
+    :return:
+    """
+    base = make_base_table()
+    table = np.zeros((8, 8, Piece.SIZE + 1), dtype=np.bool_)
+    for d, direction in enumerate(get_eight_directions()):
+        # 駒から王へ向かう方向
+        opposite = get_opposite_direction(direction=direction)
+        # 短い利き
+        table[d, 0, Piece.WHITE_FU:Piece.EMPTY] = base[opposite]
+
+        # 長い利き
+        if direction in (Direction.RIGHT, Direction.UP, Direction.DOWN,
+                         Direction.LEFT):
+            pieces = [Piece.WHITE_HI, Piece.WHITE_RY]
+            if direction == Direction.UP:
+                pieces.append(Piece.WHITE_KY)
+        else:
+            pieces = [Piece.WHITE_KA, Piece.WHITE_UM]
+        table[d, :, pieces] = True
+    return table
+
+
+def _make_constant(name, array, dtype):
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    constant = tf.constant(array, dtype=dtype, name=name)
+
+    store(constant, name)
+
+    return constant
+
+
+def make_ray_index_table():
+    return _make_constant(name='king_ray_index',
+                          array=make_ray_index_array(), dtype=tf.int32)
+
+
+def make_ke_index_table():
+    return _make_constant(name='king_ke_index',
+                          array=make_ke_index_array(), dtype=tf.int32)
+
+
+def make_attack_table():
+    # 1次元にして、(方向 * 8 + 距離 - 1) * (Piece.SIZE + 1) + 駒で引く
+    return _make_constant(name='king_attack',
+                          array=np.reshape(make_attack_array(), [-1]),
+                          dtype=tf.bool)
+
+
+class CheckLayer(snt.AbstractModule):
+    def __init__(self, name='check'):
+        super().__init__(name=name)
+
+    def _build(self, board, occupancy=None):
+        """
+        手番側が王手されているか、王手している駒の数、王手している駒のマスを求める
+        盤面はピンを考慮していないもの
+
+        :param board:
+        :param occupancy: boardのmake_occupancyの出力
+            省略した場合はここで求める
+        :return: 王手の有無 [batch, 1, 1, 1]のbool
+            王手している駒の数 [batch, 1, 1, 1]のint32
+            王手している駒のマス 盤面と同じ形のbool
+        """
+        flat_board = tf.reshape(board, [-1, 81])
+        batch_size = tf.shape(flat_board)[0]
+
+        # 王のマス
+        if occupancy is None:
+            occupancy = make_occupancy(board=board)
+        has_ou = occupancy.has_black_ou
+        ou_square = occupancy.black_ou_square
+
+        # 盤の外のマスを加える
+        padded = tf.pad(flat_board, [[0, 0], [0, 1]],
+                        constant_values=OFF_BOARD)
+        flat_padded = tf.reshape(padded, [-1])
+        offset = tf.range(batch_size) * (OFF_BOARD_SQUARE + 1)
+
+        # 直線上のマスの駒 [batch, 8, 8]
+        ray_square = tf.gather(make_ray_index_table(), ou_square)
+        ray_piece = tf.gather(flat_padded,
+                              ray_square + tf.reshape(offset, [-1, 1, 1]))
+        # 最初に当たる駒(盤の外も含む)
+        occupied = tf.not_equal(ray_piece, Piece.EMPTY)
+        blocked = tf.cumsum(tf.to_int32(occupied), axis=2, exclusive=True)
+        first = tf.logical_and(occupied, tf.equal(blocked, 0))
+        attack_index = ray_piece + np.reshape(
+            np.arange(64, dtype=np.int32) * (Piece.SIZE + 1), [1, 8, 8]
+        )
+        ray_check = tf.logical_and(
+            first, tf.gather(make_attack_table(), attack_index)
+        )
+
+        # 桂馬 [batch, 2]
+        ke_square = tf.gather(make_ke_index_table(), ou_square)
+        ke_piece = tf.gather(flat_padded,
+                             ke_square + tf.reshape(offset, [-1, 1]))
+        ke_check = tf.equal(ke_piece, Piece.WHITE_KE)
+
+        # 王がいない場合は王手はない
+        ray_check = tf.logical_and(ray_check,
+                                   tf.reshape(has_ou, [-1, 1, 1]))
+        ke_check = tf.logical_and(ke_check, tf.reshape(has_ou, [-1, 1]))
+
+        count = (tf.reduce_sum(tf.to_int32(ray_check), axis=[1, 2]) +
+                 tf.reduce_sum(tf.to_int32(ke_check), axis=1))
+        count = tf.reshape(count, [-1, 1, 1, 1])
+        flag = tf.greater(count, 0)
+
+        # 王手している駒のマス
+        # 王手していない場合は盤の外のマスにする
+        checker_square = tf.concat([
+            tf.reshape(tf.where(ray_check, ray_square,
+                                tf.fill(tf.shape(ray_square),
+                                        OFF_BOARD_SQUARE)), [-1, 64]),
+            tf.where(ke_check, ke_square,
+                     tf.fill(tf.shape(ke_square), OFF_BOARD_SQUARE))
+        ], axis=1)
+        squares = tf.greater(tf.reduce_max(
+            tf.one_hot(checker_square, OFF_BOARD_SQUARE + 1, dtype=tf.int32),
+            axis=1
+        ), 0)
+        squares = tf.reshape(squares[:, :OFF_BOARD_SQUARE], tf.shape(board))
+
+        return flag, count, squares
@@ -13,6 +13,7 @@ from annotation.black_effect.pseudo_ou_effect import BlackPseudoOuEffect
 from annotation.direction import (Direction, get_eight_directions,
                                   get_opposite_direction, get_cross_directions,
                                   get_diagonal_directions)
+from annotation.naive_effect.packed import SHORT_DIRECTIONS, unpack_flags
 from annotation.piece import Piece
 from ..white_all_check import WhiteAllCheckLayer
 from ..white_short_check import WhiteShortCheckLayer
@@ -44,10 +45,14 @@ class TestAvailableSquare(tf.test.TestCase):
             data_format=self.data_format, use_cudnn=self.use_cudnn
         )(ph)
         all_check, _ = WhiteAllCheckLayer()(ph, pseudo_effect)
-        available_square = CheckAvailableSquareLayer()(pseudo_effect,
-                                                       all_check)
+        available_square = CheckAvailableSquareLayer(
+            data_format=self.data_format
+        )(pseudo_effect, all_check)
         available_square = tf.squeeze(available_square)
-        short_check = WhiteShortCheckLayer()(ph, pseudo_effect)
+        short_check = unpack_flags(
+            WhiteShortCheckLayer()(ph, pseudo_effect.short),
+            directions=SHORT_DIRECTIONS
+        )
 
         with self.test_session() as sess:
             for direction in chain(get_eight_directions(),
@@ -111,8 +116,10 @@ class TestAvailableSquare(tf.test.TestCase):
             data_format=self.data_format, use_cudnn=self.use_cudnn
         )(ph)
         all_check, long_check = WhiteAllCheckLayer()(ph, pseudo_effect)
-        available_square = CheckAvailableSquareLayer()(pseudo_effect,
-                                                       all_check)
+        long_check = unpack_flags(long_check)
+        available_square = CheckAvailableSquareLayer(
+            data_format=self.data_format
+        )(pseudo_effect, all_check)
         available_square = tf.squeeze(available_square)
 
         long_piece_list = [Piece.WHITE_KY, Piece.WHITE_KA, Piece.WHITE_HI,
@@ -128,7 +135,7 @@ class TestAvailableSquare(tf.test.TestCase):
                         direction in get_cross_directions()):
                     continue
                 elif (piece == Piece.WHITE_RY and
-                        direction == get_diagonal_directions()):
+                        direction in get_diagonal_directions()):
                     continue
 
                 x, y = self._get_position(direction=direction, i=i, j=j, k=k)
@@ -182,9 +189,8 @@ class TestAvailableSquare(tf.test.TestCase):
         def _get(m, n):
             if m == n:
                 return repeat(m)
-            elif m < n:
-                return range(m, n)
-            else:
-                return range(n, m)
+            # 王のマスを含めず、王手している駒のマスを含めて、王の側から並べる
+            step = 1 if m < n else -1
+            return range(m + step, n + step, step)
 
         return _get(i, x), _get(j, y)
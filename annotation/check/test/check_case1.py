@@ -10,6 +10,7 @@ from dotenv import load_dotenv
 
 from annotation.black_effect.pseudo_ou_effect import BlackPseudoOuEffect
 from ..white_all_check import WhiteAllCheckLayer
+from annotation.naive_effect.packed import SHORT_DIRECTIONS, unpack_flags
 from annotation.direction import Direction
 
 __author__ = 'Yasuhiro'
@@ -62,7 +63,10 @@ class TestCheckCase1(tf.test.TestCase):
         all_check, long_check = WhiteAllCheckLayer()(board, pseudo_effect)
 
         with self.test_session() as sess:
-            all_check_, long_check_ = sess.run([all_check, long_check])
+            all_check_, long_check_ = sess.run([
+                unpack_flags(all_check, directions=SHORT_DIRECTIONS),
+                unpack_flags(long_check)
+            ])
 
         for direction, check in all_check_.items():
             with self.subTest(direction=direction):
@@ -11,6 +11,7 @@ from dotenv import load_dotenv
 
 from annotation.black_effect.pseudo_ou_effect import BlackPseudoOuEffect
 from ..white_all_check import WhiteAllCheckLayer
+from annotation.naive_effect.packed import SHORT_DIRECTIONS, unpack_flags
 from annotation.direction import Direction
 from ..black_available_square import CheckAvailableSquareLayer
 
@@ -75,7 +76,10 @@ class TestCheckCase1(tf.test.TestCase):
         all_check, long_check = WhiteAllCheckLayer()(self.board, pseudo_effect)
 
         with self.test_session() as sess:
-            all_check_, long_check_ = sess.run([all_check, long_check])
+            all_check_, long_check_ = sess.run([
+                unpack_flags(all_check, directions=SHORT_DIRECTIONS),
+                unpack_flags(long_check)
+            ])
 
         for direction, check in all_check_.items():
             with self.subTest(direction=direction):
@@ -92,8 +96,9 @@ class TestCheckCase1(tf.test.TestCase):
 
         all_check, long_check = WhiteAllCheckLayer()(self.board, pseudo_effect)
 
-        available_square = CheckAvailableSquareLayer()(pseudo_effect,
-                                                       all_check)
+        available_square = CheckAvailableSquareLayer(
+            data_format=self.data_format
+        )(pseudo_effect, all_check)
 
         available_square = tf.squeeze(available_square)
         with self.test_session() as sess:
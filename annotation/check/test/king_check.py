@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+from dotenv import load_dotenv
+
+from annotation.black_effect.pseudo_ou_effect import BlackPseudoOuEffect
+from annotation.direction import (Direction, get_cross_directions,
+                                  get_diagonal_directions, get_step)
+from annotation.piece import Piece
+from annotation.short_board.white_table import make_base_table
+from ..king_check import CheckLayer
+from ..white_all_check import WhiteAllCheckLayer
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def make_random_board(rng):
+    """
+    手番側の王を一つだけ置いて、残りのマスにランダムに駒を置く
+
+    :param rng:
+    :return: [9, 9]の盤面 (筋, 段)
+    """
+    board = np.full((9, 9), Piece.EMPTY, dtype=np.int32)
+    white_pieces = [piece for piece in range(Piece.WHITE_FU, Piece.EMPTY)
+                    if piece != Piece.WHITE_OU]
+    black_pieces = [piece for piece in range(Piece.BLACK_FU, Piece.WHITE_FU)
+                    if piece != Piece.BLACK_OU]
+    for i, j in zip(*np.nonzero(rng.rand(9, 9) < 0.3)):
+        if rng.rand() < 0.7:
+            board[i, j] = rng.choice(white_pieces)
+        else:
+            board[i, j] = rng.choice(black_pieces)
+    board[rng.randint(9), rng.randint(9)] = Piece.BLACK_OU
+    return board
+
+
+def find_checkers(board):
+    """
+    王手している駒のマスを非手番側の全ての駒の利きを調べて求める
+
+    :param board: [9, 9]の盤面 (筋, 段)
+    :return:
+    """
+    base = make_base_table()
+    squares = np.zeros((9, 9), dtype=np.bool_)
+    ou = tuple(v[0] for v in np.nonzero(board == Piece.BLACK_OU))
+    for i, j in zip(*np.nonzero(board >= Piece.WHITE_FU)):
+        piece = board[i, j]
+        if piece == Piece.EMPTY:
+            continue
+        for direction in Direction:
+            dh, dw = get_step(direction=direction)
+            # 短い利き
+            if base[direction][piece - Piece.WHITE_FU]:
+                if (i + dh, j + dw) == ou:
+                    squares[i, j] = True
+
+            # 長い利き
+            if direction in get_cross_directions():
+                long = piece in (Piece.WHITE_HI, Piece.WHITE_RY) or (
+                    piece == Piece.WHITE_KY and direction == Direction.DOWN
+                )
+            elif direction in get_diagonal_directions():
+                long = piece in (Piece.WHITE_KA, Piece.WHITE_UM)
+            else:
+                long = False
+            x, y = i + dh, j + dw
+            while long and 0 <= x < 9 and 0 <= y < 9:
+                if (x, y) == ou:
+                    squares[i, j] = True
+                if board[x, y] != Piece.EMPTY:
+                    break
+                x, y = x + dh, y + dw
+    return squares
+
+
+class TestKingCheck(tf.test.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        dotenv_path = Path(__file__).parents[3] / '.env'
+        load_dotenv(str(dotenv_path))
+
+        cls.data_format = os.environ.get('DATA_FORMAT')
+        cls.use_cudnn = bool(os.environ.get('USE_CUDNN'))
+
+    def _reshape(self, board):
+        if self.data_format == 'NCHW':
+            return np.reshape(board, [-1, 1, 9, 9])
+        else:
+            return np.reshape(board, [-1, 9, 9, 1])
+
+    def test_random(self):
+        """
+        王手している駒を全てのマスを調べて求めた結果と比べる
+
+        :return:
+        """
+        rng = np.random.RandomState(0)
+        boards = self._reshape(
+            np.stack([make_random_board(rng) for _ in range(500)])
+        )
+
+        ph = tf.placeholder(tf.int32, shape=[None] + list(boards.shape[1:]))
+        flag, count, squares = CheckLayer()(ph)
+
+        with self.test_session() as sess:
+            flag_value, count_value, squares_value = sess.run(
+                [flag, count, squares], feed_dict={ph: boards}
+            )
+
+        for b, board in enumerate(boards):
+            expected = find_checkers(np.reshape(board, [9, 9]))
+            self.assertEqual(flag_value[b, 0, 0, 0], np.any(expected))
+            self.assertEqual(count_value[b, 0, 0, 0], np.sum(expected))
+            self.assertTrue(np.all(
+                np.reshape(squares_value[b], [9, 9]) == expected
+            ))
+
+    def test_check_layer(self):
+        """
+        仮想的な利きから求めた王手の判定と比べる
+
+        :return:
+        """
+        rng = np.random.RandomState(1)
+        boards = self._reshape(
+            np.stack([make_random_board(rng) for _ in range(200)])
+        )
+
+        ph = tf.placeholder(tf.int32, shape=[None] + list(boards.shape[1:]))
+        pseudo_effect = BlackPseudoOuEffect(
+            data_format=self.data_format, use_cudnn=self.use_cudnn
+        )(ph)
+        check, _ = WhiteAllCheckLayer()(ph, pseudo_effect)
+        expected = tf.reduce_any(check, axis=1, keep_dims=True)
+
+        flag, _, _ = CheckLayer()(ph)
+
+        with self.test_session() as sess:
+            flag_value, expected_value = sess.run(
+                [flag, expected], feed_dict={ph: boards}
+            )
+
+        self.assertTupleEqual(flag_value.shape, expected_value.shape)
+        self.assertTrue(np.all(flag_value == expected_value))
+
+    def test_no_ou(self):
+        """
+        王がない場合は王手はない
+
+        :return:
+        """
+        board = np.full((2, 9, 9), Piece.EMPTY, dtype=np.int32)
+        board[:, 4, 5] = Piece.WHITE_HI
+        board[1, 4, 0] = Piece.BLACK_OU
+
+        ph = tf.placeholder(tf.int32, shape=self._reshape(board).shape)
+        flag, count, squares = CheckLayer()(ph)
+
+        with self.test_session() as sess:
+            flag_value, count_value, squares_value = sess.run(
+                [flag, count, squares], feed_dict={ph: self._reshape(board)}
+            )
+
+        self.assertFalse(flag_value[0, 0, 0, 0])
+        self.assertEqual(count_value[0, 0, 0, 0], 0)
+        self.assertFalse(np.any(squares_value[0]))
+
+        self.assertTrue(flag_value[1, 0, 0, 0])
+        self.assertEqual(count_value[1, 0, 0, 0], 1)
+        self.assertTrue(np.reshape(squares_value[1], [9, 9])[4, 5])
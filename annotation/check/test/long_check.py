@@ -13,6 +13,7 @@ from annotation.black_effect.pseudo_ou_effect import BlackPseudoOuEffect
 from annotation.direction import (Direction, get_eight_directions,
                                   get_opposite_direction, get_cross_directions,
                                   get_diagonal_directions)
+from annotation.naive_effect.packed import unpack_flags
 from annotation.piece import Piece
 from ..white_long_check import WhiteLongCheckLayer
 
@@ -37,7 +38,7 @@ class TestCheckLong(tf.test.TestCase):
         pseudo_effect = BlackPseudoOuEffect(
             data_format=self.data_format, use_cudnn=self.use_cudnn
         )(ph)
-        long_check = WhiteLongCheckLayer()(ph, pseudo_effect)
+        long_check = unpack_flags(WhiteLongCheckLayer()(ph, pseudo_effect.long))
 
         # 利きの長い駒のみに限定する
         # UM,RYの長い利きのみで、短い利きは対象に含めない
@@ -12,6 +12,7 @@ from dotenv import load_dotenv
 from annotation.black_effect.pseudo_ou_effect import BlackPseudoOuEffect
 from annotation.direction import (Direction, get_eight_directions,
                                   get_opposite_direction)
+from annotation.naive_effect.packed import SHORT_DIRECTIONS, unpack_flags
 from annotation.piece import Piece
 from annotation.short_board.white_table import make_base_table
 from ..white_short_check import WhiteShortCheckLayer
@@ -42,7 +43,10 @@ class TestCheckShort(tf.test.TestCase):
         pseudo_effect = BlackPseudoOuEffect(
             data_format=self.data_format, use_cudnn=self.use_cudnn
         )(ph)
-        short_check = WhiteShortCheckLayer()(ph, pseudo_effect)
+        short_check = unpack_flags(
+            WhiteShortCheckLayer()(ph, pseudo_effect.short),
+            directions=SHORT_DIRECTIONS
+        )
 
         # 利きの短い駒のみに限定する
         # UM,RYの短い利きのみで、長い利きは対象に含めない
@@ -4,7 +4,6 @@
 import sonnet as snt
 import tensorflow as tf
 
-from ..direction import Direction, get_eight_directions
 from .white_long_check import WhiteLongCheckLayer
 from .white_short_check import WhiteShortCheckLayer
 
@@ -22,19 +21,16 @@ class WhiteAllCheckLayer(snt.AbstractModule):
 
         :param board:
         :param pseudo_ou_effects: 短い利きと長い利きで分かれている namedtuple
-        :return:
+        :return: SHORT_DIRECTIONSの順の王手のフラグ [batch, 10, 1, 1]と
+            8方向の長い利きでの王手のフラグ [batch, 8, 1, 1]
         """
         short_check = WhiteShortCheckLayer()(board, pseudo_ou_effects.short)
         long_check = WhiteLongCheckLayer()(board, pseudo_ou_effects.long)
 
-        outputs = {
-            direction: tf.logical_or(short_check[direction],
-                                     long_check[direction])
-            for direction in get_eight_directions()
-        }
-        outputs.update({
-            direction: short_check[direction]
-            for direction in (Direction.RIGHT_UP_UP, Direction.LEFT_UP_UP)
-        })
+        # 8方向は長い利きと短い利きを合わせて、桂馬の動きは短い利きだけ
+        outputs = tf.concat([
+            tf.logical_or(short_check[:, :8], long_check),
+            short_check[:, 8:]
+        ], axis=1)
 
         return outputs, long_check
@@ -1,11 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import tensorflow as tf
 import sonnet as snt
 
 from ..boolean_board import white
-from ..direction import Direction
+from ..direction import Direction, get_eight_directions
+from ..naive_effect.packed import as_packed_effects, to_packed_plane
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/17'
@@ -24,27 +26,37 @@ class WhiteLongCheckLayer(snt.AbstractModule):
         王手がかかっている可能性があるのは手番側のみなのなので、逆のパターンはない
 
         :param board:
-        :param pseudo_ou_effects:
-        :return:
+        :param pseudo_ou_effects: 8方向の[batch, 8, 9, 9]
+            方向ごとのdictでもよい
+        :return: 8方向の王手のフラグ [batch, 8, 1, 1]
         """
         cross_pieces = white.select_white_hi_ry_board(board=board)
         diagonal_pieces = white.select_white_ka_um_board(board=board)
         ky_pieces = white.select_white_ky_board(board=board)
 
-        outputs = {}
-        for direction, pseudo_effect in pseudo_ou_effects.items():
-            if direction == Direction.UP:
-                pieces = tf.logical_or(cross_pieces, ky_pieces)
-            elif direction in (Direction.RIGHT, Direction.DOWN,
-                               Direction.LEFT):
-                pieces = cross_pieces
-            else:
-                pieces = diagonal_pieces
-
-            pseudo_effect = pseudo_ou_effects[direction]
-
-            check = tf.logical_and(pseudo_effect, pieces)
-            flag = tf.reduce_any(check, axis=[1, 2, 3], keep_dims=True)
-            outputs[direction] = flag
-
-        return outputs
+        # 縦横、斜め、上の3種類の駒の盤面を、方向ごとに並べる
+        pieces = tf.concat([
+            to_packed_plane(cross_pieces), to_packed_plane(diagonal_pieces),
+            to_packed_plane(tf.logical_or(cross_pieces, ky_pieces))
+        ], axis=1)
+        pieces = tf.gather(pieces, make_long_check_index(), axis=1)
+
+        # 8方向をまとめて[batch, 8, 9, 9]で判定する
+        check = tf.logical_and(as_packed_effects(pseudo_ou_effects), pieces)
+        flag = tf.reduce_any(check, axis=[2, 3], keep_dims=True)
+        return flag
+
+
+def make_long_check_index():
+    """
+    8方向のそれぞれで王手をする駒の種類
+    0は縦横、1は斜め、2は上に利きを伸ばす駒
+
+    :return:
+    """
+    return np.array([
+        2 if direction == Direction.UP else
+        0 if direction in (Direction.RIGHT, Direction.DOWN,
+                           Direction.LEFT) else 1
+        for direction in get_eight_directions()
+    ], dtype=np.int32)
@@ -1,13 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from itertools import chain
-
 import tensorflow as tf
 import sonnet as snt
 
 from ..boolean_board import white
-from ..direction import Direction, get_eight_directions, get_opposite_direction
+from ..direction import get_opposite_direction
+from ..naive_effect.packed import (SHORT_DIRECTIONS, as_packed_effects,
+                                   pack_planes)
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/17'
@@ -26,21 +26,22 @@ class WhiteShortCheckLayer(snt.AbstractModule):
         王手がかかっている可能性があるのは手番側のみなのなので、逆のパターンはない
 
         :param board:
-        :param pseudo_ou_effects:
-        :return:
+        :param pseudo_ou_effects: SHORT_DIRECTIONSの順の[batch, 10, 9, 9]
+            方向ごとのdictでもよい
+        :return: SHORT_DIRECTIONSの順の王手のフラグ [batch, 10, 1, 1]
         """
-        outputs = {}
-        for direction, pseudo_effect in pseudo_ou_effects.items():
-            # OUの通常の動きの8方向も含まれているが、まとめてpseudo_effectと呼ぶ
-            opposite_direction = get_opposite_direction(direction=direction)
-            piece = white.select_white_direction_board(
-                board=board, direction=opposite_direction
-            )
-
-            pseudo_effect = pseudo_ou_effects[direction]
-
-            check = tf.logical_and(pseudo_effect, piece)
-            flag = tf.reduce_any(check, axis=[1, 2, 3], keep_dims=True)
-            outputs[direction] = flag
-
-        return outputs
+        # OUの通常の動きの8方向も含まれているが、まとめてpseudo_effectと呼ぶ
+        piece_list = [
+            white.select_white_direction_board(
+                board=board,
+                direction=get_opposite_direction(direction=direction)
+            ) for direction in SHORT_DIRECTIONS
+        ]
+
+        # 全ての方向をまとめて[batch, 10, 9, 9]で判定する
+        check = tf.logical_and(
+            as_packed_effects(pseudo_ou_effects, directions=SHORT_DIRECTIONS),
+            pack_planes(piece_list)
+        )
+        flag = tf.reduce_any(check, axis=[2, 3], keep_dims=True)
+        return flag
@@ -53,6 +53,32 @@ def get_opposite_direction(direction):
         return Direction(19 - direction)
 
 
+def get_step(direction):
+    """
+    方向ごとに1回移動した時の(筋, 段)の変化量を返す
+    右は筋が小さくなる方向、上は段が小さくなる方向
+
+    :param direction:
+    :return:
+    """
+    steps = {
+        Direction.RIGHT_UP: (-1, -1),
+        Direction.RIGHT: (-1, 0),
+        Direction.RIGHT_DOWN: (-1, 1),
+        Direction.UP: (0, -1),
+        Direction.DOWN: (0, 1),
+        Direction.LEFT_UP: (1, -1),
+        Direction.LEFT: (1, 0),
+        Direction.LEFT_DOWN: (1, 1),
+        # 桂馬の動き
+        Direction.RIGHT_UP_UP: (-1, -2),
+        Direction.LEFT_UP_UP: (1, -2),
+        Direction.RIGHT_DOWN_DOWN: (-1, 2),
+        Direction.LEFT_DOWN_DOWN: (1, 2)
+    }
+    return steps[direction]
+
+
 class PinDirection(enum.IntEnum):
     DIAGONAL1 = 0
     HORIZONTAL = 1
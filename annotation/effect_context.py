@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+先後のナイーブな利き、王からの仮想的な利き、ピンを考慮した盤面、
+手番側の王手の判定をまとめて求める
+盤面の占有状況(occupancy.Occupancy)も一緒に持ち、利きの層に渡す
+
+BlackEffectLayerとWhiteEffectLayerの両方がこの結果を使うので、
+AnnotationLayerで一度だけ計算して両方に渡す
+片方しか使わない場合は、使わない方は計算せずにNoneにする
+
+バッチの前半と後半が互いに相手から見た局面の場合(paired)は、
+非手番側のナイーブな利きを前半と後半を入れ替えた手番側のナイーブな利きから求める
+
+long_engineが'bits'の場合は、手番側で使うものをbit_contextで
+ビットに詰めたワードのまま求めて、最後に盤面の形に戻す
+"""
+
+from collections import namedtuple
+
+import sonnet as snt
+
+from .bit_context import BlackBitContextLayer
+from .black_effect.pseudo_ou_effect import BlackPseudoOuEffect
+from .black_naive_effect import BlackNaiveAllEffect
+from .check import CheckAvailableSquareLayer, WhiteAllCheckLayer
+from .naive_effect.packed import reverse_directions
+from .occupancy import make_occupancy
+from .perspective import mirror_both_sides
+from .pin import BlackPinLayer, WhitePinLayer
+from .white_effect.pseudo_ou_effect import WhitePseudoOuEffect
+from .white_naive_effect import WhiteNaiveAllEffect
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+EffectContext = namedtuple('EffectContext', [
+    'occupancy', 'black_naive_effect', 'black_naive_long_effect',
+    'white_naive_effect', 'white_naive_long_effect',
+    'black_pseudo_ou_effect', 'white_pseudo_ou_effect',
+    'black_pinned_board', 'white_pinned_board',
+    'black_check', 'black_long_check', 'black_available_square'
+])
+
+
+class EffectContextLayer(snt.AbstractModule):
+    def __init__(self, data_format, use_cudnn=True, long_engine='conv',
+                 short_engine='conv', black=True, white=True, paired=False,
+                 name='effect_context'):
+        """
+
+        :param data_format:
+        :param use_cudnn:
+        :param long_engine:
+        :param short_engine:
+        :param black: 手番側の利き(BlackEffectLayer)で使うものを求めるか
+            非手番側のナイーブな利き、手番側の王からの仮想的な利き、手番側のピン、
+            手番側の王手の判定と王手を考慮した移動可能なマス
+        :param white: 非手番側の利き(WhiteEffectLayer)で使うものを求めるか
+            手番側のナイーブな利き、非手番側の王からの仮想的な利き、非手番側のピン
+        :param paired: バッチの前半と後半が互いに相手から見た局面か
+            perspective.stack_both_sidesで重ねた局面
+        :param name:
+        """
+        super().__init__(name=name)
+        self.data_format = data_format
+        self.use_cudnn = use_cudnn
+        self.long_engine = long_engine
+        self.short_engine = short_engine
+        self.black = black
+        self.white = white
+        self.paired = paired
+
+    def _build(self, board, occupancy=None):
+        """
+        先後の利きの計算で共通に使うものを求める
+
+        :param board:
+        :param occupancy: boardのmake_occupancyの出力
+            省略した場合はここで求める
+        :return:
+        """
+        if occupancy is None:
+            occupancy = make_occupancy(board=board)
+        options = dict(data_format=self.data_format, use_cudnn=self.use_cudnn,
+                       long_engine=self.long_engine,
+                       short_engine=self.short_engine)
+
+        # bitsでは手番側で使うものを全てワードのまま求めるので、
+        # 非手番側のナイーブな利きを相手から見た局面から求めなくてよい
+        bits = self.black and self.long_engine == 'bits'
+
+        black_naive_effect = black_naive_long_effect = None
+        white_naive_effect = white_naive_long_effect = None
+        if self.paired and (self.white or (self.black and not bits)):
+            # 相手から見た局面の手番側のナイーブな利きは非手番側のナイーブな利き
+            black_naive_effect, black_naive_long_effect = BlackNaiveAllEffect(
+                **options
+            )(board)
+            white_naive_effect = mirror_both_sides(output=black_naive_effect)
+            white_naive_long_effect = mirror_both_sides(
+                output=reverse_directions(black_naive_long_effect)
+            )
+
+        black_pseudo_ou_effect = black_pinned_board = None
+        black_check = black_long_check = black_available_square = None
+        if bits:
+            (white_naive_effect, white_naive_long_effect,
+             black_pseudo_ou_effect, black_pinned_board, black_check,
+             black_long_check, black_available_square) = BlackBitContextLayer(
+                data_format=self.data_format
+            )(board)
+        elif self.black:
+            if white_naive_effect is None:
+                white_naive_effect, white_naive_long_effect = \
+                    WhiteNaiveAllEffect(**options)(board)
+            # 手番側の王から仮想的な利きを伸ばす
+            black_pseudo_ou_effect = BlackPseudoOuEffect(**options)(board)
+            # ピンされているかを判定
+            black_pinned_board = BlackPinLayer(
+                data_format=self.data_format
+            )(board, black_pseudo_ou_effect.long, white_naive_long_effect,
+              occupancy=occupancy)
+            # 王手を判定
+            black_check, black_long_check = WhiteAllCheckLayer()(
+                board, black_pseudo_ou_effect
+            )
+            # 王手を考慮した移動可能な領域の候補
+            black_available_square = CheckAvailableSquareLayer(
+                data_format=self.data_format
+            )(black_pseudo_ou_effect, black_check)
+
+        white_pseudo_ou_effect = white_pinned_board = None
+        if self.white:
+            if black_naive_effect is None:
+                black_naive_effect, black_naive_long_effect = \
+                    BlackNaiveAllEffect(**options)(board)
+            # 非手番側の王から仮想的な利きを伸ばす
+            white_pseudo_ou_effect = WhitePseudoOuEffect(**options)(board)
+            # ピンされているかを判定
+            white_pinned_board = WhitePinLayer(
+                data_format=self.data_format
+            )(board, white_pseudo_ou_effect, black_naive_long_effect,
+              occupancy=occupancy)
+
+        context = EffectContext(
+            occupancy=occupancy,
+            black_naive_effect=black_naive_effect,
+            black_naive_long_effect=black_naive_long_effect,
+            white_naive_effect=white_naive_effect,
+            white_naive_long_effect=white_naive_long_effect,
+            black_pseudo_ou_effect=black_pseudo_ou_effect,
+            white_pseudo_ou_effect=white_pseudo_ou_effect,
+            black_pinned_board=black_pinned_board,
+            white_pinned_board=white_pinned_board,
+            black_check=black_check,
+            black_long_check=black_long_check,
+            black_available_square=black_available_square
+        )
+        return context
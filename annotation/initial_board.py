@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from .piece import Piece
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def make_initial_board():
+    """
+    手番側から見た平手の初期局面
+
+    :return:
+    """
+    board = np.empty((9, 9), dtype=np.int32)
+    board[:] = Piece.EMPTY
+
+    board[:, 2] = Piece.WHITE_FU
+    board[:, 6] = Piece.BLACK_FU
+    board[1, 1] = Piece.WHITE_KA
+    board[7, 7] = Piece.BLACK_KA
+    board[7, 1] = Piece.WHITE_HI
+    board[1, 7] = Piece.BLACK_HI
+    for i, p in enumerate([Piece.BLACK_KY, Piece.BLACK_KE, Piece.BLACK_GI,
+                           Piece.BLACK_KI, Piece.BLACK_OU]):
+        board[i, 0] = p + 14
+        board[8 - i, 0] = p + 14
+        board[i, 8] = p
+        board[8 - i, 8] = p
+
+    return board
+
+
+def make_initial_inputs(batch_size, data_format):
+    """
+    初期局面をbatch_size個並べた盤面と持ち駒
+
+    :param batch_size:
+    :param data_format:
+    :return:
+    """
+    board = make_initial_board()
+    if data_format == 'NCHW':
+        board = np.reshape(board, (1, 1, 9, 9))
+    else:
+        board = np.reshape(board, (1, 9, 9, 1))
+    board = np.tile(board, (batch_size, 1, 1, 1))
+    hand = np.zeros((batch_size, 7), dtype=np.int32)
+    return board, hand
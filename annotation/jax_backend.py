@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JAXでAnnotationLayerと同じ出力を計算する
+
+1局面の関数をvectorized.annotateをjax.numpyで実行して書き、
+jax.vmapでバッチにしてjax.jitでコンパイルする
+XLAで全体が1つの計算にまとめられるので、マルチコアのCPUでまとめて計算できる
+tensorflowとsonnetを使わないので、JAXの学習ループからそのまま呼び出せる
+
+jax.jitは入力の形ごとにコンパイルするので、バッチサイズごとに初回はコンパイルの時間がかかる
+enable_compilation_cacheでコンパイルの結果をディスクに保存すると、次のプロセスから再利用できる
+CPUで実行する場合は環境変数JAX_PLATFORMS=cpuを指定する
+"""
+
+import jax
+import jax.numpy as jnp
+
+from .vectorized import annotate, format_outputs, to_absolute, to_relative
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+ACTION_FORMATS = ('list', 'dense')
+
+
+def enable_compilation_cache(cache_dir):
+    """
+    コンパイルの結果をディスクに保存して、次回以降に再利用する
+
+    :param cache_dir: 保存先のディレクトリ
+    :return:
+    """
+    jax.config.update('jax_compilation_cache_dir', str(cache_dir))
+    # 短い時間でコンパイルできたものも保存する
+    jax.config.update('jax_persistent_cache_min_compile_time_secs', 0)
+
+
+def annotate_position(board, hand):
+    """
+    1局面の出力を求める
+
+    :param board: [81]の整数、手番側から見た盤面
+    :param hand: [7]の整数、手番側の持ち駒
+    :return: 行動[139, 81]のbool、
+        手番側の利きの数[81]と非手番側の利きの数[81]のint32、王手のbool
+    """
+    outputs = annotate(jnp, board[None], hand[None])
+    return tuple(output[0] for output in outputs)
+
+
+# [batch, 81]と[batch, 7]を入力して、vectorized.annotateと同じ形を出力する
+annotate_batch = jax.vmap(annotate_position)
+
+
+class AnnotationFunction(object):
+    def __init__(self, data_format, action_format='list',
+                 absolute_output=False):
+        """
+        AnnotationLayerと同じ入出力の関数
+        引数はtf2.AnnotationFunctionと同じ
+
+        :param data_format:
+        :param action_format: 'list'または'dense'
+        :param absolute_output: turnを指定した場合に、盤面の形の出力を
+            先手から見た向きに戻すならTrue
+        """
+        if action_format not in ACTION_FORMATS:
+            raise ValueError(action_format)
+
+        self.data_format = data_format
+        self.action_format = action_format
+        self.absolute_output = absolute_output
+
+        self._relative_function = jax.jit(self._annotate_relative)
+        self._absolute_function = jax.jit(self._annotate_absolute)
+
+    def __call__(self, board, black_hand, white_hand=None, turn=None):
+        """
+        turnを省略した場合はboardとblack_handが手番側から見た局面
+        turnを指定した場合はboardが先手から見た盤面で、
+        black_handとwhite_handが先手と後手の持ち駒
+
+        :param board:
+        :param black_hand:
+        :param white_hand:
+        :param turn: [batch]のbool、後手番ならTrue
+        :return: AnnotationLayerと同じ4つの出力
+        """
+        if turn is None:
+            return self._relative_function(board, black_hand)
+        if white_hand is None:
+            raise ValueError('white_hand is required')
+        return self._absolute_function(board, black_hand, white_hand, turn)
+
+    def _annotate_relative(self, board, hand):
+        outputs = annotate_batch(jnp.reshape(board, (-1, 81)),
+                                 jnp.asarray(hand, dtype=jnp.int32))
+        return self._format(outputs)
+
+    def _annotate_absolute(self, board, black_hand, white_hand, turn):
+        board, hand, _ = to_relative(jnp, jnp.reshape(board, (-1, 81)),
+                                     black_hand, white_hand, turn)
+        action, black_count, white_count, check = annotate_batch(
+            board, jnp.asarray(hand, dtype=jnp.int32)
+        )
+        if self.absolute_output:
+            action = to_absolute(jnp, action, turn)
+            black_count = to_absolute(jnp, black_count, turn)
+            white_count = to_absolute(jnp, white_count, turn)
+        return self._format((action, black_count, white_count, check))
+
+    def _format(self, outputs):
+        return format_outputs(jnp, outputs, data_format=self.data_format,
+                              action_format=self.action_format)
@@ -17,7 +17,7 @@ def make_one_hot(index_board, data_format):
     if data_format == 'NCHW':
         shape = [-1, 2, 9, 9]
     else:
-        shape = [1, 9, 9, 2]
+        shape = [-1, 9, 9, 2]
     one_hot = tf.reshape(one_hot, shape)
 
     return one_hot
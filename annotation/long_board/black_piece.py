@@ -1,13 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import numpy as np
-import tensorflow as tf
-
-from .axis import make_one_hot
+from .black_table import get_directions
 from ..direction import (Direction, PinDirection, get_cross_directions,
                          get_diagonal_directions)
+from ..memo import lookup, store
 from ..piece import Piece
+from ..selection import select_one_hot
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/16'
@@ -26,12 +25,8 @@ def select_black_ou(board, data_format):
     :param data_format:
     :return:
     """
-    table = np.zeros(Piece.SIZE, dtype=np.int32)
-    table[Piece.BLACK_OU] = 1
-    table[Piece.EMPTY] = -1
-
-    converted = tf.gather(table, board)
-    one_hot = make_one_hot(index_board=converted, data_format=data_format)
+    one_hot = select_one_hot(board=board, key='black_long_ou',
+                             data_format=data_format)
 
     return one_hot
 
@@ -47,23 +42,16 @@ def select_black_cross_pieces(board, data_format, direction):
     """
     if direction != Direction.UP:
         # 上方向は一回きりなので、残りの方向は保存しているか確認する
-        collection = tf.get_collection_ref('black_cross_pieces')
-        if len(collection):
-            return collection[0]
-
-    table = np.zeros(Piece.SIZE, dtype=np.int32)
-    table[Piece.BLACK_HI] = 1
-    table[Piece.BLACK_RY] = 1
-    if direction == Direction.UP:
-        table[Piece.BLACK_KY] = 1
-    table[Piece.EMPTY] = -1
+        cached = lookup('black_cross_pieces', board, data_format)
+        if cached is not None:
+            return cached
 
-    converted = tf.gather(table, board)
-    one_hot = make_one_hot(index_board=converted, data_format=data_format)
+    one_hot = select_one_hot(board=board, key=('black_long', direction),
+                             data_format=data_format)
 
     if direction != Direction.UP:
         # 上方向は一回きりなので、残りの方向の場合は保存する
-        tf.add_to_collection('black_cross_pieces', one_hot)
+        store(one_hot, 'black_cross_pieces', board, data_format)
 
     return one_hot
 
@@ -79,19 +67,14 @@ def select_black_diagonal_pieces(board, data_format, direction):
     :return:
     """
     name = 'black_diagonal_pieces'
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
+    cached = lookup(name, board, data_format)
+    if cached is not None:
+        return cached
 
-    table = np.zeros(Piece.SIZE, dtype=np.int32)
-    table[Piece.BLACK_KA] = 1
-    table[Piece.BLACK_UM] = 1
-    table[Piece.EMPTY] = -1
+    one_hot = select_one_hot(board=board, key=('black_long', direction),
+                             data_format=data_format)
 
-    converted = tf.gather(table, board)
-    one_hot = make_one_hot(index_board=converted, data_format=data_format)
-
-    tf.add_to_collection(name, one_hot)
+    store(one_hot, name, board, data_format)
 
     return one_hot
 
@@ -120,10 +103,9 @@ def select_black_ky(board, data_format, direction):
     :return:
     """
     if direction == Direction.UP:
-        table = make_ky_table(direction=direction)
-        converted = tf.gather(table, board)
-
-        one_hot = make_one_hot(index_board=converted, data_format=data_format)
+        one_hot = select_one_hot(board=board,
+                                 key=('black_long_ky', direction),
+                                 data_format=data_format)
         return one_hot
     else:
         raise ValueError(direction)
@@ -191,80 +173,16 @@ def select_black_major_piece(board, data_format, direction, piece):
         # 4方向あるが、2方向でいい
         normalized_direction = PinDirection[direction.name]
         name = '{}_{}'.format(piece.name, normalized_direction.name)
-        collection = tf.get_collection_ref(name)
-        if len(collection):
-            return collection[0]
+        cached = lookup(name, board, data_format)
+        if cached is not None:
+            return cached
 
-        table = make_major_table(
-            direction=direction, piece=piece,
-            pin_directions=get_pin_directions(piece=piece)
+        one_hot = select_one_hot(
+            board=board, key=('black_long_major', piece, direction),
+            data_format=data_format
         )
-        converted = tf.gather(table, board)
 
-        one_hot = make_one_hot(index_board=converted, data_format=data_format)
-
-        tf.add_to_collection(name, one_hot)
+        store(one_hot, name, board, data_format)
         return one_hot
     else:
         raise ValueError(direction)
-
-
-def get_directions(piece):
-    if piece in (Piece.BLACK_KA, Piece.BLACK_UM):
-        return get_diagonal_directions()
-    elif piece in (Piece.BLACK_HI, Piece.BLACK_RY):
-        return get_cross_directions()
-    else:
-        raise ValueError(piece)
-
-
-def get_pin_directions(piece):
-    if piece in (Piece.BLACK_KA, Piece.BLACK_UM):
-        return PinDirection.DIAGONAL1, PinDirection.DIAGONAL2
-    elif piece in (Piece.BLACK_HI, Piece.BLACK_RY):
-        return PinDirection.VERTICAL, PinDirection.HORIZONTAL
-    else:
-        raise ValueError(piece)
-
-
-def make_ky_table(direction):
-    """
-    ピンを考慮してKYの動きを計算する
-    成りの計算のために駒の種類ごとに計算する
-
-    :param direction:
-    :return:
-    """
-    table = np.zeros(Piece.SIZE + 14 * PinDirection.SIZE, dtype=np.int32)
-    if direction != Direction.UP:
-        return table
-
-    table[Piece.EMPTY] = -1
-
-    table[Piece.BLACK_KY] = 1
-    offset = Piece.SIZE + 14 * PinDirection.UP
-    table[Piece.BLACK_KY + offset] = 1
-
-    return table
-
-
-def make_major_table(direction, piece, pin_directions):
-    table = np.zeros(Piece.SIZE + 14 * PinDirection.SIZE, dtype=np.int32)
-
-    normalized_direction = PinDirection[direction.name]
-    name = 'black_{}_{}'.format(piece.name, normalized_direction.name)
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
-
-    table[Piece.EMPTY] = -1
-    table[piece] = 1
-    # ピンの方向に対応する移動方向ならフラグを立てる
-    offset = Piece.SIZE + piece - Piece.BLACK_FU
-    for pin_direction in pin_directions:
-        index = offset + 14 * pin_direction
-        table[index] = pin_direction == normalized_direction
-
-    tf.add_to_collection(name, table)
-
-    return table
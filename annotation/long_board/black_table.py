@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+手番側の利きの長い駒を選び出すための表
+
+値は1が利きを伸ばす駒、0がその他の駒、-1が空きマス
+selectionでone hotに変換する
+"""
+
+import numpy as np
+
+from ..direction import (Direction, PinDirection, get_cross_directions,
+                         get_diagonal_directions)
+from ..piece import Piece
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def make_empty_table():
+    table = np.zeros(Piece.SIZE + 14 * PinDirection.SIZE, dtype=np.int32)
+    table[Piece.EMPTY] = -1
+    return table
+
+
+def make_ou_table():
+    table = make_empty_table()
+    table[Piece.BLACK_OU] = 1
+    return table
+
+
+def make_cross_table(direction):
+    table = make_empty_table()
+    table[Piece.BLACK_HI] = 1
+    table[Piece.BLACK_RY] = 1
+    if direction == Direction.UP:
+        table[Piece.BLACK_KY] = 1
+    return table
+
+
+def make_diagonal_table():
+    table = make_empty_table()
+    table[Piece.BLACK_KA] = 1
+    table[Piece.BLACK_UM] = 1
+    return table
+
+
+def make_ky_table(direction):
+    """
+    ピンを考慮してKYの動きを計算する
+    成りの計算のために駒の種類ごとに計算する
+
+    :param direction:
+    :return:
+    """
+    table = np.zeros(Piece.SIZE + 14 * PinDirection.SIZE, dtype=np.int32)
+    if direction != Direction.UP:
+        return table
+
+    table[Piece.EMPTY] = -1
+
+    table[Piece.BLACK_KY] = 1
+    offset = Piece.SIZE + 14 * PinDirection.UP
+    table[Piece.BLACK_KY + offset] = 1
+
+    return table
+
+
+def make_major_table(direction, piece, pin_directions=None):
+    if pin_directions is None:
+        pin_directions = get_pin_directions(piece=piece)
+    normalized_direction = PinDirection[direction.name]
+
+    table = make_empty_table()
+    table[piece] = 1
+    # ピンの方向に対応する移動方向ならフラグを立てる
+    offset = Piece.SIZE + piece - Piece.BLACK_FU
+    for pin_direction in pin_directions:
+        index = offset + 14 * pin_direction
+        table[index] = pin_direction == normalized_direction
+
+    return table
+
+
+def get_directions(piece):
+    if piece in (Piece.BLACK_KA, Piece.BLACK_UM):
+        return get_diagonal_directions()
+    elif piece in (Piece.BLACK_HI, Piece.BLACK_RY):
+        return get_cross_directions()
+    else:
+        raise ValueError(piece)
+
+
+def get_pin_directions(piece):
+    if piece in (Piece.BLACK_KA, Piece.BLACK_UM):
+        return PinDirection.DIAGONAL1, PinDirection.DIAGONAL2
+    elif piece in (Piece.BLACK_HI, Piece.BLACK_RY):
+        return PinDirection.VERTICAL, PinDirection.HORIZONTAL
+    else:
+        raise ValueError(piece)
@@ -1,13 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import numpy as np
-import tensorflow as tf
-
-from .axis import make_one_hot
 from ..direction import (Direction, PinDirection, get_cross_directions,
                          get_diagonal_directions)
-from ..piece import Piece
+from ..memo import lookup, store
+from ..selection import select_one_hot
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/17'
@@ -24,12 +21,8 @@ def select_white_ou(board, data_format):
     :param data_format:
     :return:
     """
-    table = np.zeros(Piece.SIZE, dtype=np.int32)
-    table[Piece.WHITE_OU] = 1
-    table[Piece.EMPTY] = -1
-
-    converted = tf.gather(table, board)
-    one_hot = make_one_hot(index_board=converted, data_format=data_format)
+    one_hot = select_one_hot(board=board, key='white_long_ou',
+                             data_format=data_format)
 
     return one_hot
 
@@ -54,31 +47,14 @@ def select_white_cross_pieces(board, data_format, direction, naive):
         name = fmt.format(PinDirection.HORIZONTAL.name)
     else:
         name = fmt.format(direction.name)
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
+    cached = lookup(name, board, data_format)
+    if cached is not None:
+        return cached
 
-    normalized_direction = PinDirection[direction.name]
+    one_hot = select_one_hot(board=board, key=('white_long', direction),
+                             data_format=data_format)
 
-    table = np.zeros(Piece.SIZE + 14 * PinDirection.SIZE, dtype=np.int32)
-    table[Piece.WHITE_HI] = 1
-    table[Piece.WHITE_RY] = 1
-    for pin_direction in (PinDirection.HORIZONTAL, PinDirection.VERTICAL):
-        offset = Piece.SIZE - Piece.WHITE_FU + 14 * pin_direction
-        value = pin_direction == normalized_direction
-        table[offset + Piece.WHITE_HI] = value
-        table[offset + Piece.WHITE_RY] = value
-    if direction == Direction.DOWN:
-        table[Piece.WHITE_KY] = 1
-        index = (Piece.SIZE + Piece.WHITE_KY - Piece.WHITE_FU +
-                 14 * PinDirection.VERTICAL)
-        table[index] = 1
-    table[Piece.EMPTY] = -1
-
-    converted = tf.gather(table, board)
-    one_hot = make_one_hot(index_board=converted, data_format=data_format)
-
-    tf.add_to_collection(name, one_hot)
+    store(one_hot, name, board, data_format)
 
     return one_hot
 
@@ -101,24 +77,14 @@ def select_white_diagonal_pieces(board, data_format, direction, naive):
 
     normalized_direction = PinDirection[direction.name]
     name = fmt.format(normalized_direction.name)
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
-
-    table = np.zeros(Piece.SIZE + 14 * PinDirection.SIZE, dtype=np.int32)
-    table[Piece.WHITE_KA] = 1
-    table[Piece.WHITE_UM] = 1
-    for pin_direction in (PinDirection.DIAGONAL1, PinDirection.DIAGONAL2):
-        offset = Piece.SIZE - Piece.WHITE_FU + 14 * pin_direction
-        value = pin_direction == normalized_direction
-        table[offset + Piece.WHITE_KA] = value
-        table[offset + Piece.WHITE_UM] = value
-    table[Piece.EMPTY] = -1
-
-    converted = tf.gather(table, board)
-    one_hot = make_one_hot(index_board=converted, data_format=data_format)
-
-    tf.add_to_collection(name, one_hot)
+    cached = lookup(name, board, data_format)
+    if cached is not None:
+        return cached
+
+    one_hot = select_one_hot(board=board, key=('white_long', direction),
+                             data_format=data_format)
+
+    store(one_hot, name, board, data_format)
 
     return one_hot
 
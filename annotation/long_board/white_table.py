@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+非手番側の利きの長い駒を選び出すための表
+
+値は1が利きを伸ばす駒、0がその他の駒、-1が空きマス
+selectionでone hotに変換する
+"""
+
+import numpy as np
+
+from ..direction import Direction, PinDirection
+from ..piece import Piece
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def make_empty_table():
+    table = np.zeros(Piece.SIZE + 14 * PinDirection.SIZE, dtype=np.int32)
+    table[Piece.EMPTY] = -1
+    return table
+
+
+def make_ou_table():
+    table = make_empty_table()
+    table[Piece.WHITE_OU] = 1
+    return table
+
+
+def make_cross_table(direction):
+    normalized_direction = PinDirection[direction.name]
+
+    table = make_empty_table()
+    table[Piece.WHITE_HI] = 1
+    table[Piece.WHITE_RY] = 1
+    for pin_direction in (PinDirection.HORIZONTAL, PinDirection.VERTICAL):
+        offset = Piece.SIZE - Piece.WHITE_FU + 14 * pin_direction
+        value = pin_direction == normalized_direction
+        table[offset + Piece.WHITE_HI] = value
+        table[offset + Piece.WHITE_RY] = value
+    if direction == Direction.DOWN:
+        table[Piece.WHITE_KY] = 1
+        index = (Piece.SIZE + Piece.WHITE_KY - Piece.WHITE_FU +
+                 14 * PinDirection.VERTICAL)
+        table[index] = 1
+    return table
+
+
+def make_diagonal_table(direction):
+    normalized_direction = PinDirection[direction.name]
+
+    table = make_empty_table()
+    table[Piece.WHITE_KA] = 1
+    table[Piece.WHITE_UM] = 1
+    for pin_direction in (PinDirection.DIAGONAL1, PinDirection.DIAGONAL2):
+        offset = Piece.SIZE - Piece.WHITE_FU + 14 * pin_direction
+        value = pin_direction == normalized_direction
+        table[offset + Piece.WHITE_KA] = value
+        table[offset + Piece.WHITE_UM] = value
+    return table
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+グラフの中で一度だけ作ればいいテンソルを保存する
+
+キーは名前と入力のテンソル、data_formatや計算方法などの設定の組
+テンソルは同一性で区別するので、同じグラフに別の入力で複数のAnnotationLayerを作っても
+他の入力の結果が返ることはない
+フィルタやマスクなどの定数は入力を持たないので、名前だけをキーにしてグラフの中で共有する
+numpyの配列などハッシュできない入力の場合は保存せずに毎回計算する
+
+保存先はグラフの属性なので、グラフが破棄されると一緒に破棄される
+保存したテンソルはグラフを参照しているので、グラフの外に保存すると破棄されない
+"""
+
+import tensorflow as tf
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+MEMO_ATTRIBUTE = '_annotation_memo'
+
+
+def get_graph_memo(graph=None):
+    """
+    グラフごとの保存先
+
+    :param graph: 省略した場合はデフォルトのグラフ
+    :return:
+    """
+    if graph is None:
+        graph = tf.get_default_graph()
+    memo = getattr(graph, MEMO_ATTRIBUTE, None)
+    if memo is None:
+        memo = {}
+        setattr(graph, MEMO_ATTRIBUTE, memo)
+    return memo
+
+
+def make_key(name, key):
+    """
+    テンソルは同一性で区別する
+    テンソルはグラフが持っているので、グラフが破棄されるまでidは変わらない
+    ハッシュできない値を含む場合はNone
+
+    :param name:
+    :param key:
+    :return:
+    """
+    key = (name,) + tuple(
+        ('tensor', id(k)) if isinstance(k, tf.Tensor) else k for k in key
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def lookup(name, *key):
+    """
+    保存されている値を返す
+    保存されていない場合はNone
+
+    :param name:
+    :param key: 入力のテンソルや設定
+    :return:
+    """
+    key = make_key(name=name, key=key)
+    if key is None:
+        return None
+    return get_graph_memo().get(key)
+
+
+def store(value, name, *key):
+    """
+    値を保存して、そのまま返す
+
+    :param value:
+    :param name:
+    :param key: 入力のテンソルや設定
+    :return:
+    """
+    key = make_key(name=name, key=key)
+    if key is not None:
+        get_graph_memo()[key] = value
+    return value
@@ -1,8 +1,21 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from .effect import ShortEffectLayer, LongEffectLayer, LongEffectAllRangeLayer
-from .combine import CombineLayer
+from .effect import (ShortEffectLayer, LongEffectLayer,
+                     LongEffectDistanceLayer, LongEffectAllRangeLayer,
+                     LONG_ENGINES, SHORT_ENGINES, check_long_engine,
+                     check_short_engine, compute_long_effects,
+                     compute_long_all_range_effects, compute_short_effects,
+                     compute_packed_long_effects,
+                     compute_packed_long_all_range_effects,
+                     compute_packed_short_effects)
+from .bank import LongEffectBankLayer, ShortEffectBankLayer
+from .combine import (CombineLayer, combine_any, combine_all,
+                      combine_count)
+from .packed import (SHORT_DIRECTIONS, pack_effects, unpack_effects,
+                     unpack_long_effects, expand_directions,
+                     add_short_effects, reverse_directions,
+                     as_packed_effects, as_packed_flags)
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/15'
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+複数の方向、距離の畳み込みフィルタを一つにまとめて、少ない回数の畳み込みで利きを求める
+
+フィルタは移動先のマスを中心に置き、padding='SAME'で畳み込む
+長い利きは方向の軸ごとにフィルタの大きさを揃える
+    縦方向 [1, 17], 横方向 [17, 1], 斜め方向 [17, 17]
+短い利きは桂馬の動きも含めて[5, 5]に揃える
+
+入力は方向ごとにチャネル方向に連結する
+出力のチャネルは方向ごと(長い利きはさらに距離ごと)に並ぶ
+packed=Trueの場合はチャネルを分けずに、packed.pyの形で返す
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import sonnet as snt
+import tensorflow as tf
+
+from ..direction import Direction, get_step
+from ..memo import lookup, store
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def get_footprint(direction):
+    """
+    長い利きのフィルタの大きさ
+
+    :param direction:
+    :return:
+    """
+    if direction in (Direction.UP, Direction.DOWN):
+        return 1, 17
+    elif direction in (Direction.RIGHT, Direction.LEFT):
+        return 17, 1
+    elif direction in (Direction.RIGHT_UP, Direction.RIGHT_DOWN,
+                       Direction.LEFT_UP, Direction.LEFT_DOWN):
+        return 17, 17
+    else:
+        raise ValueError(direction)
+
+
+def make_long_kernel_bank(directions):
+    """
+    長い利きのフィルタをまとめる
+    サイズは[filter_height, filter_width, 2 * 方向の数, 8 * 方向の数]
+    全ての方向のフィルタの大きさは同じでないといけない
+
+    :param directions:
+    :return:
+    """
+    name = 'long_kernel_bank_{}'.format(
+        '_'.join(direction.name for direction in directions)
+    )
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    height, width = get_footprint(direction=directions[0])
+    center_h, center_w = height // 2, width // 2
+
+    n = len(directions)
+    kernel = np.zeros((height, width, 2 * n, 8 * n), dtype=np.float32)
+    for i, direction in enumerate(directions):
+        if get_footprint(direction=direction) != (height, width):
+            raise ValueError(direction)
+
+        dh, dw = get_step(direction=direction)
+        for distance in range(1, 9):
+            output = 8 * i + distance - 1
+            # source
+            # 移動先から逆方向へ戻った位置にある
+            kernel[center_h - dh * distance, center_w - dw * distance,
+                   2 * i + 1, output] = 1
+            # midway
+            for k in range(1, distance):
+                kernel[center_h - dh * k, center_w - dw * k,
+                       2 * i:2 * i + 2, output] = -1
+
+    kernel = tf.constant(kernel, dtype=tf.float32, name=name)
+
+    store(kernel, name)
+
+    return kernel
+
+
+def make_short_kernel_bank(directions):
+    """
+    短い利きのフィルタをまとめる
+    サイズは[5, 5, 方向の数, 方向の数]
+
+    :param directions:
+    :return:
+    """
+    name = 'short_kernel_bank_{}'.format(
+        '_'.join(direction.name for direction in directions)
+    )
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    n = len(directions)
+    kernel = np.zeros((5, 5, n, n), dtype=np.float32)
+    for i, direction in enumerate(directions):
+        dh, dw = get_step(direction=direction)
+        # source
+        kernel[2 - dh, 2 - dw, i, i] = 1
+
+    kernel = tf.constant(kernel, dtype=tf.float32, name=name)
+
+    store(kernel, name)
+
+    return kernel
+
+
+def to_channel_first(flag, data_format):
+    """
+    畳み込みの出力のチャネルを2番目の次元にする
+
+    :param flag:
+    :param data_format:
+    :return: [batch, channel, 9, 9]
+    """
+    if data_format == 'NCHW':
+        return flag
+    return tf.transpose(flag, [0, 3, 1, 2])
+
+
+class LongEffectBankLayer(snt.AbstractModule):
+    def __init__(self, data_format, use_cudnn=True, packed=False,
+                 name='long_effect_bank'):
+        """
+
+        :param data_format:
+        :param use_cudnn:
+        :param packed: Trueの場合は[batch, 方向, 距離, 9, 9]のテンソルを返す
+            方向の並びは入力のdictの順
+        :param name:
+        """
+        super().__init__(name=name)
+        self.data_format = data_format
+        self.use_cudnn = use_cudnn
+        self.packed = packed
+
+    def _build(self, inputs):
+        """
+        方向ごとの入力のdictを受け取り、方向ごとに距離別の利きのlistを返す
+        フィルタの大きさが同じ方向をまとめて畳み込むので、畳み込みは最大3回
+
+        :param inputs: 方向をキーとするdict
+            値はlong_boardで選び出したone hot
+        :return:
+        """
+        axis = 1 if self.data_format == 'NCHW' else -1
+
+        groups = OrderedDict()
+        for direction in inputs.keys():
+            footprint = get_footprint(direction=direction)
+            groups.setdefault(footprint, []).append(direction)
+
+        outputs = {}
+        packed_list = []
+        for directions in groups.values():
+            kernel = make_long_kernel_bank(directions=directions)
+            stacked = tf.concat([inputs[d] for d in directions], axis=axis)
+            raw_value = tf.nn.conv2d(
+                input=stacked, filter=kernel, strides=[1, 1, 1, 1],
+                padding='SAME', use_cudnn_on_gpu=self.use_cudnn,
+                data_format=self.data_format
+            )
+            # 1以上なら利きがある、0以下なら利きがない
+            flag = raw_value > 0.5
+
+            if self.packed:
+                flag = to_channel_first(flag=flag,
+                                        data_format=self.data_format)
+                packed_list.append(
+                    tf.reshape(flag, [-1, len(directions), 8, 9, 9])
+                )
+                continue
+
+            # 方向ごと、距離ごとに分ける
+            flag_list = tf.split(flag, 8 * len(directions), axis=axis)
+            for i, direction in enumerate(directions):
+                outputs[direction] = flag_list[8 * i:8 * (i + 1)]
+
+        if self.packed:
+            packed = tf.concat(packed_list, axis=1)
+            # フィルタの大きさごとの並びを入力の順に戻す
+            grouped = [d for directions in groups.values() for d in directions]
+            order = [grouped.index(d) for d in inputs.keys()]
+            if order != list(range(len(order))):
+                packed = tf.gather(packed, order, axis=1)
+            return packed
+
+        return outputs
+
+
+class ShortEffectBankLayer(snt.AbstractModule):
+    def __init__(self, data_format, use_cudnn=True, packed=False,
+                 name='short_effect_bank'):
+        """
+
+        :param data_format:
+        :param use_cudnn:
+        :param packed: Trueの場合は[batch, 方向, 9, 9]のテンソルを返す
+            方向の並びは入力のdictの順
+        :param name:
+        """
+        super().__init__(name=name)
+        self.data_format = data_format
+        self.use_cudnn = use_cudnn
+        self.packed = packed
+
+    def _build(self, inputs):
+        """
+        方向ごとの入力のdictを受け取り、方向ごとの利きを返す
+        畳み込みは1回
+
+        :param inputs: 方向をキーとするdict
+            値はshort_boardで選び出した駒
+        :return:
+        """
+        axis = 1 if self.data_format == 'NCHW' else -1
+
+        directions = list(inputs.keys())
+        kernel = make_short_kernel_bank(directions=directions)
+        stacked = tf.concat([inputs[d] for d in directions], axis=axis)
+        raw_value = tf.nn.conv2d(
+            input=stacked, filter=kernel, strides=[1, 1, 1, 1],
+            padding='SAME', use_cudnn_on_gpu=self.use_cudnn,
+            data_format=self.data_format
+        )
+        # 演算誤差はないと思うので、そのままbool型に変換する
+        flag = tf.cast(raw_value, tf.bool)
+
+        if self.packed:
+            return to_channel_first(flag=flag, data_format=self.data_format)
+
+        flag_list = tf.split(flag, len(directions), axis=axis)
+        outputs = dict(zip(directions, flag_list))
+
+        return outputs
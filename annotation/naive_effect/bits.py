@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+盤面を筋ごとに9ビットのuint16の整数(ワード)に詰めて、ビット演算で利きを求める
+
+[..., 9]のuint16で、最後の軸のi番目の要素は筋iの段の並びをビットで表す
+段jのマスはj番目のビット
+bool型の盤面[..., 9, 9]の81バイトに対して18バイト、float32の1/18の量になる
+
+段の方向へずらすのはビットシフト、筋の方向へずらすのは要素をずらす
+筋の方向はshift.pad_upstreamと同じように、移動元の側を1回だけパディングして、
+ずらすたびに移動先の側の要素を捨てる
+
+和や積は使わずにビット演算だけで計算する
+複数の盤面をまとめる場合もreduce_or_wordsとreduce_and_wordsでビット演算にする
+"""
+
+from functools import reduce
+
+import numpy as np
+import tensorflow as tf
+
+from .shift import UPSTREAM_SIZE, slice_axes
+from ..direction import get_step
+from ..memo import lookup, store
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+BIT_DTYPE = tf.uint16
+# 盤の範囲のビット
+FULL_BITS = (1 << 9) - 1
+
+
+def _make_constant(name, array):
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    constant = tf.constant(array, dtype=BIT_DTYPE, name=name)
+
+    store(constant, name)
+
+    return constant
+
+
+def make_rank_index():
+    """
+    段の番号 [9]
+    ワードに詰める時のシフトの量
+
+    :return:
+    """
+    return _make_constant(name='bit_rank_index', array=np.arange(9))
+
+
+def make_bit_weight():
+    """
+    段ごとのビット [9]
+    ワードから盤面に戻す時のマスク
+
+    :return:
+    """
+    return _make_constant(name='bit_weight', array=1 << np.arange(9))
+
+
+def make_full_bits():
+    return _make_constant(name='bit_full', array=FULL_BITS)
+
+
+def reduce_or_words(words, axis):
+    """
+    axisの方向に並んだワードの論理和
+
+    :param words:
+    :param axis:
+    :return:
+    """
+    return reduce(tf.bitwise.bitwise_or, tf.unstack(words, axis=axis))
+
+
+def reduce_and_words(words, axis):
+    """
+    axisの方向に並んだワードの論理積
+
+    :param words:
+    :param axis:
+    :return:
+    """
+    return reduce(tf.bitwise.bitwise_and, tf.unstack(words, axis=axis))
+
+
+def pack_words(flag):
+    """
+    bool型の[..., 9, 9]の盤面を[..., 9]のワードに詰める
+    最後の2軸は(筋, 段)
+
+    :param flag:
+    :return:
+    """
+    bits = tf.bitwise.left_shift(tf.cast(flag, BIT_DTYPE), make_rank_index())
+    return reduce_or_words(bits, axis=-1)
+
+
+def unpack_words(words):
+    """
+    [..., 9]のワードをbool型の[..., 9, 9]の盤面に戻す
+
+    :param words:
+    :return:
+    """
+    return tf.not_equal(
+        tf.bitwise.bitwise_and(tf.expand_dims(words, axis=-1),
+                               make_bit_weight()),
+        0
+    )
+
+
+def pad_words_upstream(words, direction):
+    """
+    directionの方向へ合計UPSTREAM_SIZEマスずらせるように、
+    筋の方向の移動元の側だけを0で埋める
+    段の方向はビットシフトなので、パディングしない
+
+    :param words:
+    :param direction:
+    :return:
+    """
+    dh, _ = get_step(direction=direction)
+    if dh == 0:
+        return words
+    paddings = [[0, 0]] * (words.get_shape().ndims - 1)
+    paddings.append([max(dh, 0) * UPSTREAM_SIZE, max(-dh, 0) * UPSTREAM_SIZE])
+    return tf.pad(words, paddings)
+
+
+def _slice_files(words, front, back):
+    axis = words.get_shape().ndims - 1
+    return slice_axes(flag=words, ranges={axis: (front, back)})
+
+
+def make_shift_size(size):
+    return _make_constant(name='bit_shift_{}'.format(size), array=size)
+
+
+def _shift_ranks(words, dw):
+    if dw > 0:
+        # 盤の外へはみ出したビットを捨てる
+        return tf.bitwise.bitwise_and(
+            tf.bitwise.left_shift(words, make_shift_size(size=dw)),
+            make_full_bits()
+        )
+    elif dw < 0:
+        return tf.bitwise.right_shift(words, make_shift_size(size=-dw))
+    return words
+
+
+def shift_words(words, direction, step_size=1):
+    """
+    ワードをdirectionの方向へstep_sizeマスだけずらす
+    筋の方向は移動先の側の要素を捨てるだけなので、
+    pad_words_upstreamでパディングしたワードを入力する
+
+    :param words:
+    :param direction:
+    :param step_size:
+    :return:
+    """
+    dh, dw = get_step(direction=direction)
+    dh, dw = dh * step_size, dw * step_size
+
+    # 筋方向は要素を捨てる
+    if dh != 0:
+        words = _slice_files(words=words, front=max(-dh, 0),
+                             back=max(dh, 0))
+    # 段方向はビットシフト
+    return _shift_ranks(words=words, dw=dw)
+
+
+def align_words(words, direction, step_size=1):
+    """
+    shift_wordsでずらしたワードと同じ範囲になるように、
+    ずらしていないワードの移動元の側の要素を捨てる
+
+    :param words:
+    :param direction:
+    :param step_size:
+    :return:
+    """
+    dh, _ = get_step(direction=direction)
+    if dh == 0:
+        return words
+    dh *= step_size
+    return _slice_files(words=words, front=max(dh, 0), back=max(-dh, 0))
+
+
+def crop_words(words, direction):
+    """
+    pad_words_upstreamでパディングしたワードから盤の範囲の9筋を切り出す
+
+    :param words:
+    :param direction:
+    :return:
+    """
+    dh, _ = get_step(direction=direction)
+    extra = words.get_shape().as_list()[-1] - 9
+    if extra == 0:
+        return words
+    if dh > 0:
+        return _slice_files(words=words, front=extra, back=0)
+    return _slice_files(words=words, front=0, back=extra)
+
+
+def pad_board_words(words):
+    """
+    筋の方向の両側に盤の外の1筋を0で加える
+    同じワードを複数の方向へ1マスずらす場合に、パディングを1回で済ませるために使う
+
+    :param words:
+    :return:
+    """
+    paddings = [[0, 0]] * (words.get_shape().ndims - 1)
+    paddings.append([1, 1])
+    return tf.pad(words, paddings)
+
+
+def shift_padded_words(padded, direction):
+    """
+    pad_board_wordsでパディングしたワードから、
+    directionの方向へ1マスずらした盤の範囲のワードを切り出す
+    短い利きは駒のマスを利きの方向へずらしたもの
+
+    :param padded:
+    :param direction:
+    :return:
+    """
+    dh, dw = get_step(direction=direction)
+    words = _slice_files(words=padded, front=1 - dh, back=1 + dh)
+    return _shift_ranks(words=words, dw=dw)
+
+
+def fill_words(source, empty, direction):
+    """
+    Kogge-Stoneの方法で距離をまとめた長い利きを求める
+    1, 2, 4マスとずらす量を倍にしていくので、3回で盤の端まで届く
+    sourceとemptyの形は放送できればよい
+
+    :param source: 利きを伸ばす駒のワード
+    :param empty: 空きマスのワード
+    :param direction:
+    :return:
+    """
+    generator = pad_words_upstream(words=source, direction=direction)
+    propagator = pad_words_upstream(words=empty, direction=direction)
+    for step_size in (1, 2, 4):
+        options = dict(direction=direction, step_size=step_size)
+        shifted = shift_words(words=generator, **options)
+        generator = align_words(words=generator, **options)
+        aligned = align_words(words=propagator, **options)
+        generator = tf.bitwise.bitwise_or(
+            generator, tf.bitwise.bitwise_and(aligned, shifted)
+        )
+        if step_size < 4:
+            propagator = tf.bitwise.bitwise_and(
+                aligned, shift_words(words=propagator, **options)
+            )
+    # generatorは駒の位置と駒から空きマスで繋がっているマス
+    # 1マス進めると利きのあるマスになる
+    return crop_words(
+        words=shift_words(words=generator, direction=direction),
+        direction=direction
+    )
+
+
+def step_words(source, empty, direction):
+    """
+    1マスずつ利きを伸ばして距離ごとの長い利きを求める
+    出力は[..., 8, 9]で、距離の軸を筋の軸の前に加える
+
+    :param source: 利きを伸ばす駒のワード
+    :param empty: 空きマスのワード
+    :param direction:
+    :return:
+    """
+    empty = pad_words_upstream(words=empty, direction=direction)
+    words = shift_words(
+        words=pad_words_upstream(words=source, direction=direction),
+        direction=direction
+    )
+    outputs = [crop_words(words=words, direction=direction)]
+    for _ in range(7):
+        empty = align_words(words=empty, direction=direction)
+        words = shift_words(words=tf.bitwise.bitwise_and(words, empty),
+                            direction=direction)
+        outputs.append(crop_words(words=words, direction=direction))
+    return tf.stack(outputs, axis=-2)
@@ -4,33 +4,80 @@
 import tensorflow as tf
 import sonnet as snt
 
-from .kernel import make_short_kernel, make_long_kernel
-from .pad import pad
+from .kernel import make_centered_short_kernel, make_centered_long_kernel
 from .combine import CombineLayer
+from .shift import (pad_board, shift_padded, pad_upstream, shift_upstream,
+                    align_upstream, crop_upstream)
+from .ray_table import (make_ray_table, make_ray_source_index,
+                        make_occupancy_weight, make_ray_offset)
+from .bank import LongEffectBankLayer, ShortEffectBankLayer
+from .bits import fill_words, pack_words, step_words, unpack_words
+from .packed import pack_planes, to_packed_plane
+from ..memo import lookup, store
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/03'
 
 
+# 長い利きの計算方法
+# conv: 距離ごとの畳み込み
+# fill: 盤面をずらしながら空きマスで利きを伸ばす
+# table: 直線上の駒の配置ごとに計算した利きを表引きする
+# bank: 方向、距離ごとのフィルタをまとめて1回の畳み込みで計算する
+# bits: 筋ごとにビットに詰めたワードをビット演算で伸ばす
+LONG_ENGINES = ('conv', 'fill', 'table', 'bank', 'bits')
+# 短い利きの計算方法
+# conv: 方向ごとの畳み込み
+# bank: 方向ごとのフィルタをまとめて1回の畳み込みで計算する
+# shift: 盤面をずらすだけで、畳み込みもfloat型の計算も使わない
+SHORT_ENGINES = ('conv', 'bank', 'shift')
+
+
+def check_long_engine(long_engine):
+    if long_engine not in LONG_ENGINES:
+        raise ValueError(long_engine)
+
+
+def check_short_engine(short_engine):
+    if short_engine not in SHORT_ENGINES:
+        raise ValueError(short_engine)
+
+
 class ShortEffectLayer(snt.AbstractModule):
     def __init__(self, direction, data_format, use_cudnn=True,
-                 name='short_effect'):
+                 short_engine='conv', name='short_effect'):
         super().__init__(name=name)
         self.direction = direction
         self.data_format = data_format
         self.use_cudnn = use_cudnn
 
+        check_short_engine(short_engine=short_engine)
+        self.short_engine = short_engine
+
     def _build(self, board):
-        kernel = make_short_kernel(direction=self.direction)
+        if self.short_engine == 'shift':
+            # 1マスの利きは盤面をずらしたものと同じ
+            # 同じ入力を複数の方向でずらすので、パディングは入力ごとに1回にする
+            outputs = shift_padded(
+                padded=pad_short_flag(board=board,
+                                      data_format=self.data_format),
+                direction=self.direction, data_format=self.data_format
+            )
+            return outputs
+        elif self.short_engine == 'bank':
+            outputs = ShortEffectBankLayer(
+                data_format=self.data_format, use_cudnn=self.use_cudnn
+            )({self.direction: board})
+            return outputs[self.direction]
+
+        # 移動先を中心にしたフィルタなので、9x9の出力がそのまま得られる
+        kernel = make_centered_short_kernel(direction=self.direction)
         raw_value = tf.nn.conv2d(
-            input=board, filter=kernel, strides=[1, 1, 1, 1], padding='VALID',
+            input=board, filter=kernel, strides=[1, 1, 1, 1], padding='SAME',
             use_cudnn_on_gpu=self.use_cudnn, data_format=self.data_format
         )
-        outputs = pad(
-            # 演算誤差はないと思うので、そのままbool型に変換する
-            flag=tf.cast(raw_value, tf.bool), direction=self.direction,
-            data_format=self.data_format, kernel_size=2
-        )
+        # 演算誤差はないと思うので、そのままbool型に変換する
+        outputs = tf.cast(raw_value, tf.bool)
 
         return outputs
 
@@ -45,32 +92,80 @@ class LongEffectLayer(snt.AbstractModule):
         self.use_cudnn = use_cudnn
 
     def _build(self, inputs):
-        kernel = make_long_kernel(direction=self.direction,
-                                  size=self.kernel_size)
+        # 移動先を中心にしたフィルタなので、9x9の出力がそのまま得られる
+        kernel = make_centered_long_kernel(direction=self.direction,
+                                           size=self.kernel_size)
         raw_value = tf.nn.conv2d(
-            input=inputs, filter=kernel, strides=[1, 1, 1, 1], padding='VALID',
+            input=inputs, filter=kernel, strides=[1, 1, 1, 1], padding='SAME',
             use_cudnn_on_gpu=self.use_cudnn, data_format=self.data_format
         )
         # 1以上なら利きがある、0以下なら利きがない
-        flag = raw_value > 0.5
-
-        outputs = pad(
-            flag=flag, direction=self.direction,
-            data_format=self.data_format, kernel_size=self.kernel_size
-        )
+        outputs = raw_value > 0.5
 
         return outputs
 
 
-class LongEffectAllRangeLayer(snt.AbstractModule):
+class LongEffectDistanceLayer(snt.AbstractModule):
     def __init__(self, direction, data_format, use_cudnn=True,
-                 name='long_effect_all_range'):
+                 long_engine='conv', name='long_effect_distance'):
         super().__init__(name=name)
         self.direction = direction
         self.data_format = data_format
         self.use_cudnn = use_cudnn
 
+        check_long_engine(long_engine=long_engine)
+        self.long_engine = long_engine
+
     def _build(self, inputs):
+        """
+        移動距離ごとの利きを求める
+        出力は長さ8のlistで、i番目は距離i+1の利き
+
+        :param inputs:
+        :return:
+        """
+        if self.long_engine == 'fill':
+            # 移動元の側を1回だけパディングして、ずらすたびに端を捨てる
+            source, empty = split_long_input(
+                inputs=pad_upstream(flag=inputs, direction=self.direction,
+                                    data_format=self.data_format),
+                data_format=self.data_format
+            )
+            options = dict(direction=self.direction,
+                           data_format=self.data_format)
+            # 1マスずつ利きを伸ばす
+            # 途中のマスが空いている場合だけ次のマスへ進める
+            flag = shift_upstream(flag=source, **options)
+            outputs = [crop_upstream(flag=flag, **options)]
+            for _ in range(7):
+                empty = align_upstream(flag=empty, **options)
+                flag = shift_upstream(flag=tf.logical_and(flag, empty),
+                                      **options)
+                outputs.append(crop_upstream(flag=flag, **options))
+            return outputs
+        elif self.long_engine == 'table':
+            outputs = lookup_ray_table(inputs=inputs, direction=self.direction,
+                                       data_format=self.data_format)
+            outputs = [restore_board_shape(flag=flag,
+                                           data_format=self.data_format)
+                       for flag in outputs]
+            return outputs
+        elif self.long_engine == 'bank':
+            outputs = LongEffectBankLayer(
+                data_format=self.data_format, use_cudnn=self.use_cudnn
+            )({self.direction: inputs})
+            return outputs[self.direction]
+        elif self.long_engine == 'bits':
+            # 距離ごとのワードをまとめて1回で盤面に戻す
+            source, empty = split_long_words(inputs=inputs,
+                                             data_format=self.data_format)
+            flag = unpack_words(step_words(source=source, empty=empty,
+                                           direction=self.direction))
+            outputs = [restore_board_shape(flag=flag[:, :, i],
+                                           data_format=self.data_format)
+                       for i in range(8)]
+            return outputs
+
         outputs = [
             LongEffectLayer(
                 direction=self.direction, kernel_size=size,
@@ -79,6 +174,413 @@ class LongEffectAllRangeLayer(snt.AbstractModule):
             )(inputs)
             for size in range(2, 10)
         ]
+        return outputs
+
+
+class LongEffectAllRangeLayer(snt.AbstractModule):
+    def __init__(self, direction, data_format, use_cudnn=True,
+                 long_engine='conv', name='long_effect_all_range'):
+        super().__init__(name=name)
+        self.direction = direction
+        self.data_format = data_format
+        self.use_cudnn = use_cudnn
+
+        check_long_engine(long_engine=long_engine)
+        self.long_engine = long_engine
+
+    def _build(self, inputs):
+        if self.long_engine == 'fill':
+            return self._build_fill(inputs=inputs)
+        elif self.long_engine == 'table':
+            return self._build_table(inputs=inputs)
+        elif self.long_engine == 'bits':
+            source, empty = split_long_words(inputs=inputs,
+                                             data_format=self.data_format)
+            words = fill_words(source=source, empty=empty,
+                               direction=self.direction)
+            return restore_board_shape(flag=unpack_words(words),
+                                       data_format=self.data_format)
+
+        outputs = LongEffectDistanceLayer(
+            direction=self.direction, data_format=self.data_format,
+            use_cudnn=self.use_cudnn, long_engine=self.long_engine
+        )(inputs)
 
         outputs = CombineLayer()(outputs)
         return outputs
+
+    def _build_fill(self, inputs):
+        """
+        Kogge-Stoneの方法で利きを伸ばす
+        1, 2, 4マスとずらす量を倍にしていくので、3回で盤の端まで届く
+
+        :param inputs:
+        :return:
+        """
+        options = dict(direction=self.direction, data_format=self.data_format)
+        # ずらす量の合計は8マスなので、移動元の側を1回だけパディングすればよい
+        generator, propagator = split_long_input(
+            inputs=pad_upstream(flag=inputs, **options),
+            data_format=self.data_format
+        )
+        for step_size in (1, 2, 4):
+            shifted = shift_upstream(flag=generator, step_size=step_size,
+                                     **options)
+            generator = align_upstream(flag=generator, step_size=step_size,
+                                       **options)
+            aligned = align_upstream(flag=propagator, step_size=step_size,
+                                     **options)
+            generator = tf.logical_or(generator,
+                                      tf.logical_and(aligned, shifted))
+            if step_size < 4:
+                propagator = tf.logical_and(aligned, shift_upstream(
+                    flag=propagator, step_size=step_size, **options
+                ))
+        # generatorは駒の位置と駒から空きマスで繋がっているマス
+        # 1マス進めると利きのあるマスになる
+        outputs = crop_upstream(
+            flag=shift_upstream(flag=generator, **options), **options
+        )
+        return outputs
+
+    def _build_table(self, inputs):
+        flag = tf.reduce_any(tf.stack(lookup_ray_table(
+            inputs=inputs, direction=self.direction,
+            data_format=self.data_format
+        ), axis=1), axis=1)
+        outputs = restore_board_shape(flag=flag, data_format=self.data_format)
+        return outputs
+
+
+def split_long_input(inputs, data_format):
+    """
+    長い利きの入力のone hotを利きを伸ばす駒のマスと空いているマスに分ける
+    channel1が利きを伸ばす駒、channel0がその他の駒で、空きマスはどちらも0
+
+    :param inputs:
+    :param data_format:
+    :return:
+    """
+    axis = 1 if data_format == 'NCHW' else -1
+    flag = inputs > 0.5
+    other, source = tf.split(flag, 2, axis=axis)
+    empty = tf.logical_not(tf.logical_or(source, other))
+    return source, empty
+
+
+def split_long_words(inputs, data_format):
+    """
+    長い利きの入力のone hotを利きを伸ばす駒と空きマスの[batch, 1, 9]のワードに分ける
+
+    :param inputs:
+    :param data_format:
+    :return:
+    """
+    source, empty = split_long_input(inputs=inputs, data_format=data_format)
+    return (pack_words(to_packed_plane(source)),
+            pack_words(to_packed_plane(empty)))
+
+
+def to_short_flag(board):
+    """
+    短い利きの入力をbool型にする
+    bool型の場合はそのまま、uint8型などの場合は0以外をTrueとする
+    選び出した駒は0か1なので、float型でも比較で誤差はない
+
+    :param board:
+    :return:
+    """
+    if board.dtype == tf.bool:
+        return board
+    return tf.not_equal(board, tf.zeros([], dtype=board.dtype))
+
+
+def pad_short_flag(board, data_format):
+    """
+    短い利きの入力をbool型にして、pad_boardでパディングする
+    グラフの中で入力ごとに1回だけ作る
+
+    :param board:
+    :param data_format:
+    :return:
+    """
+    name = 'short_padded_flag'
+    cached = lookup(name, board, data_format)
+    if cached is not None:
+        return cached
+
+    padded = pad_board(flag=to_short_flag(board=board),
+                       data_format=data_format)
+
+    store(padded, name, board, data_format)
+
+    return padded
+
+
+def lookup_ray_table(inputs, direction, data_format):
+    """
+    全てのマスについて移動元とした時の利きが届く距離を表から取り出し、
+    距離ごとに移動先のマスへ移す
+    駒の配置の番号は駒の有無と重みの行列積で求める
+
+    出力は長さ8のlistで、i番目は距離i+1の利き[batch, 81]
+
+    :param inputs:
+    :param direction:
+    :param data_format:
+    :return:
+    """
+    source, empty = split_long_input(inputs=inputs, data_format=data_format)
+    source = tf.reshape(source, [-1, 81])
+    occupied = tf.to_float(tf.logical_not(tf.reshape(empty, [-1, 81])))
+
+    # 値は127以下の整数なので、誤差はない
+    occupancy = tf.matmul(occupied,
+                          make_occupancy_weight(direction=direction))
+    index = tf.to_int32(occupancy) + make_ray_offset()
+
+    reach = tf.gather(make_ray_table(direction=direction), index)
+
+    # 盤の外の移動元として81番目にFalseを加える
+    padding = tf.zeros_like(source[:, :1])
+    source_index = make_ray_source_index(direction=direction)
+    outputs = []
+    for i in range(8):
+        flag = tf.logical_and(source, tf.greater(reach, i))
+        flag = tf.concat([flag, padding], axis=1)
+        outputs.append(tf.gather(flag, source_index[i], axis=1))
+    return outputs
+
+
+def restore_board_shape(flag, data_format):
+    """
+    [batch, 81]を盤面の形に戻す
+
+    :param flag:
+    :param data_format:
+    :return:
+    """
+    if data_format == 'NCHW':
+        shape = [-1, 1, 9, 9]
+    else:
+        shape = [-1, 9, 9, 1]
+    return tf.reshape(flag, shape)
+
+
+def compute_long_effects(inputs, data_format, use_cudnn=True,
+                         long_engine='conv'):
+    """
+    方向ごとの入力のdictから方向ごとに距離別の利きのlistを求める
+    long_engineが'bank'の場合は全ての方向をまとめて畳み込む
+
+    :param inputs: 方向をキーとするdict
+    :param data_format:
+    :param use_cudnn:
+    :param long_engine:
+    :return:
+    """
+    check_long_engine(long_engine=long_engine)
+    if long_engine == 'bank':
+        return LongEffectBankLayer(
+            data_format=data_format, use_cudnn=use_cudnn
+        )(inputs)
+
+    outputs = {
+        direction: LongEffectDistanceLayer(
+            direction=direction, data_format=data_format,
+            use_cudnn=use_cudnn, long_engine=long_engine
+        )(value) for direction, value in inputs.items()
+    }
+    return outputs
+
+
+def compute_long_all_range_effects(inputs, data_format, use_cudnn=True,
+                                   long_engine='conv'):
+    """
+    方向ごとの入力のdictから方向ごとに距離をまとめた利きを求める
+
+    :param inputs: 方向をキーとするdict
+    :param data_format:
+    :param use_cudnn:
+    :param long_engine:
+    :return:
+    """
+    check_long_engine(long_engine=long_engine)
+    if long_engine == 'bank':
+        effects = LongEffectBankLayer(
+            data_format=data_format, use_cudnn=use_cudnn
+        )(inputs)
+        outputs = {
+            direction: CombineLayer()(effect_list)
+            for direction, effect_list in effects.items()
+        }
+        return outputs
+
+    outputs = {
+        direction: LongEffectAllRangeLayer(
+            direction=direction, data_format=data_format,
+            use_cudnn=use_cudnn, long_engine=long_engine
+        )(value) for direction, value in inputs.items()
+    }
+    return outputs
+
+
+def compute_short_effects(inputs, data_format, use_cudnn=True,
+                          short_engine='conv'):
+    """
+    方向ごとの入力のdictから方向ごとの利きを求める
+    short_engineが'bank'の場合は全ての方向をまとめて畳み込む
+
+    :param inputs: 方向をキーとするdict
+    :param data_format:
+    :param use_cudnn:
+    :param short_engine:
+    :return:
+    """
+    check_short_engine(short_engine=short_engine)
+    if short_engine == 'bank':
+        return ShortEffectBankLayer(
+            data_format=data_format, use_cudnn=use_cudnn
+        )(inputs)
+    elif short_engine == 'shift':
+        # 同じ入力を複数の方向で使うことが多いので、パディングは入力ごとに1回にする
+        # 入力が複数ある場合は、チャネルの方向に重ねてパディングを全体で1回にする
+        channels = {}
+        for value in inputs.values():
+            if value not in channels:
+                channels[value] = len(channels)
+        if len(channels) == 1:
+            padded = pad_short_flag(board=next(iter(channels)),
+                                    data_format=data_format)
+            channels = {value: None for value in channels}
+        else:
+            axis = 1 if data_format == 'NCHW' else -1
+            padded = pad_board(
+                flag=tf.concat([to_short_flag(board=value)
+                                for value in channels], axis=axis),
+                data_format=data_format
+            )
+        outputs = {
+            direction: shift_padded(
+                padded=padded, direction=direction, data_format=data_format,
+                channel=channels[value]
+            ) for direction, value in inputs.items()
+        }
+        return outputs
+
+    outputs = {
+        direction: ShortEffectLayer(
+            direction=direction, data_format=data_format,
+            use_cudnn=use_cudnn, short_engine=short_engine
+        )(value) for direction, value in inputs.items()
+    }
+    return outputs
+
+
+def compute_packed_long_effects(inputs, data_format, use_cudnn=True,
+                                long_engine='conv'):
+    """
+    方向ごとの入力のdictから、距離別の利きを[batch, n, 8, 9, 9]で求める
+    方向の並びは入力のdictの順
+    long_engineが'bank'の場合は畳み込みの出力を方向ごとに分けずにまとめる
+    'bits'の場合は全ての方向のワードをまとめてから1回で盤面に戻す
+
+    :param inputs: 方向をキーとするdict
+    :param data_format:
+    :param use_cudnn:
+    :param long_engine:
+    :return:
+    """
+    check_long_engine(long_engine=long_engine)
+    if long_engine == 'bank':
+        return LongEffectBankLayer(
+            data_format=data_format, use_cudnn=use_cudnn, packed=True
+        )(inputs)
+    elif long_engine == 'bits':
+        return unpack_words(compute_long_words(
+            inputs=inputs, data_format=data_format, function=step_words
+        ))
+
+    outputs = compute_long_effects(
+        inputs=inputs, data_format=data_format, use_cudnn=use_cudnn,
+        long_engine=long_engine
+    )
+    return tf.stack([pack_planes(outputs[direction]) for direction in inputs],
+                    axis=1)
+
+
+def compute_packed_long_all_range_effects(inputs, data_format, use_cudnn=True,
+                                          long_engine='conv'):
+    """
+    方向ごとの入力のdictから、距離をまとめた利きを[batch, n, 9, 9]で求める
+    方向の並びは入力のdictの順
+    long_engineが'bank'の場合は畳み込みの出力を方向ごとに分けずにまとめる
+    'bits'の場合は全ての方向のワードをまとめてから1回で盤面に戻す
+
+    :param inputs: 方向をキーとするdict
+    :param data_format:
+    :param use_cudnn:
+    :param long_engine:
+    :return:
+    """
+    check_long_engine(long_engine=long_engine)
+    if long_engine == 'bank':
+        packed = LongEffectBankLayer(
+            data_format=data_format, use_cudnn=use_cudnn, packed=True
+        )(inputs)
+        return tf.reduce_any(packed, axis=2)
+    elif long_engine == 'bits':
+        return unpack_words(compute_long_words(
+            inputs=inputs, data_format=data_format, function=fill_words
+        ))
+
+    outputs = compute_long_all_range_effects(
+        inputs=inputs, data_format=data_format, use_cudnn=use_cudnn,
+        long_engine=long_engine
+    )
+    return pack_planes([outputs[direction] for direction in inputs])
+
+
+def compute_long_words(inputs, data_format, function):
+    """
+    方向ごとの入力のdictから、長い利きのワードを方向の軸にまとめて求める
+    方向の並びは入力のdictの順
+
+    :param inputs: 方向をキーとするdict
+    :param data_format:
+    :param function: fill_wordsまたはstep_words
+    :return: fill_wordsは[batch, n, 9]、step_wordsは[batch, n, 8, 9]
+    """
+    outputs = []
+    for direction, value in inputs.items():
+        source, empty = split_long_words(inputs=value,
+                                         data_format=data_format)
+        outputs.append(function(source=source, empty=empty,
+                                direction=direction))
+    return tf.concat(outputs, axis=1)
+
+
+def compute_packed_short_effects(inputs, data_format, use_cudnn=True,
+                                 short_engine='conv'):
+    """
+    方向ごとの入力のdictから、利きを[batch, n, 9, 9]で求める
+    方向の並びは入力のdictの順
+    short_engineが'bank'の場合は畳み込みの出力をそのまま使う
+
+    :param inputs: 方向をキーとするdict
+    :param data_format:
+    :param use_cudnn:
+    :param short_engine:
+    :return:
+    """
+    check_short_engine(short_engine=short_engine)
+    if short_engine == 'bank':
+        return ShortEffectBankLayer(
+            data_format=data_format, use_cudnn=use_cudnn, packed=True
+        )(inputs)
+
+    outputs = compute_short_effects(
+        inputs=inputs, data_format=data_format, use_cudnn=use_cudnn,
+        short_engine=short_engine
+    )
+    return pack_planes([outputs[direction] for direction in inputs])
@@ -10,362 +10,73 @@
 あくまで求めるのは、n-1マス利きがあるか(移動できるか)どうかなので、途中に駒があると利きはない
 """
 
-from collections import namedtuple
-
 import numpy as np
 import tensorflow as tf
 
+from ..direction import get_step
+from ..memo import lookup, store
+
 __author__ = 'Yasuhiro'
 __date__ = '2018/1/27'
 
 
-Index = namedtuple('Index', ['source', 'target'])
-
-
-def make_long_kernel(direction, size):
-    name = 'long_kernel_{}{}'.format(direction.name, size)
-    collection = tf.get_collection_ref(name)
-    if len(collection) == 0:
-        # まだない
-        f_list = [make_long_right_up_kernel, make_long_right_kernel,
-                  make_long_right_down_kernel, make_long_up_kernel,
-                  make_long_down_kernel, make_long_left_up_kernel,
-                  make_long_left_kernel, make_long_left_down_kernel]
-
-        kernel = tf.constant(f_list[direction.value](size=size),
-                             dtype=tf.float32, name=name)
-
-        tf.add_to_collection(name, kernel)
-    else:
-        kernel = collection[0]
-
-    return kernel
-
-
-def make_short_kernel(direction):
-    name = 'short_kernel_{}'.format(direction.name)
-    collection = tf.get_collection_ref(name)
-    if len(collection) == 0:
-        # まだない
-        f_list = [make_short_right_up_kernel, make_short_right_kernel,
-                  make_short_right_down_kernel, make_short_up_kernel,
-                  make_short_down_kernel, make_short_left_up_kernel,
-                  make_short_left_kernel, make_short_left_down_kernel,
-                  # 桂馬の動き
-                  make_short_right_up_up_kernel, make_short_left_up_up_kernel,
-                  make_short_right_down_down_kernel,
-                  make_short_left_down_down_kernel]
-
-        kernel = tf.constant(f_list[direction.value](), dtype=tf.float32,
-                             name=name)
-
-        tf.add_to_collection(name, kernel)
-    else:
-        kernel = collection[0]
-
-    return kernel
-
-
-def get_up_index():
-    return Index(source=-1, target=0)
-
-
-def get_down_index():
-    return Index(source=0, target=-1)
-
-
-def get_right_index():
-    return Index(source=-1, target=0)
-
-
-def get_left_index():
-    return Index(source=0, target=-1)
-
-
-def make_long_vertical_kernel(size, w):
-    shape = (1, size, 2, 1)
-    kernel = np.empty(shape)
-
-    # target
-    kernel[0, w.target, :, 0] = (0, 0)
-    # source
-    kernel[0, w.source, :, 0] = (0, 1)
-    # midway
-    kernel[0, 1:-1] = -1
-
-    return kernel
-
-
-def make_short_vertical_kernel(w):
-    shape = (1, 2, 1, 1)
-    kernel = np.empty(shape)
-
-    # target
-    kernel[0, w.target] = 0
-    # source
-    kernel[0, w.source] = 1
-
-    return kernel
-
-
-def make_long_horizontal_kernel(size, h):
-    shape = (size, 1, 2, 1)
-    kernel = np.empty(shape)
-
-    # target
-    kernel[h.target, 0, :, 0] = (0, 0)
-    # source
-    kernel[h.source, 0, :, 0] = (0, 1)
-    # midway
-    kernel[1:-1, 0] = -1
-
-    return kernel
-
-
-def make_short_horizontal_kernel(h):
-    shape = (2, 1, 1, 1)
-    kernel = np.empty(shape)
-
-    # target
-    kernel[h.target] = 0
-    # source
-    kernel[h.source] = 1
-
-    return kernel
-
-
-def make_long_diagonal1_kernel(size, h, w):
+def make_centered_short_kernel(direction):
     """
-    初期配置の角交換の方向の利きを求める
+    移動先のマスを中心に置いたフィルタ
+    padding='SAME'で畳み込むと、パディングなしで9x9の出力になる
+    フィルタの大きさは奇数なので、上下左右に同じ量のパディングになる
 
-    :param size:
-    :param h:
-    :param w:
+    :param direction:
     :return:
     """
-    shape = (size, size, 2, 1)
-    kernel = np.zeros(shape)
-
-    # target
-    kernel[h.target, w.target, :, 0] = (0, 0)
-    # source
-    kernel[h.source, w.source, :, 0] = (0, 1)
-    # midway
-    for i in range(1, size - 1):
-        kernel[i, i] = -1
-
-    return kernel
-
-
-def make_short_diagonal1_kernel(h, w):
-    shape = (2, 2, 1, 1)
-    kernel = np.zeros(shape)
-
-    # target
-    kernel[h.target, w.target] = 0
-    # source
-    kernel[h.source, w.source] = 1
-
-    return kernel
-
-
-def make_long_diagonal2_kernel(size, h, w):
-    """
-    diagonal1と直交する方向の利きを求める
+    name = 'centered_short_kernel_{}'.format(direction.name)
+    cached = lookup(name)
+    if cached is not None:
+        return cached
 
-    :param size:
-    :param h:
-    :param w:
-    :return:
-    """
-    shape = (size, size, 2, 1)
-    kernel = np.zeros(shape)
+    dh, dw = get_step(direction=direction)
+    height, width = 2 * abs(dh) + 1, 2 * abs(dw) + 1
 
-    # target
-    kernel[h.target, w.target, :, 0] = (0, 0)
+    kernel = np.zeros((height, width, 1, 1))
     # source
-    kernel[h.source, w.source, :, 0] = (0, 1)
-    # midway
-    for i in range(1, size - 1):
-        kernel[i, size - i - 1] = -1
+    kernel[height // 2 - dh, width // 2 - dw] = 1
 
-    return kernel
+    kernel = tf.constant(kernel, dtype=tf.float32, name=name)
 
-
-def make_short_diagonal2_kernel(h, w):
-    shape = (2, 2, 1, 1)
-    kernel = np.zeros(shape)
-
-    # target
-    kernel[h.target, w.target] = 0
-    # source
-    kernel[h.source, w.source] = 1
+    store(kernel, name)
 
     return kernel
 
 
-def make_long_up_kernel(size):
+def make_centered_long_kernel(direction, size):
     """
-    手番側から見て相手方向へ進む利きを求める
+    移動先のマスを中心に置いた長い利きのフィルタ
+    距離はsize - 1
 
+    :param direction:
     :param size:
     :return:
     """
-    w = get_up_index()
-    return make_long_vertical_kernel(size=size, w=w)
-
+    name = 'centered_long_kernel_{}{}'.format(direction.name, size)
+    cached = lookup(name)
+    if cached is not None:
+        return cached
 
-def make_short_up_kernel():
-    return make_short_vertical_kernel(w=get_up_index())
+    dh, dw = get_step(direction=direction)
+    distance = size - 1
+    height = 2 * abs(dh) * distance + 1
+    width = 2 * abs(dw) * distance + 1
+    center_h, center_w = height // 2, width // 2
 
-
-def make_long_down_kernel(size):
-    """
-    手番側から見て自身の方向へ進む利きを求める
-
-    :param size:
-    :return:
-    """
-    w = get_down_index()
-    return make_long_vertical_kernel(size=size, w=w)
-
-
-def make_short_down_kernel():
-    return make_short_vertical_kernel(w=get_down_index())
-
-
-def make_long_right_kernel(size):
-    """
-    手番側から見て右方向へ動く利きを求める
-
-    :param size:
-    :return:
-    """
-    h = get_right_index()
-    return make_long_horizontal_kernel(size=size, h=h)
-
-
-def make_short_right_kernel():
-    return make_short_horizontal_kernel(h=get_right_index())
-
-
-def make_long_left_kernel(size):
-    """
-    手番側から見て左方向へ進む利きを求める
-    :param size:
-    :return:
-    """
-    h = get_left_index()
-    return make_long_horizontal_kernel(size=size, h=h)
-
-
-def make_short_left_kernel():
-    return make_short_horizontal_kernel(h=get_left_index())
-
-
-def make_long_right_up_kernel(size):
-    """
-    手番側から見て右上方向へ進む利きを求める
-    :param size:
-    :return:
-    """
-    h = get_right_index()
-    w = get_up_index()
-    return make_long_diagonal1_kernel(size=size, h=h, w=w)
-
-
-def make_short_right_up_kernel():
-    return make_short_diagonal1_kernel(h=get_right_index(), w=get_up_index())
-
-
-def make_long_left_down_kernel(size):
-    """
-    手番側から見て左下方向へ進む利きを求める
-    :param size:
-    :return:
-    """
-    h = get_left_index()
-    w = get_down_index()
-    return make_long_diagonal1_kernel(size=size, h=h, w=w)
-
-
-def make_short_left_down_kernel():
-    return make_short_diagonal1_kernel(h=get_left_index(), w=get_down_index())
-
-
-def make_long_left_up_kernel(size):
-    """
-    手番側から見て左上方向へ進む利きを求める
-    :param size:
-    :return:
-    """
-    h = get_left_index()
-    w = get_up_index()
-    return make_long_diagonal2_kernel(size=size, h=h, w=w)
-
-
-def make_short_left_up_kernel():
-    return make_short_diagonal1_kernel(h=get_left_index(), w=get_up_index())
-
-
-def make_long_right_down_kernel(size):
-    """
-    手番側から見て右下方向へ進む利きを求める
-    :param size:
-    :return:
-    """
-    h = get_right_index()
-    w = get_down_index()
-    return make_long_diagonal2_kernel(size=size, h=h, w=w)
-
-
-def make_short_right_down_kernel():
-    return make_short_diagonal1_kernel(h=get_right_index(), w=get_down_index())
-
-
-def make_short_right_up_up_kernel():
-    shape = (2, 3, 1, 1)
-    kernel = np.zeros(shape)
-
-    # target
-    kernel[0, 0] = 0
-    # source
-    kernel[1, 2] = 1
-
-    return kernel
-
-
-def make_short_left_up_up_kernel():
-    shape = (2, 3, 1, 1)
-    kernel = np.zeros(shape)
-
-    # target
-    kernel[1, 0] = 0
-    # source
-    kernel[0, 2] = 1
-
-    return kernel
-
-
-def make_short_right_down_down_kernel():
-    shape = (2, 3, 1, 1)
-    kernel = np.zeros(shape)
-
-    # target
-    kernel[0, 2] = 0
+    kernel = np.zeros((height, width, 2, 1))
     # source
-    kernel[1, 0] = 1
-
-    return kernel
-
+    kernel[center_h - dh * distance, center_w - dw * distance, :, 0] = (0, 1)
+    # midway
+    for k in range(1, distance):
+        kernel[center_h - dh * k, center_w - dw * k] = -1
 
-def make_short_left_down_down_kernel():
-    shape = (2, 3, 1, 1)
-    kernel = np.zeros(shape)
+    kernel = tf.constant(kernel, dtype=tf.float32, name=name)
 
-    # target
-    kernel[1, 2] = 0
-    # source
-    kernel[0, 0] = 1
+    store(kernel, name)
 
     return kernel
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+方向ごとのdictに分かれている利きを一つのテンソルにまとめて扱う
+
+8方向の短い利きや方向ごとにまとめた長い利きは[batch, 8, 9, 9]
+方向の並びはget_eight_directionsの順、王の短い利きはSHORT_DIRECTIONSの順
+盤面の並びはdata_formatに関係なく(筋, 段)
+方向ごとのフラグは[batch, n, 1, 1]で、[batch, n, 9, 9]と放送できる
+駒ごとの長い利きは[batch, 8, 8, 9, 9]で、方向、距離、筋、段の順
+短い利きは距離1の位置に入れる
+
+逆方向は方向の軸を反転したものになる
+
+ナイーブな長い利き、王からの仮想的な利き、王手のフラグは、求めた層がこの形で返し、
+ピンや王手の層はこの形のまま受け取る
+as_packed_effectsとas_packed_flagsで方向ごとのdictも受け取れる
+駒ごとの利き、利きの個数、移動の行動もこの形のままで求め、
+方向ごとのdictや行動ごとのlistには外に返すところでだけ変換する
+"""
+
+import tensorflow as tf
+
+from ..direction import Direction, get_eight_directions
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+# 手番側の王の仮想的な短い利きのまとめ方、8方向と前に跳ねる桂馬の動き
+SHORT_DIRECTIONS = get_eight_directions() + (Direction.RIGHT_UP_UP,
+                                             Direction.LEFT_UP_UP)
+
+
+def to_packed_plane(board):
+    """
+    盤面の形の[batch, 1, 9, 9]または[batch, 9, 9, 1]を[batch, 1, 9, 9]にする
+    チャネルの次元は大きさが1なので、reshapeだけでよい
+
+    :param board:
+    :return:
+    """
+    return tf.reshape(board, [-1, 1, 9, 9])
+
+
+def to_packed_block(board):
+    """
+    盤面の形の[batch, 1, 9, 9]または[batch, 9, 9, 1]を[batch, 1, 1, 9, 9]にする
+    方向ごと、距離ごとの利き[batch, 8, 8, 9, 9]と放送できる
+
+    :param board:
+    :return:
+    """
+    return tf.reshape(board, [-1, 1, 1, 9, 9])
+
+
+def from_packed_plane(plane, data_format):
+    """
+    [batch, 1, 9, 9]や[batch, 9, 9]をdata_formatの盤面の形にする
+
+    :param plane:
+    :param data_format:
+    :return:
+    """
+    if data_format == 'NCHW':
+        shape = [-1, 1, 9, 9]
+    else:
+        shape = [-1, 9, 9, 1]
+    return tf.reshape(plane, shape)
+
+
+def pack_planes(planes):
+    """
+    [batch, 1, 9, 9]または[batch, 9, 9, 1]のlistを[batch, n, 9, 9]にまとめる
+    チャネルの次元は大きさが1なので、どちらのdata_formatでも並びは同じ
+
+    :param planes:
+    :return:
+    """
+    stacked = tf.stack(planes, axis=1)
+    return tf.reshape(stacked, [-1, len(planes), 9, 9])
+
+
+def unpack_planes(packed, data_format):
+    """
+    [batch, n, 9, 9]をdata_formatの盤面の形のlistに戻す
+
+    :param packed:
+    :param data_format:
+    :return:
+    """
+    return [from_packed_plane(plane=plane, data_format=data_format)
+            for plane in tf.unstack(packed, axis=1)]
+
+
+def pack_effects(effects, directions=None):
+    """
+    方向をキーとするdictを[batch, n, 9, 9]にまとめる
+
+    :param effects:
+    :param directions: 省略した場合は8方向
+    :return:
+    """
+    if directions is None:
+        directions = get_eight_directions()
+    return pack_planes([effects[direction] for direction in directions])
+
+
+def unpack_effects(packed, data_format, directions=None):
+    """
+    pack_effectsの逆変換
+
+    :param packed:
+    :param data_format:
+    :param directions: 省略した場合は8方向
+    :return:
+    """
+    if directions is None:
+        directions = get_eight_directions()
+    return dict(zip(directions,
+                    unpack_planes(packed=packed, data_format=data_format)))
+
+
+def unpack_long_effects(packed, data_format, directions=None):
+    """
+    [batch, n, 8, 9, 9]の長い利きを方向ごとに距離別のlistのdictに戻す
+
+    :param packed:
+    :param data_format:
+    :param directions: 省略した場合は8方向
+    :return:
+    """
+    if directions is None:
+        directions = get_eight_directions()
+    return {
+        direction: unpack_planes(packed=effect, data_format=data_format)
+        for direction, effect in zip(directions, tf.unstack(packed, axis=1))
+    }
+
+
+def expand_directions(packed, directions):
+    """
+    directionsの順に並んだ方向の軸をget_eight_directionsの順の8方向にする
+    directionsにない方向はFalseで埋める
+    短い利き[batch, n, 9, 9]でも長い利き[batch, n, 8, 9, 9]でもよい
+
+    :param packed:
+    :param directions:
+    :return:
+    """
+    directions = tuple(directions)
+    eight_directions = get_eight_directions()
+    if directions == eight_directions:
+        return packed
+
+    # 最後にFalseの方向を1つ加えて、ない方向はそこから集める
+    padded = tf.concat([packed, tf.zeros_like(packed[:, :1])], axis=1)
+    index = [directions.index(direction) if direction in directions
+             else len(directions) for direction in eight_directions]
+    return tf.gather(padded, index, axis=1)
+
+
+def add_short_effects(long_effects, short_effects):
+    """
+    8方向の長い利き[batch, 8, 8, 9, 9]の距離1に短い利き[batch, 8, 9, 9]を加える
+
+    :param long_effects:
+    :param short_effects:
+    :return:
+    """
+    first = tf.logical_or(long_effects[:, :, 0], short_effects)
+    return tf.concat([tf.expand_dims(first, axis=2), long_effects[:, :, 1:]],
+                     axis=2)
+
+
+def as_packed_effects(effects, directions=None):
+    """
+    方向ごとのdictならpack_effectsでまとめ、まとめたものならそのまま返す
+
+    :param effects:
+    :param directions: 省略した場合は8方向
+    :return:
+    """
+    if isinstance(effects, dict):
+        return pack_effects(effects, directions=directions)
+    return effects
+
+
+def reverse_directions(packed):
+    """
+    方向の軸を反転して、逆方向の利きの並びにする
+    8方向でも桂馬の動きでも同じ
+
+    :param packed:
+    :return:
+    """
+    return tf.reverse(packed, axis=[1])
+
+
+def pack_flags(flags, directions=None):
+    """
+    方向ごとの[batch, 1, 1, 1]のフラグを[batch, n, 1, 1]にまとめる
+    [batch, n, 9, 9]と放送できる
+
+    :param flags:
+    :param directions: 省略した場合は8方向
+    :return:
+    """
+    if directions is None:
+        directions = get_eight_directions()
+    # Pythonのboolなどのスカラーも受け取れるように、1次元にしてから重ねる
+    stacked = tf.stack([tf.reshape(flags[direction], [-1])
+                        for direction in directions], axis=1)
+    return tf.reshape(stacked, [-1, len(directions), 1, 1])
+
+
+def as_packed_flags(flags, directions=None):
+    """
+    方向ごとのdictならpack_flagsでまとめ、まとめたものならそのまま返す
+
+    :param flags:
+    :param directions: 省略した場合は8方向
+    :return:
+    """
+    if isinstance(flags, dict):
+        return pack_flags(flags, directions=directions)
+    return flags
+
+
+def unpack_flags(packed, directions=None):
+    """
+    pack_flagsの逆変換
+
+    :param packed:
+    :param directions: 省略した場合は8方向
+    :return:
+    """
+    if directions is None:
+        directions = get_eight_directions()
+    return {
+        direction: tf.reshape(flag, [-1, 1, 1, 1])
+        for direction, flag in zip(directions, tf.unstack(packed, axis=1))
+    }
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+長い利きを表引きで求めるための表を作る
+python-shogiのBB_RANK_ATTACKSなどと同じように、
+マスとそのマスから伸びる直線上の駒の配置の組み合わせごとに利きを事前に計算しておく
+
+直線上の駒の配置は、移動元から近い順に1マス目から7マス目までの有無をビットで表す
+8マス目の駒はそれより先のマスの利きに影響しないので、含めない
+
+表に入れるのは移動元のマスごとの利きが届く距離だけで、移動先のマスは
+距離ごとの移動元のマスの番号の表(make_ray_source_index)で引く
+局面ごとの値は[batch, 81]の大きさで済み、移動元と移動先の組み合わせ
+[batch, 81, 81]を作らない
+"""
+
+import numpy as np
+import tensorflow as tf
+
+from ..direction import get_step
+from ..memo import lookup, store
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+# 直線上の駒の配置の組み合わせの数
+OCCUPANCY_SIZE = 2 ** 7
+
+
+def make_ray_table(direction):
+    """
+    [81 * OCCUPANCY_SIZE]の表を作る
+    番号は移動元のマス * OCCUPANCY_SIZE + 駒の配置
+    値は利きが届く最も遠いマスまでの距離で、最初に当たる駒のマスも含む
+    マスの番号は筋 * 9 + 段
+
+    :param direction:
+    :return:
+    """
+    name = 'ray_table_{}'.format(direction.name)
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    dh, dw = get_step(direction=direction)
+
+    table = np.zeros((81, OCCUPANCY_SIZE), dtype=np.int32)
+    occupancy = np.arange(OCCUPANCY_SIZE)
+    for h in range(9):
+        for w in range(9):
+            source = h * 9 + w
+            # まだ途中の駒に遮られていない組み合わせ
+            open_ray = np.ones(OCCUPANCY_SIZE, dtype=np.bool_)
+            for distance in range(1, 9):
+                i, j = h + dh * distance, w + dw * distance
+                if not (0 <= i < 9 and 0 <= j < 9):
+                    break
+                table[source, open_ray] = distance
+                if distance < 8:
+                    # このマスに駒があると、次のマスから先は利きがない
+                    blocked = (occupancy >> (distance - 1)) & 1
+                    open_ray = np.logical_and(open_ray, blocked == 0)
+    table = np.reshape(table, [-1])
+
+    table = tf.constant(table, dtype=tf.int32, name=name)
+
+    store(table, name)
+
+    return table
+
+
+def make_ray_source_index(direction):
+    """
+    移動先のマスから距離ごとの移動元のマスを引く[8, 81]の表
+    i行目は距離i+1で、移動元が盤の外の場合は81
+
+    :param direction:
+    :return:
+    """
+    name = 'ray_source_index_{}'.format(direction.name)
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    dh, dw = get_step(direction=direction)
+
+    index = np.full((8, 81), 81, dtype=np.int32)
+    for distance in range(1, 9):
+        for i in range(9):
+            for j in range(9):
+                h, w = i - dh * distance, j - dw * distance
+                if 0 <= h < 9 and 0 <= w < 9:
+                    index[distance - 1, i * 9 + j] = h * 9 + w
+
+    index = tf.constant(index, dtype=tf.int32, name=name)
+
+    store(index, name)
+
+    return index
+
+
+def make_occupancy_weight(direction):
+    """
+    盤面の駒の有無から直線上の駒の配置の番号を行列積で求めるための重み
+    [81, 81]の行列で、行は駒のあるマス、列は移動元のマス
+
+    :param direction:
+    :return:
+    """
+    name = 'ray_occupancy_weight_{}'.format(direction.name)
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    dh, dw = get_step(direction=direction)
+
+    weight = np.zeros((81, 81), dtype=np.float32)
+    for h in range(9):
+        for w in range(9):
+            for distance in range(1, 8):
+                i, j = h + dh * distance, w + dw * distance
+                if not (0 <= i < 9 and 0 <= j < 9):
+                    break
+                weight[i * 9 + j, h * 9 + w] = 2 ** (distance - 1)
+
+    weight = tf.constant(weight, dtype=tf.float32, name=name)
+
+    store(weight, name)
+
+    return weight
+
+
+def make_ray_offset():
+    """
+    移動元のマスごとの表の行の先頭位置
+
+    :return:
+    """
+    name = 'ray_table_offset'
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    offset = np.arange(81, dtype=np.int32) * OCCUPANCY_SIZE
+    offset = tf.constant(offset, dtype=tf.int32, name=name)
+
+    store(offset, name)
+
+    return offset
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+盤面を指定の方向へずらす
+畳み込みを使わずに利きを求めるために使う
+
+縦型で相手側から手番側の順序のマスの並びになっている
+盤の外へはみ出したマスは捨てて、空いたマスは0(False)で埋める
+
+tf.padは入力ごとに1回だけにして、ずらすのはtf.sliceで切り出すだけにする
+- 1マスだけずらす場合は、pad_boardで盤の周りを埋めてshift_paddedで切り出す
+- 同じ方向へ何回もずらす場合は、pad_upstreamで移動元の側をまとめて埋めて、
+  shift_upstreamでずらすたびに移動先の側の端を捨てる
+"""
+
+import tensorflow as tf
+
+from ..direction import get_step
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def get_board_axes(data_format):
+    """
+    盤面の筋と段の軸
+
+    :param data_format:
+    :return:
+    """
+    if data_format == 'NCHW':
+        return 2, 3
+    else:
+        return 1, 2
+
+
+def slice_axes(flag, ranges):
+    """
+    軸ごとに先頭と末尾のマスを捨てる
+    大きさは静的に決まっている必要がある
+
+    :param flag:
+    :param ranges: 軸から(先頭から捨てる数, 末尾から捨てる数)へのdict
+    :return:
+    """
+    shape = flag.get_shape().as_list()
+    begin = [0] * len(shape)
+    size = [-1] * len(shape)
+    for axis, (front, back) in ranges.items():
+        begin[axis] = front
+        size[axis] = shape[axis] - front - back
+    return tf.slice(flag, begin, size)
+
+
+# pad_boardで盤の周りに加えるマスの数
+# 桂馬の動きまで扱える
+PAD_SIZE = 2
+
+
+def pad_board(flag, data_format):
+    """
+    盤の周りをPAD_SIZEマスだけ0(False)で埋める
+    同じ盤面を複数の方向へずらす場合に、パディングを1回で済ませるために使う
+
+    :param flag:
+    :param data_format:
+    :return:
+    """
+    p = [PAD_SIZE, PAD_SIZE]
+    if data_format == 'NCHW':
+        paddings = [[0, 0], [0, 0], p, p]
+    else:
+        paddings = [[0, 0], p, p, [0, 0]]
+    return tf.pad(flag, paddings)
+
+
+def shift_padded(padded, direction, data_format, channel=None):
+    """
+    pad_boardでパディングした盤面から、directionの方向へ1マスずらした盤面を切り出す
+    出力は9x9で、追加のパディングは行わない
+
+    :param padded:
+    :param direction:
+    :param data_format:
+    :param channel: 複数の盤面をチャネルの方向に重ねてパディングした場合に、
+        切り出すチャネル
+    :return:
+    """
+    dh, dw = get_step(direction=direction)
+    if data_format == 'NCHW':
+        begin = [0, 0, PAD_SIZE - dh, PAD_SIZE - dw]
+        size = [-1, -1, 9, 9]
+        channel_axis = 1
+    else:
+        begin = [0, PAD_SIZE - dh, PAD_SIZE - dw, 0]
+        size = [-1, 9, 9, -1]
+        channel_axis = 3
+    if channel is not None:
+        begin[channel_axis] = channel
+        size[channel_axis] = 1
+    return tf.slice(padded, begin, size)
+
+
+# pad_upstreamで移動元の側に加えるマスの数
+# 長い利きの最大の距離まで扱える
+UPSTREAM_SIZE = 8
+
+
+def pad_upstream(flag, direction, data_format):
+    """
+    directionの方向へ合計UPSTREAM_SIZEマスずらせるように、
+    移動元の側だけを0(False)で埋める
+    同じ方向へ何回もずらす場合に、パディングを1回で済ませるために使う
+
+    パディングした盤面の移動先の側の端は、元の盤面の端と同じ位置になる
+    移動元の側に加えたマスは駒がないので、ずらしてもFalseのままになる
+
+    :param flag:
+    :param direction:
+    :param data_format:
+    :return:
+    """
+    dh, dw = get_step(direction=direction)
+    paddings = [[0, 0], [0, 0], [0, 0], [0, 0]]
+    for axis, d in zip(get_board_axes(data_format=data_format), (dh, dw)):
+        paddings[axis] = [max(d, 0) * UPSTREAM_SIZE,
+                          max(-d, 0) * UPSTREAM_SIZE]
+    return tf.pad(flag, paddings)
+
+
+def shift_upstream(flag, direction, data_format, step_size=1):
+    """
+    pad_upstreamでパディングした盤面をdirectionの方向へstep_sizeマスだけずらす
+    盤の外へはみ出す移動先の側の端を捨てるだけなので、パディングは行わない
+    移動元の側の端が短くなる
+
+    :param flag:
+    :param direction:
+    :param data_format:
+    :param step_size:
+    :return:
+    """
+    dh, dw = get_step(direction=direction)
+    axes = get_board_axes(data_format=data_format)
+    return slice_axes(flag=flag, ranges={
+        axis: (max(-d, 0) * step_size, max(d, 0) * step_size)
+        for axis, d in zip(axes, (dh, dw))
+    })
+
+
+def align_upstream(flag, direction, data_format, step_size=1):
+    """
+    shift_upstreamでずらした盤面と同じ範囲になるように、
+    ずらしていない盤面の移動元の側の端を捨てる
+
+    :param flag:
+    :param direction:
+    :param data_format:
+    :param step_size:
+    :return:
+    """
+    dh, dw = get_step(direction=direction)
+    axes = get_board_axes(data_format=data_format)
+    return slice_axes(flag=flag, ranges={
+        axis: (max(d, 0) * step_size, max(-d, 0) * step_size)
+        for axis, d in zip(axes, (dh, dw))
+    })
+
+
+def crop_upstream(flag, direction, data_format):
+    """
+    pad_upstreamでパディングした盤面から盤の範囲の9x9を切り出す
+
+    :param flag:
+    :param direction:
+    :param data_format:
+    :return:
+    """
+    dh, dw = get_step(direction=direction)
+    axes = get_board_axes(data_format=data_format)
+    shape = flag.get_shape().as_list()
+    ranges = {}
+    for axis, d in zip(axes, (dh, dw)):
+        extra = shape[axis] - 9
+        ranges[axis] = (extra, 0) if d > 0 else (0, extra)
+    return slice_axes(flag=flag, ranges=ranges)
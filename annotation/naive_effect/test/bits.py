@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import tensorflow as tf
+
+from annotation.direction import Direction, get_eight_directions, get_step
+from ..bits import (pack_words, pad_board_words, shift_padded_words,
+                    unpack_words)
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestBits(tf.test.TestCase):
+    def make_flag(self, n):
+        return np.random.binomial(1, 0.5, size=(n, 3, 9, 9)).astype(np.bool_)
+
+    def test_pack(self):
+        """
+        ワードに詰めてから戻すと元の盤面と一致し、段jはj番目のビットになる
+
+        :return:
+        """
+        flag = self.make_flag(n=16)
+
+        words = pack_words(tf.constant(flag))
+        restored = unpack_words(words)
+
+        with self.test_session() as sess:
+            words, restored = sess.run([words, restored])
+        self.assertEqual(np.uint16, words.dtype)
+        self.assertTupleEqual((16, 3, 9), words.shape)
+        self.assertAllEqual(np.sum(flag << np.arange(9), axis=-1), words)
+        self.assertAllEqual(flag, restored)
+
+    def test_shift(self):
+        """
+        1マスずらしたワードが盤面を(筋, 段)の変化量だけずらしたものと一致する
+
+        :return:
+        """
+        flag = self.make_flag(n=16)
+        directions = get_eight_directions() + (Direction.RIGHT_UP_UP,
+                                               Direction.LEFT_UP_UP,
+                                               Direction.RIGHT_DOWN_DOWN,
+                                               Direction.LEFT_DOWN_DOWN)
+
+        padded = pad_board_words(pack_words(tf.constant(flag)))
+        shifted = [unpack_words(shift_padded_words(padded=padded,
+                                                   direction=direction))
+                   for direction in directions]
+
+        with self.test_session() as sess:
+            shifted = sess.run(shifted)
+        for direction, actual in zip(directions, shifted):
+            dh, dw = get_step(direction=direction)
+            expected = np.zeros_like(flag)
+            for i in range(9):
+                for j in range(9):
+                    if 0 <= i - dh < 9 and 0 <= j - dw < 9:
+                        expected[..., i, j] = flag[..., i - dh, j - dw]
+            with self.subTest(direction=direction):
+                self.assertAllEqual(expected, actual)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import tensorflow as tf
+
+from ..combine import (CombineLayer, combine_any, combine_all, combine_count,
+                       combine_or)
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestCombine(tf.test.TestCase):
+    def test_combine(self):
+        """
+        reduceでまとめた結果がnumpyで計算した結果と一致することを確認する
+        要素数が奇数の場合も確認する
+
+        :return:
+        """
+        for n in (1, 2, 7, 8, 10):
+            values = np.random.binomial(1, 0.5, size=(n, 4, 1, 9, 9))
+            values = values.astype(np.bool)
+            tensors = [tf.constant(v) for v in values]
+
+            outputs = [combine_any(tensors), combine_all(tensors),
+                       combine_count(tensors), combine_or(*tensors)]
+            with self.test_session() as sess:
+                any_, all_, count, or_ = sess.run(outputs)
+
+            with self.subTest(n=n):
+                self.assertAllEqual(np.any(values, axis=0), any_)
+                self.assertAllEqual(np.all(values, axis=0), all_)
+                self.assertAllEqual(np.sum(values, axis=0), count)
+                self.assertAllEqual(np.any(values, axis=0), or_)
+
+    def test_combine_layer(self):
+        values = np.random.binomial(1, 0.5, size=(8, 4, 1, 9, 9))
+        values = values.astype(np.bool)
+
+        effect = CombineLayer()([tf.constant(v) for v in values])
+        with self.test_session() as sess:
+            actual = sess.run(effect)
+        self.assertAllEqual(np.any(values, axis=0), actual)
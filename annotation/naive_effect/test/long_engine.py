@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+from dotenv import load_dotenv
+
+from annotation.direction import get_eight_directions
+from ..effect import (LongEffectAllRangeLayer, LongEffectDistanceLayer,
+                      compute_long_effects,
+                      compute_packed_long_all_range_effects)
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestLongEngine(tf.test.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        dotenv_path = Path(__file__).parents[3] / '.env'
+        load_dotenv(str(dotenv_path))
+
+        cls.data_format = os.environ.get('DATA_FORMAT')
+        cls.use_cudnn = bool(os.environ.get('USE_CUDNN'))
+
+    def make_inputs(self, n):
+        """
+        利きを伸ばす駒、利きを遮る駒、空きマスをランダムに配置したone hotを作る
+
+        :param n:
+        :return:
+        """
+        index = np.random.choice(3, size=(n, 9, 9), p=[0.15, 0.15, 0.7])
+        one_hot = np.zeros((n, 9, 9, 2), dtype=np.float32)
+        one_hot[..., 0] = index == 0
+        one_hot[..., 1] = index == 1
+        if self.data_format == 'NCHW':
+            one_hot = np.transpose(one_hot, [0, 3, 1, 2])
+        return one_hot
+
+    def test_all_range(self):
+        """
+        畳み込みで求めた利きと他の方法で求めた利きが一致することを確認する
+
+        :return:
+        """
+        inputs = self.make_inputs(n=64)
+        ph = tf.placeholder(tf.float32, shape=inputs.shape)
+
+        for direction, engine in product(get_eight_directions(),
+                                         ('fill', 'table', 'bank', 'bits')):
+            conv_effect = LongEffectAllRangeLayer(
+                direction=direction, data_format=self.data_format,
+                use_cudnn=self.use_cudnn, long_engine='conv'
+            )(ph)
+            other_effect = LongEffectAllRangeLayer(
+                direction=direction, data_format=self.data_format,
+                use_cudnn=self.use_cudnn, long_engine=engine
+            )(ph)
+
+            with self.test_session() as sess:
+                expected, actual = sess.run([conv_effect, other_effect],
+                                            feed_dict={ph: inputs})
+            with self.subTest(direction=direction, engine=engine):
+                self.assertAllEqual(expected, actual)
+
+    def test_distance(self):
+        """
+        距離ごとの利きも一致することを確認する
+
+        :return:
+        """
+        inputs = self.make_inputs(n=64)
+        ph = tf.placeholder(tf.float32, shape=inputs.shape)
+
+        for direction, engine in product(get_eight_directions(),
+                                         ('fill', 'table', 'bank', 'bits')):
+            conv_effect = LongEffectDistanceLayer(
+                direction=direction, data_format=self.data_format,
+                use_cudnn=self.use_cudnn, long_engine='conv'
+            )(ph)
+            other_effect = LongEffectDistanceLayer(
+                direction=direction, data_format=self.data_format,
+                use_cudnn=self.use_cudnn, long_engine=engine
+            )(ph)
+            self.assertEqual(8, len(other_effect))
+
+            with self.test_session() as sess:
+                expected, actual = sess.run([conv_effect, other_effect],
+                                            feed_dict={ph: inputs})
+            for distance, (e, a) in enumerate(zip(expected, actual), start=1):
+                with self.subTest(direction=direction, engine=engine,
+                                  distance=distance):
+                    self.assertAllEqual(e, a)
+
+    def test_bank_all_directions(self):
+        """
+        全ての方向をまとめて畳み込んでも、方向ごとの利きと一致することを確認する
+
+        :return:
+        """
+        inputs = self.make_inputs(n=64)
+        ph = tf.placeholder(tf.float32, shape=inputs.shape)
+
+        conv_effects = compute_long_effects(
+            inputs={direction: ph for direction in get_eight_directions()},
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            long_engine='conv'
+        )
+        bank_effects = compute_long_effects(
+            inputs={direction: ph for direction in get_eight_directions()},
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            long_engine='bank'
+        )
+
+        with self.test_session() as sess:
+            expected, actual = sess.run([conv_effects, bank_effects],
+                                        feed_dict={ph: inputs})
+        for direction in get_eight_directions():
+            for distance, (e, a) in enumerate(zip(expected[direction],
+                                                  actual[direction]),
+                                              start=1):
+                with self.subTest(direction=direction, distance=distance):
+                    self.assertAllEqual(e, a)
+
+    def test_packed(self):
+        """
+        まとめた形で求めた利きが方向ごとの利きを入力の順に並べたものと一致することを確認する
+
+        :return:
+        """
+        inputs = self.make_inputs(n=64)
+        ph = tf.placeholder(tf.float32, shape=inputs.shape)
+        # 方向の並びが入力のdictの順になることを確かめるために逆順にする
+        directions = get_eight_directions()[::-1]
+
+        expected = [
+            LongEffectAllRangeLayer(
+                direction=direction, data_format=self.data_format,
+                use_cudnn=self.use_cudnn, long_engine='conv'
+            )(ph) for direction in directions
+        ]
+        for engine in ('conv', 'fill', 'table', 'bank', 'bits'):
+            packed = compute_packed_long_all_range_effects(
+                inputs={direction: ph for direction in directions},
+                data_format=self.data_format, use_cudnn=self.use_cudnn,
+                long_engine=engine
+            )
+
+            with self.test_session() as sess:
+                expected_, actual = sess.run([expected, packed],
+                                             feed_dict={ph: inputs})
+            with self.subTest(engine=engine):
+                self.assertTupleEqual((64, 8, 9, 9), actual.shape)
+                for i, e in enumerate(expected_):
+                    self.assertAllEqual(np.reshape(e, [64, 9, 9]),
+                                        actual[:, i])
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            LongEffectAllRangeLayer(
+                direction=get_eight_directions()[0],
+                data_format=self.data_format, long_engine='unknown'
+            )
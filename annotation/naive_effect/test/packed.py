@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+from dotenv import load_dotenv
+
+from annotation.direction import (get_cross_directions, get_eight_directions,
+                                  get_opposite_direction)
+from ..packed import (add_short_effects, expand_directions, pack_effects,
+                      reverse_directions, unpack_effects, unpack_long_effects)
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestPacked(tf.test.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        dotenv_path = Path(__file__).parents[3] / '.env'
+        load_dotenv(str(dotenv_path))
+
+        cls.data_format = os.environ.get('DATA_FORMAT')
+        cls.use_cudnn = bool(os.environ.get('USE_CUDNN'))
+
+    def make_plane(self, n):
+        if self.data_format == 'NCHW':
+            shape = (n, 1, 9, 9)
+        else:
+            shape = (n, 9, 9, 1)
+        return np.random.binomial(1, 0.5, size=shape).astype(np.bool)
+
+    def test_effects(self):
+        """
+        まとめてから戻すと元の利きと一致し、方向の軸を反転すると逆方向になる
+
+        :return:
+        """
+        effects = {direction: self.make_plane(n=4)
+                   for direction in get_eight_directions()}
+
+        packed = pack_effects({k: tf.constant(v) for k, v in effects.items()})
+        restored = unpack_effects(packed, data_format=self.data_format)
+        reversed_ = unpack_effects(reverse_directions(packed),
+                                   data_format=self.data_format)
+
+        with self.test_session() as sess:
+            shape, restored, reversed_ = sess.run(
+                [tf.shape(packed), restored, reversed_]
+            )
+        self.assertAllEqual([4, 8, 9, 9], shape)
+        for direction in get_eight_directions():
+            with self.subTest(direction=direction):
+                self.assertAllEqual(effects[direction], restored[direction])
+                self.assertAllEqual(
+                    effects[get_opposite_direction(direction)],
+                    reversed_[direction]
+                )
+
+    def test_long_effects(self):
+        """
+        4方向の長い利きと短い利きを8方向にしてまとめると、
+        ない方向はFalse、短い利きは距離1に加わる
+
+        :return:
+        """
+        long_effects = np.random.binomial(1, 0.5, size=(4, 4, 8, 9, 9))
+        long_effects = long_effects.astype(np.bool_)
+        short_effects = np.random.binomial(1, 0.5, size=(4, 4, 9, 9))
+        short_effects = short_effects.astype(np.bool_)
+        directions = get_cross_directions()
+
+        packed = add_short_effects(
+            long_effects=expand_directions(tf.constant(long_effects),
+                                           directions=directions),
+            short_effects=expand_directions(tf.constant(short_effects),
+                                            directions=directions)
+        )
+        restored = unpack_long_effects(packed, data_format=self.data_format)
+
+        with self.test_session() as sess:
+            packed, restored = sess.run([packed, restored])
+        self.assertEqual((4, 8, 8, 9, 9), packed.shape)
+        for i, direction in enumerate(get_eight_directions()):
+            with self.subTest(direction=direction):
+                if direction not in directions:
+                    self.assertFalse(np.any(packed[:, i]))
+                    continue
+                j = directions.index(direction)
+                expected = long_effects[:, j].copy()
+                expected[:, 0] |= short_effects[:, j]
+                self.assertAllEqual(expected, packed[:, i])
+                for k in range(8):
+                    self.assertAllEqual(
+                        expected[:, k],
+                        np.reshape(restored[direction][k], (4, 9, 9))
+                    )
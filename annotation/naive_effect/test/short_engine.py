@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from itertools import chain
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+from dotenv import load_dotenv
+
+from annotation.direction import Direction, get_eight_directions
+from ..effect import (ShortEffectLayer, compute_short_effects,
+                      compute_packed_short_effects)
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestShortEngine(tf.test.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        dotenv_path = Path(__file__).parents[3] / '.env'
+        load_dotenv(str(dotenv_path))
+
+        cls.data_format = os.environ.get('DATA_FORMAT')
+        cls.use_cudnn = bool(os.environ.get('USE_CUDNN'))
+
+    @staticmethod
+    def get_directions():
+        return list(chain(get_eight_directions(),
+                          (Direction.RIGHT_UP_UP, Direction.LEFT_UP_UP,
+                           Direction.RIGHT_DOWN_DOWN,
+                           Direction.LEFT_DOWN_DOWN)))
+
+    def make_inputs(self, n):
+        """
+        駒をランダムに配置した盤面を作る
+
+        :param n:
+        :return:
+        """
+        board = np.random.binomial(1, 0.3, size=(n, 9, 9, 1))
+        board = board.astype(np.float32)
+        if self.data_format == 'NCHW':
+            board = np.transpose(board, [0, 3, 1, 2])
+        return board
+
+    def test_bank(self):
+        """
+        方向ごとの畳み込みとまとめた畳み込みの利きが一致することを確認する
+
+        :return:
+        """
+        inputs = self.make_inputs(n=64)
+        ph = tf.placeholder(tf.float32, shape=inputs.shape)
+
+        directions = self.get_directions()
+        conv_effects = compute_short_effects(
+            inputs={direction: ph for direction in directions},
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            short_engine='conv'
+        )
+        bank_effects = compute_short_effects(
+            inputs={direction: ph for direction in directions},
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            short_engine='bank'
+        )
+
+        with self.test_session() as sess:
+            expected, actual = sess.run([conv_effects, bank_effects],
+                                        feed_dict={ph: inputs})
+        for direction in directions:
+            with self.subTest(direction=direction):
+                self.assertAllEqual(expected[direction], actual[direction])
+
+    def test_shift(self):
+        """
+        盤面をずらして求めた利きが畳み込みの利きと一致することを確認する
+        入力がfloat型でもbool型でも同じ結果になる
+
+        :return:
+        """
+        inputs = self.make_inputs(n=64)
+        ph = tf.placeholder(tf.float32, shape=inputs.shape)
+
+        directions = self.get_directions()
+        conv_effects = compute_short_effects(
+            inputs={direction: ph for direction in directions},
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            short_engine='conv'
+        )
+        shift_effects = compute_short_effects(
+            inputs={direction: ph for direction in directions},
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            short_engine='shift'
+        )
+        bool_effects = {
+            direction: ShortEffectLayer(
+                direction=direction, data_format=self.data_format,
+                short_engine='shift'
+            )(tf.cast(ph, tf.bool)) for direction in directions
+        }
+
+        with self.test_session() as sess:
+            expected, actual1, actual2 = sess.run(
+                [conv_effects, shift_effects, bool_effects],
+                feed_dict={ph: inputs}
+            )
+        for direction in directions:
+            with self.subTest(direction=direction):
+                self.assertAllEqual(expected[direction], actual1[direction])
+                self.assertAllEqual(expected[direction], actual2[direction])
+
+    def test_packed(self):
+        """
+        まとめた形で求めた利きが方向ごとの利きを入力の順に並べたものと一致することを確認する
+
+        :return:
+        """
+        inputs = self.make_inputs(n=64)
+        ph = tf.placeholder(tf.float32, shape=inputs.shape)
+
+        directions = self.get_directions()
+        expected = compute_short_effects(
+            inputs={direction: ph for direction in directions},
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            short_engine='conv'
+        )
+        for engine in ('conv', 'shift', 'bank'):
+            packed = compute_packed_short_effects(
+                inputs={direction: ph for direction in directions},
+                data_format=self.data_format, use_cudnn=self.use_cudnn,
+                short_engine=engine
+            )
+
+            with self.test_session() as sess:
+                expected_, actual = sess.run([expected, packed],
+                                             feed_dict={ph: inputs})
+            with self.subTest(engine=engine):
+                self.assertTupleEqual((64, len(directions), 9, 9),
+                                      actual.shape)
+                for i, direction in enumerate(directions):
+                    self.assertAllEqual(
+                        np.reshape(expected_[direction], [64, 9, 9]),
+                        actual[:, i]
+                    )
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            ShortEffectLayer(
+                direction=Direction.UP, data_format=self.data_format,
+                short_engine='unknown'
+            )
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+numbaでコンパイルした1局面ずつの処理でAnnotationLayerと同じ出力を計算する
+
+探索のノードのようにバッチサイズが1の場合は、sess.runの1回の呼び出しに
+数ミリ秒かかり、そのほとんどが演算の呼び出しのオーバーヘッドになる
+ここでは1局面の処理をループで書いて@njitでコンパイルし、1局面を数十マイクロ秒で計算する
+バッチはprangeで局面ごとに並列に計算する
+
+計算の手順はvectorized.annotateと同じで、同じ表を使う
+移動先のマスごとに8方向の直線上で最初に当たる駒を求め、
+その駒の利き、王の直線上のピン、王手の回避先、王の逃げ先、駒を打つマスを求める
+
+    from annotation.numba_backend import annotate, annotate_position
+    action, black_count, white_count, check = annotate_position(board, hand)
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from numba import njit, prange
+
+from .numpy_backend import annotate_with
+from .piece import Piece
+from .vectorized.table import ACTION_SIZE, OFF_BOARD, PIECE_SIZE, get_tables
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+# numbaの中ではIntEnumを使えないので、intにしておく
+BLACK_FU = int(Piece.BLACK_FU)
+BLACK_KE = int(Piece.BLACK_KE)
+BLACK_OU = int(Piece.BLACK_OU)
+EMPTY = int(Piece.EMPTY)
+WHITE_FU = int(Piece.WHITE_FU)
+WHITE_KE = int(Piece.WHITE_KE)
+WHITE_OU = int(Piece.WHITE_OU)
+
+# numbaのnamedtupleとして関数に渡す表
+# グローバル変数の大きな配列を参照するとコンパイルの結果をキャッシュできない
+KernelTables = namedtuple('KernelTables', [
+    'ray', 'black_ke', 'white_ke', 'black_attack', 'white_attack',
+    'black_slider', 'white_slider', 'line', 'promotable', 'must_promote',
+    'padded_rank', 'drop_area'
+])
+
+
+def make_kernel_tables():
+    """
+    vectorized.tableの表を駒、方向、距離の次元に戻して並べる
+
+    :return:
+    """
+    tables = get_tables()
+    return KernelTables(
+        ray=tables.ray, black_ke=tables.black_ke, white_ke=tables.white_ke,
+        black_attack=np.reshape(tables.black_attack, [PIECE_SIZE, 8, 8]),
+        white_attack=np.reshape(tables.white_attack, [PIECE_SIZE, 8, 8]),
+        black_slider=np.reshape(tables.black_slider, [PIECE_SIZE, 8]),
+        white_slider=np.reshape(tables.white_slider, [PIECE_SIZE, 8]),
+        line=tables.line, promotable=tables.promotable,
+        must_promote=np.reshape(tables.must_promote, [PIECE_SIZE, 9]),
+        padded_rank=tables.padded_rank, drop_area=tables.drop_area
+    )
+
+
+_kernel_tables = None
+
+
+def get_kernel_tables():
+    global _kernel_tables
+    if _kernel_tables is None:
+        _kernel_tables = make_kernel_tables()
+    return _kernel_tables
+
+
+@njit(cache=True)
+def _find_first_pieces(padded, ray, first, first_piece, first_square,
+                       second, second_piece):
+    """
+    マスごとに8方向の直線上で最初に当たる駒と2番目に当たる駒を求める
+    vectorized.core._find_first_piecesと同じ値を書き込む
+
+    :param padded: [82]
+    :param ray: [81, 8, 9]
+    :param first: [81, 8]
+    :param first_piece: [81, 8]
+    :param first_square: [81, 8]
+    :param second: [81, 8]
+    :param second_piece: [81, 8]
+    :return:
+    """
+    for t in range(81):
+        for e in range(8):
+            # 直線の最後は盤の外なので、必ず止まる
+            k = 0
+            while padded[ray[t, e, k]] == EMPTY:
+                k += 1
+            j = k + 1
+            while j < 9 and padded[ray[t, e, j]] == EMPTY:
+                j += 1
+            if j == 9:
+                # 直線上に駒がない場合で、盤の外の後ろの空きマスの位置にする
+                j = 0
+
+            first[t, e] = k
+            first_piece[t, e] = padded[ray[t, e, k]]
+            first_square[t, e] = ray[t, e, k]
+            second[t, e] = j
+            second_piece[t, e] = padded[ray[t, e, j]]
+
+
+@njit(cache=True)
+def _find_king(board, king):
+    for t in range(81):
+        if board[t] == king:
+            return t, True
+    return 0, False
+
+
+@njit(cache=True)
+def _pin_line(first_piece, first_square, second_piece, king_square,
+              has_king, black, slider_table, line_table, line):
+    """
+    王の直線上で最初に当たる味方の駒の後ろに、王の方へ長い利きを持つ相手の駒があれば
+    その味方の駒はピンされている
+
+    :param first_piece:
+    :param first_square:
+    :param second_piece:
+    :param king_square:
+    :param has_king:
+    :param black: 手番側の王ならTrue
+    :param slider_table: 相手の駒のスライダーの表
+    :param line_table: 方向ごとの直線の番号+1
+    :param line: [82]、ピンされた駒のマスに直線の番号+1を書き込む
+    :return:
+    """
+    line[:] = 0
+    if not has_king:
+        return
+    for e in range(8):
+        piece = first_piece[king_square, e]
+        if black:
+            own = piece < WHITE_FU and piece != BLACK_OU
+        else:
+            own = WHITE_FU <= piece < EMPTY and piece != WHITE_OU
+        if own and slider_table[second_piece[king_square, e], e]:
+            line[first_square[king_square, e]] = line_table[e]
+
+
+@njit(cache=True)
+def _annotate_position(board, hand, action, black_count, white_count,
+                       tables):
+    """
+    1局面の出力を求める
+    出力の配列はゼロで初期化しておく
+
+    :param board: [81]のint32、手番側から見た盤面
+    :param hand: [7]のint32、手番側の持ち駒
+    :param action: [139, 81]のbool
+    :param black_count: [81]のint32
+    :param white_count: [81]のint32
+    :param tables: KernelTables
+    :return: 王手ならTrue
+    """
+    padded = np.empty(82, dtype=np.int32)
+    padded[:81] = board
+    padded[81] = OFF_BOARD
+
+    first = np.empty((81, 8), dtype=np.int32)
+    first_piece = np.empty((81, 8), dtype=np.int32)
+    first_square = np.empty((81, 8), dtype=np.int32)
+    second = np.empty((81, 8), dtype=np.int32)
+    second_piece = np.empty((81, 8), dtype=np.int32)
+    _find_first_pieces(padded, tables.ray, first, first_piece, first_square,
+                       second, second_piece)
+
+    black_king, has_black_king = _find_king(board, BLACK_OU)
+    white_king, has_white_king = _find_king(board, WHITE_OU)
+
+    # 王手と、王手している駒と長い利きで王手している駒と王の間のマス
+    evasion = np.zeros(82, dtype=np.bool_)
+    n_checks = 0
+    if has_black_king:
+        for e in range(8):
+            k = first[black_king, e]
+            if tables.white_attack[first_piece[black_king, e], e, min(k, 7)]:
+                n_checks += 1
+                for i in range(k + 1):
+                    evasion[tables.ray[black_king, e, i]] = True
+        for c in range(2):
+            square = tables.white_ke[black_king, c]
+            if padded[square] == WHITE_KE:
+                n_checks += 1
+                evasion[square] = True
+    check = n_checks > 0
+
+    # 王以外の駒が移動できるマス、両王手なら王以外は動けない
+    target = np.empty(81, dtype=np.bool_)
+    for t in range(81):
+        target[t] = not check or (n_checks == 1 and evasion[t])
+
+    # 手番側の王を取り除いた盤面での非手番側の利きと、手番側の利きの有無
+    white_effect = np.zeros(81, dtype=np.bool_)
+    black_effect = np.zeros(81, dtype=np.bool_)
+    for t in range(81):
+        for e in range(8):
+            k, piece = first[t, e], first_piece[t, e]
+            if tables.black_attack[piece, e, min(k, 7)]:
+                black_effect[t] = True
+            if piece == BLACK_OU:
+                k, piece = second[t, e], second_piece[t, e]
+            if tables.white_attack[piece, e, min(k, 7)]:
+                white_effect[t] = True
+        for c in range(2):
+            if padded[tables.black_ke[t, c]] == BLACK_KE:
+                black_effect[t] = True
+            if padded[tables.white_ke[t, c]] == WHITE_KE:
+                white_effect[t] = True
+
+    # 手番側の利きと移動の行動
+    pin = np.empty(82, dtype=np.int32)
+    _pin_line(first_piece, first_square, second_piece, black_king,
+              has_black_king, True, tables.white_slider, tables.line,
+              pin)
+    for t in range(81):
+        rank = t % 9
+        own = board[t] < WHITE_FU
+        movable = not own and target[t]
+        counted = not check or movable
+        for e in range(8):
+            k, piece = first[t, e], first_piece[t, e]
+            if not tables.black_attack[piece, e, min(k, 7)]:
+                continue
+            # 移動元から見た方向
+            d = 7 - e
+            if piece == BLACK_OU:
+                if white_effect[t]:
+                    continue
+                black_count[t] += 1
+                if not own:
+                    action[k * 16 + d, t] = True
+                continue
+
+            source_line = pin[first_square[t, e]]
+            if source_line != 0 and source_line != tables.line[e]:
+                continue
+            if counted:
+                black_count[t] += 1
+            if not movable:
+                continue
+            if not tables.must_promote[piece, rank]:
+                action[k * 16 + d, t] = True
+            if tables.promotable[piece] and (
+                    rank <= 2 or tables.padded_rank[first_square[t, e]] <= 2):
+                action[k * 16 + 8 + d, t] = True
+
+        for c in range(2):
+            square = tables.black_ke[t, c]
+            if padded[square] != BLACK_KE or pin[square] != 0:
+                continue
+            if counted:
+                black_count[t] += 1
+            if not movable:
+                continue
+            if rank > 1:
+                action[128 + c, t] = True
+            if rank <= 2:
+                action[130 + c, t] = True
+
+    # 非手番側の利き
+    # 非手番側の王は手番側の利きがないマスだけに利きがある
+    _pin_line(first_piece, first_square, second_piece, white_king,
+              has_white_king, False, tables.black_slider, tables.line,
+              pin)
+    for t in range(81):
+        for e in range(8):
+            k, piece = first[t, e], first_piece[t, e]
+            if not tables.white_attack[piece, e, min(k, 7)]:
+                continue
+            if piece == WHITE_OU:
+                if not black_effect[t]:
+                    white_count[t] += 1
+                continue
+            source_line = pin[first_square[t, e]]
+            if source_line == 0 or source_line == tables.line[e]:
+                white_count[t] += 1
+        for c in range(2):
+            square = tables.white_ke[t, c]
+            if padded[square] == WHITE_KE and pin[square] == 0:
+                white_count[t] += 1
+
+    # 駒を打つ行動
+    fu_file = np.zeros(9, dtype=np.bool_)
+    for t in range(81):
+        if board[t] == BLACK_FU:
+            fu_file[t // 9] = True
+    for t in range(81):
+        if board[t] != EMPTY or not target[t]:
+            continue
+        for piece in range(7):
+            if hand[piece] <= 0 or not tables.drop_area[piece, t]:
+                continue
+            if piece == BLACK_FU and fu_file[t // 9]:
+                continue
+            action[132 + piece, t] = True
+
+    return check
+
+
+@njit(cache=True, parallel=True)
+def _annotate_batch(board, hand, action, black_count, white_count, check,
+                    tables):
+    for i in prange(board.shape[0]):
+        check[i] = _annotate_position(board[i], hand[i], action[i],
+                                      black_count[i], white_count[i], tables)
+
+
+def annotate_relative(board, hand):
+    """
+    vectorized.annotateと同じ入出力で、局面ごとに並列に計算する
+
+    :param board: [batch, 81]の整数、手番側から見た盤面
+    :param hand: [batch, 7]の整数、手番側の持ち駒
+    :return: 行動[batch, 139, 81]のbool、
+        手番側の利きの数[batch, 81]と非手番側の利きの数[batch, 81]のint32、
+        王手[batch]のbool
+    """
+    board = np.ascontiguousarray(board, dtype=np.int32)
+    hand = np.ascontiguousarray(hand, dtype=np.int32)
+    batch_size = board.shape[0]
+
+    action = np.zeros((batch_size, ACTION_SIZE, 81), dtype=np.bool_)
+    black_count = np.zeros((batch_size, 81), dtype=np.int32)
+    white_count = np.zeros((batch_size, 81), dtype=np.int32)
+    check = np.zeros(batch_size, dtype=np.bool_)
+    _annotate_batch(board, hand, action, black_count, white_count, check,
+                    get_kernel_tables())
+    return action, black_count, white_count, check
+
+
+def annotate_position(board, hand):
+    """
+    1局面だけを計算する
+    バッチの次元を持たないので、探索のノードごとの呼び出しに使う
+
+    :param board: [81]または[9, 9]の整数、手番側から見た盤面
+    :param hand: [7]の整数、手番側の持ち駒
+    :return: 行動[139, 81]のbool、
+        手番側の利きの数[81]と非手番側の利きの数[81]のint32、王手のbool
+    """
+    board = np.ascontiguousarray(np.reshape(board, [81]), dtype=np.int32)
+    hand = np.ascontiguousarray(hand, dtype=np.int32)
+
+    action = np.zeros((ACTION_SIZE, 81), dtype=np.bool_)
+    black_count = np.zeros(81, dtype=np.int32)
+    white_count = np.zeros(81, dtype=np.int32)
+    check = _annotate_position(board, hand, action, black_count, white_count,
+                               get_kernel_tables())
+    return action, black_count, white_count, bool(check)
+
+
+def annotate(board, black_hand, white_hand=None, turn=None,
+             data_format='NCHW', action_format='list',
+             absolute_output=False):
+    """
+    AnnotationLayerと同じ4つの出力を求める
+    引数はnumpy_backend.annotateと同じ
+
+    :param board:
+    :param black_hand:
+    :param white_hand:
+    :param turn:
+    :param data_format:
+    :param action_format: 'list', 'dense', 'packed8', 'packed32'
+    :param absolute_output:
+    :return: 行動、手番側の利きの数、非手番側の利きの数、王手
+    """
+    return annotate_with(
+        annotate_relative, board=board, black_hand=black_hand,
+        white_hand=white_hand, turn=turn, data_format=data_format,
+        action_format=action_format, absolute_output=absolute_output
+    )
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+numpyだけでAnnotationLayerと同じ出力を計算する
+
+tensorflowとsonnetを読み込まないので、CPUだけで動く軽いプロセスからすぐに使える
+計算はvectorized.annotateをnumpyで実行する
+
+盤面は駒の種類ごとのuint64のビットボードではなく、[batch, 81]の配列のまま扱う
+移動先のマスごとに8方向の直線上で最初に当たる駒を表引きで求めて、
+利きや合法手をバッチ全体のbool型の配列の演算で求める
+
+    from annotation.numpy_backend import annotate
+    action, black_count, white_count, check = annotate(board, hand)
+"""
+
+import numpy as np
+
+from .vectorized import annotate as annotate_relative
+from .vectorized import (SparseAction, format_outputs, to_absolute,
+                         to_relative)
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+ACTION_FORMATS = ('list', 'dense', 'packed8', 'packed32', 'sparse')
+
+# 詰める型
+PACKED_TYPES = {
+    'packed8': np.uint8,
+    'packed32': np.uint32
+}
+
+
+def check_action_format(action_format):
+    if action_format not in ACTION_FORMATS:
+        raise ValueError(action_format)
+
+
+def pack_action(action, action_format):
+    """
+    行動をマスの次元をビットに詰めた整数にする
+    action_format.pack_actionと同じ並び
+
+    :param action: [batch, 139, 81]のbool
+    :param action_format: 'packed8'または'packed32'
+    :return: [batch, 139, 11]のuint8または[batch, 139, 3]のuint32
+    """
+    dtype = np.dtype(PACKED_TYPES[action_format])
+    n_bits = dtype.itemsize * 8
+    size = (81 + n_bits - 1) // n_bits
+
+    flag = np.zeros(action.shape[:2] + (size * n_bits,), dtype=np.bool_)
+    flag[..., :81] = action
+    # 下位ビットから詰めて、リトルエンディアンのバイト列として読む
+    data = np.packbits(flag, axis=-1, bitorder='little')
+    return data.view(dtype.newbyteorder('<')).astype(dtype)
+
+
+def make_sparse_action(action):
+    """
+    合法手だけを局面の順に並べる
+    action_format.make_sparse_actionと同じ並び
+
+    :param action: [batch, 139, 81]のbool
+    :return: SparseAction
+    """
+    batch, action_index, square = np.nonzero(action)
+    values = np.stack([action_index, square], axis=1).astype(np.int32)
+    count = np.sum(action, axis=(1, 2), dtype=np.int32)
+    offsets = np.concatenate([np.zeros(1, dtype=np.int32),
+                              np.cumsum(count, dtype=np.int32)])
+    return SparseAction(values=values, offsets=offsets, count=count)
+
+
+def annotate(board, black_hand, white_hand=None, turn=None,
+             data_format='NCHW', action_format='list',
+             absolute_output=False):
+    """
+    AnnotationLayerと同じ4つの出力を求める
+    turnを省略した場合は手番側から見た局面を入力する
+    turnを指定した場合は先手から見た局面を入力する
+
+    :param board: 盤面 [batch, 1, 9, 9]、[batch, 9, 9, 1]または[batch, 9, 9]
+    :param black_hand: 手番側の持ち駒
+        turnを指定した場合は先手の持ち駒
+    :param white_hand: turnを指定した場合は後手の持ち駒
+    :param turn: 手番 [batch]のbool、後手番ならTrue
+    :param data_format: 出力の形
+    :param action_format: 'list', 'dense', 'packed8', 'packed32', 'sparse'
+    :param absolute_output: turnを指定した場合に、盤面の形の出力を
+        先手から見た向きに戻すか
+    :return: 行動、手番側の利きの数、非手番側の利きの数、王手
+    """
+    return annotate_with(
+        lambda b, h: annotate_relative(np, b, h), board=board,
+        black_hand=black_hand, white_hand=white_hand, turn=turn,
+        data_format=data_format, action_format=action_format,
+        absolute_output=absolute_output
+    )
+
+
+def annotate_with(function, board, black_hand, white_hand=None, turn=None,
+                  data_format='NCHW', action_format='list',
+                  absolute_output=False):
+    """
+    手番側から見た局面の計算をfunctionで行い、入出力の変換はannotateと同じにする
+    numpy以外の実装でも同じ引数で呼び出せるようにする
+
+    :param function: 盤面[batch, 81]と持ち駒[batch, 7]から
+        vectorized.annotateと同じ出力を求める関数
+    :param board:
+    :param black_hand:
+    :param white_hand:
+    :param turn:
+    :param data_format:
+    :param action_format:
+    :param absolute_output:
+    :return:
+    """
+    check_action_format(action_format=action_format)
+
+    board = np.reshape(np.asarray(board, dtype=np.int32), [-1, 81])
+    black_hand = np.asarray(black_hand, dtype=np.int32)
+    if turn is not None:
+        if white_hand is None:
+            raise ValueError('white_hand is required')
+        turn = np.asarray(turn, dtype=np.bool_)
+        board, black_hand, _ = to_relative(np, board, black_hand,
+                                           np.asarray(white_hand), turn)
+
+    outputs = function(board, black_hand)
+    return finish_outputs(outputs, turn=turn, data_format=data_format,
+                          action_format=action_format,
+                          absolute_output=absolute_output)
+
+
+def finish_outputs(outputs, turn=None, data_format='NCHW',
+                   action_format='list', absolute_output=False):
+    """
+    手番側から見た局面で求めたvectorized.annotateと同じ出力を、
+    annotateと同じ形式の出力にする
+
+    :param outputs: 行動[batch, 139, 81]、手番側と非手番側の利きの数[batch, 81]、
+        王手[batch]
+    :param turn: 手番 [batch]のbool、Noneなら向きを変えない
+    :param data_format:
+    :param action_format:
+    :param absolute_output:
+    :return:
+    """
+    check_action_format(action_format=action_format)
+
+    action, black_count, white_count, check = outputs
+    if turn is not None and absolute_output:
+        action = to_absolute(np, action, turn)
+        black_count = to_absolute(np, black_count, turn)
+        white_count = to_absolute(np, white_count, turn)
+
+    outputs = (action, black_count, white_count, check)
+    if action_format in PACKED_TYPES or action_format == 'sparse':
+        _, black_count, white_count, check = format_outputs(
+            np, outputs, data_format=data_format, action_format='dense'
+        )
+        if action_format == 'sparse':
+            action = make_sparse_action(action)
+        else:
+            action = pack_action(action, action_format=action_format)
+        return action, black_count, white_count, check
+    return format_outputs(np, outputs, data_format=data_format,
+                          action_format=action_format)
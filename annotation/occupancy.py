@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+盤面の占有状況をまとめたもの
+
+空きマス、手番側の駒のマス、王のマスを盤面ごとに1回だけ求めて、各層で共有する
+AnnotationLayerが最初に一度だけ求めて、occupancy引数で各層に明示的に渡す
+盤面のテンソルをキーにして保存するので、
+引数を省略した層や選択の関数からも同じものを参照できる
+"""
+
+from collections import namedtuple
+
+import tensorflow as tf
+
+from .memo import lookup, store
+from .piece import Piece
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+# empty: 空きマス
+# black: 手番側の駒のマス (ピンされた駒は含まない)
+# non_black: 手番側の駒以外のマス (空きマスとピンされた駒を含む)
+# black_ou, white_ou: 王のマス、短い利きの入力に使うのでfloat32
+# black_ou_square: 手番側の王のマスの番号 [batch]、王がいない場合は0
+# has_black_ou: 手番側の王がいるか [batch]
+# ピンされた駒のマスは利きが必要なのでEffectContextが持つ
+Occupancy = namedtuple('Occupancy', ['board', 'empty', 'black', 'non_black',
+                                     'black_ou', 'white_ou',
+                                     'black_ou_square', 'has_black_ou'])
+
+
+def make_occupancy(board):
+    """
+    盤面の占有状況を求める
+    同じ盤面に対しては一度だけ計算する
+
+    :param board:
+    :return:
+    """
+    name = 'occupancy'
+    cached = lookup(name, board)
+    if cached is not None:
+        return cached
+
+    with tf.name_scope(name):
+        empty = tf.equal(board, Piece.EMPTY)
+        black = tf.less(board, Piece.WHITE_FU)
+        non_black = tf.logical_not(black)
+        black_ou = tf.to_float(tf.equal(board, Piece.BLACK_OU))
+        white_ou = tf.to_float(tf.equal(board, Piece.WHITE_OU))
+
+        # 盤面はチャンネルが1つなのでdata_formatによらずに並べられる
+        flat_ou = tf.reshape(black_ou, [-1, 81])
+        black_ou_square = tf.argmax(flat_ou, axis=1, output_type=tf.int32)
+        has_black_ou = tf.reduce_any(tf.greater(flat_ou, 0), axis=1)
+
+    occupancy = Occupancy(board=board, empty=empty, black=black,
+                          non_black=non_black, black_ou=black_ou,
+                          white_ou=white_ou, black_ou_square=black_ou_square,
+                          has_black_ou=has_black_ou)
+
+    store(occupancy, name, board)
+
+    return occupancy
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AnnotationLayerと同じ入出力のONNXのモデルを作る
+
+onnxruntimeで学習したネットワークと同じセッションの中で実行できるように、
+盤面と持ち駒を入力して、行動、利きの数、王手を出力するモデルにする
+バッチサイズは決めない
+
+AnnotationLayerのグラフは駒ごとの盤面のPadや畳み込み、boolのgatherなどを使うので、
+計算の中身はvectorized.annotate(集める操作と要素ごとの演算だけの実装)を
+TensorFlow 2で追跡し、tf2onnxで変換する
+tensorflow.experimental.numpyのtake_along_axisは、
+ONNXにない演算(BroadcastArgs)を使うので、tf.gatherで置き換える
+
+    from annotation.onnx_export import export_onnx
+    export_onnx('annotation.onnx', data_format='NCHW')
+"""
+
+import onnx
+import tensorflow as tf
+import tensorflow.experimental.numpy as tnp
+import tf2onnx
+
+from .vectorized import annotate, format_outputs
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+INPUT_NAMES = ('board', 'hand')
+# AnnotationLayerの出力の名前と同じ
+OUTPUT_NAMES = ('action', 'black_count', 'white_count', 'check')
+DEFAULT_OPSET = 13
+
+
+class OnnxNumpy(object):
+    """
+    tensorflow.experimental.numpyの関数のうち、
+    ONNXに変換できない演算を使うものを置き換える
+    """
+    def __getattr__(self, name):
+        return getattr(tnp, name)
+
+    @staticmethod
+    def take_along_axis(arr, indices, axis):
+        """
+        numpy.take_along_axisと同じ
+        indicesの軸より後ろの次元の大きさが1の場合は、arrの形に広げる
+
+        :param arr:
+        :param indices:
+        :param axis:
+        :return:
+        """
+        arr = tf.convert_to_tensor(arr)
+        indices = tf.convert_to_tensor(indices)
+        rank = len(arr.shape)
+        if axis < 0:
+            axis += rank
+        if axis == rank - 1:
+            return tf.gather(arr, indices, axis=axis, batch_dims=axis)
+
+        # 軸を最後に移して、軸より前の次元をバッチの次元としてgatherする
+        perm = list(range(axis)) + list(range(axis + 1, rank)) + [axis]
+        arr = tf.transpose(arr, perm)
+        indices = tf.transpose(indices, perm)
+        shape = tf.concat([tf.shape(arr)[:-1], tf.shape(indices)[-1:]],
+                          axis=0)
+        indices = tf.broadcast_to(indices, shape)
+        result = tf.gather(arr, indices, axis=rank - 1, batch_dims=rank - 1)
+
+        inverse = list(range(axis)) + [rank - 1] + list(range(axis, rank - 1))
+        return tf.transpose(result, inverse)
+
+
+def make_annotation_function(data_format):
+    """
+    盤面と持ち駒からAnnotationLayerと同じ4つの出力を求めるtf.function
+    行動の出力形式はdense
+
+    :param data_format:
+    :return:
+    """
+    xp = OnnxNumpy()
+
+    if data_format == 'NCHW':
+        board_shape = [None, 1, 9, 9]
+    else:
+        board_shape = [None, 9, 9, 1]
+    input_signature = [
+        tf.TensorSpec(board_shape, dtype=tf.int32, name=INPUT_NAMES[0]),
+        tf.TensorSpec([None, 7], dtype=tf.int32, name=INPUT_NAMES[1])
+    ]
+
+    def function(board, hand):
+        outputs = annotate(xp, tf.reshape(board, [-1, 81]), hand)
+        outputs = format_outputs(xp, outputs, data_format=data_format,
+                                 action_format='dense')
+        return tuple(tf.convert_to_tensor(output) for output in outputs)
+    return tf.function(function, input_signature=input_signature)
+
+
+def rename_outputs(model, names=OUTPUT_NAMES):
+    """
+    tf2onnxが付けた出力の名前を置き換えて、入出力のバッチの次元をbatchという名前にする
+
+    :param model: onnx.ModelProto
+    :param names:
+    :return:
+    """
+    graph = model.graph
+    for output, name in zip(graph.output, names):
+        for node in graph.node:
+            for values in (node.input, node.output):
+                for i, value in enumerate(values):
+                    if value == output.name:
+                        values[i] = name
+        output.name = name
+
+    for value in list(graph.input) + list(graph.output):
+        value.type.tensor_type.shape.dim[0].dim_param = 'batch'
+    return model
+
+
+def export_onnx(path, data_format, opset=DEFAULT_OPSET):
+    """
+    ONNXのモデルを作って保存する
+    入力はboard ([batch, 1, 9, 9]または[batch, 9, 9, 1]のint32)と
+    hand ([batch, 7]のint32)で、手番側から見た局面
+    出力はaction, black_count, white_count, checkで、
+    AnnotationLayer(action_format='dense')と同じ形と型
+
+    :param path: 保存先のファイル
+    :param data_format:
+    :param opset:
+    :return: onnx.ModelProto
+    """
+    function = make_annotation_function(data_format=data_format)
+    model, _ = tf2onnx.convert.from_function(
+        function, input_signature=function.input_signature, opset=opset
+    )
+    model = rename_outputs(model)
+    onnx.checker.check_model(model)
+    onnx.save(model, str(path))
+    return model
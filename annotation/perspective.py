@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+先手から見た局面(絶対的な向きの局面)と手番側から見た局面を変換する
+
+後手番の局面は盤面を180度回転して、駒の先後を入れ替え、持ち駒を入れ替える
+局面ごとに手番が異なってもよいように、グラフの中でまとめて変換する
+
+マスの番号は筋 * 9 + 段なので、180度の回転は番号の逆順になる
+"""
+
+import numpy as np
+import tensorflow as tf
+
+from .memo import lookup, store
+from .piece import Piece
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def make_swap_array():
+    """
+    駒の先後を入れ替える表
+    空きマスはそのまま
+
+    :return:
+    """
+    table = np.arange(Piece.SIZE, dtype=np.int32)
+    table[Piece.BLACK_FU:Piece.WHITE_FU] += Piece.WHITE_FU - Piece.BLACK_FU
+    table[Piece.WHITE_FU:Piece.EMPTY] -= Piece.WHITE_FU - Piece.BLACK_FU
+    return table
+
+
+def make_swap_table():
+    name = 'perspective_swap'
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    table = tf.constant(make_swap_array(), dtype=tf.int32, name=name)
+
+    store(table, name)
+
+    return table
+
+
+def rotate_board(board, turn=None):
+    """
+    盤面の形のテンソルを180度回転する
+    data_formatに関係なく盤面の並びは(筋, 段)
+
+    :param board: [batch, 1, 9, 9]または[batch, 9, 9, 1]
+        盤面をまとめた[batch, n, 9, 9]でもよい
+    :param turn: [batch]のbool、Trueの局面だけを回転する
+        省略した場合は全ての局面を回転する
+    :return:
+    """
+    flat = tf.reshape(board, [tf.shape(board)[0], -1, 81])
+    rotated = tf.reverse(flat, axis=[2])
+    if turn is not None:
+        rotated = tf.where(tf.reshape(turn, [-1]), rotated, flat)
+    return tf.reshape(rotated, tf.shape(board))
+
+
+def flip_board(board, turn=None):
+    """
+    相手から見た盤面にする
+    180度回転して、駒の先後を入れ替える
+
+    :param board:
+    :param turn: [batch]のbool、Trueの局面だけを変換する
+        省略した場合は全ての局面を変換する
+    :return:
+    """
+    swapped = tf.gather(make_swap_table(), board)
+    if turn is not None:
+        turn = tf.reshape(turn, [-1])
+        swapped = tf.reshape(
+            tf.where(turn, tf.reshape(swapped, [-1, 81]),
+                     tf.reshape(board, [-1, 81])),
+            tf.shape(board)
+        )
+    return rotate_board(board=swapped, turn=turn)
+
+
+def to_relative(board, black_hand, white_hand, turn):
+    """
+    先手から見た局面を手番側から見た局面にする
+
+    :param board: 先手から見た盤面
+    :param black_hand: 先手の持ち駒 [batch, 7]
+    :param white_hand: 後手の持ち駒 [batch, 7]
+    :param turn: [batch]のbool、後手番ならTrue
+    :return: 手番側から見た盤面、手番側の持ち駒、非手番側の持ち駒
+    """
+    with tf.name_scope('to_relative'):
+        turn = tf.reshape(turn, [-1])
+        relative_board = flip_board(board=board, turn=turn)
+        turn_hand = tf.where(turn, white_hand, black_hand)
+        next_hand = tf.where(turn, black_hand, white_hand)
+    return relative_board, turn_hand, next_hand
+
+
+def to_absolute(output, turn):
+    """
+    手番側から見た盤面の形の出力を先手から見た向きに戻す
+    マスの位置だけを戻すので、行動の方向などの意味は手番側から見たまま
+
+    :param output: 盤面の形のテンソル、またはそのlist
+    :param turn: [batch]のbool、後手番ならTrue
+    :return:
+    """
+    if isinstance(output, (list, tuple)):
+        return type(output)(to_absolute(output=o, turn=turn) for o in output)
+    return rotate_board(board=output, turn=turn)
+
+
+def stack_both_sides(board, black_hand, white_hand):
+    """
+    手番側から見た局面と非手番側から見た局面をバッチの方向に重ねる
+    前半が手番側、後半が非手番側から見た局面になる
+
+    :param board: 手番側から見た盤面
+    :param black_hand: 手番側の持ち駒
+    :param white_hand: 非手番側の持ち駒
+    :return:
+    """
+    with tf.name_scope('stack_both_sides'):
+        stacked_board = tf.concat([board, flip_board(board=board)], axis=0)
+        stacked_hand = tf.concat([black_hand, white_hand], axis=0)
+    return stacked_board, stacked_hand
+
+
+def split_both_sides(output):
+    """
+    stack_both_sidesで重ねた局面の出力を前半と後半に分ける
+
+    :param output: テンソル、またはそのlist
+    :return: 前半と後半の組
+    """
+    if isinstance(output, (list, tuple)):
+        pairs = [split_both_sides(output=o) for o in output]
+        return (type(output)(p[0] for p in pairs),
+                type(output)(p[1] for p in pairs))
+    size = tf.shape(output)[0] // 2
+    return output[:size], output[size:]
+
+
+def mirror_both_sides(output):
+    """
+    stack_both_sidesで重ねた局面の出力で、前半と後半を入れ替えて180度回転する
+    相手から見た局面の出力を自分から見た向きにする
+
+    :param output: 盤面の形のテンソル
+    :return:
+    """
+    first, second = split_both_sides(output=output)
+    return rotate_board(board=tf.concat([second, first], axis=0))
@@ -1,13 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import sonnet as snt
 import tensorflow as tf
 
-from ..boolean_board import select_black_all_board
-from ..direction import (get_eight_directions, get_opposite_direction,
-                         PinDirection)
+from ..direction import get_eight_directions, PinDirection
+from ..memo import lookup, store
+from ..naive_effect.packed import (as_packed_effects, reverse_directions,
+                                   to_packed_plane)
+from ..occupancy import make_occupancy
 from ..piece import Piece
+
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/17'
 
@@ -17,33 +21,64 @@ class BlackPinLayer(snt.AbstractModule):
         super().__init__(name=name)
         self.data_format = data_format
 
-    def _build(self, board, black_pseudo_ou_effect, white_long_effect):
+    def _build(self, board, black_pseudo_ou_effect, white_long_effect,
+               occupancy=None):
         """
+        8方向をまとめた[batch, 8, 9, 9]の形で計算する
 
         :param board:
-        :param black_pseudo_ou_effect:
-        :param white_long_effect:
+        :param black_pseudo_ou_effect: [batch, 8, 9, 9]
+            方向ごとのdictでもよい
+        :param white_long_effect: [batch, 8, 9, 9]
+            方向ごとのdictでもよい
+        :param occupancy: boardのmake_occupancyの出力
+            省略した場合はここで求める
         :return:
         """
-        # もともとのboardの値を初期値としてセット
-        pin_value_list = [board]
-
-        black_piece = select_black_all_board(board=board)
-        for direction in get_eight_directions():
-            # 反対同士からの利きが当たっている駒はピンされている
-            flag = tf.logical_and(
-                black_pseudo_ou_effect[direction],
-                white_long_effect[get_opposite_direction(direction)]
-            )
-            # 王手されている場合の経路の可能性もある
-            # ピンならば、駒がある
-            pinned = tf.logical_and(flag, black_piece)
-
-            # ピンされているならば、そのマスだけがTrue
-            # ピンの方向に対応した値を計算
-            offset = Piece.SIZE + 14 * PinDirection[direction.name]
-            pin_value_list.append(offset * tf.to_int32(pinned))
+        if occupancy is None:
+            occupancy = make_occupancy(board=board)
+        black_piece = to_packed_plane(occupancy.black)
+
+        # 反対同士からの利きが当たっている駒はピンされている
+        # 逆方向は方向の軸を反転すると得られる
+        flag = tf.logical_and(
+            as_packed_effects(black_pseudo_ou_effect),
+            reverse_directions(as_packed_effects(white_long_effect))
+        )
+        # 王手されている場合の経路の可能性もある
+        # ピンならば、駒がある
+        pinned = tf.logical_and(flag, black_piece)
+
+        # ピンされているならば、そのマスだけがTrue
+        # ピンの方向に対応した値を計算
+        pin_value = tf.reduce_sum(
+            make_black_pin_offset() * tf.to_int32(pinned), axis=1
+        )
 
         # ピンされているマスに方向に応じた値を加える
-        pinned_board = tf.add_n(pin_value_list)
+        pinned_board = board + tf.reshape(pin_value, tf.shape(board))
         return pinned_board
+
+
+def make_black_pin_offset():
+    """
+    方向ごとにピンされている場合に加える値
+    [1, 8, 1, 1]で、[batch, 8, 9, 9]と放送できる
+
+    :return:
+    """
+    name = 'black_pin_offset'
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    offset = np.array([
+        Piece.SIZE + 14 * PinDirection[direction.name]
+        for direction in get_eight_directions()
+    ], dtype=np.int32)
+    offset = tf.constant(np.reshape(offset, [1, 8, 1, 1]), dtype=tf.int32,
+                         name=name)
+
+    store(offset, name)
+
+    return offset
@@ -46,7 +46,7 @@ class TestBlackPin(tf.test.TestCase):
         }
         pinned_board = BlackPinLayer(
             data_format=self.data_format
-        )(ph, pseudo_effect, long_effect)
+        )(ph, pseudo_effect.long, long_effect)
         offset = tf.squeeze(pinned_board - ph)
 
         long_piece_list = (Piece.WHITE_KY, Piece.WHITE_KA, Piece.WHITE_HI,
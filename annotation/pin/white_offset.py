@@ -1,12 +1,15 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import sonnet as snt
 import tensorflow as tf
 
-from ..boolean_board import select_white_all_board
-from ..direction import (get_eight_directions, get_opposite_direction,
-                         PinDirection)
+from ..direction import get_eight_directions, PinDirection
+from ..memo import lookup, store
+from ..naive_effect.packed import (as_packed_effects, reverse_directions,
+                                   to_packed_plane)
+from ..occupancy import make_occupancy
 from ..piece import Piece
 
 __author__ = 'Yasuhiro'
@@ -18,30 +21,63 @@ class WhitePinLayer(snt.AbstractModule):
         super().__init__(name=name)
         self.data_format = data_format
 
-    def _build(self, board, white_pseudo_ou_effect, black_long_effect):
+    def _build(self, board, white_pseudo_ou_effect, black_long_effect,
+               occupancy=None):
         """
+        8方向をまとめた[batch, 8, 9, 9]の形で計算する
 
         :param board:
-        :param white_pseudo_ou_effect:
-        :param black_long_effect:
+        :param white_pseudo_ou_effect: [batch, 8, 9, 9]
+            方向ごとのdictでもよい
+        :param black_long_effect: [batch, 8, 9, 9]
+            方向ごとのdictでもよい
+        :param occupancy: boardのmake_occupancyの出力
+            省略した場合はここで求める
         :return:
         """
-        pin_value_list = [board]
-        white_piece = select_white_all_board(board=board)
-        for direction in get_eight_directions():
-            # 反対同士からの利きが当たっている駒はピンされている
-            flag = tf.logical_and(
-                white_pseudo_ou_effect[direction],
-                black_long_effect[get_opposite_direction(direction)]
-            )
-            # ピンされているならば、そのマスだけがTrue
-            pinned = tf.logical_and(flag, white_piece)
-
-            # ピンの方向に対応した値を計算
-            offset = (Piece.SIZE - Piece.WHITE_FU +
-                      14 * PinDirection[direction.name])
-            pin_value_list.append(offset * tf.to_int32(pinned))
+        if occupancy is None:
+            occupancy = make_occupancy(board=board)
+        # 空きマスも含む
+        white_piece = to_packed_plane(occupancy.non_black)
+
+        # 反対同士からの利きが当たっている駒はピンされている
+        # 逆方向は方向の軸を反転すると得られる
+        flag = tf.logical_and(
+            as_packed_effects(white_pseudo_ou_effect),
+            reverse_directions(as_packed_effects(black_long_effect))
+        )
+        # ピンされているならば、そのマスだけがTrue
+        pinned = tf.logical_and(flag, white_piece)
+
+        # ピンの方向に対応した値を計算
+        pin_value = tf.reduce_sum(
+            make_white_pin_offset() * tf.to_int32(pinned), axis=1
+        )
 
         # ピンされているマスに方向に応じた値を加える
-        pinned_board = tf.add_n(pin_value_list)
+        pinned_board = board + tf.reshape(pin_value, tf.shape(board))
         return pinned_board
+
+
+def make_white_pin_offset():
+    """
+    方向ごとにピンされている場合に加える値
+    [1, 8, 1, 1]で、[batch, 8, 9, 9]と放送できる
+
+    :return:
+    """
+    name = 'white_pin_offset'
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    offset = np.array([
+        Piece.SIZE - Piece.WHITE_FU + 14 * PinDirection[direction.name]
+        for direction in get_eight_directions()
+    ], dtype=np.int32)
+    offset = tf.constant(np.reshape(offset, [1, 8, 1, 1]), dtype=tf.int32,
+                         name=name)
+
+    store(offset, name)
+
+    return offset
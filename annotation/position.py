@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+指し手を進めたり戻したりしながら、利きの状態を差分で更新する局面
+
+盤面と持ち駒に加えて、先手と後手の駒のマスごとの利きの数、ピンされた駒、
+王手の状態を保持する
+1手で変わるのは移動元と移動先のマスの駒と、そのマスを通る長い利きだけなので、
+そのマスの駒の利きと、そのマスを通る直線の利きだけを更新する
+
+盤面は先手から見た向きで、マスの番号は筋 * 9 + 段
+保持する利きの数はピンや王手を考えないので、AnnotationLayerの利きの数とは異なる
+annotateは保持している利きの数、ピン、王手の状態から、ピンされた駒と王の利きの分を
+補正してAnnotationLayerと同じ出力を必要な時に求める
+
+    position = Position()
+    position.do_move('7g7f')
+    action, black_count, white_count, check = position.annotate()
+    position.undo_move()
+"""
+
+import numpy as np
+
+from .direction import Direction
+from .initial_board import make_initial_board
+from .numpy_backend import finish_outputs
+from .piece import Piece
+from .vectorized.table import (ACTION_SIZE, OFF_BOARD_SQUARE,
+                               make_attack_array, make_drop_area_array,
+                               make_ke_index_array, make_line_array,
+                               make_promotion_arrays, make_ray_index_array)
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+EMPTY = int(Piece.EMPTY)
+WHITE_FU = int(Piece.WHITE_FU)
+BLACK_OU = int(Piece.BLACK_OU)
+WHITE_OU = int(Piece.WHITE_OU)
+BLACK_KE = int(Piece.BLACK_KE)
+WHITE_KE = int(Piece.WHITE_KE)
+BLACK_FU = int(Piece.BLACK_FU)
+
+# USI形式の駒の名前から持ち駒の番号への変換
+DROP_PIECES = {
+    'P': Piece.BLACK_FU, 'L': Piece.BLACK_KY, 'N': Piece.BLACK_KE,
+    'S': Piece.BLACK_GI, 'G': Piece.BLACK_KI, 'B': Piece.BLACK_KA,
+    'R': Piece.BLACK_HI
+}
+
+
+def make_tables():
+    """
+    1マスずつ処理するので、numpyの配列ではなくlistの表にする
+
+    :return: 直線上のマス[81][8][8]、
+        駒から見た桂馬の移動先のマス[81][2]を先手と後手の順に並べたもの、
+        駒と移動先から見た方向と距離-1ごとの利き[PIECE_SIZE][8][8]、
+        長い利きの有無[PIECE_SIZE][8]、方向ごとの直線の番号+1[8]、
+        手番側の駒ごとに成れるか[PIECE_SIZE]、
+        手番側の駒と移動先の段ごとに成らないと動けないか[PIECE_SIZE][9]、
+        持ち駒ごとに打てる段[7][9]
+    """
+    attack = make_attack_array(black=True) | make_attack_array(black=False)
+    ke = (
+        make_ke_index_array(),
+        make_ke_index_array(directions=(Direction.RIGHT_DOWN_DOWN,
+                                        Direction.LEFT_DOWN_DOWN))
+    )
+    promotable, must_promote = make_promotion_arrays()
+    return (make_ray_index_array().tolist(),
+            tuple(table.tolist() for table in ke),
+            attack.tolist(), attack[:, :, 1].tolist(),
+            make_line_array().tolist(),
+            promotable.tolist(), must_promote.tolist(),
+            make_drop_area_array()[:, :9].tolist())
+
+
+(RAY, KE_SQUARE, ATTACK, SLIDER, LINE,
+ PROMOTABLE, MUST_PROMOTE, DROP_RANK) = make_tables()
+
+
+def get_color(piece):
+    """
+    駒の持ち主
+
+    :param piece:
+    :return: 先手の駒なら0、後手の駒なら1、空きマスなら-1
+    """
+    if piece < WHITE_FU:
+        return 0
+    elif piece < EMPTY:
+        return 1
+    return -1
+
+
+def get_hand_piece(piece):
+    """
+    取った駒を持ち駒にした時の番号
+
+    :param piece:
+    :return:
+    """
+    piece %= WHITE_FU
+    if piece >= Piece.BLACK_TO:
+        piece -= Piece.BLACK_TO
+    return piece
+
+
+class Position(object):
+    __slots__ = ('board', 'hand', 'turn', 'effect', 'pin', 'king',
+                 '_history')
+
+    def __init__(self, board=None, black_hand=None, white_hand=None,
+                 turn=False):
+        """
+        省略した場合は平手の初期局面
+
+        :param board: 先手から見た盤面 [81]または[9, 9] (筋, 段)
+        :param black_hand: 先手の持ち駒 [7]
+        :param white_hand: 後手の持ち駒 [7]
+        :param turn: 後手番ならTrue
+        """
+        if board is None:
+            board = make_initial_board()
+        self.board = np.reshape(np.array(board, dtype=np.int32), [81])
+
+        self.hand = np.zeros((2, 7), dtype=np.int32)
+        if black_hand is not None:
+            self.hand[0] = black_hand
+        if white_hand is not None:
+            self.hand[1] = white_hand
+        self.turn = bool(turn)
+
+        # 先手と後手の駒の利きの数、ピンを考えない
+        self.effect = np.zeros((2, 81), dtype=np.int32)
+        # 先手と後手のピンされた駒の直線の番号+1、ピンされていなければ0
+        self.pin = np.zeros((2, 81), dtype=np.int32)
+        # 先手と後手の王のマス、王がいなければ-1
+        self.king = [-1, -1]
+        self._history = []
+
+        for square in range(81):
+            piece = int(self.board[square])
+            if piece == BLACK_OU:
+                self.king[0] = square
+            elif piece == WHITE_OU:
+                self.king[1] = square
+            if piece != EMPTY:
+                self._add_piece_effect(square, piece, 1)
+        self._update_pin()
+
+    def __str__(self):
+        s = """<{turn}>
+{board}
+{black_hand}
+{white_hand}
+""".format(turn='white' if self.turn else 'black',
+           board=np.reshape(self.board, [9, 9]),
+           black_hand=self.hand[0], white_hand=self.hand[1])
+
+        return s
+
+    @property
+    def check(self):
+        """
+        手番側の王が王手されているか
+
+        :return:
+        """
+        return self.n_checks > 0
+
+    @property
+    def n_checks(self):
+        """
+        手番側の王に王手している駒の数
+
+        :return:
+        """
+        color = int(self.turn)
+        king = self.king[color]
+        if king < 0:
+            return 0
+        return int(self.effect[1 - color, king])
+
+    def do_move(self, move):
+        """
+        指し手で局面を進める
+        合法手かどうかは確認しない
+
+        :param move: USI形式の指し手の文字列
+        :return:
+        """
+        move = str(move)
+        color = int(self.turn)
+        target = (int(move[2]) - 1) * 9 + ord(move[3]) - ord('a')
+
+        if move[1] == '*':
+            piece = DROP_PIECES[move[0]]
+            self.hand[color, piece] -= 1
+            self._set_square(target, piece + color * WHITE_FU)
+            self._history.append((-1, target, EMPTY, EMPTY))
+        else:
+            source = (int(move[0]) - 1) * 9 + ord(move[1]) - ord('a')
+            piece = int(self.board[source])
+            captured = int(self.board[target])
+            if captured != EMPTY:
+                self.hand[color, get_hand_piece(captured)] += 1
+
+            promoted = piece + 8 if move.endswith('+') else piece
+            self._set_square(target, promoted)
+            self._set_square(source, EMPTY)
+            if piece in (BLACK_OU, WHITE_OU):
+                self.king[color] = target
+            self._history.append((source, target, piece, captured))
+
+        self.turn = not self.turn
+        self._update_pin()
+
+    def undo_move(self):
+        """
+        最後の指し手を戻す
+
+        :return:
+        """
+        source, target, piece, captured = self._history.pop()
+        self.turn = not self.turn
+        color = int(self.turn)
+
+        if source < 0:
+            dropped = int(self.board[target])
+            self._set_square(target, EMPTY)
+            self.hand[color, get_hand_piece(dropped)] += 1
+        else:
+            self._set_square(source, piece)
+            self._set_square(target, captured)
+            if captured != EMPTY:
+                self.hand[color, get_hand_piece(captured)] -= 1
+            if piece in (BLACK_OU, WHITE_OU):
+                self.king[color] = source
+
+        self._update_pin()
+
+    def inputs(self, data_format='NCHW'):
+        """
+        AnnotationLayerにturnを指定して入力する形の局面
+        バッチサイズは1
+
+        :param data_format:
+        :return: 盤面[1, 1, 9, 9]または[1, 9, 9, 1]、先手の持ち駒[1, 7]、
+            後手の持ち駒[1, 7]、手番[1]
+        """
+        if data_format == 'NCHW':
+            shape = [1, 1, 9, 9]
+        else:
+            shape = [1, 9, 9, 1]
+        return (np.reshape(self.board, shape), self.hand[:1].copy(),
+                self.hand[1:].copy(), np.array([self.turn]))
+
+    def annotate(self, data_format='NCHW', action_format='list',
+                 absolute_output=False):
+        """
+        AnnotationLayerと同じ4つの出力を求める
+        バッチサイズは1
+        差分で更新した利きの数、ピン、王手の状態から求める
+
+        :param data_format:
+        :param action_format: 'list', 'dense', 'packed8', 'packed32', 'sparse'
+        :param absolute_output: 盤面の形の出力を先手から見た向きにするか
+        :return: 行動、手番側の利きの数、非手番側の利きの数、王手
+        """
+        outputs = [output[np.newaxis] for output in self._annotate()]
+        return finish_outputs(outputs, turn=np.array([self.turn]),
+                              data_format=data_format,
+                              action_format=action_format,
+                              absolute_output=absolute_output)
+
+    def _annotate(self):
+        """
+        手番側から見た向きで、vectorized.annotateと同じ1局面の出力を求める
+
+        保持している利きの数はピンや王手を考えないので、次の分を補正する
+            ピンされた駒の、ピンの直線から外れた利き
+            手番側の王の利きのうち、手番側の王を取り除いた盤面で
+            非手番側の利きがあるマス
+            非手番側の王の利きのうち、手番側の利きがあるマス
+            王手されている場合は、王以外の駒の利きは王手を防げるマスだけ
+
+        :return: 行動[139, 81]のbool、手番側と非手番側の利きの数[81]のint32、
+            王手のbool
+        """
+        color = int(self.turn)
+        board = self.board
+        colors = np.where(board < WHITE_FU, 0,
+                          np.where(board < EMPTY, 1, -1))
+        own = colors == color
+
+        n_checks = self.n_checks
+        if n_checks == 0:
+            target = np.ones(81, dtype=np.bool_)
+        elif n_checks == 1:
+            target = self._find_evasion(color)
+        else:
+            # 両王手なら王以外は動けない
+            target = np.zeros(81, dtype=np.bool_)
+        movable = ~own & target
+        counted = (n_checks == 0) | movable
+
+        # ピンされた駒の、ピンの直線から外れた利き
+        unpinned = self.effect.copy()
+        for c in range(2):
+            for square in np.flatnonzero(self.pin[c]):
+                line = self.pin[c, square]
+                for d, _, t in self._iter_targets(square, board[square]):
+                    if d >= 8 or LINE[d] != line:
+                        unpinned[c, t] -= 1
+
+        # 王の利き
+        king_effect = np.zeros((2, 81), dtype=np.int32)
+        for c, king in enumerate(self.king):
+            if king >= 0:
+                for _, _, t in self._iter_targets(king, board[king]):
+                    king_effect[c, t] = 1
+        # 手番側の王は、王を取り除いた盤面で非手番側の利きがないマスだけに利きがある
+        safe = (self.effect[1 - color] + self._through_king(color)) == 0
+        black_king = king_effect[color] * safe
+        black_count = (np.where(counted, unpinned[color] - king_effect[color],
+                                0) + black_king).astype(np.int32)
+        # 非手番側の王は手番側の利きがないマスだけに利きがある
+        white_count = (unpinned[1 - color] - king_effect[1 - color] *
+                       (self.effect[color] > 0)).astype(np.int32)
+
+        action = np.zeros((ACTION_SIZE, 81), dtype=np.bool_)
+        for source in np.flatnonzero(own):
+            piece = int(board[source])
+            if piece == BLACK_OU + color * WHITE_FU:
+                for d, _, t in self._iter_targets(source, piece):
+                    if black_king[t] and not own[t]:
+                        action[self._direction(d, color), t] = True
+            else:
+                self._add_moves(action, source, piece, movable, color)
+
+        # 駒を打つ行動
+        droppable = (board == EMPTY) & target
+        own_fu = np.any(np.reshape(board == BLACK_FU + color * WHITE_FU,
+                                   [9, 9]), axis=1)
+        for piece in np.flatnonzero(self.hand[color]):
+            for t in np.flatnonzero(droppable):
+                if not DROP_RANK[piece][self._relative_rank(t, color)]:
+                    continue
+                if piece == BLACK_FU and own_fu[t // 9]:
+                    continue
+                action[132 + piece, t] = True
+
+        if color:
+            # 手番側から見た向きにする
+            action = action[:, ::-1]
+            black_count = black_count[::-1]
+            white_count = white_count[::-1]
+        return action, black_count, white_count, np.array(n_checks > 0)
+
+    def _add_moves(self, action, source, piece, movable, color):
+        """
+        王以外の駒の移動の行動を加える
+
+        :param action: [139, 81]、先手から見たマスの番号
+        :param source:
+        :param piece:
+        :param movable: 移動できるマス[81]
+        :param color: 手番
+        :return:
+        """
+        line = self.pin[color, source]
+        # 手番側から見た駒と移動元の段
+        relative = piece - color * WHITE_FU
+        source_rank = self._relative_rank(source, color)
+        for d, k, t in self._iter_targets(source, piece):
+            if not movable[t]:
+                continue
+            rank = self._relative_rank(t, color)
+            if d >= 8:
+                if line:
+                    continue
+                # 後手の桂馬は180度回転すると左右が入れ替わる
+                index = 128 + (d - 8 if color == 0 else 9 - d)
+                if rank >= 2:
+                    action[index, t] = True
+                if rank <= 2:
+                    action[index + 2, t] = True
+                continue
+            if line and LINE[d] != line:
+                continue
+            index = k * 16 + self._direction(d, color)
+            if not MUST_PROMOTE[relative][rank]:
+                action[index, t] = True
+            if PROMOTABLE[relative] and (rank <= 2 or source_rank <= 2):
+                action[index + 8, t] = True
+
+    def _find_evasion(self, color):
+        """
+        王手している駒が1つの場合に、王以外の駒で王手を防げるマス
+        王手している駒のマスと、長い利きの場合は王との間のマス
+
+        :param color: 王手されている側
+        :return: [81]のbool
+        """
+        board = self.board
+        king = self.king[color]
+        evasion = np.zeros(81, dtype=np.bool_)
+        for e in range(8):
+            for k, source in enumerate(RAY[king][e]):
+                if source == OFF_BOARD_SQUARE:
+                    break
+                piece = board[source]
+                if piece == EMPTY:
+                    continue
+                if get_color(piece) != color and ATTACK[piece][e][k]:
+                    evasion[RAY[king][e][:k + 1]] = True
+                break
+        for source in KE_SQUARE[color][king]:
+            if (source != OFF_BOARD_SQUARE and
+                    board[source] == WHITE_KE - color * WHITE_FU):
+                evasion[source] = True
+        return evasion
+
+    def _through_king(self, color):
+        """
+        王を取り除いた場合に、王の後ろのマスに届く相手の長い利き
+        王手している長い利きの上を、遠ざかる方へは逃げられない
+
+        :param color: 王の持ち主
+        :return: [81]のint32
+        """
+        effect = np.zeros(81, dtype=np.int32)
+        king = self.king[color]
+        if king < 0:
+            return effect
+
+        board = self.board
+        for e in range(8):
+            for k, source in enumerate(RAY[king][e]):
+                if source == OFF_BOARD_SQUARE:
+                    break
+                piece = board[source]
+                if piece == EMPTY:
+                    continue
+                if (get_color(piece) != color and ATTACK[piece][e][k] and
+                        SLIDER[piece][e]):
+                    target = RAY[king][7 - e][0]
+                    if target != OFF_BOARD_SQUARE:
+                        effect[target] += 1
+                break
+        return effect
+
+    @staticmethod
+    def _direction(direction, color):
+        """
+        先手から見た方向を手番側から見た方向にする
+        180度回転すると逆方向になる
+
+        :param direction:
+        :param color:
+        :return:
+        """
+        return 7 - direction if color else direction
+
+    @staticmethod
+    def _relative_rank(square, color):
+        """
+        手番側から見た段
+
+        :param square:
+        :param color:
+        :return:
+        """
+        rank = square % 9
+        return 8 - rank if color else rank
+
+    def _set_square(self, square, piece):
+        """
+        マスの駒を置き換えて、利きを更新する
+
+        :param square:
+        :param piece: 置く駒、空きマスにするならEMPTY
+        :return:
+        """
+        old = int(self.board[square])
+        if old != EMPTY:
+            self._add_piece_effect(square, old, -1)
+        if (old == EMPTY) != (piece == EMPTY):
+            # マスが埋まると、そのマスを通る長い利きがその先に届かなくなる
+            self._update_line_effect(square, -1 if old == EMPTY else 1)
+
+        self.board[square] = piece
+        if piece != EMPTY:
+            self._add_piece_effect(square, piece, 1)
+
+    def _add_piece_effect(self, square, piece, sign):
+        """
+        マスの駒の利きを加える
+
+        :param square:
+        :param piece:
+        :param sign: 加えるなら1、取り除くなら-1
+        :return:
+        """
+        effect = self.effect[get_color(piece)]
+        for _, _, target in self._iter_targets(square, piece):
+            effect[target] += sign
+
+    def _iter_targets(self, square, piece):
+        """
+        マスの駒が利きを持つマス
+
+        :param square:
+        :param piece:
+        :return: 駒から見た方向、距離-1、移動先のマスの組
+            桂馬の方向はKE_SQUAREの順に8, 9
+        """
+        board = self.board
+        attack = ATTACK[piece]
+        for d in range(8):
+            # 移動先から見ると逆方向
+            table = attack[7 - d]
+            for k, target in enumerate(RAY[square][d]):
+                if target == OFF_BOARD_SQUARE or not table[k]:
+                    break
+                yield d, k, target
+                if board[target] != EMPTY:
+                    break
+
+        if piece in (BLACK_KE, WHITE_KE):
+            for i, target in enumerate(KE_SQUARE[get_color(piece)][square]):
+                if target != OFF_BOARD_SQUARE:
+                    yield 8 + i, 0, target
+
+    def _update_line_effect(self, square, sign):
+        """
+        マスを通る長い利きの、マスより先の部分を加える
+
+        :param square:
+        :param sign: 加えるなら1、取り除くなら-1
+        :return:
+        """
+        board = self.board
+        for e in range(8):
+            for k, source in enumerate(RAY[square][e]):
+                if source == OFF_BOARD_SQUARE:
+                    break
+                piece = board[source]
+                if piece == EMPTY:
+                    continue
+                if ATTACK[piece][e][k] and SLIDER[piece][e]:
+                    effect = self.effect[get_color(piece)]
+                    for target in RAY[square][7 - e]:
+                        if target == OFF_BOARD_SQUARE:
+                            break
+                        effect[target] += sign
+                        if board[target] != EMPTY:
+                            break
+                break
+
+    def _update_pin(self):
+        """
+        王の直線上で最初に当たる味方の駒の後ろに、王の方へ長い利きを持つ相手の駒があれば
+        その味方の駒はピンされている
+
+        :return:
+        """
+        self.pin[:] = 0
+        board = self.board
+        for color, king in enumerate(self.king):
+            if king < 0:
+                continue
+            for e in range(8):
+                pinned = -1
+                for source in RAY[king][e]:
+                    if source == OFF_BOARD_SQUARE:
+                        break
+                    piece = board[source]
+                    if piece == EMPTY:
+                        continue
+                    if pinned < 0:
+                        if get_color(piece) != color:
+                            break
+                        pinned = source
+                        continue
+                    if get_color(piece) != color and SLIDER[piece][e]:
+                        self.pin[color, pinned] = LINE[e]
+                    break
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+駒を選び出すための表を一つの[TABLE_SIZE, K]の表にまとめて、
+盤面ごとに1回のgatherで全ての選び出しの結果[batch, K, 9, 9]を求める
+
+それぞれの選び出しは結果のチャネルを切り出すだけになる
+同じ値の表は一つのチャネルにまとめる
+
+表の種類
+    plane: 短い利きの駒やbool型の盤面、1チャネル
+    one hot: 長い利きの駒、2チャネル (channel0がその他の駒、channel1が利きを伸ばす駒)
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import tensorflow as tf
+
+from .direction import (Direction, PinDirection, get_eight_directions,
+                        get_cross_directions, get_diagonal_directions)
+from .long_board import black_table as black_long_table
+from .long_board import white_table as white_long_table
+from .memo import lookup, store
+from .piece import Piece
+from .short_board.black_table import (make_black_direction_array,
+                                      make_black_piece_array)
+from .short_board.white_table import make_white_direction_array
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+# 手番側のピンは[Piece.SIZE, Piece.SIZE + 56)の値で表される
+TABLE_SIZE = Piece.SIZE + 14 * PinDirection.SIZE
+
+# 駒の種類を限定して選び出す短い利きの駒とその方向
+BLACK_PIECE_DIRECTIONS = (
+    (Piece.BLACK_FU, (Direction.UP,)),
+    (Piece.BLACK_KE, (Direction.RIGHT_UP_UP, Direction.LEFT_UP_UP)),
+    (Piece.BLACK_GI, (Direction.RIGHT_UP, Direction.RIGHT_DOWN, Direction.UP,
+                      Direction.LEFT_UP, Direction.LEFT_DOWN)),
+    (Piece.BLACK_KI, (Direction.RIGHT_UP, Direction.RIGHT, Direction.UP,
+                      Direction.DOWN, Direction.LEFT_UP, Direction.LEFT)),
+    (Piece.BLACK_UM, get_cross_directions()),
+    (Piece.BLACK_RY, get_diagonal_directions())
+)
+BLACK_MAJOR_PIECES = (Piece.BLACK_KA, Piece.BLACK_HI,
+                      Piece.BLACK_UM, Piece.BLACK_RY)
+
+
+def make_one_hot_array(table):
+    """
+    -1, 0, 1の値の表を2チャネルの表に変換する
+    -1は両方のチャネルが0
+
+    :param table:
+    :return:
+    """
+    return np.stack([table == 0, table == 1], axis=1)
+
+
+def make_tables():
+    """
+    全ての選び出しの表をキーと値の組で返す
+
+    :return:
+    """
+    # boolean_boardの__init__からこのモジュールを読み込むので、循環importを避ける
+    from .boolean_board import table as bool_table
+
+    tables = OrderedDict()
+
+    # 短い利き
+    black_directions = get_eight_directions() + (Direction.RIGHT_UP_UP,
+                                                 Direction.LEFT_UP_UP)
+    for direction in black_directions:
+        tables['black_short', direction] = make_black_direction_array(
+            direction=direction
+        )
+    for piece, directions in BLACK_PIECE_DIRECTIONS:
+        for direction in directions:
+            tables['black_piece', piece, direction] = make_black_piece_array(
+                piece=piece, direction=direction
+            )
+    white_directions = get_eight_directions() + (Direction.RIGHT_DOWN_DOWN,
+                                                 Direction.LEFT_DOWN_DOWN)
+    for direction in white_directions:
+        tables['white_short', direction] = make_white_direction_array(
+            direction=direction, mask_ou=False
+        )
+        tables['white_short_without_ou', direction] = \
+            make_white_direction_array(direction=direction, mask_ou=True)
+
+    # 長い利き
+    tables['black_long_ou'] = make_one_hot_array(
+        black_long_table.make_ou_table()
+    )
+    for direction in get_cross_directions():
+        tables['black_long', direction] = make_one_hot_array(
+            black_long_table.make_cross_table(direction=direction)
+        )
+    for direction in get_diagonal_directions():
+        tables['black_long', direction] = make_one_hot_array(
+            black_long_table.make_diagonal_table()
+        )
+    tables['black_long_ky', Direction.UP] = make_one_hot_array(
+        black_long_table.make_ky_table(direction=Direction.UP)
+    )
+    for piece in BLACK_MAJOR_PIECES:
+        for direction in black_long_table.get_directions(piece=piece):
+            tables['black_long_major', piece, direction] = make_one_hot_array(
+                black_long_table.make_major_table(direction=direction,
+                                                  piece=piece)
+            )
+    tables['white_long_ou'] = make_one_hot_array(
+        white_long_table.make_ou_table()
+    )
+    for direction in get_cross_directions():
+        tables['white_long', direction] = make_one_hot_array(
+            white_long_table.make_cross_table(direction=direction)
+        )
+    for direction in get_diagonal_directions():
+        tables['white_long', direction] = make_one_hot_array(
+            white_long_table.make_diagonal_table(direction=direction)
+        )
+
+    # bool型の盤面
+    tables['white_ka_um'] = bool_table.make_white_ka_um_table()
+    tables['white_hi_ry'] = bool_table.make_white_hi_ry_table()
+    tables['white_ky'] = bool_table.make_white_ky_table()
+    for direction in Direction:
+        tables['white_direction', direction] = \
+            bool_table.make_white_direction_table(direction=direction)
+
+    return tables
+
+
+_catalog = None
+
+
+def get_catalog():
+    """
+    選び出しの表を一つにまとめる
+    キーから結果のチャネルの位置への対応と[TABLE_SIZE, K]の表を返す
+    同じ値の表は同じチャネルを使う
+
+    :return:
+    """
+    global _catalog
+    if _catalog is not None:
+        return _catalog
+
+    index = {}
+    channels = {}
+    columns = []
+    for key, table in make_tables().items():
+        table = np.reshape(table.astype(np.float32), [TABLE_SIZE, -1])
+        signature = table.tobytes()
+        if signature not in channels:
+            channels[signature] = len(columns)
+            columns.extend(table.T)
+        index[key] = channels[signature]
+
+    _catalog = index, np.stack(columns, axis=1)
+    return _catalog
+
+
+def get_channel(key):
+    index, _ = get_catalog()
+    return index[key]
+
+
+def make_selection_table():
+    name = 'selection_table'
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    _, table = get_catalog()
+    table = tf.constant(table, dtype=tf.float32, name=name)
+
+    store(table, name)
+
+    return table
+
+
+def get_selection_stack(board):
+    """
+    全ての選び出しの結果[batch, K, 9, 9]を求める
+    盤面のテンソルごとに1回だけgatherする
+
+    :param board:
+    :return:
+    """
+    name = 'selection_stack'
+    cached = lookup(name, board)
+    if cached is not None:
+        return cached
+
+    table = make_selection_table()
+    # data_formatに関係なく盤面の並びは(筋, 段)
+    converted = tf.gather(table, tf.reshape(board, [-1, 81]))
+    stack = tf.reshape(tf.transpose(converted, [0, 2, 1]),
+                       [-1, table.shape[1].value, 9, 9])
+
+    store(stack, name, board)
+
+    return stack
+
+
+def select_plane(board, key):
+    """
+    1チャネルの選び出しの結果を盤面と同じ形で返す
+
+    :param board:
+    :param key:
+    :return:
+    """
+    channel = get_channel(key=key)
+    stack = get_selection_stack(board=board)
+    return tf.reshape(stack[:, channel], tf.shape(board))
+
+
+def select_flag(board, key):
+    """
+    select_planeのbool型版
+
+    :param board:
+    :param key:
+    :return:
+    """
+    return tf.cast(select_plane(board=board, key=key), tf.bool)
+
+
+def select_one_hot(board, key, data_format):
+    """
+    長い利きの駒の選び出しの結果をone hotで返す
+
+    :param board:
+    :param key:
+    :param data_format:
+    :return:
+    """
+    channel = get_channel(key=key)
+    stack = get_selection_stack(board=board)
+    one_hot = stack[:, channel:channel + 2]
+    if data_format != 'NCHW':
+        one_hot = tf.transpose(one_hot, [0, 2, 3, 1])
+    return one_hot
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+駒の方向ごとの基本的な利きの表
+tensorflowを使わない処理からも使えるようにnumpyだけで定義する
+"""
+
+import numpy as np
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def make_base_table():
+    """
+    ピンを考えない状況での方向ごとの基本的な利きの有無を設定する
+    長い利きは含まない
+
+    :return:
+    """
+    table = np.array([
+        # right up
+        [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1],
+        # right
+        [0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 0],
+        # right down
+        [0, 0, 0, 1, 0, 0, 1, 1, 1, 1, 1, 1, 0, 1],
+        # up
+        [0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 0],
+        # down
+        [1, 0, 0, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 0],
+        # left up
+        [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1],
+        # left
+        [0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 0],
+        # left down
+        [0, 0, 0, 1, 0, 0, 1, 1, 1, 1, 1, 1, 0, 1],
+        # right up up
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        # left up up
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        # right down down
+        [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        # left down down
+        [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+    ], dtype=np.float32)
+
+    return table
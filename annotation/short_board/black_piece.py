@@ -1,13 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import numpy as np
-import tensorflow as tf
-
-from .black_table import make_black_direction_table
 from ..direction import (PinDirection, Direction, get_cross_directions,
                          get_diagonal_directions)
+from ..memo import lookup, store
+from ..occupancy import make_occupancy
 from ..piece import Piece
+from ..selection import select_plane
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/16'
@@ -26,8 +25,7 @@ def select_black_short_pieces(board, direction):
     :param direction:
     :return:
     """
-    table = make_black_direction_table(direction=direction)
-    converted = tf.gather(table, board)
+    converted = select_plane(board=board, key=('black_short', direction))
 
     return converted
 
@@ -41,36 +39,11 @@ def select_black_ou(board):
     """
     # 桂馬で王手されているかを調べるために、擬似的に王から桂馬の効きを計算する
     # 王の通常の動きの計算もある
-    # 2回使うので、collectionに登録する
-    name = 'black_short_ou'
-    collection = tf.get_collection_ref(name)
-    if len(collection) == 0:
-        selected = tf.to_float(tf.equal(board, Piece.BLACK_OU))
-        tf.add_to_collection(name, selected)
-    else:
-        selected = collection[0]
+    # 2回使うので、占有状況の方で一度だけ計算する
+    selected = make_occupancy(board=board).black_ou
     return selected
 
 
-def make_mask(piece):
-    mask = np.zeros(Piece.SIZE + 14 * PinDirection.SIZE)
-    # 利用する場所だけを設定
-    mask[piece] = 1
-    mask[Piece.SIZE + piece::14] = 1
-
-    return mask
-
-
-def make_mask_ki():
-    mask = np.zeros(Piece.SIZE + 14 * PinDirection.SIZE)
-    for piece in (Piece.BLACK_KI, Piece.BLACK_TO, Piece.BLACK_NY,
-                  Piece.BLACK_NK, Piece.BLACK_NG):
-        mask[piece] = 1
-        mask[Piece.SIZE + piece::14] = 1
-
-    return mask
-
-
 def select_black_piece(board, piece, direction):
     """
     成りの処理があるので、駒ごとに利きの判定を行う
@@ -80,13 +53,8 @@ def select_black_piece(board, piece, direction):
     :param direction:
     :return:
     """
-    if piece == Piece.BLACK_KI:
-        mask = make_mask_ki()
-    else:
-        mask = make_mask(piece=piece)
-
-    table = mask * make_black_direction_table(direction=direction)
-    selected = tf.gather(table, board)
+    selected = select_plane(board=board,
+                            key=('black_piece', piece, direction))
 
     return selected
 
@@ -119,13 +87,13 @@ def select_black_ke(board, direction):
 
     # どちらの方向でも帰ってくる値は同じ
     name = 'black_ke_piece'
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
+    cached = lookup(name, board)
+    if cached is not None:
+        return cached
 
     ke = select_black_piece(board=board, piece=Piece.BLACK_KE,
                             direction=direction)
-    tf.add_to_collection(name, ke)
+    store(ke, name, board)
 
     return ke
 
@@ -148,16 +116,16 @@ def select_black_gi(board, direction):
     diagonals = PinDirection.DIAGONAL1, PinDirection.DIAGONAL2
     if normalized_direction in diagonals:
         name = 'black_gi_piece_{}'.format(normalized_direction.name)
-        collection = tf.get_collection_ref(name)
-        if len(collection):
-            return collection[0]
+        cached = lookup(name, board)
+        if cached is not None:
+            return cached
 
     gi = select_black_piece(board=board, piece=Piece.BLACK_GI,
                             direction=direction)
 
     if normalized_direction in diagonals:
         # noinspection PyUnboundLocalVariable
-        tf.add_to_collection(name, gi)
+        store(gi, name, board)
 
     return gi
 
@@ -181,17 +149,16 @@ def select_black_ki(board, direction):
     crosses = PinDirection.HORIZONTAL, PinDirection.VERTICAL
     if normalized_direction in crosses:
         name = 'black_ki_piece_{}'.format(normalized_direction.name)
-        collection = tf.get_collection_ref(name)
-
-        if len(collection):
-            return collection[0]
+        cached = lookup(name, board)
+        if cached is not None:
+            return cached
 
     ki = select_black_piece(board=board, piece=Piece.BLACK_KI,
                             direction=direction)
 
     if normalized_direction in crosses:
         # noinspection PyUnboundLocalVariable
-        tf.add_to_collection(name, ki)
+        store(ki, name, board)
 
     return ki
 
@@ -210,15 +177,14 @@ def select_black_um(board, direction):
 
     normalized_direction = PinDirection[direction.name]
     name = 'black_um_piece_{}'.format(normalized_direction.name)
-    collection = tf.get_collection_ref(name)
-
-    if len(collection):
-        return collection[0]
+    cached = lookup(name, board)
+    if cached is not None:
+        return cached
 
     um = select_black_piece(board=board, piece=Piece.BLACK_UM,
                             direction=direction)
 
-    tf.add_to_collection(name, um)
+    store(um, name, board)
 
     return um
 
@@ -237,14 +203,13 @@ def select_black_ry(board, direction):
 
     normalized_direction = PinDirection[direction.name]
     name = 'black_ry_piece_{}'.format(normalized_direction.name)
-    collection = tf.get_collection_ref(name)
-
-    if len(collection):
-        return collection[0]
+    cached = lookup(name, board)
+    if cached is not None:
+        return cached
 
     ry = select_black_piece(board=board, piece=Piece.BLACK_RY,
                             direction=direction)
 
-    tf.add_to_collection(name, ry)
+    store(ry, name, board)
 
     return ry
@@ -5,6 +5,7 @@ import numpy as np
 import tensorflow as tf
 
 from ..direction import Direction, PinDirection
+from ..memo import lookup, store
 from ..piece import Piece
 
 __author__ = 'Yasuhiro'
@@ -12,14 +13,30 @@ __date__ = '2018/3/09'
 
 
 def make_black_direction_table(direction):
+    name = 'black_naive_direction_table_{}'.format(direction.name)
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    table = make_black_direction_array(direction=direction)
+    table = tf.constant(table, dtype=tf.float32)
+
+    store(table, name)
+
+    return table
+
+
+def make_black_direction_array(direction):
+    """
+    make_black_direction_tableのnumpy版
+    選び出しのための表をまとめる時にも使う
+
+    :param direction:
+    :return:
+    """
     if direction in (Direction.RIGHT_DOWN_DOWN, Direction.LEFT_DOWN_DOWN):
         raise ValueError(direction)
 
-    name = 'black_naive_direction_table_{}'.format(direction.name)
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
-
     base = make_base_table()
 
     table = np.zeros(Piece.SIZE + 4 * 14)
@@ -29,11 +46,43 @@ def make_black_direction_table(direction):
         offset = Piece.SIZE + PinDirection[direction.name] * 14
         table[offset:offset + 14] = base[direction]
 
-    table = tf.constant(table, dtype=tf.float32)
+    return table
 
-    tf.add_to_collection(name, table)
 
-    return table
+def make_black_piece_array(piece, direction):
+    """
+    駒の種類を限定して、方向directionに動ける駒を選び出す表
+    KIはTO, NY, NK, NGも含む
+
+    :param piece:
+    :param direction:
+    :return:
+    """
+    if piece == Piece.BLACK_KI:
+        mask = make_mask_ki()
+    else:
+        mask = make_mask(piece=piece)
+
+    return mask * make_black_direction_array(direction=direction)
+
+
+def make_mask(piece):
+    mask = np.zeros(Piece.SIZE + 14 * PinDirection.SIZE)
+    # 利用する場所だけを設定
+    mask[piece] = 1
+    mask[Piece.SIZE + piece::14] = 1
+
+    return mask
+
+
+def make_mask_ki():
+    mask = np.zeros(Piece.SIZE + 14 * PinDirection.SIZE)
+    for piece in (Piece.BLACK_KI, Piece.BLACK_TO, Piece.BLACK_NY,
+                  Piece.BLACK_NK, Piece.BLACK_NG):
+        mask[piece] = 1
+        mask[Piece.SIZE + piece::14] = 1
+
+    return mask
 
 
 def make_base_table():
@@ -1,11 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import tensorflow as tf
-
-from ..piece import Piece
-from .white_table import (make_white_direction_table,
-                          make_white_direction_table_without_ou)
+from ..occupancy import make_occupancy
+from ..selection import select_plane
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/16'
@@ -22,8 +19,7 @@ def select_white_short_pieces(board, direction):
     :param direction:
     :return:
     """
-    table = make_white_direction_table(direction=direction)
-    converted = tf.gather(table, board)
+    converted = select_plane(board=board, key=('white_short', direction))
 
     return converted
 
@@ -37,14 +33,8 @@ def select_white_ou(board):
     """
     # 桂馬で王手されているかを調べるために、擬似的に王から桂馬の効きを計算する
     # 王の通常の動きの計算もある
-    # 2回使うので、collectionに登録する
-    name = 'white_short_ou'
-    collection = tf.get_collection_ref(name)
-    if len(collection) == 0:
-        selected = tf.to_float(tf.equal(board, Piece.WHITE_OU))
-        tf.add_to_collection(name, selected)
-    else:
-        selected = collection[0]
+    # 2回使うので、占有状況の方で一度だけ計算する
+    selected = make_occupancy(board=board).white_ou
     return selected
 
 
@@ -57,7 +47,7 @@ def select_white_short_pieces_without_ou(board, direction):
     :param direction:
     :return:
     """
-    table = make_white_direction_table_without_ou(direction=direction)
-    converted = tf.gather(table, board)
+    converted = select_plane(board=board,
+                             key=('white_short_without_ou', direction))
 
     return converted
@@ -5,7 +5,9 @@ import numpy as np
 import tensorflow as tf
 
 from ..direction import Direction, PinDirection
+from ..memo import lookup, store
 from ..piece import Piece
+from .base_table import make_base_table
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/28'
@@ -20,15 +22,32 @@ def make_white_direction_table_without_ou(direction):
 
 
 def _make_white_table(direction, mask_ou):
-    if direction in (Direction.RIGHT_UP_UP, Direction.LEFT_UP_UP):
-        raise ValueError(direction)
-
     name = 'white_naive_direction_table_{}'.format(direction.name)
     if mask_ou:
         name += 'without_ou'
-    collection = tf.get_collection_ref(name)
-    if len(collection):
-        return collection[0]
+    cached = lookup(name)
+    if cached is not None:
+        return cached
+
+    table = make_white_direction_array(direction=direction, mask_ou=mask_ou)
+    table = tf.constant(table, dtype=tf.float32)
+
+    store(table, name)
+
+    return table
+
+
+def make_white_direction_array(direction, mask_ou):
+    """
+    make_white_direction_tableのnumpy版
+    選び出しのための表をまとめる時にも使う
+
+    :param direction:
+    :param mask_ou: Trueの場合はOUを選ばない
+    :return:
+    """
+    if direction in (Direction.RIGHT_UP_UP, Direction.LEFT_UP_UP):
+        raise ValueError(direction)
 
     base = make_base_table()
 
@@ -44,45 +63,4 @@ def _make_white_table(direction, mask_ou):
         table[Piece.WHITE_OU] = 0
         table[Piece.SIZE + Piece.WHITE_OU - Piece.WHITE_FU::14] = 0
 
-    table = tf.constant(table, dtype=tf.float32)
-
-    tf.add_to_collection(name, table)
-
-    return table
-
-
-def make_base_table():
-    """
-    ピンを考えない状況での方向ごとの基本的な利きの有無を設定する
-    長い利きは含まない
-
-    :return:
-    """
-    table = np.array([
-        # right up
-        [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1],
-        # right
-        [0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 0],
-        # right down
-        [0, 0, 0, 1, 0, 0, 1, 1, 1, 1, 1, 1, 0, 1],
-        # up
-        [0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 0],
-        # down
-        [1, 0, 0, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 0],
-        # left up
-        [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1],
-        # left
-        [0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 0],
-        # left down
-        [0, 0, 0, 1, 0, 0, 1, 1, 1, 1, 1, 1, 0, 1],
-        # right up up
-        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        # left up up
-        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        # right down down
-        [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        # left down down
-        [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-    ], dtype=np.float32)
-
     return table
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import tensorflow as tf
+
+from .backend import BoardTestMixin
+from .batch import make_random_positions
+from ..action_format import unpack_action, unpack_action_tensor
+from ..annotation import AnnotationLayer
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestActionFormat(BoardTestMixin, tf.test.TestCase):
+    def test_action_format(self):
+        """
+        全ての出力形式で行動ごとの盤面のlistと同じ内容になることを確認する
+
+        :return:
+        """
+        boards, hands = make_random_positions(n=16, seed=0)
+        boards = self._reshape(boards)
+
+        ph_board = self._placeholder()
+        ph_hand = tf.placeholder(tf.int32, shape=[None, 7])
+
+        outputs = {}
+        for action_format in ('list', 'dense', 'packed8', 'packed32'):
+            outputs[action_format], = AnnotationLayer(
+                data_format=self.data_format, use_cudnn=self.use_cudnn,
+                outputs=['action'], action_format=action_format
+            )(ph_board, ph_hand)
+        outputs['unpacked8'] = unpack_action_tensor(
+            packed=outputs['packed8'], data_format=self.data_format
+        )
+        outputs['unpacked32'] = unpack_action_tensor(
+            packed=outputs['packed32'], data_format=self.data_format
+        )
+
+        with self.test_session() as sess:
+            values = sess.run(outputs, feed_dict={ph_board: boards,
+                                                  ph_hand: hands})
+
+        axis = 1 if self.data_format == 'NCHW' else -1
+        expected = np.concatenate(values['list'], axis=axis)
+        self.assertTupleEqual(values['dense'].shape, expected.shape)
+        self.assertTrue(np.all(values['dense'] == expected))
+
+        self.assertTupleEqual(values['packed8'].shape, (16, 139, 11))
+        self.assertEqual(values['packed8'].dtype, np.uint8)
+        self.assertTupleEqual(values['packed32'].shape, (16, 139, 3))
+        self.assertEqual(values['packed32'].dtype, np.uint32)
+
+        for name in ('packed8', 'packed32'):
+            with self.subTest(name=name):
+                unpacked = unpack_action(packed=values[name],
+                                         data_format=self.data_format)
+                self.assertTrue(np.all(unpacked == expected))
+        for name in ('unpacked8', 'unpacked32'):
+            with self.subTest(name=name):
+                self.assertTrue(np.all(values[name] == expected))
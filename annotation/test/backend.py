@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AnnotationLayerと同じ出力を計算する別の実装(tf2, jax_backend, onnx_export)の
+テストで共通の処理
+BoardTestMixinは盤面を入力するテスト全てで共通の処理
+
+AnnotationLayerはTensorFlow 1とsonnetを使うので、TensorFlow 2やJAXと同じ環境では動かない
+make_golden.pyでAnnotationLayerの入出力をファイルに保存しておき、その出力と比べる
+"""
+
+import abc
+import os
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+
+from ..vectorized import format_outputs
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+GOLDEN_PATH = Path(__file__).parent / 'data' / 'annotation_layer.npz'
+OUTPUT_NAMES = ('action', 'black_count', 'white_count', 'check')
+
+
+def reshape_board(board, data_format):
+    """
+    盤面をAnnotationLayerに入力する形にする
+
+    :param board: [batch, 9, 9]または[batch, 81]
+    :param data_format:
+    :return:
+    """
+    if data_format == 'NCHW':
+        return np.reshape(board, [-1, 1, 9, 9])
+    else:
+        return np.reshape(board, [-1, 9, 9, 1])
+
+
+def load_golden(path=GOLDEN_PATH):
+    """
+    make_golden.pyで保存したAnnotationLayerの入出力を読み込む
+
+    :param path:
+    :return: 名前から配列へのdict
+    """
+    with np.load(str(path)) as data:
+        return {key: data[key] for key in data.files}
+
+
+class BoardTestMixin(object):
+    """
+    .envからdata_formatとuse_cudnnを読み込み、盤面をdata_formatの形にする
+    unittest.TestCaseと一緒に継承する
+    """
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        dotenv_path = Path(__file__).parents[2] / '.env'
+        load_dotenv(str(dotenv_path))
+
+        cls.data_format = os.environ.get('DATA_FORMAT')
+        cls.use_cudnn = bool(os.environ.get('USE_CUDNN'))
+
+    def _reshape(self, board):
+        return reshape_board(board, data_format=self.data_format)
+
+    def _placeholder(self):
+        """
+        バッチサイズを決めない盤面のplaceholder
+        TensorFlow 1のテストだけで使う
+        このモジュールはTensorFlow 2やJAXの環境でも読み込むので、ここでimportする
+
+        :return:
+        """
+        import tensorflow as tf
+
+        shape = [None, 1, 9, 9] if self.data_format == 'NCHW' else \
+            [None, 9, 9, 1]
+        return tf.placeholder(tf.int32, shape=shape)
+
+
+class BackendTestMixin(BoardTestMixin, metaclass=abc.ABCMeta):
+    """
+    保存したAnnotationLayerの出力と比べるテスト
+    unittest.TestCaseと一緒に継承して、annotateを定義する
+    annotateを定義していないとテストのインスタンスを作る時点でTypeErrorになる
+    """
+    # turnを指定した入力に対応しているか
+    absolute_input = True
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.golden = load_golden()
+
+    @abc.abstractmethod
+    def annotate(self, board, black_hand, white_hand=None, turn=None,
+                 absolute_output=False):
+        """
+        AnnotationLayer(action_format='dense')と同じ4つの出力を求める
+
+        :param board:
+        :param black_hand:
+        :param white_hand:
+        :param turn:
+        :param absolute_output:
+        :return:
+        """
+
+    def _inputs(self, key, batch_size=None):
+        """
+        保存した入力を取り出す
+
+        :param key: 'relative'または'absolute'
+        :param batch_size: 先頭から取り出す局面の数、Noneなら全て
+        :return: 盤面と持ち駒、absoluteの場合は後手の持ち駒と手番も加える
+        """
+        names = ['board', 'black_hand']
+        if key == 'absolute':
+            names += ['white_hand', 'turn']
+        inputs = [self.golden['{}_{}'.format(key, name)][:batch_size]
+                  for name in names]
+        inputs[0] = self._reshape(inputs[0])
+        return inputs
+
+    def _expected(self, key, batch_size=None):
+        """
+        保存したAnnotationLayerの出力をdata_formatの形にする
+
+        :param key: 'relative', 'absolute', 'absolute_output'
+        :param batch_size: 先頭から取り出す局面の数、Noneなら全て
+        :return:
+        """
+        outputs = [self.golden['{}_{}'.format(key, name)][:batch_size]
+                   for name in OUTPUT_NAMES]
+        return format_outputs(np, outputs, data_format=self.data_format,
+                              action_format='dense')
+
+    def _assert_outputs(self, expected, actual):
+        for name, e, a in zip(OUTPUT_NAMES, expected, actual):
+            with self.subTest(name=name):
+                a = np.asarray(a)
+                self.assertEqual(e.dtype, a.dtype)
+                self.assertTupleEqual(e.shape, a.shape)
+                self.assertTrue(np.all(e == a))
+
+    def test_annotation_layer(self):
+        """
+        手番側から見た局面を入力して、AnnotationLayerと一致することを確認する
+        対局の局面と、王手を含むランダムな局面を比べる
+
+        :return:
+        """
+        actual = self.annotate(*self._inputs('relative'))
+        self._assert_outputs(expected=self._expected('relative'),
+                             actual=actual)
+
+    def test_absolute(self):
+        """
+        先手から見た局面を入力して、AnnotationLayerと一致することを確認する
+
+        :return:
+        """
+        if not self.absolute_input:
+            self.skipTest('turn is not supported')
+
+        board, black_hand, white_hand, turn = self._inputs('absolute')
+        for absolute_output, key in ((False, 'absolute'),
+                                     (True, 'absolute_output')):
+            with self.subTest(absolute_output=absolute_output):
+                actual = self.annotate(board, black_hand, white_hand, turn,
+                                       absolute_output=absolute_output)
+                self._assert_outputs(expected=self._expected(key),
+                                     actual=actual)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from itertools import product
+
+import numpy as np
+import shogi
+import tensorflow as tf
+
+from annotation.naive_effect import LONG_ENGINES, SHORT_ENGINES
+from annotation.piece import Piece
+from .backend import BoardTestMixin
+from .game import make_shogi_board
+from ..annotation import AnnotationLayer
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def make_random_positions(n, seed):
+    """
+    先後の王を一つずつ置いて、残りのマスにランダムに駒を置いた局面を作る
+    非手番側の王に手番側の利きがある局面は、手番側が王を取れてしまうので
+    AnnotationLayerの入力にならない
+    そのような局面は作り直す
+
+    :param n:
+    :param seed:
+    :return: 盤面 [n, 9, 9] (筋, 段)と手番側の持ち駒 [n, 7]
+    """
+    rng = np.random.RandomState(seed)
+    pieces = [piece for piece in range(Piece.BLACK_FU, Piece.EMPTY)
+              if piece not in (Piece.BLACK_OU, Piece.WHITE_OU)]
+
+    boards = np.full((n, 9, 9), Piece.EMPTY, dtype=np.int32)
+    for board in boards:
+        while True:
+            board[:] = Piece.EMPTY
+            squares = rng.choice(81, size=rng.randint(2, 30), replace=False)
+            board.flat[squares[0]] = Piece.BLACK_OU
+            board.flat[squares[1]] = Piece.WHITE_OU
+            board.flat[squares[2:]] = rng.choice(pieces,
+                                                 size=len(squares) - 2)
+
+            # python-shogiのマスは段 * 9 + (9 - 筋)
+            h, w = divmod(int(squares[1]), 9)
+            if not make_shogi_board(board).is_attacked_by(shogi.BLACK,
+                                                           w * 9 + 8 - h):
+                break
+    hands = rng.randint(0, 3, size=(n, 7)).astype(np.int32)
+    return boards, hands
+
+
+class TestBatch(BoardTestMixin, tf.test.TestCase):
+    def _build(self, long_engine='conv', short_engine='conv'):
+        """
+        バッチサイズを決めずにAnnotationLayerを作る
+
+        :param long_engine:
+        :param short_engine:
+        :return:
+        """
+        shape = [None, 1, 9, 9] if self.data_format == 'NCHW' else \
+            [None, 9, 9, 1]
+        ph_board = tf.placeholder(tf.int32, shape=shape)
+        ph_hand = tf.placeholder(tf.int32, shape=[None, 7])
+        actions, black_count, white_count, check = AnnotationLayer(
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            long_engine=long_engine, short_engine=short_engine
+        )(ph_board, ph_hand)
+        # 行動は[batch, 139, 9, 9]にまとめて比べる
+        actions = tf.stack([tf.reshape(a, [-1, 9, 9]) for a in actions],
+                           axis=1)
+        return ph_board, ph_hand, [actions, black_count, white_count, check]
+
+    def test_batch_size(self):
+        """
+        バッチにまとめて計算した結果が1局面ずつ計算した結果と一致することを確認する
+
+        :return:
+        """
+        boards, hands = make_random_positions(n=7, seed=0)
+        boards = self._reshape(boards)
+
+        ph_board, ph_hand, outputs = self._build()
+        with self.test_session() as sess:
+            expected = [
+                sess.run(outputs, feed_dict={ph_board: boards[i:i + 1],
+                                             ph_hand: hands[i:i + 1]})
+                for i in range(len(boards))
+            ]
+
+            for batch_size in (1, 7, 256, 4096):
+                index = np.arange(batch_size) % len(boards)
+                values = sess.run(outputs, feed_dict={
+                    ph_board: boards[index], ph_hand: hands[index]
+                })
+                for j, name in enumerate(('action', 'black_count',
+                                          'white_count', 'check')):
+                    with self.subTest(batch_size=batch_size, name=name):
+                        self.assertEqual(len(values[j]), batch_size)
+                        for i in range(len(boards)):
+                            self.assertTrue(np.all(
+                                values[j][index == i] == expected[i][j]
+                            ))
+
+    def test_engine(self):
+        """
+        全ての計算方法でバッチサイズを決めずに計算できることを確認する
+
+        :return:
+        """
+        boards, hands = make_random_positions(n=7, seed=1)
+        boards = self._reshape(boards)
+
+        expected = None
+        for long_engine, short_engine in product(LONG_ENGINES, SHORT_ENGINES):
+            graph = tf.Graph()
+            with graph.as_default():
+                ph_board, ph_hand, outputs = self._build(
+                    long_engine=long_engine, short_engine=short_engine
+                )
+            with tf.Session(graph=graph) as sess:
+                values = sess.run(outputs, feed_dict={ph_board: boards,
+                                                      ph_hand: hands})
+            if expected is None:
+                expected = values
+                continue
+            for e, v in zip(expected, values):
+                with self.subTest(long_engine=long_engine,
+                                  short_engine=short_engine):
+                    self.assertTrue(np.all(e == v))
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import tensorflow as tf
+
+from .backend import BoardTestMixin
+from .batch import make_random_positions
+from ..effect_context import EffectContextLayer
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestBitContext(BoardTestMixin, tf.test.TestCase):
+    def test_context(self):
+        """
+        ワードのまま求めた手番側の利き、ピン、王手の判定が
+        畳み込みで求めたものと一致することを確認する
+
+        :return:
+        """
+        boards, _ = make_random_positions(n=256, seed=2)
+
+        ph_board = self._placeholder()
+        options = dict(data_format=self.data_format, use_cudnn=self.use_cudnn,
+                       white=False)
+        expected = EffectContextLayer(long_engine='conv', **options)(ph_board)
+        actual = EffectContextLayer(long_engine='bits', **options)(ph_board)
+
+        names = ('white_naive_effect', 'white_naive_long_effect',
+                 'black_pseudo_ou_effect', 'black_pinned_board',
+                 'black_check', 'black_long_check', 'black_available_square')
+        with self.test_session() as sess:
+            expected, actual = sess.run([
+                [getattr(expected, name) for name in names],
+                [getattr(actual, name) for name in names]
+            ], feed_dict={ph_board: self._reshape(boards)})
+
+        for name, e, a in zip(names, expected, actual):
+            with self.subTest(name=name):
+                if name == 'black_pseudo_ou_effect':
+                    self.assertAllEqual(e.short, a.short)
+                    self.assertAllEqual(e.long, a.long)
+                else:
+                    self.assertAllEqual(e, a)
+        # ピンと王手のある局面が含まれている
+        self.assertTrue(np.any(expected[3] != self._reshape(boards)))
+        self.assertTrue(np.any(expected[4]))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import tensorflow as tf
+
+from .backend import BoardTestMixin
+from .batch import make_random_positions
+from .perspective import flip
+from ..annotation import AnnotationLayer
+from ..effect_context import EffectContextLayer
+from ..perspective import stack_both_sides
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestBothSides(BoardTestMixin, tf.test.TestCase):
+    def test_naive_effect(self):
+        """
+        手番側のナイーブな利きから求めた非手番側のナイーブな利きと、
+        直接求めた非手番側のナイーブな利きを比べる
+
+        :return:
+        """
+        boards, hands = make_random_positions(n=16, seed=0)
+
+        ph_board = self._placeholder()
+        ph_hand = tf.placeholder(tf.int32, shape=[None, 7])
+        board, _ = stack_both_sides(board=ph_board, black_hand=ph_hand,
+                                    white_hand=ph_hand)
+        options = dict(data_format=self.data_format, use_cudnn=self.use_cudnn)
+        expected = EffectContextLayer(**options)(board)
+        paired = EffectContextLayer(paired=True, **options)(board)
+
+        with self.test_session() as sess:
+            expected, paired = sess.run([expected, paired], feed_dict={
+                ph_board: self._reshape(boards), ph_hand: hands
+            })
+
+        self.assertTrue(np.all(
+            expected.white_naive_effect == paired.white_naive_effect
+        ))
+        self.assertTrue(np.all(
+            expected.white_naive_long_effect ==
+            paired.white_naive_long_effect
+        ))
+        self.assertTrue(np.all(
+            expected.black_pinned_board == paired.black_pinned_board
+        ))
+        self.assertTrue(np.all(
+            expected.white_pinned_board == paired.white_pinned_board
+        ))
+
+    def test_annotation(self):
+        """
+        両方から見た局面の出力を、それぞれの局面で計算した出力と比べる
+
+        :return:
+        """
+        boards, black_hands = make_random_positions(n=16, seed=1)
+        white_hands = black_hands[::-1]
+
+        ph_board = self._placeholder()
+        ph_black_hand = tf.placeholder(tf.int32, shape=[None, 7])
+        ph_white_hand = tf.placeholder(tf.int32, shape=[None, 7])
+
+        options = dict(data_format=self.data_format, use_cudnn=self.use_cudnn)
+        layer = AnnotationLayer(**options)
+        black_outputs = layer(ph_board, ph_black_hand)
+        white_outputs = layer(ph_board, ph_white_hand)
+        both_outputs = AnnotationLayer(both_sides=True, **options)(
+            ph_board, ph_black_hand, ph_white_hand
+        )
+
+        with self.test_session() as sess:
+            black_values = sess.run(black_outputs, feed_dict={
+                ph_board: self._reshape(boards), ph_black_hand: black_hands
+            })
+            white_values = sess.run(white_outputs, feed_dict={
+                ph_board: self._reshape(flip(boards)),
+                ph_white_hand: white_hands
+            })
+            both_values = sess.run(both_outputs, feed_dict={
+                ph_board: self._reshape(boards), ph_black_hand: black_hands,
+                ph_white_hand: white_hands
+            })
+
+        names = ('action', 'black_count', 'white_count', 'check')
+        for name, b, w, pair in zip(names, black_values, white_values,
+                                    both_values):
+            with self.subTest(name=name):
+                self.assertTrue(np.all(np.asarray(b) == np.asarray(pair[0])))
+                self.assertTrue(np.all(np.asarray(w) == np.asarray(pair[1])))
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import shogi
+
+from annotation.piece import Piece
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+# python-shogiの駒の種類から駒の番号への変換
+PIECE_TYPES = {
+    shogi.PAWN: Piece.BLACK_FU, shogi.LANCE: Piece.BLACK_KY,
+    shogi.KNIGHT: Piece.BLACK_KE, shogi.SILVER: Piece.BLACK_GI,
+    shogi.GOLD: Piece.BLACK_KI, shogi.BISHOP: Piece.BLACK_KA,
+    shogi.ROOK: Piece.BLACK_HI, shogi.KING: Piece.BLACK_OU,
+    shogi.PROM_PAWN: Piece.BLACK_TO, shogi.PROM_LANCE: Piece.BLACK_NY,
+    shogi.PROM_KNIGHT: Piece.BLACK_NK, shogi.PROM_SILVER: Piece.BLACK_NG,
+    shogi.PROM_BISHOP: Piece.BLACK_UM, shogi.PROM_ROOK: Piece.BLACK_RY
+}
+
+
+def convert_board(board):
+    """
+    python-shogiの局面を手番側から見た盤面と持ち駒にする
+
+    :param board: shogi.Board
+    :return: 盤面 [9, 9] (筋, 段)と手番側の持ち駒 [7]
+    """
+    position = np.full((9, 9), Piece.EMPTY, dtype=np.int32)
+    for square in shogi.SQUARES:
+        piece = board.piece_at(square)
+        if piece is None:
+            continue
+        value = PIECE_TYPES[piece.piece_type]
+        if piece.color != board.turn:
+            value += Piece.WHITE_FU
+        # python-shogiのマスは段 * 9 + (9 - 筋)
+        rank, file = divmod(square, 9)
+        h, w = 8 - file, rank
+        if board.turn == shogi.WHITE:
+            # 後手番は180度回転する
+            h, w = 8 - h, 8 - w
+        position[h, w] = value
+
+    hand = np.zeros(7, dtype=np.int32)
+    for piece_type, count in board.pieces_in_hand[board.turn].items():
+        hand[PIECE_TYPES[piece_type]] = count
+    return position, hand
+
+
+def make_shogi_board(position):
+    """
+    手番側から見た盤面をpython-shogiの局面にする
+    手番側を先手にする
+
+    :param position: 盤面 [9, 9] (筋, 段)
+    :return: shogi.Board
+    """
+    piece_types = {value: piece_type
+                   for piece_type, value in PIECE_TYPES.items()}
+
+    board = shogi.Board()
+    board.clear()
+    for (h, w), value in np.ndenumerate(position):
+        if value == Piece.EMPTY:
+            continue
+        color = shogi.BLACK if value < Piece.WHITE_FU else shogi.WHITE
+        piece_type = piece_types[value % Piece.WHITE_FU]
+        # python-shogiのマスは段 * 9 + (9 - 筋)
+        square = w * 9 + 8 - h
+        board.set_piece_at(square, shogi.Piece(piece_type, color))
+    return board
+
+
+def make_game_positions(n, seed, max_moves=256):
+    """
+    合法手をランダムに選んで対局し、途中の局面を集める
+    ランダムに駒を置いた局面と違って、実際に現れる局面だけになる
+
+    :param n: 局面の数
+    :param seed:
+    :param max_moves: 1局の最大の手数
+    :return: 手番側から見た盤面 [n, 9, 9] (筋, 段)と手番側の持ち駒 [n, 7]
+    """
+    rng = np.random.RandomState(seed)
+
+    boards, hands = [], []
+    board = shogi.Board()
+    while len(boards) < n:
+        if board.is_game_over() or board.move_number > max_moves:
+            board = shogi.Board()
+
+        position, hand = convert_board(board=board)
+        boards.append(position)
+        hands.append(hand)
+
+        moves = list(board.legal_moves)
+        board.push(moves[rng.randint(len(moves))])
+    return np.stack(boards), np.stack(hands)
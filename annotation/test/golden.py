@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+保存したAnnotationLayerの出力(data/annotation_layer.npz)が
+今のAnnotationLayerの出力と一致することを確認する
+一致しない場合はmake_golden.pyで作り直す
+"""
+
+import numpy as np
+import tensorflow as tf
+
+from .backend import BackendTestMixin, OUTPUT_NAMES
+from .make_golden import run_layer
+from ..vectorized import format_outputs
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestGolden(BackendTestMixin, tf.test.TestCase):
+    """
+    TensorFlow 1とsonnetの環境で実行する
+    """
+    def annotate(self, board, black_hand, white_hand=None, turn=None,
+                 absolute_output=False):
+        outputs = run_layer(board, black_hand, white_hand, turn,
+                            absolute_output=absolute_output,
+                            data_format=self.data_format,
+                            use_cudnn=self.use_cudnn)
+        return format_outputs(np, [outputs[name] for name in OUTPUT_NAMES],
+                              data_format=self.data_format,
+                              action_format='dense')
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+
+from .backend import OUTPUT_NAMES, BackendTestMixin
+from ..jax_backend import AnnotationFunction, annotate_position
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestJAX(BackendTestMixin, unittest.TestCase):
+    """
+    JAXの環境で実行する
+    """
+    def annotate(self, board, black_hand, white_hand=None, turn=None,
+                 absolute_output=False):
+        function = AnnotationFunction(data_format=self.data_format,
+                                      action_format='dense',
+                                      absolute_output=absolute_output)
+        return function(board, black_hand, white_hand, turn)
+
+    def test_batch_size(self):
+        """
+        バッチサイズごとにAnnotationLayerと一致することを確認する
+
+        :return:
+        """
+        function = AnnotationFunction(data_format=self.data_format,
+                                      action_format='dense')
+        for batch_size in (1, 7, 192):
+            with self.subTest(batch_size=batch_size):
+                actual = function(*self._inputs('relative', batch_size))
+                self._assert_outputs(
+                    expected=self._expected('relative', batch_size),
+                    actual=actual
+                )
+
+    def test_position(self):
+        """
+        1局面ずつ計算した結果がAnnotationLayerと一致することを確認する
+
+        :return:
+        """
+        boards = np.reshape(self.golden['relative_board'], [-1, 81])
+        hands = self.golden['relative_black_hand']
+        outputs = [annotate_position(board, hand)
+                   for board, hand in zip(boards, hands)]
+        actual = [np.stack([np.asarray(output[i]) for output in outputs])
+                  for i in range(4)]
+        expected = [self.golden['relative_' + name] for name in OUTPUT_NAMES]
+        self._assert_outputs(expected=expected, actual=actual)
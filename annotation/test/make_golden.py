@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+別の実装のテスト(backend.py)で比べるAnnotationLayerの入出力をファイルに保存する
+TensorFlow 1とsonnetの環境で、リポジトリのルートから実行する
+
+    python -m annotation.test.make_golden
+
+盤面の形の出力はdata_formatによらない[batch, 139, 81], [batch, 81], [batch]の形で保存する
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+from dotenv import load_dotenv
+
+from .backend import GOLDEN_PATH, OUTPUT_NAMES, reshape_board
+from .batch import make_random_positions
+from .game import make_game_positions
+from ..annotation import AnnotationLayer
+from ..vectorized import to_relative
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def get_env():
+    dotenv_path = Path(__file__).parents[2] / '.env'
+    load_dotenv(str(dotenv_path))
+
+    data_format = os.environ.get('DATA_FORMAT')
+    use_cudnn = bool(os.environ.get('USE_CUDNN'))
+
+    return data_format, use_cudnn
+
+
+def run_layer(board, black_hand, white_hand=None, turn=None,
+              absolute_output=False, data_format='NCHW', use_cudnn=False):
+    """
+    AnnotationLayer(action_format='dense')の出力をdata_formatによらない形で求める
+
+    :param board: [batch, 9, 9]
+    :param black_hand:
+    :param white_hand:
+    :param turn:
+    :param absolute_output:
+    :param data_format:
+    :param use_cudnn:
+    :return: 出力の名前から配列へのdict
+    """
+    board = reshape_board(board, data_format=data_format)
+    with tf.Graph().as_default():
+        ph_board = tf.placeholder(tf.int32, shape=(None,) + board.shape[1:])
+        ph_black_hand = tf.placeholder(tf.int32, shape=[None, 7])
+        feed_dict = {ph_board: board, ph_black_hand: black_hand}
+        inputs = [ph_board, ph_black_hand]
+        if turn is not None:
+            ph_white_hand = tf.placeholder(tf.int32, shape=[None, 7])
+            ph_turn = tf.placeholder(tf.bool, shape=[None])
+            feed_dict.update({ph_white_hand: white_hand, ph_turn: turn})
+            inputs += [ph_white_hand, ph_turn]
+
+        outputs = AnnotationLayer(
+            data_format=data_format, use_cudnn=use_cudnn,
+            action_format='dense', absolute_output=absolute_output
+        )(*inputs)
+        with tf.Session() as sess:
+            action, black_count, white_count, check = sess.run(
+                outputs, feed_dict=feed_dict
+            )
+
+    if data_format == 'NHWC':
+        action = np.transpose(action, (0, 3, 1, 2))
+    batch_size = len(board)
+    values = (np.reshape(action, [batch_size, -1, 81]),
+              np.reshape(black_count, [batch_size, 81]),
+              np.reshape(white_count, [batch_size, 81]),
+              np.reshape(check, [batch_size]))
+    return dict(zip(OUTPUT_NAMES, values))
+
+
+def make_golden(data_format, use_cudnn):
+    """
+    手番側から見た局面と、先手から見た局面の入出力を求める
+
+    :param data_format:
+    :param use_cudnn:
+    :return: 名前から配列へのdict
+    """
+    game_boards, game_hands = make_game_positions(n=128, seed=0)
+    random_boards, random_hands = make_random_positions(n=64, seed=3)
+    board = np.concatenate([game_boards, random_boards])
+    black_hand = np.concatenate([game_hands, random_hands])
+
+    golden = {'relative_board': board, 'relative_black_hand': black_hand}
+    outputs = run_layer(board, black_hand, data_format=data_format,
+                        use_cudnn=use_cudnn)
+    golden.update({'relative_' + key: value
+                   for key, value in outputs.items()})
+
+    # 後手番の局面は盤面を回転して駒の持ち主を入れ替える
+    # 盤面の変換は2回行うと元に戻るので、to_relativeで先手から見た局面にする
+    boards, hands = make_game_positions(n=64, seed=2)
+    turn = np.arange(64) % 2 == 1
+    board, black_hand, white_hand = to_relative(
+        np, np.reshape(boards, [-1, 81]), hands, hands[::-1], turn
+    )
+    board = np.reshape(board, [-1, 9, 9]).astype(np.int32)
+    golden.update({'absolute_board': board,
+                   'absolute_black_hand': black_hand,
+                   'absolute_white_hand': white_hand, 'absolute_turn': turn})
+    for absolute_output, key in ((False, 'absolute'),
+                                 (True, 'absolute_output')):
+        outputs = run_layer(board, black_hand, white_hand, turn,
+                            absolute_output=absolute_output,
+                            data_format=data_format, use_cudnn=use_cudnn)
+        golden.update({'{}_{}'.format(key, name): value
+                       for name, value in outputs.items()})
+    return golden
+
+
+def main():
+    data_format, use_cudnn = get_env()
+    golden = make_golden(data_format=data_format, use_cudnn=use_cudnn)
+
+    GOLDEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(str(GOLDEN_PATH), **golden)
+    print('saved {} arrays to {}'.format(len(golden), GOLDEN_PATH))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import gc
+import weakref
+
+import numpy as np
+import tensorflow as tf
+
+from ..memo import lookup, store
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestMemo(tf.test.TestCase):
+    def test_tensor_key(self):
+        """
+        同じテンソルなら保存した値を返し、別のテンソルなら返さないことを確認する
+
+        :return:
+        """
+        with tf.Graph().as_default():
+            a = tf.zeros([1, 9, 9])
+            b = tf.zeros([1, 9, 9])
+            value = store(tf.ones([1]), 'memo_test', a, 'NCHW')
+
+            self.assertIs(lookup('memo_test', a, 'NCHW'), value)
+            self.assertIsNone(lookup('memo_test', b, 'NCHW'))
+            self.assertIsNone(lookup('memo_test', a, 'NHWC'))
+
+    def test_unhashable_key(self):
+        """
+        numpyの配列を入力にした場合は保存しないことを確認する
+
+        :return:
+        """
+        with tf.Graph().as_default():
+            board = np.zeros([1, 9, 9], dtype=np.int32)
+            value = store(tf.ones([1]), 'memo_test', board)
+
+            self.assertIsNotNone(value)
+            self.assertIsNone(lookup('memo_test', board))
+
+    def test_release(self):
+        """
+        グラフを破棄すると保存した値も破棄されることを確認する
+
+        :return:
+        """
+        graph = tf.Graph()
+        with graph.as_default():
+            store(tf.ones([1]), 'memo_test')
+        reference = weakref.ref(graph)
+        del graph
+        gc.collect()
+
+        self.assertIsNone(reference())
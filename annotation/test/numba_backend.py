@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import tensorflow as tf
+
+from .backend import BoardTestMixin
+from .batch import make_random_positions
+from .game import make_game_positions
+from ..annotation import AnnotationLayer
+from ..numba_backend import annotate, annotate_position
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestNumbaBackend(BoardTestMixin, tf.test.TestCase):
+    def _run_layer(self, boards, hands):
+        shape = [None, 1, 9, 9] if self.data_format == 'NCHW' else \
+            [None, 9, 9, 1]
+        ph_board = tf.placeholder(tf.int32, shape=shape)
+        ph_hand = tf.placeholder(tf.int32, shape=[None, 7])
+        outputs = AnnotationLayer(
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            action_format='dense'
+        )(ph_board, ph_hand)
+
+        with self.test_session() as sess:
+            return sess.run(outputs, feed_dict={ph_board: boards,
+                                                ph_hand: hands})
+
+    def test_annotation_layer(self):
+        """
+        対局の局面とランダムな局面でAnnotationLayerと一致することを確認する
+        ランダムな局面は非手番側の王に利きがない合法な局面で、
+        王手の局面を含むので、王手を避ける行動も比べられる
+
+        :return:
+        """
+        positions = {
+            'game': make_game_positions(n=256, seed=0),
+            'random': make_random_positions(n=256, seed=1)
+        }
+        names = ('action', 'black_count', 'white_count', 'check')
+        for key, (boards, hands) in positions.items():
+            boards = self._reshape(boards)
+            expected = self._run_layer(boards=boards, hands=hands)
+            with self.subTest(positions=key):
+                self.assertTrue(np.any(expected[3]))
+            actual = annotate(boards, hands, data_format=self.data_format,
+                              action_format='dense')
+            for name, e, a in zip(names, expected, actual):
+                with self.subTest(positions=key, name=name):
+                    self.assertEqual(e.dtype, a.dtype)
+                    self.assertTupleEqual(e.shape, a.shape)
+                    self.assertTrue(np.all(e == a))
+
+    def test_position(self):
+        """
+        1局面ずつ計算した結果がバッチで計算した結果と一致することを確認する
+
+        :return:
+        """
+        boards, hands = make_game_positions(n=64, seed=2)
+        expected = annotate(boards, hands, data_format='NCHW',
+                            action_format='dense')
+        for i in range(64):
+            action, black_count, white_count, check = annotate_position(
+                boards[i], hands[i]
+            )
+            with self.subTest(i=i):
+                self.assertTrue(np.all(
+                    np.reshape(action, [139, 1, 9, 9]) ==
+                    expected[0][i, :, None]
+                ))
+                self.assertTrue(np.all(np.reshape(black_count, [1, 9, 9]) ==
+                                       expected[1][i]))
+                self.assertTrue(np.all(np.reshape(white_count, [1, 9, 9]) ==
+                                       expected[2][i]))
+                self.assertEqual(check, expected[3][i, 0, 0, 0])
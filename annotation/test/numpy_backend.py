@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import tensorflow as tf
+
+from .backend import BoardTestMixin
+from .game import make_game_positions
+from ..annotation import AnnotationLayer
+from ..numpy_backend import annotate
+from ..vectorized import SparseAction
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestNumpyBackend(BoardTestMixin, tf.test.TestCase):
+    def _assert_outputs(self, expected, actual):
+        names = ('action', 'black_count', 'white_count', 'check')
+        for name, e, a in zip(names, expected, actual):
+            with self.subTest(name=name):
+                if isinstance(e, SparseAction):
+                    for field, x, y in zip(e._fields, e, a):
+                        with self.subTest(field=field):
+                            self._assert_array(expected=x, actual=y)
+                    continue
+                if isinstance(e, list):
+                    self.assertEqual(len(e), len(a))
+                    e, a = np.stack(e), np.stack(a)
+                self._assert_array(expected=e, actual=a)
+
+    def _assert_array(self, expected, actual):
+        self.assertEqual(expected.dtype, actual.dtype)
+        self.assertTupleEqual(expected.shape, actual.shape)
+        self.assertTrue(np.all(expected == actual))
+
+    def test_action_format(self):
+        """
+        全ての出力形式でAnnotationLayerと一致することを確認する
+
+        :return:
+        """
+        boards, hands = make_game_positions(n=256, seed=0)
+        boards = self._reshape(boards)
+
+        ph_board = self._placeholder()
+        ph_hand = tf.placeholder(tf.int32, shape=[None, 7])
+
+        action_formats = ('list', 'dense', 'packed8', 'packed32', 'sparse')
+        outputs = {}
+        for action_format in action_formats:
+            outputs[action_format] = AnnotationLayer(
+                data_format=self.data_format, use_cudnn=self.use_cudnn,
+                action_format=action_format
+            )(ph_board, ph_hand)
+
+        with self.test_session() as sess:
+            values = sess.run(outputs, feed_dict={ph_board: boards,
+                                                  ph_hand: hands})
+
+        for action_format in action_formats:
+            with self.subTest(action_format=action_format):
+                actual = annotate(boards, hands,
+                                  data_format=self.data_format,
+                                  action_format=action_format)
+                self._assert_outputs(expected=values[action_format],
+                                     actual=actual)
+
+    def test_absolute(self):
+        """
+        先手から見た局面を入力した場合にAnnotationLayerと一致することを確認する
+
+        :return:
+        """
+        boards, hands = make_game_positions(n=64, seed=1)
+        boards = self._reshape(boards)
+        white_hands = hands[::-1]
+        turn = np.arange(64) % 2 == 1
+
+        ph_board = self._placeholder()
+        ph_black_hand = tf.placeholder(tf.int32, shape=[None, 7])
+        ph_white_hand = tf.placeholder(tf.int32, shape=[None, 7])
+        ph_turn = tf.placeholder(tf.bool, shape=[None])
+
+        outputs = {}
+        for absolute_output in (False, True):
+            outputs[absolute_output] = AnnotationLayer(
+                data_format=self.data_format, use_cudnn=self.use_cudnn,
+                action_format='dense', absolute_output=absolute_output
+            )(ph_board, ph_black_hand, ph_white_hand, ph_turn)
+
+        with self.test_session() as sess:
+            values = sess.run(outputs, feed_dict={
+                ph_board: boards, ph_black_hand: hands,
+                ph_white_hand: white_hands, ph_turn: turn
+            })
+
+        for absolute_output in (False, True):
+            with self.subTest(absolute_output=absolute_output):
+                actual = annotate(boards, hands, white_hands, turn,
+                                  data_format=self.data_format,
+                                  action_format='dense',
+                                  absolute_output=absolute_output)
+                self._assert_outputs(expected=values[absolute_output],
+                                     actual=actual)
+
+    def test_white_hand(self):
+        """
+        turnだけを指定した場合はエラーになることを確認する
+
+        :return:
+        """
+        boards, hands = make_game_positions(n=1, seed=2)
+        with self.assertRaises(ValueError):
+            annotate(boards, hands, turn=np.zeros(1, dtype=np.bool_))
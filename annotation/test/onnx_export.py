@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import tempfile
+from pathlib import Path
+
+import onnxruntime as ort
+import tensorflow as tf
+
+from .backend import BackendTestMixin
+from ..onnx_export import INPUT_NAMES, OUTPUT_NAMES, export_onnx
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestOnnxExport(BackendTestMixin, tf.test.TestCase):
+    """
+    TensorFlow 2とonnxruntimeの環境で実行する
+    """
+    # モデルの入力は手番側から見た局面だけ
+    absolute_input = False
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.directory = tempfile.TemporaryDirectory()
+        path = Path(cls.directory.name) / 'annotation.onnx'
+        export_onnx(path, data_format=cls.data_format)
+        cls.session = ort.InferenceSession(
+            str(path), providers=['CPUExecutionProvider']
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+        super().tearDownClass()
+
+    def annotate(self, board, black_hand, white_hand=None, turn=None,
+                 absolute_output=False):
+        return self.session.run(None, {INPUT_NAMES[0]: board,
+                                       INPUT_NAMES[1]: black_hand})
+
+    def test_signature(self):
+        """
+        入出力の名前と型がAnnotationLayerと同じことを確認する
+
+        :return:
+        """
+        inputs = self.session.get_inputs()
+        self.assertEqual(tuple(i.name for i in inputs), INPUT_NAMES)
+        self.assertEqual([i.type for i in inputs],
+                         ['tensor(int32)', 'tensor(int32)'])
+
+        outputs = self.session.get_outputs()
+        self.assertEqual(tuple(o.name for o in outputs), OUTPUT_NAMES)
+        self.assertEqual([o.type for o in outputs],
+                         ['tensor(bool)', 'tensor(int32)', 'tensor(int32)',
+                          'tensor(bool)'])
+
+    def test_batch_size(self):
+        """
+        バッチサイズを変えて、AnnotationLayerと一致することを確認する
+
+        :return:
+        """
+        for batch_size in (1, 7, 192):
+            with self.subTest(batch_size=batch_size):
+                actual = self.annotate(*self._inputs('relative', batch_size))
+                self._assert_outputs(
+                    expected=self._expected('relative', batch_size),
+                    actual=actual
+                )
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import tensorflow as tf
+
+from annotation.piece import Piece
+from .backend import BoardTestMixin
+from .batch import make_random_positions
+from ..annotation import AnnotationLayer
+from ..perspective import flip_board, to_relative
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def flip(boards):
+    """
+    numpyで盤面を相手から見た盤面にする
+
+    :param boards: [batch, 9, 9]
+    :return:
+    """
+    flipped = boards[:, ::-1, ::-1].copy()
+    black = flipped < Piece.WHITE_FU
+    white = np.logical_and(flipped >= Piece.WHITE_FU, flipped < Piece.EMPTY)
+    flipped[black] += Piece.WHITE_FU
+    flipped[white] -= Piece.WHITE_FU
+    return flipped
+
+
+class TestPerspective(BoardTestMixin, tf.test.TestCase):
+    def test_flip(self):
+        """
+        手番が後手の局面だけが変換されることを確認する
+
+        :return:
+        """
+        boards, hands = make_random_positions(n=16, seed=0)
+        white_hands = hands[::-1]
+        turn = np.arange(16) % 2 == 1
+
+        ph_board = self._placeholder()
+        ph_black_hand = tf.placeholder(tf.int32, shape=[None, 7])
+        ph_white_hand = tf.placeholder(tf.int32, shape=[None, 7])
+        ph_turn = tf.placeholder(tf.bool, shape=[None])
+        board, turn_hand, next_hand = to_relative(
+            board=ph_board, black_hand=ph_black_hand,
+            white_hand=ph_white_hand, turn=ph_turn
+        )
+        twice = flip_board(flip_board(ph_board))
+
+        with self.test_session() as sess:
+            board_value, turn_value, next_value, twice_value = sess.run(
+                [board, turn_hand, next_hand, twice],
+                feed_dict={ph_board: self._reshape(boards),
+                           ph_black_hand: hands, ph_white_hand: white_hands,
+                           ph_turn: turn}
+            )
+
+        expected = np.where(turn[:, None, None], flip(boards), boards)
+        self.assertTrue(np.all(board_value == self._reshape(expected)))
+        self.assertTrue(np.all(
+            turn_value == np.where(turn[:, None], white_hands, hands)
+        ))
+        self.assertTrue(np.all(
+            next_value == np.where(turn[:, None], hands, white_hands)
+        ))
+        self.assertTrue(np.all(twice_value == self._reshape(boards)))
+
+    def test_annotation(self):
+        """
+        先手から見た局面を入力した結果と、手番側から見た局面を入力した結果を比べる
+
+        :return:
+        """
+        boards, hands = make_random_positions(n=16, seed=1)
+        white_hands = hands[::-1]
+        turn = np.arange(16) % 2 == 1
+        # 後手番の局面を先手から見た局面にする
+        absolute_boards = np.where(turn[:, None, None], flip(boards), boards)
+        black_hands = np.where(turn[:, None], white_hands, hands)
+        white_hands = np.where(turn[:, None], hands, white_hands)
+
+        ph_board = self._placeholder()
+        ph_hand = tf.placeholder(tf.int32, shape=[None, 7])
+        ph_absolute_board = self._placeholder()
+        ph_black_hand = tf.placeholder(tf.int32, shape=[None, 7])
+        ph_white_hand = tf.placeholder(tf.int32, shape=[None, 7])
+        ph_turn = tf.placeholder(tf.bool, shape=[None])
+
+        options = dict(data_format=self.data_format, use_cudnn=self.use_cudnn)
+        expected = AnnotationLayer(**options)(ph_board, ph_hand)
+        relative = AnnotationLayer(**options)(
+            ph_absolute_board, ph_black_hand, ph_white_hand, ph_turn
+        )
+        absolute = AnnotationLayer(absolute_output=True, **options)(
+            ph_absolute_board, ph_black_hand, ph_white_hand, ph_turn
+        )
+
+        with self.test_session() as sess:
+            expected, relative, absolute = sess.run(
+                [expected, relative, absolute],
+                feed_dict={ph_board: self._reshape(boards), ph_hand: hands,
+                           ph_absolute_board: self._reshape(absolute_boards),
+                           ph_black_hand: black_hands,
+                           ph_white_hand: white_hands, ph_turn: turn}
+            )
+
+        names = ('action', 'black_count', 'white_count', 'check')
+        for name, e, r, a in zip(names, expected, relative, absolute):
+            with self.subTest(name=name):
+                e = np.asarray(e)
+                r = np.asarray(r)
+                a = np.asarray(a)
+                self.assertTrue(np.all(e == r))
+
+                if name == 'check':
+                    self.assertTrue(np.all(e == a))
+                    continue
+                # 後手番の局面は180度回転している
+                if name == 'action':
+                    e = np.moveaxis(e, 0, 1)
+                    a = np.moveaxis(a, 0, 1)
+                e = np.reshape(e, [16, -1, 81])
+                a = np.reshape(a, [16, -1, 81])
+                rotated = np.where(turn[:, None, None], e[..., ::-1], e)
+                self.assertTrue(np.all(a == rotated))
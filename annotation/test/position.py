@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import shogi
+import tensorflow as tf
+
+from .backend import BackendTestMixin
+from ..position import Position
+from ..usi import to_usi
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def play_random_game(seed, max_moves=256):
+    """
+    合法手をランダムに選んで対局する
+
+    :param seed:
+    :param max_moves:
+    :return: USI形式の指し手のlist
+    """
+    rng = np.random.RandomState(seed)
+    board = shogi.Board()
+    moves = []
+    while not board.is_game_over() and len(moves) < max_moves:
+        legal_moves = list(board.legal_moves)
+        move = legal_moves[rng.randint(len(legal_moves))]
+        board.push(move)
+        moves.append(move.usi())
+    return moves
+
+
+class TestPosition(BackendTestMixin, tf.test.TestCase):
+    """
+    保存したAnnotationLayerの出力と比べる局面は、指し手を進めて戻した後に
+    差分で更新した状態から出力を求める
+    """
+    def annotate(self, board, black_hand, white_hand=None, turn=None,
+                 absolute_output=False):
+        rng = np.random.RandomState(0)
+        outputs = []
+        for i in range(len(board)):
+            position = Position(
+                board=np.reshape(board[i], [81]), black_hand=black_hand[i],
+                white_hand=None if white_hand is None else white_hand[i],
+                turn=False if turn is None else turn[i]
+            )
+            self._walk(position, rng=rng)
+            outputs.append(position.annotate(
+                data_format=self.data_format, action_format='dense',
+                absolute_output=absolute_output
+            ))
+        return [np.concatenate(values) for values in zip(*outputs)]
+
+    @staticmethod
+    def _walk(position, rng, max_moves=8):
+        """
+        出力の合法手からランダムに選んで指し手を進め、途中で一部を戻してから全て戻す
+
+        :param position:
+        :param rng:
+        :param max_moves:
+        :return:
+        """
+        n_moves = 0
+        for n in (max_moves, max_moves // 2):
+            for _ in range(n):
+                action = position.annotate(action_format='sparse')[0]
+                if action.count[0] == 0:
+                    break
+                index, square = action.values[rng.randint(action.count[0])]
+                position.do_move(to_usi(action=index, square=square,
+                                        turn=position.turn))
+                n_moves += 1
+            for _ in range(n_moves // 2):
+                position.undo_move()
+                n_moves -= 1
+        for _ in range(n_moves):
+            position.undo_move()
+
+    def test_incremental(self):
+        """
+        差分で更新した状態が、同じ局面を作り直した状態と一致することを確認する
+        全ての指し手を戻すと初期局面に戻ることも確認する
+
+        :return:
+        """
+        for seed in range(4):
+            moves = play_random_game(seed=seed)
+            board = shogi.Board()
+            position = Position()
+            initial = Position()
+            for i, move in enumerate(moves):
+                board.push(shogi.Move.from_usi(move))
+                position.do_move(move)
+
+                expected = Position(board=position.board,
+                                    black_hand=position.hand[0],
+                                    white_hand=position.hand[1],
+                                    turn=position.turn)
+                with self.subTest(seed=seed, i=i):
+                    self.assertTrue(np.all(position.effect == expected.effect))
+                    self.assertTrue(np.all(position.pin == expected.pin))
+                    self.assertEqual(position.check, board.is_check())
+
+            for _ in moves:
+                position.undo_move()
+            with self.subTest(seed=seed):
+                self.assertTrue(np.all(position.board == initial.board))
+                self.assertTrue(np.all(position.hand == initial.hand))
+                self.assertTrue(np.all(position.effect == initial.effect))
+                self.assertFalse(position.turn)
+
+    def test_inputs(self):
+        """
+        AnnotationLayerに入力する形の盤面になることを確認する
+
+        :return:
+        """
+        position = Position()
+        position.do_move('7g7f')
+        board, black_hand, white_hand, turn = position.inputs(
+            data_format=self.data_format
+        )
+        self.assertTrue(np.all(board == self._reshape(position.board)))
+        self.assertTupleEqual(black_hand.shape, (1, 7))
+        self.assertTupleEqual(white_hand.shape, (1, 7))
+        self.assertTrue(np.all(turn == [True]))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import shogi
+import tensorflow as tf
+
+from .backend import BoardTestMixin
+from .batch import make_random_positions
+from ..annotation import AnnotationLayer
+from ..initial_board import make_initial_board
+from ..usi import to_usi
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestSparseAction(BoardTestMixin, tf.test.TestCase):
+    def _build(self, action_format):
+        shape = [None, 1, 9, 9] if self.data_format == 'NCHW' else \
+            [None, 9, 9, 1]
+        ph_board = tf.placeholder(tf.int32, shape=shape)
+        ph_hand = tf.placeholder(tf.int32, shape=[None, 7])
+        action, = AnnotationLayer(
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            outputs=['action'], action_format=action_format
+        )(ph_board, ph_hand)
+        return ph_board, ph_hand, action
+
+    def test_sparse(self):
+        """
+        合法手の並びが盤面の形の出力と一致することを確認する
+
+        :return:
+        """
+        boards, hands = make_random_positions(n=16, seed=0)
+
+        ph_board, ph_hand, sparse = self._build(action_format='sparse')
+        dense = AnnotationLayer(
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            outputs=['action'], action_format='dense'
+        )(ph_board, ph_hand)[0]
+
+        with self.test_session() as sess:
+            sparse, dense = sess.run([sparse, dense], feed_dict={
+                ph_board: self._reshape(boards), ph_hand: hands
+            })
+
+        if self.data_format != 'NCHW':
+            dense = np.transpose(dense, [0, 3, 1, 2])
+        dense = np.reshape(dense, [16, 139, 81])
+
+        self.assertTrue(np.all(sparse.count == np.sum(dense, axis=(1, 2))))
+        self.assertEqual(sparse.offsets[0], 0)
+        self.assertTrue(np.all(np.diff(sparse.offsets) == sparse.count))
+        for b in range(16):
+            values = sparse.values[sparse.offsets[b]:sparse.offsets[b + 1]]
+            expected = np.stack(np.nonzero(dense[b]), axis=1)
+            self.assertTrue(np.all(values == expected))
+
+    def test_usi(self):
+        """
+        初期局面の合法手をUSI形式にしてpython-shogiの合法手と比べる
+        初期局面は先後で対称なので、後手番でも同じ盤面になる
+
+        :return:
+        """
+        board = self._reshape(make_initial_board())
+        ph_board, ph_hand, sparse = self._build(action_format='sparse')
+        with self.test_session() as sess:
+            sparse = sess.run(sparse, feed_dict={
+                ph_board: np.concatenate([board, board]),
+                ph_hand: np.zeros((2, 7), dtype=np.int32)
+            })
+
+        turn = np.repeat([False, True], sparse.count)
+        moves = to_usi(action=sparse.values[:, 0], square=sparse.values[:, 1],
+                       turn=turn)
+
+        black = shogi.Board()
+        white = shogi.Board(
+            'lnsgkgsnl/1r5b1/ppppppppp/9/9/9/PPPPPPPPP/1B5R1/LNSGKGSNL w - 1'
+        )
+        for b, position in enumerate((black, white)):
+            with self.subTest(turn=b):
+                expected = sorted(move.usi() for move in position.legal_moves)
+                actual = sorted(moves[sparse.offsets[b]:sparse.offsets[b + 1]])
+                self.assertListEqual(actual, expected)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import tensorflow as tf
+
+from .backend import BackendTestMixin
+from ..tf2 import AnnotationFunction
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+class TestTF2(BackendTestMixin, tf.test.TestCase):
+    """
+    TensorFlow 2の環境で実行する
+    """
+    def annotate(self, board, black_hand, white_hand=None, turn=None,
+                 absolute_output=False):
+        function = AnnotationFunction(data_format=self.data_format,
+                                      action_format='dense',
+                                      absolute_output=absolute_output)
+        return function(board, black_hand, white_hand, turn)
+
+    def test_batch_size(self):
+        """
+        バッチサイズが変わっても追跡し直さずに、AnnotationLayerと一致することを確認する
+
+        :return:
+        """
+        function = AnnotationFunction(data_format=self.data_format,
+                                      action_format='dense')
+        for batch_size in (1, 7, 192):
+            with self.subTest(batch_size=batch_size):
+                actual = function(*self._inputs('relative', batch_size))
+                self._assert_outputs(
+                    expected=self._expected('relative', batch_size),
+                    actual=actual
+                )
+        self.assertEqual(
+            function._relative_function.experimental_get_tracing_count(), 1
+        )
+
+    def test_numpy_behavior(self):
+        """
+        読み込んでもtf.Tensorの振る舞いを変えないことを確認する
+        numpyと同じ振る舞いならint32とfloat32の足し算ができる
+
+        :return:
+        """
+        with self.assertRaises((TypeError, tf.errors.InvalidArgumentError)):
+            tf.constant(1, dtype=tf.int32) + tf.constant(1.0)
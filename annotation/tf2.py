@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TensorFlow 2でAnnotationLayerと同じ出力を計算する
+
+vectorized.annotateをtensorflow.experimental.numpyで実行して、
+tf.function(jit_compile=True)で1回だけ追跡する
+XLAで小さな演算がまとめられるので、eagerの学習ループからそのまま呼び出せる
+
+placeholderやSession、sonnetを使わないので、TensorFlow 2だけで動く
+vectorized.annotateは整数をint32にそろえているので、
+experimental_enable_numpy_behaviorは使わない(tf.Tensorの振る舞いを変えない)
+"""
+
+import tensorflow as tf
+import tensorflow.experimental.numpy as tnp
+
+from .vectorized import annotate, format_outputs, to_absolute, to_relative
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+ACTION_FORMATS = ('list', 'dense')
+
+
+class AnnotationFunction(tf.Module):
+    def __init__(self, data_format, action_format='list',
+                 absolute_output=False, jit_compile=True,
+                 name='annotation_function'):
+        """
+        AnnotationLayerと同じ入出力の関数
+
+        :param data_format:
+        :param action_format: 'list'または'dense'
+        :param absolute_output: turnを指定した場合に、盤面の形の出力を
+            先手から見た向きに戻すならTrue
+        :param jit_compile: XLAでコンパイルするならTrue
+        :param name:
+        """
+        super().__init__(name=name)
+        if action_format not in ACTION_FORMATS:
+            raise ValueError(action_format)
+
+        self.data_format = data_format
+        self.action_format = action_format
+        self.absolute_output = absolute_output
+
+        # バッチサイズを決めずに1回だけ追跡する
+        if data_format == 'NCHW':
+            board_shape = [None, 1, 9, 9]
+        else:
+            board_shape = [None, 9, 9, 1]
+        board_spec = tf.TensorSpec(board_shape, dtype=tf.int32)
+        hand_spec = tf.TensorSpec([None, 7], dtype=tf.int32)
+        turn_spec = tf.TensorSpec([None], dtype=tf.bool)
+
+        self._relative_function = tf.function(
+            self._annotate_relative, input_signature=[board_spec, hand_spec],
+            jit_compile=jit_compile
+        )
+        self._absolute_function = tf.function(
+            self._annotate_absolute,
+            input_signature=[board_spec, hand_spec, hand_spec, turn_spec],
+            jit_compile=jit_compile
+        )
+
+    def __call__(self, board, black_hand, white_hand=None, turn=None):
+        """
+        turnを省略した場合はboardとblack_handが手番側から見た局面
+        turnを指定した場合はboardが先手から見た盤面で、
+        black_handとwhite_handが先手と後手の持ち駒
+
+        :param board:
+        :param black_hand:
+        :param white_hand:
+        :param turn: [batch]のbool、後手番ならTrue
+        :return: AnnotationLayerと同じ4つの出力
+        """
+        if turn is None:
+            return self._relative_function(board, black_hand)
+        if white_hand is None:
+            raise ValueError('white_hand is required')
+        return self._absolute_function(board, black_hand, white_hand, turn)
+
+    def _annotate_relative(self, board, hand):
+        outputs = annotate(tnp, tnp.reshape(board, (-1, 81)), hand)
+        return self._format(outputs)
+
+    def _annotate_absolute(self, board, black_hand, white_hand, turn):
+        board, hand, _ = to_relative(tnp, tnp.reshape(board, (-1, 81)),
+                                     black_hand, white_hand, turn)
+        action, black_count, white_count, check = annotate(tnp, board, hand)
+        if self.absolute_output:
+            action = to_absolute(tnp, action, turn)
+            black_count = to_absolute(tnp, black_count, turn)
+            white_count = to_absolute(tnp, white_count, turn)
+        return self._format((action, black_count, white_count, check))
+
+    def _format(self, outputs):
+        outputs = format_outputs(tnp, outputs, data_format=self.data_format,
+                                 action_format=self.action_format)
+        # tnpの配列をtf.Tensorとして返す
+        return tf.nest.map_structure(tf.convert_to_tensor, outputs)
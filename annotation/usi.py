@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行動のインデックスと移動先のマスの組をUSI形式の指し手の文字列に変換する
+
+行動のインデックスはrandom_action.get_action_indexと同じ
+    移動 (distance - 1) * 16 + promotion * 8 + direction (0--127)
+    桂馬 右に跳ねる,左に跳ねる,右に跳ねる(成),左に跳ねる(成) (128--131)
+    駒を打つ 132 + 駒の番号 (132--138)
+方向とマスは手番側から見たもので、マスの番号は筋 * 9 + 段
+後手番の場合は盤面を180度回転してUSIの座標にする
+
+tensorflowを使わずにnumpyだけで計算する
+"""
+
+import numpy as np
+
+from .direction import Direction, get_eight_directions, get_step
+from .piece import Piece
+from .vectorized.table import ACTION_SIZE
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+FILE_NAMES = np.array(list('123456789'))
+RANK_NAMES = np.array(list('abcdefghi'))
+DROP_NAMES = {
+    Piece.BLACK_FU: 'P', Piece.BLACK_KY: 'L', Piece.BLACK_KE: 'N',
+    Piece.BLACK_GI: 'S', Piece.BLACK_KA: 'B', Piece.BLACK_HI: 'R',
+    Piece.BLACK_KI: 'G'
+}
+
+
+def make_action_arrays():
+    """
+    行動のインデックスごとの移動元への差分、成りのフラグ、打つ駒の名前
+
+    :return: 筋の差分、段の差分、成りのフラグ、打つ駒の名前
+        打つ行動の差分は0、移動の行動の駒の名前は空文字列
+    """
+    dh = np.zeros(ACTION_SIZE, dtype=np.int32)
+    dw = np.zeros(ACTION_SIZE, dtype=np.int32)
+    promotion = np.zeros(ACTION_SIZE, dtype=np.bool_)
+    drop = np.full(ACTION_SIZE, '', dtype='<U1')
+
+    for distance in range(1, 9):
+        for p in range(2):
+            for direction in get_eight_directions():
+                index = (distance - 1) * 16 + p * 8 + direction
+                step = get_step(direction=direction)
+                dh[index] = step[0] * distance
+                dw[index] = step[1] * distance
+                promotion[index] = p
+    for p in range(2):
+        for i, direction in enumerate((Direction.RIGHT_UP_UP,
+                                       Direction.LEFT_UP_UP)):
+            index = 128 + p * 2 + i
+            dh[index], dw[index] = get_step(direction=direction)
+            promotion[index] = p
+    for piece, name in DROP_NAMES.items():
+        drop[132 + piece] = name
+
+    return dh, dw, promotion, drop
+
+
+_action_arrays = None
+
+
+def get_action_arrays():
+    global _action_arrays
+    if _action_arrays is None:
+        _action_arrays = make_action_arrays()
+    return _action_arrays
+
+
+def to_usi(action, square, turn=None, absolute=False):
+    """
+    行動のインデックスと移動先のマスをUSI形式の文字列の配列にする
+
+    :param action: 行動のインデックスの配列
+    :param square: 移動先のマスの番号の配列
+    :param turn: 後手番ならTrueの配列、またはbool
+        省略した場合は先手番
+    :param absolute: squareが先手から見たマスの番号の場合はTrue
+        AnnotationLayerのabsolute_outputを指定した場合
+    :return: actionと同じ形の文字列の配列
+    """
+    action = np.asarray(action)
+    square = np.asarray(square)
+    if turn is None:
+        turn = False
+    turn = np.broadcast_to(np.asarray(turn, dtype=np.bool_), action.shape)
+
+    if absolute:
+        # 手番側から見たマスにする
+        square = np.where(turn, 80 - square, square)
+
+    dh, dw, promotion, drop = get_action_arrays()
+    target_h, target_w = np.divmod(square, 9)
+    source_h = target_h - dh[action]
+    source_w = target_w - dw[action]
+
+    # 後手番の場合は180度回転する
+    target_h = np.where(turn, 8 - target_h, target_h)
+    target_w = np.where(turn, 8 - target_w, target_w)
+    source_h = np.where(turn, 8 - source_h, source_h)
+    source_w = np.where(turn, 8 - source_w, source_w)
+
+    target = np.char.add(FILE_NAMES[target_h], RANK_NAMES[target_w])
+    # 打つ行動では移動元は盤の外になるが、その結果は使わない
+    source = np.char.add(FILE_NAMES[np.clip(source_h, 0, 8)],
+                         RANK_NAMES[np.clip(source_w, 0, 8)])
+    move = np.char.add(np.char.add(source, target),
+                       np.where(promotion[action], '+', ''))
+    drop_name = drop[action]
+    dropped = np.char.add(np.char.add(drop_name, '*'), target)
+
+    return np.where(drop_name != '', dropped, move)
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+numpyと同じ関数を持つモジュールで書いたAnnotationLayerの処理
+tensorflowやsonnetに依存しないので、numpy以外の計算の仕組みからも使える
+"""
+
+from .core import (SparseAction, annotate, format_outputs, to_absolute,
+                   to_relative)
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
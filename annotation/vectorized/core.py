@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AnnotationLayerと同じ出力を、numpyと同じ関数を持つモジュールxpで計算する
+xpにはnumpy, jax.numpy, tensorflow.experimental.numpyなどを使う
+
+盤面を[batch, 81]にして、移動先のマスごとに8方向の直線上で最初に当たる駒を求める
+その駒が移動先へ動けるなら利きがある
+配列への代入を使わないので、追跡してコンパイルする仕組みでもそのまま使える
+型の暗黙の変換に頼らないように、整数は全てint32にそろえる
+tensorflow.experimental.numpyでもexperimental_enable_numpy_behaviorなしで動く
+
+盤面と持ち駒は手番側から見たもので、出力も手番側から見たものになる
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .table import ACTION_SIZE, OFF_BOARD, get_tables
+from ..piece import Piece
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+# IntEnumのままではjax.numpyなどで値として扱えないので、intにしておく
+BLACK_FU = int(Piece.BLACK_FU)
+BLACK_KE = int(Piece.BLACK_KE)
+BLACK_OU = int(Piece.BLACK_OU)
+EMPTY = int(Piece.EMPTY)
+WHITE_FU = int(Piece.WHITE_FU)
+WHITE_KE = int(Piece.WHITE_KE)
+WHITE_OU = int(Piece.WHITE_OU)
+
+# 直線上の距離、方向、マスの番号
+# numpyの既定のint64のままではtf.Tensorと演算できないので、int32にしておく
+DISTANCE = np.arange(9, dtype=np.int32)
+DIRECTION = np.arange(8, dtype=np.int32)
+SQUARE = np.arange(81, dtype=np.int32)
+
+# 合法手だけを並べた出力
+# action_formatの'sparse'で使う、tensorflowを読み込まずに使えるようにここで定義する
+SparseAction = namedtuple('SparseAction', ['values', 'offsets', 'count'])
+
+
+def _to_int(xp, x):
+    return xp.asarray(x, dtype=np.int32)
+
+
+def _count(xp, flag, axis):
+    return xp.sum(_to_int(xp, flag), axis=axis, dtype=np.int32)
+
+
+def _argmax(xp, flag, axis):
+    """
+    最初にTrueになる位置
+    argmaxはint64を返すので、int32にする
+
+    :param xp:
+    :param flag:
+    :param axis:
+    :return:
+    """
+    return _to_int(xp, xp.argmax(_to_int(xp, flag), axis=axis))
+
+
+def _pad_board(xp, board):
+    """
+    盤の外のマスとして、番号81のマスにOFF_BOARDを置く
+
+    :param xp:
+    :param board: [batch, 81]
+    :return: [batch, 82]
+    """
+    return xp.concatenate([board, xp.full_like(board[:, :1], OFF_BOARD)],
+                          axis=1)
+
+
+def _find_first_pieces(xp, padded):
+    """
+    マスごとに8方向の直線上で最初に当たる駒と2番目に当たる駒を求める
+    移動先に利きを持てるのは、直線上で最初に当たる駒だけ
+
+    :param xp:
+    :param padded: [batch, 82]
+    :return: 1番目の駒の距離-1、駒、マスと、2番目の駒の距離-1、駒
+        いずれも[batch, 81, 8]、駒がなければ盤の外の位置になる
+    """
+    tables = get_tables()
+    ray_piece = xp.take(padded, tables.ray, axis=1)
+    occupied = ray_piece != EMPTY
+
+    first = _argmax(xp, occupied, axis=3)
+    # 盤の外の後ろには駒がないので、その場合は空きマスの位置になる
+    second = _argmax(xp, occupied & (first[..., None] < DISTANCE), axis=3)
+    first_piece = xp.take_along_axis(ray_piece, first[..., None],
+                                     axis=3)[..., 0]
+    second_piece = xp.take_along_axis(ray_piece, second[..., None],
+                                      axis=3)[..., 0]
+    first_square = xp.take(tables.ray_flat, tables.ray_base + first)
+    return first, first_piece, first_square, second, second_piece
+
+
+def _lookup_attack(xp, distance, piece, attack_table):
+    """
+    直線上の駒が移動先に利きを持つか
+
+    :param xp:
+    :param distance: [batch, 81, 8]、距離-1
+    :param piece: [batch, 81, 8]
+    :param attack_table: make_attack_arrayを1次元にした表
+    :return: [batch, 81, 8]のbool
+    """
+    # 盤の外の位置の駒は利きを持たないので、距離は表の範囲に収めればよい
+    index = (piece * 64 + get_tables().direction_offset +
+             xp.minimum(distance, 7))
+    return xp.take(attack_table, index)
+
+
+def _find_king(xp, board, king):
+    """
+    王のマスを求める
+
+    :param xp:
+    :param board: [batch, 81]
+    :param king: 王の駒の値
+    :return: 王のマス[batch]と王がいるか[batch]
+    """
+    is_king = board == king
+    square = _argmax(xp, is_king, axis=1)
+    return square, xp.any(is_king, axis=1)
+
+
+def _take_king(xp, value, square):
+    """
+    王のマスの値を取り出す
+
+    :param xp:
+    :param value: [batch, 81, ...]
+    :param square: [batch]
+    :return: [batch, ...]
+    """
+    index = xp.reshape(square, (-1,) + (1,) * (len(value.shape) - 1))
+    return xp.take_along_axis(value, index, axis=1)[:, 0]
+
+
+def _pin_line(xp, first_piece, first_square, second_piece, king_square,
+              has_king, king, slider_table):
+    """
+    王の直線上で最初に当たる味方の駒の後ろに、王の方へ長い利きを持つ相手の駒があれば
+    その味方の駒はピンされている
+
+    :param xp:
+    :param first_piece: _find_first_piecesの出力
+    :param first_square: _find_first_piecesの出力
+    :param second_piece: _find_first_piecesの出力
+    :param king_square: [batch]
+    :param has_king: [batch]
+    :param king: 王の駒の値
+    :param slider_table: 相手の駒のmake_slider_arrayを1次元にした表
+    :return: [batch, 81]のint32、ピンされた駒の直線の番号+1、ピンがなければ0
+    """
+    tables = get_tables()
+
+    piece = _take_king(xp, value=first_piece, square=king_square)
+    square = _take_king(xp, value=first_square, square=king_square)
+    behind = _take_king(xp, value=second_piece, square=king_square)
+
+    if king == BLACK_OU:
+        own = piece < WHITE_FU
+    else:
+        own = (piece >= WHITE_FU) & (piece < EMPTY)
+    slider = xp.take(slider_table, behind * 8 + DIRECTION)
+    pinned = own & (piece != king) & slider & has_king[:, None]
+
+    match = (square[:, :, None] == SQUARE) & pinned[:, :, None]
+    return xp.sum(xp.where(match, tables.line[:, None], 0), axis=1,
+                  dtype=np.int32)
+
+
+def _allowed_by_pin(xp, line, first_square):
+    """
+    ピンの直線の上だけを動けるように、移動先ごとに移動元の駒が動けるかを求める
+
+    :param xp:
+    :param line: _pin_lineの出力
+    :param first_square: _find_first_piecesの出力
+    :return: 直線上の移動元が動けるか[batch, 81, 8]のboolと、
+        桂馬の移動元を引くために盤の外を0で埋めたline[batch, 82]
+    """
+    tables = get_tables()
+    padded = xp.concatenate([line, xp.zeros_like(line[:, :1])], axis=1)
+    source = xp.reshape(
+        xp.take_along_axis(padded, xp.reshape(first_square, (-1, 81 * 8)),
+                           axis=1),
+        (-1, 81, 8)
+    )
+    allowed = (source == 0) | (source == tables.line)
+    return allowed, padded
+
+
+def annotate(xp, board, hand):
+    """
+    合法手、手番側と非手番側の利きの数、王手の有無を求める
+
+    :param xp: numpyと同じ関数を持つモジュール
+    :param board: [batch, 81]の整数、手番側から見た盤面
+    :param hand: [batch, 7]の整数、手番側の持ち駒
+    :return: 行動[batch, 139, 81]のbool、
+        手番側の利きの数[batch, 81]と非手番側の利きの数[batch, 81]のint32、
+        王手[batch]のbool
+    """
+    tables = get_tables()
+    board = _to_int(xp, board)
+    hand = _to_int(xp, hand)
+
+    padded = _pad_board(xp, board)
+    first, first_piece, first_square, second, second_piece = \
+        _find_first_pieces(xp, padded)
+    black_attack = _lookup_attack(xp, first, first_piece,
+                                  tables.black_attack)
+    white_attack = _lookup_attack(xp, first, first_piece,
+                                  tables.white_attack)
+    black_ke = xp.take(padded, tables.black_ke, axis=1) == BLACK_KE
+    white_ke = xp.take(padded, tables.white_ke, axis=1) == WHITE_KE
+
+    black_king, has_black_king = _find_king(xp, board, BLACK_OU)
+    white_king, has_white_king = _find_king(xp, board, WHITE_OU)
+
+    # 王手
+    king_attack = (_take_king(xp, value=white_attack, square=black_king) &
+                   has_black_king[:, None])
+    king_ke = (_take_king(xp, value=white_ke, square=black_king) &
+               has_black_king[:, None])
+    n_checks = (_count(xp, king_attack, axis=1) +
+                _count(xp, king_ke, axis=1))
+    check = n_checks > 0
+
+    # 王手している駒と、長い利きで王手している駒と王の間のマス
+    king_first = _take_king(xp, value=first, square=black_king)
+    between = (king_attack[:, :, None] &
+               (DISTANCE <= king_first[:, :, None]))
+    evasion_square = xp.concatenate([
+        xp.reshape(xp.take(tables.ray, black_king, axis=0), (-1, 72)),
+        xp.take(tables.white_ke, black_king, axis=0)
+    ], axis=1)
+    evasion_flag = xp.concatenate([xp.reshape(between, (-1, 72)), king_ke],
+                                  axis=1)
+    evasion = xp.any((evasion_square[:, :, None] == SQUARE) &
+                     evasion_flag[:, :, None], axis=1)
+    # 王以外の駒が移動できるマス、両王手なら王以外は動けない
+    target = ~check[:, None] | ((n_checks == 1)[:, None] & evasion)
+
+    # 手番側の王を取り除いた盤面での非手番側の利き
+    # 長い利きで王手されている時に、利きの上を遠ざかる方へは逃げられない
+    behind_king = first_piece == BLACK_OU
+    white_effect = xp.any(_lookup_attack(
+        xp, xp.where(behind_king, second, first),
+        xp.where(behind_king, second_piece, first_piece), tables.white_attack
+    ), axis=2) | xp.any(white_ke, axis=2)
+    black_effect = xp.any(black_attack, axis=2) | xp.any(black_ke, axis=2)
+
+    # 手番側の利き
+    black_pin = _pin_line(xp, first_piece, first_square, second_piece,
+                          black_king, has_black_king, BLACK_OU,
+                          tables.white_slider)
+    allowed, padded_pin = _allowed_by_pin(xp, black_pin, first_square)
+    ke_allowed = xp.take(padded_pin, tables.black_ke, axis=1) == 0
+
+    own = board < WHITE_FU
+    movable = ~own & target
+    counted = ~check[:, None] | movable
+    black_ou = first_piece == BLACK_OU
+
+    piece_effect = black_attack & allowed & ~black_ou
+    king_effect = black_attack & black_ou & (~white_effect)[:, :, None]
+    ke_effect = black_ke & ke_allowed
+    black_count = (
+        _count(xp, (piece_effect & counted[:, :, None]) | king_effect,
+               axis=2) +
+        _count(xp, ke_effect & counted[:, :, None], axis=2)
+    )
+
+    # 非手番側の利き
+    white_pin = _pin_line(xp, first_piece, first_square, second_piece,
+                          white_king, has_white_king, WHITE_OU,
+                          tables.black_slider)
+    white_allowed, padded_white_pin = _allowed_by_pin(xp, white_pin,
+                                                      first_square)
+    white_ke_allowed = xp.take(padded_white_pin, tables.white_ke,
+                               axis=1) == 0
+    # 非手番側の王は手番側の利きがないマスだけに利きがある
+    white_effect_flag = white_attack & xp.where(
+        first_piece == WHITE_OU, (~black_effect)[:, :, None], white_allowed
+    )
+    white_count = (_count(xp, white_effect_flag, axis=2) +
+                   _count(xp, white_ke & white_ke_allowed, axis=2))
+
+    # 移動の行動
+    move = ((piece_effect & movable[:, :, None]) |
+            (king_effect & ~own[:, :, None]))
+    # 移動元か移動先が敵陣
+    zone = ((tables.rank[:, None] <= 2) |
+            (xp.take(tables.padded_rank, first_square) <= 2))
+    promotable = xp.take(tables.promotable, first_piece) & zone
+    must_promote = xp.take(tables.must_promote,
+                           first_piece * 9 + tables.rank[:, None])
+    move = xp.stack([move & ~must_promote, move & promotable], axis=1)
+    # 移動元までの距離の次元を加える
+    move = move[..., None] & (first[:, None, :, :, None] == DISTANCE[:8])
+    # [batch, 成り, 移動先, 方向, 距離] -> [batch, 距離, 成り, 方向, 移動先]
+    # 移動先から見た方向を、移動元から見た方向にする
+    move = xp.transpose(move, (0, 4, 1, 3, 2))[:, :, :, ::-1]
+    move = xp.reshape(move, (-1, 128, 81))
+
+    # 桂馬の行動
+    ke_move = ke_effect & movable[:, :, None]
+    ke_move = xp.concatenate([
+        ke_move & ~tables.ke_must_promote[:, None],
+        ke_move & tables.ke_zone[:, None]
+    ], axis=2)
+    ke_move = xp.transpose(ke_move, (0, 2, 1))
+
+    # 駒を打つ行動
+    droppable = (board == EMPTY) & target
+    fu_file = xp.any(xp.reshape(board == BLACK_FU, (-1, 9, 9)), axis=2)
+    drop_fu = xp.take(fu_file, tables.file, axis=1)
+    drop = (droppable[:, None, :] & (hand > 0)[:, :, None] &
+            tables.drop_area)
+    drop = xp.concatenate([drop[:, :1] & ~drop_fu[:, None, :], drop[:, 1:]],
+                          axis=1)
+
+    action = xp.concatenate([move, ke_move, drop], axis=1)
+
+    return action, black_count, white_count, check
+
+
+def to_relative(xp, board, black_hand, white_hand, turn):
+    """
+    先手から見た局面を手番側から見た局面にする
+    perspective.to_relativeと同じ
+
+    :param xp:
+    :param board: [batch, 81]
+    :param black_hand: [batch, 7]
+    :param white_hand: [batch, 7]
+    :param turn: [batch]のbool、後手番ならTrue
+    :return: 手番側から見た盤面、手番側の持ち駒、非手番側の持ち駒
+    """
+    board = _to_int(xp, board)
+    swapped = xp.where(
+        board < WHITE_FU, board + WHITE_FU,
+        xp.where(board < EMPTY, board - WHITE_FU, board)
+    )
+    turn = xp.reshape(turn, (-1, 1))
+    relative_board = xp.where(turn, swapped[:, ::-1], board)
+    turn_hand = xp.where(turn, white_hand, black_hand)
+    next_hand = xp.where(turn, black_hand, white_hand)
+    return relative_board, turn_hand, next_hand
+
+
+def to_absolute(xp, output, turn):
+    """
+    手番側から見た盤面の形の出力を先手から見た向きに戻す
+    最後の次元がマスの次元
+
+    :param xp:
+    :param output: [batch, ..., 81]
+    :param turn: [batch]のbool、後手番ならTrue
+    :return:
+    """
+    turn = xp.reshape(turn, (-1,) + (1,) * (len(output.shape) - 1))
+    return xp.where(turn, output[..., ::-1], output)
+
+
+def format_outputs(xp, outputs, data_format, action_format='list'):
+    """
+    annotateの出力をAnnotationLayerと同じ形にする
+
+    :param xp:
+    :param outputs: annotateの出力
+    :param data_format:
+    :param action_format: 'list'または'dense'
+    :return:
+    """
+    if action_format not in ('list', 'dense'):
+        raise ValueError(action_format)
+
+    action, black_count, white_count, check = outputs
+    if data_format == 'NCHW':
+        shape = (-1, 1, 9, 9)
+    else:
+        shape = (-1, 9, 9, 1)
+
+    if action_format == 'list':
+        action = [xp.reshape(action[:, i], shape) for i in range(ACTION_SIZE)]
+    elif data_format == 'NCHW':
+        action = xp.reshape(action, (-1, ACTION_SIZE, 9, 9))
+    else:
+        action = xp.reshape(xp.transpose(action, (0, 2, 1)),
+                            (-1, 9, 9, ACTION_SIZE))
+
+    black_count = xp.reshape(black_count, shape)
+    white_count = xp.reshape(white_count, shape)
+    check = xp.reshape(check, (-1, 1, 1, 1))
+    return action, black_count, white_count, check
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ベクトル化した処理で使う表
+
+どの表も、移動先のマスから8方向に伸ばした直線上のマスを集めて、
+その上の駒が移動先のマスへ動けるかを引く形(利きを引き寄せる形)になっている
+ずらしや畳み込みを使わずに、集める操作と要素ごとの演算だけで利きを求められる
+
+マスの番号は筋 * 9 + 段
+盤の外は番号81のマスとして、OFF_BOARDの値を置く
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from ..direction import (Direction, get_eight_directions,
+                         get_opposite_direction, get_step)
+from ..piece import Piece
+from ..short_board.base_table import make_base_table
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+# 盤の外のマスの番号と値
+OFF_BOARD_SQUARE = 81
+OFF_BOARD = int(Piece.SIZE)
+# 盤の外の値を含めた駒の種類の数
+PIECE_SIZE = Piece.SIZE + 1
+
+# 行動の数 移動128、桂馬4、駒を打つ7
+ACTION_SIZE = 139
+
+# 手番側の桂馬の行動の順序
+BLACK_KE_DIRECTIONS = (Direction.RIGHT_UP_UP, Direction.LEFT_UP_UP)
+
+
+def make_ray_index_array():
+    """
+    [81, 8, 8]の表
+    マス、方向、距離-1ごとに直線上のマスの番号
+
+    :return:
+    """
+    table = np.full((81, 8, 8), OFF_BOARD_SQUARE, dtype=np.int32)
+    for h in range(9):
+        for w in range(9):
+            for d, direction in enumerate(get_eight_directions()):
+                dh, dw = get_step(direction=direction)
+                for distance in range(1, 9):
+                    i, j = h + dh * distance, w + dw * distance
+                    if not (0 <= i < 9 and 0 <= j < 9):
+                        break
+                    table[h * 9 + w, d, distance - 1] = i * 9 + j
+    return table
+
+
+def make_ke_index_array(directions=BLACK_KE_DIRECTIONS):
+    """
+    [81, len(directions)]の表
+    マスごとにdirectionsの方向へ桂馬で跳ねた先のマスの番号
+
+    :param directions:
+    :return:
+    """
+    table = np.full((81, len(directions)), OFF_BOARD_SQUARE,
+                    dtype=np.int32)
+    for h in range(9):
+        for w in range(9):
+            for k, direction in enumerate(directions):
+                dh, dw = get_step(direction=direction)
+                i, j = h + dh, w + dw
+                if 0 <= i < 9 and 0 <= j < 9:
+                    table[h * 9 + w, k] = i * 9 + j
+    return table
+
+
+def make_move_arrays():
+    """
+    駒ごとに動ける方向の表
+
+    :return: 短い利き[PIECE_SIZE, 12]と長い利き[PIECE_SIZE, 8]のbool
+    """
+    base = make_base_table().astype(np.bool_)
+
+    short = np.zeros((PIECE_SIZE, 12), dtype=np.bool_)
+    for direction in Direction:
+        # 後手の駒は表のまま、先手の駒は逆方向の表になる
+        opposite = get_opposite_direction(direction=direction)
+        short[Piece.BLACK_FU:Piece.WHITE_FU, direction] = base[opposite]
+        short[Piece.WHITE_FU:Piece.EMPTY, direction] = base[direction]
+
+    long = np.zeros((PIECE_SIZE, 8), dtype=np.bool_)
+    for offset in (Piece.BLACK_FU, Piece.WHITE_FU):
+        for direction in get_eight_directions():
+            if direction in (Direction.RIGHT, Direction.UP, Direction.DOWN,
+                             Direction.LEFT):
+                pieces = [Piece.BLACK_HI, Piece.BLACK_RY]
+            else:
+                pieces = [Piece.BLACK_KA, Piece.BLACK_UM]
+            long[np.add(pieces, offset), direction] = True
+    long[Piece.BLACK_KY, Direction.UP] = True
+    long[Piece.WHITE_KY, Direction.DOWN] = True
+
+    return short, long
+
+
+def make_attack_array(black):
+    """
+    [PIECE_SIZE, 8, 8]の表
+    移動先から見た方向、距離-1ごとに、その位置の駒が移動先に利きを持つか
+
+    :param black: 先手の駒の表ならTrue、後手の駒の表ならFalse
+    :return:
+    """
+    short, long = make_move_arrays()
+    if black:
+        short[Piece.WHITE_FU:] = False
+        long[Piece.WHITE_FU:] = False
+    else:
+        short[:Piece.WHITE_FU] = False
+        long[:Piece.WHITE_FU] = False
+
+    table = np.zeros((PIECE_SIZE, 8, 8), dtype=np.bool_)
+    for d, direction in enumerate(get_eight_directions()):
+        # 駒から移動先へ向かう方向
+        opposite = get_opposite_direction(direction=direction)
+        table[:, d, :] = long[:, opposite, None]
+        table[:, d, 0] |= short[:, opposite]
+    return table
+
+
+def make_slider_array(black):
+    """
+    [PIECE_SIZE, 8]の表
+    王から見た方向ごとに、その方向にある駒が王の方へ長い利きを持つか
+    ピンの判定に使う
+
+    :param black: 先手の駒の表ならTrue、後手の駒の表ならFalse
+    :return:
+    """
+    return make_attack_array(black=black)[:, :, 1]
+
+
+def make_line_array():
+    """
+    [8]の表
+    方向ごとに、逆方向と共通の直線の番号+1
+    ピンされていない駒は0とする
+
+    :return:
+    """
+    return np.array([min(d, 7 - d) + 1 for d in get_eight_directions()],
+                    dtype=np.int32)
+
+
+def make_promotion_arrays():
+    """
+    成りに関する表
+
+    :return: 駒ごとに成れるか[PIECE_SIZE]、
+        駒と移動先の段ごとに成らないと動けないか[PIECE_SIZE, 9]
+    """
+    promotable = np.zeros(PIECE_SIZE, dtype=np.bool_)
+    promotable[[Piece.BLACK_FU, Piece.BLACK_KY, Piece.BLACK_KE,
+                Piece.BLACK_GI, Piece.BLACK_KA, Piece.BLACK_HI]] = True
+
+    must = np.zeros((PIECE_SIZE, 9), dtype=np.bool_)
+    must[Piece.BLACK_FU, 0] = True
+    must[Piece.BLACK_KY, 0] = True
+    must[Piece.BLACK_KE, :2] = True
+
+    return promotable, must
+
+
+def make_drop_area_array():
+    """
+    [7, 81]の表
+    持ち駒ごとに打てる段のマス
+
+    :return:
+    """
+    rank = np.arange(81) % 9
+    table = np.ones((7, 81), dtype=np.bool_)
+    table[Piece.BLACK_FU] = rank >= 1
+    table[Piece.BLACK_KY] = rank >= 1
+    table[Piece.BLACK_KE] = rank >= 2
+    return table
+
+
+Tables = namedtuple('Tables', [
+    'ray', 'ray_flat', 'ray_base', 'black_ke', 'white_ke',
+    'black_attack', 'white_attack', 'black_slider', 'white_slider',
+    'line', 'promotable', 'must_promote', 'rank', 'padded_rank', 'file',
+    'ke_must_promote', 'ke_zone', 'drop_area', 'direction_offset'
+])
+
+
+def make_tables():
+    """
+    計算に必要な表をまとめて作る
+    駒で引く表は駒の値 * 要素数 + 位置で引けるように1次元にしている
+
+    :return:
+    """
+    # 直線の最後に盤の外のマスを置いて、必ず駒が見つかるようにする
+    ray = np.concatenate([
+        make_ray_index_array(),
+        np.full((81, 8, 1), OFF_BOARD_SQUARE, dtype=np.int32)
+    ], axis=2)
+    rank = (np.arange(81) % 9).astype(np.int32)
+    promotable, must = make_promotion_arrays()
+
+    return Tables(
+        ray=ray,
+        ray_flat=np.reshape(ray, [-1]),
+        # ray_flatでマスと方向の先頭の位置
+        ray_base=np.reshape(np.arange(81 * 8, dtype=np.int32) * 9, [81, 8]),
+        # 移動先から見て、先手の桂馬が右、左に跳ねた時の移動元のマス
+        black_ke=make_ke_index_array(
+            directions=(Direction.LEFT_DOWN_DOWN, Direction.RIGHT_DOWN_DOWN)
+        ),
+        # 移動先から見て、後手の桂馬の移動元のマス
+        white_ke=make_ke_index_array(),
+        black_attack=np.reshape(make_attack_array(black=True), [-1]),
+        white_attack=np.reshape(make_attack_array(black=False), [-1]),
+        black_slider=np.reshape(make_slider_array(black=True), [-1]),
+        white_slider=np.reshape(make_slider_array(black=False), [-1]),
+        line=make_line_array(),
+        promotable=promotable,
+        must_promote=np.reshape(must, [-1]),
+        rank=rank,
+        # 盤の外のマスは敵陣に入らない段にする
+        padded_rank=np.append(rank, 8).astype(np.int32),
+        file=(np.arange(81) // 9).astype(np.int32),
+        ke_must_promote=rank <= 1,
+        ke_zone=rank <= 2,
+        drop_area=make_drop_area_array(),
+        # 方向 * 8
+        direction_offset=np.arange(8, dtype=np.int32) * 8
+    )
+
+
+_tables = None
+
+
+def get_tables():
+    global _tables
+    if _tables is None:
+        _tables = make_tables()
+    return _tables
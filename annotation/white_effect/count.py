@@ -2,7 +2,8 @@
 # -*- coding: utf-8 -*-
 
 import sonnet as snt
-import tensorflow as tf
+
+from ..naive_effect.combine import combine_count
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/3/21'
@@ -21,9 +22,7 @@ class WhiteEffectCountLayer(snt.AbstractModule):
         :param ou_effect:
         :return:
         """
-        white_effect = [tf.to_int32(effect)
-                        for effect in short_effect + long_effect + ou_effect]
         # マスごとの利きの個数を計算
-        count = tf.add_n(white_effect)
+        count = combine_count(short_effect + long_effect + ou_effect)
 
         return count
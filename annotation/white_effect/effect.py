@@ -6,54 +6,59 @@ import sonnet as snt
 from .count import WhiteEffectCountLayer
 from .long_effect import WhiteLongEffectLayer
 from .ou import WhiteOuEffectLayer
-from .pseudo_ou_effect import WhitePseudoOuEffect
 from .short_effect import WhiteShortEffectLayer
-from ..black_naive_effect import BlackNaiveAllEffect
-from ..pin import WhitePinLayer
+# effect_contextからこのモジュールを読み込むので、循環importを避ける
+from .. import effect_context
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/3/20'
 
 
 class WhiteEffectLayer(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn=True, name='white_effect'):
+    def __init__(self, data_format, use_cudnn=True, long_engine='conv',
+                 short_engine='conv', name='white_effect'):
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.long_engine = long_engine
+        self.short_engine = short_engine
 
-    def _build(self, board):
+    def _build(self, board, context=None):
         """
         非手番側の有効な利きを求める
 
         :param board:
+        :param context: EffectContextLayerの出力
+            省略した場合はここで計算する
         :return:
         """
-        # 非手番側のナイーブな利きを求める
-        black_all_effect, black_long_effect = BlackNaiveAllEffect(
-            data_format=self.data_format, use_cudnn=self.use_cudnn
-        )(board)
+        if context is None:
+            context = effect_context.EffectContextLayer(
+                data_format=self.data_format, use_cudnn=self.use_cudnn,
+                long_engine=self.long_engine, short_engine=self.short_engine,
+                black=False
+            )(board)
+        # 手番側のナイーブな利き
+        black_all_effect = context.black_naive_effect
 
-        pseudo_effect = WhitePseudoOuEffect(
-            data_format=self.data_format, use_cudnn=self.use_cudnn
-        )(board)
-
-        # ピンされているかを判定
-        pinned_board = WhitePinLayer(
-            data_format=self.data_format
-        )(board, pseudo_effect, black_long_effect)
+        # ピンされているかを判定した盤面
+        pinned_board = context.white_pinned_board
 
         # 短い利きを計算
         white_short_effect = WhiteShortEffectLayer(
-            data_format=self.data_format, use_cudnn=self.use_cudnn
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            short_engine=self.short_engine
         )(pinned_board)
         # 長い利きを計算
         white_long_effect = WhiteLongEffectLayer(
-            data_format=self.data_format, use_cudnn=self.use_cudnn
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            long_engine=self.long_engine
         )(pinned_board)
         # OUの利きを計算
         white_ou_effect = WhiteOuEffectLayer(
-            data_format=self.data_format, use_cudnn=self.use_cudnn
-        )(board, black_all_effect)
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            short_engine=self.short_engine
+        )(board, black_all_effect, occupancy=context.occupancy)
 
         # マスごとの利きの個数を計算
         count = WhiteEffectCountLayer()(
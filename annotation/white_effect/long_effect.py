@@ -5,17 +5,20 @@ import sonnet as snt
 
 from ..direction import get_eight_directions
 from ..long_board.white_piece import select_white_long_pieces
-from ..naive_effect import LongEffectAllRangeLayer
+from ..naive_effect import (LongEffectAllRangeLayer,
+                            compute_long_all_range_effects)
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/3/20'
 
 
 class WhiteLongEffectLayer(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn=True, name='white_long_effect'):
+    def __init__(self, data_format, use_cudnn=True, long_engine='conv',
+                 name='white_long_effect'):
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.long_engine = long_engine
 
     def _build(self, pinned_board):
         """
@@ -24,22 +27,30 @@ class WhiteLongEffectLayer(snt.AbstractModule):
         :param pinned_board:
         :return:
         """
-        effect_list = [
-            WhiteLongDirectedEffectLayer(
-                direction=direction, data_format=self.data_format,
-                use_cudnn=self.use_cudnn
-            )(pinned_board) for direction in get_eight_directions()
-        ]
+        selected = {
+            direction: select_white_long_pieces(
+                board=pinned_board, data_format=self.data_format,
+                direction=direction, naive=False
+            ) for direction in get_eight_directions()
+        }
+        effects = compute_long_all_range_effects(
+            inputs=selected, data_format=self.data_format,
+            use_cudnn=self.use_cudnn, long_engine=self.long_engine
+        )
+
+        effect_list = [effects[direction]
+                       for direction in get_eight_directions()]
         return effect_list
 
 
 class WhiteLongDirectedEffectLayer(snt.AbstractModule):
     def __init__(self, direction, data_format, use_cudnn=True,
-                 name='white_long_directed_effect'):
+                 long_engine='conv', name='white_long_directed_effect'):
         super().__init__(name=name)
         self.direction = direction
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.long_engine = long_engine
 
     def _build(self, pinned_board):
         """
@@ -54,6 +65,6 @@ class WhiteLongDirectedEffectLayer(snt.AbstractModule):
         )
         effect = LongEffectAllRangeLayer(
             direction=self.direction, data_format=self.data_format,
-            use_cudnn=self.use_cudnn
+            use_cudnn=self.use_cudnn, long_engine=self.long_engine
         )(selected)
         return effect
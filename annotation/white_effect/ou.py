@@ -5,29 +5,36 @@ import sonnet as snt
 import tensorflow as tf
 
 from ..direction import get_eight_directions
-from ..naive_effect import ShortEffectLayer
-from ..short_board.white_piece import select_white_ou
+from ..naive_effect import compute_short_effects
+from ..occupancy import make_occupancy
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/3/17'
 
 
 class WhiteOuEffectLayer(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn=True, name='white_ou_effect'):
+    def __init__(self, data_format, use_cudnn=True, short_engine='conv',
+                 name='white_ou_effect'):
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
-
-    def _build(self, board, black_naive_all_effect):
-        selected = select_white_ou(board=board)
+        self.short_engine = short_engine
+
+    def _build(self, board, black_naive_all_effect, occupancy=None):
+        if occupancy is None:
+            occupancy = make_occupancy(board=board)
+        selected = occupancy.white_ou
+        effects = compute_short_effects(
+            inputs={direction: selected
+                    for direction in get_eight_directions()},
+            data_format=self.data_format, use_cudnn=self.use_cudnn,
+            short_engine=self.short_engine
+        )
         outputs = []
 
         flipped_black_effect = tf.logical_not(black_naive_all_effect)
         for direction in get_eight_directions():
-            effect = ShortEffectLayer(
-                direction=direction, data_format=self.data_format,
-                use_cudnn=self.use_cudnn
-            )(selected)
+            effect = effects[direction]
 
             # effectでTrueのマスがある（盤の端で移動できない可能性がある）
             # そのマスが相手の効きと重なっていない
@@ -6,7 +6,7 @@ from itertools import chain
 import sonnet as snt
 
 from ..direction import Direction, get_eight_directions
-from ..naive_effect import ShortEffectLayer
+from ..naive_effect import ShortEffectLayer, compute_short_effects
 from ..short_board.white_piece import select_white_short_pieces_without_ou
 
 __author__ = 'Yasuhiro'
@@ -14,10 +14,12 @@ __date__ = '2018/3/17'
 
 
 class WhiteShortEffectLayer(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn=True, name='white_short_effect'):
+    def __init__(self, data_format, use_cudnn=True, short_engine='conv',
+                 name='white_short_effect'):
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.short_engine = short_engine
 
     def _build(self, pinned_board):
         """
@@ -26,25 +28,31 @@ class WhiteShortEffectLayer(snt.AbstractModule):
         :param pinned_board:
         :return:
         """
-        effect_list = [
-            WhiteShortDirectedEffectLayer(
-                direction=direction, data_format=self.data_format,
-                use_cudnn=self.use_cudnn
-            )(pinned_board)
-            for direction in chain(get_eight_directions(),
-                                   [Direction.RIGHT_DOWN_DOWN,
-                                    Direction.LEFT_DOWN_DOWN])
-        ]
+        directions = list(chain(get_eight_directions(),
+                                [Direction.RIGHT_DOWN_DOWN,
+                                 Direction.LEFT_DOWN_DOWN]))
+        selected = {
+            direction: select_white_short_pieces_without_ou(
+                board=pinned_board, direction=direction
+            ) for direction in directions
+        }
+        effects = compute_short_effects(
+            inputs=selected, data_format=self.data_format,
+            use_cudnn=self.use_cudnn, short_engine=self.short_engine
+        )
+
+        effect_list = [effects[direction] for direction in directions]
         return effect_list
 
 
 class WhiteShortDirectedEffectLayer(snt.AbstractModule):
     def __init__(self, direction, data_format, use_cudnn=True,
-                 name='white_short_directed_effect'):
+                 short_engine='conv', name='white_short_directed_effect'):
         super().__init__(name=name)
         self.direction = direction
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.short_engine = short_engine
 
     def _build(self, pinned_board):
         """
@@ -58,6 +66,6 @@ class WhiteShortDirectedEffectLayer(snt.AbstractModule):
         )
         effect = ShortEffectLayer(
             direction=self.direction, data_format=self.data_format,
-            use_cudnn=self.use_cudnn
+            use_cudnn=self.use_cudnn, short_engine=self.short_engine
         )(selected)
         return effect
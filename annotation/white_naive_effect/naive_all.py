@@ -1,65 +1,109 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from itertools import chain
+
 import sonnet as snt
 import tensorflow as tf
 
 from .naive_short import WhiteNaiveShortEffectLayer
 from .naive_long import WhiteNaiveLongEffectLayer
 from ..direction import get_eight_directions, Direction
-from ..naive_effect import CombineLayer
+from ..long_board.white_piece import select_white_long_pieces
+from ..naive_effect import (compute_packed_long_all_range_effects,
+                            compute_packed_short_effects)
+from ..naive_effect.packed import from_packed_plane, pack_planes
+from ..short_board.white_piece import select_white_short_pieces
 
 __author__ = 'Yasuhiro'
 __date__ = '2018/2/17'
 
 
 class WhiteNaiveAllEffect(snt.AbstractModule):
-    def __init__(self, data_format, use_cudnn=True,
-                 name='white_naive_all_effect'):
+    def __init__(self, data_format, use_cudnn=True, long_engine='conv',
+                 short_engine='conv', name='white_naive_all_effect'):
         super().__init__(name=name)
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.long_engine = long_engine
+        self.short_engine = short_engine
 
     def _build(self, board):
         """
         非手番側のナイーブな利きを全て求める
 
-        同時にナイーブな長い利きも返す
+        同時にナイーブな長い利きも8方向をまとめた[batch, 8, 9, 9]で返す
         手番側の駒がピンされているかを判定に利用する
 
         :param board:
         :return:
         """
-        effect_list = []
-        long_effects = {}
-        for direction in get_eight_directions():
-            short_effect = WhiteNaiveShortEffectLayer(
-                direction=direction, data_format=self.data_format,
-                use_cudnn=self.use_cudnn,
-                name='white_naive_short_effect_{}'.format(direction.name)
-            )(board)
-            long_effect = WhiteNaiveLongEffectLayer(
-                direction=direction, data_format=self.data_format,
-                use_cudnn=self.use_cudnn,
-                name='white_naive_long_effect_{}'.format(direction.name)
-            )(board)
+        ke_directions = (Direction.RIGHT_DOWN_DOWN, Direction.LEFT_DOWN_DOWN)
+        short_effects = self._make_short_effects(
+            board=board,
+            directions=tuple(chain(get_eight_directions(), ke_directions))
+        )
+        long_effects = self._make_long_effects(board=board)
 
-            long_effects[direction] = long_effect
+        # 全ての方向の利きを1回でまとめる
+        effect = from_packed_plane(
+            plane=tf.reduce_any(tf.concat([short_effects, long_effects],
+                                          axis=1), axis=1),
+            data_format=self.data_format
+        )
 
-            effect_list.append(tf.logical_or(short_effect, long_effect))
+        return effect, long_effects
 
-        eight_effects = CombineLayer()(effect_list)
+    def _make_short_effects(self, board, directions):
+        """
+        短い利きを方向ごとに分けずに[batch, n, 9, 9]で求める
 
-        effect_ke_list = []
-        for direction in (Direction.RIGHT_DOWN_DOWN, Direction.LEFT_DOWN_DOWN):
-            effect_ke = WhiteNaiveShortEffectLayer(
+        :param board:
+        :param directions:
+        :return:
+        """
+        if self.short_engine in ('bank', 'shift'):
+            # 全ての方向をまとめて計算する
+            # bankは1回の畳み込み、shiftは1回のパディングで済む
+            selected = {
+                direction: select_white_short_pieces(
+                    board=board, direction=direction
+                ) for direction in directions
+            }
+            return compute_packed_short_effects(
+                inputs=selected, data_format=self.data_format,
+                use_cudnn=self.use_cudnn, short_engine=self.short_engine
+            )
+
+        outputs = [
+            WhiteNaiveShortEffectLayer(
                 direction=direction, data_format=self.data_format,
-                use_cudnn=self.use_cudnn,
-                name='white_naive_short_effect_{}'.format(direction)
-            )(board)
-            effect_ke_list.append(effect_ke)
-        effect_ke = tf.logical_or(*effect_ke_list)
+                use_cudnn=self.use_cudnn, short_engine=self.short_engine,
+                name='white_naive_short_effect_{}'.format(direction.name)
+            )(board) for direction in directions
+        ]
+        return pack_planes(outputs)
 
-        effect = tf.logical_or(eight_effects, effect_ke)
+    def _make_long_effects(self, board):
+        if self.long_engine in ('bank', 'bits'):
+            # bankはフィルタの大きさが同じ方向をまとめて畳み込み、
+            # bitsは全ての方向のワードをまとめてから盤面に戻し、方向ごとに分けずに返す
+            selected = {
+                direction: select_white_long_pieces(
+                    board=board, data_format=self.data_format,
+                    direction=direction, naive=True
+                ) for direction in get_eight_directions()
+            }
+            return compute_packed_long_all_range_effects(
+                inputs=selected, data_format=self.data_format,
+                use_cudnn=self.use_cudnn, long_engine=self.long_engine
+            )
 
-        return effect, long_effects
+        outputs = [
+            WhiteNaiveLongEffectLayer(
+                direction=direction, data_format=self.data_format,
+                use_cudnn=self.use_cudnn, long_engine=self.long_engine,
+                name='white_naive_long_effect_{}'.format(direction.name)
+            )(board) for direction in get_eight_directions()
+        ]
+        return pack_planes(outputs)
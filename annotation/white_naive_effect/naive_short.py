@@ -12,11 +12,12 @@ __date__ = '2018/2/17'
 
 class WhiteNaiveShortEffectLayer(snt.AbstractModule):
     def __init__(self, direction, data_format, use_cudnn=True,
-                 name='white_naive_short_effect'):
+                 short_engine='conv', name='white_naive_short_effect'):
         super().__init__(name=name)
         self.direction = direction
         self.data_format = data_format
         self.use_cudnn = use_cudnn
+        self.short_engine = short_engine
 
     def _build(self, board):
         """
@@ -31,7 +32,7 @@ class WhiteNaiveShortEffectLayer(snt.AbstractModule):
                                                     direction=self.direction)
         effect = ShortEffectLayer(
             direction=self.direction, data_format=self.data_format,
-            use_cudnn=self.use_cudnn,
+            use_cudnn=self.use_cudnn, short_engine=self.short_engine,
             name='white_naive_short_effect_{}'.format(self.direction.name)
         )(selected_pieces)
 
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AnnotationLayerのグラフの大きさと実行速度を計測する
+
+グラフの大きさは演算の種類ごとの個数と、
+1ステップで確保されるテンソルの個数とバイト数(静的な形から計算)で比べる
+バッチサイズを決めずにグラフを作るので、
+複数のバッチサイズを指定して1秒あたりの局面数の変化を比べられる
+"""
+
+import argparse
+import os
+import time
+from collections import Counter
+from itertools import product
+from pathlib import Path
+
+import tensorflow as tf
+from dotenv import load_dotenv
+
+from annotation import AnnotationLayer, ACTION_FORMATS, OUTPUT_NAMES
+from annotation.initial_board import make_initial_inputs
+from annotation.naive_effect import LONG_ENGINES, SHORT_ENGINES
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+def get_env():
+    dotenv_path = Path(__file__).parents[0] / '.env'
+    load_dotenv(str(dotenv_path))
+
+    data_format = os.environ.get('DATA_FORMAT')
+    use_cudnn = bool(os.environ.get('USE_CUDNN'))
+
+    return data_format, use_cudnn
+
+
+def count_graph(graph, batch_size):
+    """
+    演算の種類ごとの個数と、定数以外の演算の出力の個数とバイト数を数える
+    出力のバイト数は形が静的に決まるものだけを数える
+    バッチサイズが決まっていない場合はbatch_sizeとして数える
+
+    :param graph:
+    :param batch_size:
+    :return:
+    """
+    op_types = Counter()
+    n_tensors = 0
+    n_bytes = 0
+    for op in graph.get_operations():
+        op_types[op.type] += 1
+        if op.type in ('Const', 'Placeholder'):
+            continue
+        for output in op.outputs:
+            n_tensors += 1
+            shape = output.shape
+            if shape.dims is None:
+                continue
+            size = 1
+            for i, dim in enumerate(shape.as_list()):
+                if dim is None:
+                    if i != 0:
+                        size = 0
+                        break
+                    dim = batch_size
+                size *= dim
+            n_bytes += size * output.dtype.size
+    return op_types, n_tensors, n_bytes
+
+
+def parse_outputs(text):
+    """
+    カンマ区切りの出力の名前をtupleにする
+    'all'は全ての出力
+
+    :param text:
+    :return:
+    """
+    if text == 'all':
+        return OUTPUT_NAMES
+    outputs = tuple(text.split(','))
+    for name in outputs:
+        if name not in OUTPUT_NAMES:
+            raise argparse.ArgumentTypeError(name)
+    return outputs
+
+
+def run_benchmark(long_engine, short_engine, batch_size, n_steps,
+                  data_format, use_cudnn, outputs=OUTPUT_NAMES,
+                  action_format='list'):
+    graph = tf.Graph()
+    with graph.as_default():
+        if data_format == 'NCHW':
+            shape = (None, 1, 9, 9)
+        else:
+            shape = (None, 9, 9, 1)
+        ph_board = tf.placeholder(shape=shape, dtype=tf.int32)
+        ph_hand = tf.placeholder(shape=(None, 7), dtype=tf.int32)
+        outputs = AnnotationLayer(
+            data_format=data_format, use_cudnn=use_cudnn,
+            long_engine=long_engine, short_engine=short_engine,
+            outputs=outputs, action_format=action_format
+        )(ph_board, ph_hand)
+
+    op_types, n_tensors, n_bytes = count_graph(graph=graph,
+                                               batch_size=batch_size)
+
+    board, hand = make_initial_inputs(batch_size=batch_size,
+                                      data_format=data_format)
+    feed_dict = {ph_board: board, ph_hand: hand}
+    with tf.Session(graph=graph) as sess:
+        # 初回は計測しない
+        sess.run(outputs, feed_dict=feed_dict)
+
+        start = time.perf_counter()
+        for _ in range(n_steps):
+            sess.run(outputs, feed_dict=feed_dict)
+        elapsed = (time.perf_counter() - start) / n_steps
+
+    return {
+        'ops': sum(op_types.values()),
+        'pad': op_types['Pad'] + op_types['PadV2'],
+        'const': op_types['Const'],
+        'conv': op_types['Conv2D'],
+        'tensors': n_tensors,
+        'bytes': n_bytes,
+        'seconds': elapsed,
+        'positions': batch_size / elapsed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--long-engine', nargs='+', default=['conv'],
+                        choices=LONG_ENGINES)
+    parser.add_argument('--short-engine', nargs='+', default=['conv'],
+                        choices=SHORT_ENGINES)
+    parser.add_argument('--outputs', nargs='+', default=[OUTPUT_NAMES],
+                        type=parse_outputs,
+                        help='calculated outputs separated by comma '
+                             '(e.g. action black_count,white_count check)')
+    parser.add_argument('--action-format', nargs='+', default=['list'],
+                        choices=ACTION_FORMATS)
+    parser.add_argument('--batch-size', nargs='+', type=int, default=[1])
+    parser.add_argument('--n-steps', type=int, default=100)
+    args = parser.parse_args()
+
+    data_format, use_cudnn = get_env()
+
+    print('outputs\taction\tlong\tshort\tbatch\tops\tpad\tconst\tconv\t'
+          'tensors\tbytes\tmsec/step\tpositions/sec')
+    for (outputs, action_format, long_engine, short_engine,
+         batch_size) in product(args.outputs, args.action_format,
+                                args.long_engine, args.short_engine,
+                                args.batch_size):
+        r = run_benchmark(
+            long_engine=long_engine, short_engine=short_engine,
+            batch_size=batch_size, n_steps=args.n_steps,
+            data_format=data_format, use_cudnn=use_cudnn, outputs=outputs,
+            action_format=action_format
+        )
+        print('{}\t{}\t{}\t{}\t{}\t{ops}\t{pad}\t{const}\t{conv}\t'
+              '{tensors}\t{bytes}\t{msec:.3f}\t{positions:.0f}'.format(
+                  ','.join(outputs), action_format, long_engine,
+                  short_engine, batch_size, msec=r['seconds'] * 1000, **r
+              ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AnnotationLayerと同じ出力を計算する実装ごとに実行速度を計測する
+
+graph: TensorFlow 1のグラフのAnnotationLayer
+tf2: TensorFlow 2のtf.function(jit_compile=True)
+tf2-nojit: TensorFlow 2のtf.function(XLAを使わない)
+numpy: numpyだけで計算する
+numba: numbaでコンパイルした処理で、バッチの局面を並列に計算する
+numba-position: numbaでコンパイルした処理で、1局面ずつ計算する
+jax: JAXのjax.jit(jax.vmap)、バッチサイズごとにコンパイルする
+onnx: ONNXに変換したモデルをonnxruntimeのCPUで実行する
+
+実装ごとに必要なライブラリだけを読み込むので、
+TensorFlow 1と2の比較はそれぞれの環境で実行して、1秒あたりの局面数を比べる
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from annotation.initial_board import make_initial_inputs
+
+__author__ = 'Yasuhiro'
+__date__ = '2026/10/18'
+
+
+BACKENDS = ('graph', 'tf2', 'tf2-nojit', 'numpy', 'numba',
+            'numba-position', 'jax', 'onnx')
+
+
+def get_env():
+    dotenv_path = Path(__file__).parents[0] / '.env'
+    load_dotenv(str(dotenv_path))
+
+    data_format = os.environ.get('DATA_FORMAT')
+    use_cudnn = bool(os.environ.get('USE_CUDNN'))
+
+    return data_format, use_cudnn
+
+
+def make_graph_function(data_format, use_cudnn):
+    import tensorflow as tf
+    from annotation import AnnotationLayer
+
+    graph = tf.Graph()
+    with graph.as_default():
+        if data_format == 'NCHW':
+            shape = (None, 1, 9, 9)
+        else:
+            shape = (None, 9, 9, 1)
+        ph_board = tf.placeholder(shape=shape, dtype=tf.int32)
+        ph_hand = tf.placeholder(shape=(None, 7), dtype=tf.int32)
+        outputs = AnnotationLayer(
+            data_format=data_format, use_cudnn=use_cudnn
+        )(ph_board, ph_hand)
+    sess = tf.Session(graph=graph)
+
+    def function(board, hand):
+        return sess.run(outputs, feed_dict={ph_board: board, ph_hand: hand})
+    return function
+
+
+def make_tf2_function(data_format, jit_compile):
+    import tensorflow as tf
+    from annotation.tf2 import AnnotationFunction
+
+    annotation = AnnotationFunction(data_format=data_format,
+                                    jit_compile=jit_compile)
+
+    def function(board, hand):
+        outputs = annotation(board, hand)
+        return tf.nest.map_structure(lambda t: t.numpy(), outputs)
+    return function
+
+
+def make_numpy_function(data_format):
+    from annotation.numpy_backend import annotate
+
+    def function(board, hand):
+        return annotate(board, hand, data_format=data_format)
+    return function
+
+
+def make_numba_function(data_format):
+    from annotation.numba_backend import annotate
+
+    def function(board, hand):
+        return annotate(board, hand, data_format=data_format)
+    return function
+
+
+def make_numba_position_function():
+    from annotation.numba_backend import annotate_position
+
+    def function(board, hand):
+        return [annotate_position(b, h) for b, h in zip(board, hand)]
+    return function
+
+
+def make_jax_function(data_format):
+    import jax
+    import numpy as np
+    from annotation.jax_backend import AnnotationFunction
+
+    annotation = AnnotationFunction(data_format=data_format)
+
+    def function(board, hand):
+        outputs = annotation(board, hand)
+        return jax.tree_util.tree_map(np.asarray, outputs)
+    return function
+
+
+def make_onnx_function(data_format):
+    import tempfile
+    import onnxruntime as ort
+    from annotation.onnx_export import INPUT_NAMES, export_onnx
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'annotation.onnx'
+        export_onnx(path, data_format=data_format)
+        session = ort.InferenceSession(str(path),
+                                       providers=['CPUExecutionProvider'])
+
+    def function(board, hand):
+        return session.run(None, {INPUT_NAMES[0]: board,
+                                  INPUT_NAMES[1]: hand})
+    return function
+
+
+def make_function(backend, data_format, use_cudnn):
+    """
+    numpyの盤面と持ち駒から、numpyの出力を求める関数を作る
+
+    :param backend:
+    :param data_format:
+    :param use_cudnn:
+    :return:
+    """
+    if backend == 'graph':
+        return make_graph_function(data_format=data_format,
+                                   use_cudnn=use_cudnn)
+    elif backend == 'tf2':
+        return make_tf2_function(data_format=data_format, jit_compile=True)
+    elif backend == 'tf2-nojit':
+        return make_tf2_function(data_format=data_format, jit_compile=False)
+    elif backend == 'numpy':
+        return make_numpy_function(data_format=data_format)
+    elif backend == 'numba':
+        return make_numba_function(data_format=data_format)
+    elif backend == 'numba-position':
+        return make_numba_position_function()
+    elif backend == 'jax':
+        return make_jax_function(data_format=data_format)
+    elif backend == 'onnx':
+        return make_onnx_function(data_format=data_format)
+    raise ValueError(backend)
+
+
+def run_benchmark(function, batch_size, n_steps, data_format):
+    board, hand = make_initial_inputs(batch_size=batch_size,
+                                      data_format=data_format)
+    # 初回は追跡やコンパイルを含むので計測しない
+    start = time.perf_counter()
+    function(board, hand)
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(n_steps):
+        function(board, hand)
+    elapsed = (time.perf_counter() - start) / n_steps
+
+    return {
+        'first': first,
+        'seconds': elapsed,
+        'positions': batch_size / elapsed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--backend', nargs='+', default=['tf2'],
+                        choices=BACKENDS)
+    parser.add_argument('--batch-size', nargs='+', type=int,
+                        default=[1, 16, 256, 4096])
+    parser.add_argument('--n-steps', type=int, default=100)
+    args = parser.parse_args()
+
+    data_format, use_cudnn = get_env()
+
+    print('backend\tbatch\tfirst msec\tmsec/step\tpositions/sec')
+    for backend in args.backend:
+        # 関数は実装ごとに1回だけ作り、バッチサイズを変えて呼び出す
+        function = make_function(backend=backend, data_format=data_format,
+                                 use_cudnn=use_cudnn)
+        for batch_size in args.batch_size:
+            r = run_benchmark(function=function, batch_size=batch_size,
+                              n_steps=args.n_steps, data_format=data_format)
+            print('{}\t{}\t{:.3f}\t{:.3f}\t{:.0f}'.format(
+                backend, batch_size, r['first'] * 1000, r['seconds'] * 1000,
+                r['positions']
+            ))
+
+
+if __name__ == '__main__':
+    main()
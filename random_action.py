@@ -507,12 +507,13 @@ def run_random_action(seed, max_actions, n_episodes):
 
     data_format, use_cudnn = get_env()
     if data_format == 'NCHW':
-        shape = (1, 1, 9, 9)
+        shape = (-1, 1, 9, 9)
     else:
-        shape = (1, 9, 9, 1)
+        shape = (-1, 9, 9, 1)
 
-    ph_board = tf.placeholder(shape=shape, dtype=tf.int32)
-    ph_hand = tf.placeholder(shape=(1, 7), dtype=tf.int32)
+    # バッチサイズは決めない
+    ph_board = tf.placeholder(shape=(None,) + shape[1:], dtype=tf.int32)
+    ph_hand = tf.placeholder(shape=(None, 7), dtype=tf.int32)
     all_actions, black_count, white_count, black_check = AnnotationLayer(
         data_format=data_format, use_cudnn=use_cudnn
     )(ph_board, ph_hand)
@@ -551,12 +552,12 @@ def run_random_action(seed, max_actions, n_episodes):
             if position.turn == BLACK:
                 feed_dict = {
                     ph_board: position.positive_board.board.reshape(shape),
-                    ph_hand: position.positive_board.black_hand.reshape((1, 7))
+                    ph_hand: position.positive_board.black_hand.reshape((-1, 7))
                 }
             else:
                 feed_dict = {
                     ph_board: position.reversed_board.board.reshape(shape),
-                    ph_hand: position.reversed_board.black_hand.reshape((1, 7))
+                    ph_hand: position.reversed_board.black_hand.reshape((-1, 7))
                 }
             actions, black_c, white_c, check = sess.run(
                 [all_actions, black_count, white_count, black_check],